@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.apps import apps
+
+
+class Command(BaseCommand):
+    help = "Cập nhật lại cột search_text (dữ liệu tìm kiếm không dấu) theo từng lô"
+
+    MODELS = ("accounts.User", "accounts.Customer")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Model cần cập nhật (ví dụ: accounts.User), mặc định tất cả",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Số bản ghi mỗi lô (mặc định 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size phải ít nhất là 1")
+
+        for label in options["models"] or self.MODELS:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError):
+                raise CommandError(f"Không tìm thấy model: {label}")
+
+            if not hasattr(model, "rebuild_search_text"):
+                raise CommandError(f"Model {label} không có cột search_text")
+
+            stdout = self.stdout if options["verbosity"] > 1 else None
+            updated = model.rebuild_search_text(batch_size=batch_size, stdout=stdout)
+            self.stdout.write(
+                self.style.SUCCESS(f"{label}: đã cập nhật {updated} bản ghi")
+            )
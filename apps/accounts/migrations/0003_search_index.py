@@ -0,0 +1,18 @@
+from django.db import migrations
+
+from utils.search import SearchIndex
+
+
+SEARCH_INDEX_FIELDS = ("full_name", "phone_number", "code", "email")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_created_id_index'),
+    ]
+
+    operations = [
+        SearchIndex('accounts_customer', SEARCH_INDEX_FIELDS).operation(),
+        SearchIndex('accounts_user', SEARCH_INDEX_FIELDS).operation(),
+    ]
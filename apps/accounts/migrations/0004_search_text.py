@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+from utils.search import SearchIndex
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='search_text',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1024, verbose_name='Dữ liệu tìm kiếm'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='search_text',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1024, verbose_name='Dữ liệu tìm kiếm'),
+        ),
+        SearchIndex('accounts_customer', ('search_text',), normalized=True).operation(),
+        SearchIndex('accounts_user', ('search_text',), normalized=True).operation(),
+    ]
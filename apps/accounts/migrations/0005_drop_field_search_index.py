@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+from utils.search import SearchIndex
+
+
+SEARCH_INDEX_FIELDS = ("full_name", "phone_number", "code", "email")
+
+
+# User/Customer tìm kiếm trên cột `search_text` (SearchTextBackend): bỏ các index theo
+# từng trường của 0003 (GIN trigram trên PostgreSQL, bảng FTS5 và trigger trên SQLite)
+# và btree trên `search_text`, chỉ giữ index GIN trigram của 0004.
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_search_text'),
+    ]
+
+    operations = [
+        SearchIndex('accounts_customer', SEARCH_INDEX_FIELDS).drop_operation(),
+        SearchIndex('accounts_user', SEARCH_INDEX_FIELDS).drop_operation(),
+        migrations.AlterField(
+            model_name='customer',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1024, verbose_name='Dữ liệu tìm kiếm'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='search_text',
+            field=models.CharField(blank=True, default='', editable=False, max_length=1024, verbose_name='Dữ liệu tìm kiếm'),
+        ),
+    ]
@@ -0,0 +1,138 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:16
+
+import apps.accounts.models.utils.validators
+import django.db.models.deletion
+from django.contrib.auth.hashers import make_password
+from django.db import migrations, models
+
+
+def fill_empty_passwords(apps, schema_editor):
+    # Cột password không còn cho phép NULL: tài khoản chưa có mật khẩu nhận mật khẩu không dùng được
+    for model_name in ("User", "Customer"):
+        model = apps.get_model("accounts", model_name)
+        model.objects.filter(password__isnull=True).update(password=make_password(None))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_drop_field_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_empty_passwords, migrations.RunPython.noop),
+        migrations.AlterModelOptions(
+            name='customer',
+            options={'verbose_name': 'Tài khoản khách hàng', 'verbose_name_plural': 'Tài khoản khách hàng'},
+        ),
+        migrations.AlterModelOptions(
+            name='user',
+            options={'verbose_name': 'Tài khoản người dùng', 'verbose_name_plural': 'Tài khoản người dùng'},
+        ),
+        migrations.RemoveIndex(
+            model_name='customer',
+            name='accounts_cu_code_622509_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customer',
+            name='accounts_cu_full_na_2ae038_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customer',
+            name='accounts_cu_created_242e5c_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='customer',
+            name='accounts_cu_phone_n_b183a9_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='accounts_us_code_2c75a3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='accounts_us_full_na_88336b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='accounts_us_created_4734df_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='accounts_us_phone_n_613c4a_idx',
+        ),
+        migrations.RemoveField(
+            model_name='adminuser',
+            name='last_login',
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='representative',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='customer_representative', to='accounts.user', verbose_name='Người đại diện'),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='code',
+            field=models.CharField(blank=True, db_index=True, error_messages={'blank': 'Mã không được bỏ trống', 'invalid': 'Mã không hợp lệ', 'max_length': 'Mã không thể dài hơn 100 ký tự', 'null': 'Mã không được bỏ trống', 'required': 'Mã không được bỏ trống', 'unique': 'Mã đã tồn tại trên hệ thống'}, max_length=100, null=True, verbose_name='Mã'),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='email',
+            field=models.EmailField(blank=True, db_index=True, error_messages={'blank': 'Địa chỉ email không được bỏ trống', 'invalid': 'Địa chỉ email không hợp lệ', 'max_length': 'Địa chỉ email không thể dài hơn 255 ký tự', 'null': 'Địa chỉ email không được bỏ trống', 'required': 'Địa chỉ email không được bỏ trống', 'unique': 'Địa chỉ email đã tồn tại trên hệ thống'}, max_length=255, null=True, verbose_name='Địa chỉ email'),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='full_name',
+            field=models.CharField(db_index=True, error_messages={'blank': 'Họ và tên không được bỏ trống', 'invalid': 'Họ và tên không hợp lệ', 'max_length': 'Họ và tên không thể dài hơn 255 ký tự', 'null': 'Họ và tên không được bỏ trống', 'required': 'Họ và tên không được bỏ trống', 'unique': 'Họ và tên đã tồn tại trên hệ thống'}, max_length=255, verbose_name='Họ và Tên'),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='password',
+            field=models.CharField(error_messages={'blank': 'Mật khẩu không được bỏ trống', 'invalid': 'Mật khẩu không hợp lệ', 'max_length': 'Mật khẩu không thể dài hơn 128 ký tự', 'null': 'Mật khẩu không được bỏ trống', 'required': 'Mật khẩu không được bỏ trống', 'unique': 'Mật khẩu đã tồn tại trên hệ thống'}, max_length=128, verbose_name='Mật khẩu'),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='phone_number',
+            field=models.CharField(db_index=True, error_messages={'blank': 'Số điện thoại không được bỏ trống', 'invalid': 'Số điện thoại không hợp lệ', 'max_length': 'Số điện thoại không thể dài hơn 128 ký tự', 'null': 'Số điện thoại không được bỏ trống', 'required': 'Số điện thoại không được bỏ trống', 'unique': 'Số điện thoại đã tồn tại trên hệ thống'}, max_length=128, unique=True, validators=[apps.accounts.models.utils.validators.validate_phone_number], verbose_name='Số điện thoại'),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='status',
+            field=models.CharField(choices=[('ACTIVATED', 'Đang hoạt động'), ('NOT_ACTIVATED', 'Chưa kích hoạt'), ('LOCKED', 'Vô hiệu hóa')], db_index=True, default='ACTIVATED', error_messages={'blank': 'Trạng thái không được bỏ trống', 'invalid': 'Trạng thái không hợp lệ', 'null': 'Trạng thái không được bỏ trống', 'required': 'Trạng thái không được bỏ trống'}, max_length=100, verbose_name='Trạng thái'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='code',
+            field=models.CharField(blank=True, db_index=True, error_messages={'blank': 'Mã không được bỏ trống', 'invalid': 'Mã không hợp lệ', 'max_length': 'Mã không thể dài hơn 100 ký tự', 'null': 'Mã không được bỏ trống', 'required': 'Mã không được bỏ trống', 'unique': 'Mã đã tồn tại trên hệ thống'}, max_length=100, null=True, verbose_name='Mã'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(blank=True, db_index=True, error_messages={'blank': 'Địa chỉ email không được bỏ trống', 'invalid': 'Địa chỉ email không hợp lệ', 'max_length': 'Địa chỉ email không thể dài hơn 255 ký tự', 'null': 'Địa chỉ email không được bỏ trống', 'required': 'Địa chỉ email không được bỏ trống', 'unique': 'Địa chỉ email đã tồn tại trên hệ thống'}, max_length=255, null=True, verbose_name='Địa chỉ email'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='full_name',
+            field=models.CharField(db_index=True, error_messages={'blank': 'Họ và tên không được bỏ trống', 'invalid': 'Họ và tên không hợp lệ', 'max_length': 'Họ và tên không thể dài hơn 255 ký tự', 'null': 'Họ và tên không được bỏ trống', 'required': 'Họ và tên không được bỏ trống', 'unique': 'Họ và tên đã tồn tại trên hệ thống'}, max_length=255, verbose_name='Họ và Tên'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='password',
+            field=models.CharField(error_messages={'blank': 'Mật khẩu không được bỏ trống', 'invalid': 'Mật khẩu không hợp lệ', 'max_length': 'Mật khẩu không thể dài hơn 128 ký tự', 'null': 'Mật khẩu không được bỏ trống', 'required': 'Mật khẩu không được bỏ trống', 'unique': 'Mật khẩu đã tồn tại trên hệ thống'}, max_length=128, verbose_name='Mật khẩu'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='phone_number',
+            field=models.CharField(db_index=True, error_messages={'blank': 'Số điện thoại không được bỏ trống', 'invalid': 'Số điện thoại không hợp lệ', 'max_length': 'Số điện thoại không thể dài hơn 128 ký tự', 'null': 'Số điện thoại không được bỏ trống', 'required': 'Số điện thoại không được bỏ trống', 'unique': 'Số điện thoại đã tồn tại trên hệ thống'}, max_length=128, unique=True, validators=[apps.accounts.models.utils.validators.validate_phone_number], verbose_name='Số điện thoại'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='status',
+            field=models.CharField(choices=[('ACTIVATED', 'Đang hoạt động'), ('NOT_ACTIVATED', 'Chưa kích hoạt'), ('LOCKED', 'Vô hiệu hóa')], db_index=True, default='ACTIVATED', error_messages={'blank': 'Trạng thái không được bỏ trống', 'invalid': 'Trạng thái không hợp lệ', 'null': 'Trạng thái không được bỏ trống', 'required': 'Trạng thái không được bỏ trống'}, max_length=100, verbose_name='Trạng thái'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='type',
+            field=models.CharField(choices=[('ADMIN', 'Quản trị viên'), ('STAFF', 'Nhân viên'), ('MANAGER', 'Quản lý'), ('PHARMACY', 'Nhà thuốc'), ('SUPPLIER', 'Nhà cung cấp'), ('PARTNER', 'Đối tác'), ('SELLER', 'Bán hàng'), ('DOCTOR', 'Bác sĩ')], db_index=True, error_messages={'blank': 'Đối tượng không được bỏ trống', 'invalid': 'Đối tượng không hợp lệ', 'null': 'Đối tượng không được bỏ trống', 'required': 'Đối tượng không được bỏ trống'}, max_length=100, verbose_name='Đối tượng'),
+        ),
+    ]
@@ -30,6 +30,9 @@ class Customer(PhoneUserBase):
         db_table = "accounts_customer"
         verbose_name = "Tài khoản khách hàng"
         verbose_name_plural = "Tài khoản khách hàng"
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="accounts_cu_created_id_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 condition=models.Q(is_delete=False) & ~models.Q(phone_number__isnull=True) & ~models.Q(phone_number__exact=''),
@@ -47,11 +50,24 @@ class Customer(PhoneUserBase):
         return "{}: {} - {}".format(self.pk, self.full_name, self.phone_number)
 
     def save(self, *args, **kwargs):
-        if not self.pk and not self.representative:
+        if self._state.adding and not self.representative:
             current_user = get_current_user()
             if self.get_related_model('representative', current_user):
                 self.representative = current_user
         
         super().save(*args, **kwargs)
 
-        self.generate_code(prefix="KH")
+        self.generate_code(prefix=self.get_code_prefix())
+
+    def get_code_prefix(self):
+        return "KH"
+
+    @classmethod
+    def prepare_bulk_create(cls, instances):
+        super().prepare_bulk_create(instances)
+
+        current_user = cls.get_login_user()
+        if isinstance(current_user, cls._meta.get_field('representative').related_model):
+            for instance in instances:
+                if instance.representative_id is None:
+                    instance.representative = current_user
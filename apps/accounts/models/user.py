@@ -51,6 +51,9 @@ class User(PhoneUserBase):
         db_table = "accounts_user"
         verbose_name = "Tài khoản người dùng"
         verbose_name_plural = "Tài khoản người dùng"
+        indexes = [
+            models.Index(fields=["created_at", "id"], name="accounts_us_created_id_idx"),
+        ]
         constraints = [
             models.UniqueConstraint(
                 condition=models.Q(is_delete=False) & ~models.Q(phone_number__isnull=True) & ~models.Q(phone_number__exact=''),
@@ -69,4 +72,7 @@ class User(PhoneUserBase):
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
-        self.generate_code(prefix=UserTypeChoices.prefix(self.type))
+        self.generate_code(prefix=self.get_code_prefix())
+
+    def get_code_prefix(self):
+        return UserTypeChoices.prefix(self.type)
@@ -2,8 +2,12 @@ from django.db import models
 from django.contrib.auth.models import AbstractBaseUser
 
 from datetime import datetime
+from typing import List, Sequence
 
 from utils.base_models import BaseModelSoftDelete
+from utils.principal_cache import PrincipalCache
+from utils.id_allocator import IdAllocator
+from helpers.string_helper import unaccent_vn
 from constants.error_messages import ErrorMessages
 
 from .validators import validate_phone_number
@@ -63,8 +67,25 @@ class PhoneUserBase(AbstractBaseUser, BaseModelSoftDelete):
         null=True,
     )
 
+    # Dữ liệu tìm kiếm đã chuẩn hóa (không dấu, chữ thường), cập nhật khi save.
+    # Không dùng btree (không phục vụ được LIKE '%...%'): PostgreSQL dùng index GIN
+    # trigram tạo trong migration accounts.0004
+    search_text = models.CharField(
+        verbose_name='Dữ liệu tìm kiếm',
+        max_length=1024,
+        editable=False,
+        blank=True,
+        default='',
+    )
+
     REQUIRED_FIELDS = ["full_name"]
     USERNAME_FIELD = "phone_number"
+
+    # Các trường được chuẩn hóa vào search_text (xem utils.search.SearchTextBackend)
+    search_index_fields = ("full_name", "phone_number", "code", "email")
+
+    # Các trường được lưu trong cache xác thực (xem utils.principal_cache.PrincipalCache)
+    principal_cache_fields = ("phone_number", "code", "full_name", "status", "is_delete")
     
     last_login = None
 
@@ -82,6 +103,9 @@ class PhoneUserBase(AbstractBaseUser, BaseModelSoftDelete):
     def __str__(self):
         return "{}: {} - {}".format(self.pk, self.full_name, self.phone_number)
 
+    def get_code_prefix(self) -> str:
+        raise NotImplementedError("Model phải định nghĩa get_code_prefix")
+
     def generate_code(self, prefix, digit_length=5, commit=True):
         if self.pk and not self.code:
             date_str = datetime.now().strftime("%Y%m%d")
@@ -91,12 +115,148 @@ class PhoneUserBase(AbstractBaseUser, BaseModelSoftDelete):
                 self.save(update_fields=["code"])
         return self.code
 
+    @classmethod
+    def normalize_search_text(cls, *values) -> str:
+        """
+        Chuẩn hóa các giá trị thành chuỗi tìm kiếm: bỏ dấu, chữ thường, bỏ khoảng trắng thừa
+        """
+        text = " ".join(unaccent_vn(str(value)) for value in values if value)
+        return " ".join(text.lower().split())[:1024]
+
+    def build_search_text(self) -> str:
+        return self.normalize_search_text(
+            *(getattr(self, field) for field in self.search_index_fields)
+        )
+
+    @classmethod
+    def rebuild_search_text(cls, batch_size=1000, stdout=None) -> int:
+        """
+        Cập nhật lại search_text cho toàn bộ bản ghi (kể cả đã xóa mềm) theo từng lô
+
+        Args:
+            batch_size: Số bản ghi mỗi lô
+            stdout: Luồng ghi tiến trình (tùy chọn)
+
+        Returns:
+            int: Số bản ghi đã được cập nhật
+        """
+        fields = ["pk", "search_text", *cls.search_index_fields]
+        queryset = cls._base_manager.order_by("pk").only(*fields)
+
+        last_pk = None
+        updated = 0
+        while True:
+            batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+            batch = list(batch[:batch_size])
+            if not batch:
+                return updated
+
+            changed = []
+            for instance in batch:
+                search_text = instance.build_search_text()
+                if instance.search_text != search_text:
+                    instance.search_text = search_text
+                    changed.append(instance)
+
+            if changed:
+                cls._base_manager.bulk_update(changed, ["search_text"], batch_size=batch_size)
+                updated += len(changed)
+
+            last_pk = batch[-1].pk
+            if stdout is not None:
+                stdout.write(f"{cls.__name__}: {last_pk} ({updated} cập nhật)")
+
+    def allocate_code(self, using=None) -> bool:
+        """
+        Cấp phát trước pk và sinh mã để INSERT một lần (không UPDATE mã sau khi tạo)
+
+        Chỉ có hiệu lực trên PostgreSQL (xem IdAllocator). Với CSDL khác, mã được
+        sinh và UPDATE sau khi INSERT (xem User.save, Customer.save, after_bulk_write).
+
+        Returns:
+            bool: True nếu đã cấp phát (CSDL hỗ trợ sequence, xem IdAllocator)
+        """
+        if not self._state.adding or self.pk is not None or self.code:
+            return False
+
+        if not IdAllocator.supports(type(self), using):
+            return False
+
+        self.pk = IdAllocator.next_id(type(self), using)
+        self.generate_code(self.get_code_prefix(), commit=False)
+        return True
+
     def save(self, *args, **kwargs):
+        if self.allocate_code(kwargs.get("using")):
+            # pk đã có giá trị: bỏ qua UPDATE thử của Django, INSERT trực tiếp
+            kwargs["force_insert"] = True
+
+        self.search_text = self.build_search_text()
+
+        # Khi chỉ cập nhật một số trường, cập nhật thêm search_text nếu bị ảnh hưởng
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "search_text" not in update_fields:
+            if set(update_fields) & set(self.search_index_fields):
+                kwargs["update_fields"] = [*update_fields, "search_text"]
+
         if self.pk:
             deleted_flag = f"__deleted__{self.pk}"
             if self.is_delete and self.phone_number and not self.phone_number.endswith(deleted_flag):
                 self.phone_number = f"{self.phone_number}{deleted_flag}"
         super().save(*args, **kwargs)
+        PrincipalCache.invalidate(type(self), self.pk)
 
     def delete(self, using=None, keep_parents=False, hard_delete=False):
-        return super().delete(using, keep_parents, hard_delete, delete_keys=["phone_number"]) 
\ No newline at end of file
+        pk = self.pk
+        result = super().delete(using, keep_parents, hard_delete, delete_keys=["phone_number"])
+        PrincipalCache.invalidate(type(self), pk)
+        return result 
+
+    @classmethod
+    def prepare_bulk_create(cls, instances: Sequence["PhoneUserBase"]) -> None:
+        super().prepare_bulk_create(instances)
+
+        # Cấp phát pk cho cả lô bằng một truy vấn để mã được INSERT cùng bản ghi
+        pending = [instance for instance in instances if instance.pk is None and not instance.code]
+        if pending and IdAllocator.supports(cls):
+            for instance, pk in zip(pending, IdAllocator.reserve(cls, len(pending))):
+                instance.pk = pk
+                instance.generate_code(instance.get_code_prefix(), commit=False)
+
+        for instance in instances:
+            instance.search_text = instance.build_search_text()
+
+    @classmethod
+    def prepare_bulk_update(cls, instances: Sequence["PhoneUserBase"], fields: Sequence[str]) -> List[str]:
+        fields = super().prepare_bulk_update(instances, fields)
+        if set(fields) & set(cls.search_index_fields) and "search_text" not in fields:
+            for instance in instances:
+                instance.search_text = instance.build_search_text()
+            fields.append("search_text")
+        return fields
+
+    @classmethod
+    def prepare_bulk_delete(cls, instances: Sequence["PhoneUserBase"], delete_keys: Sequence[str] = ()) -> List[str]:
+        return super().prepare_bulk_delete(instances, [*delete_keys, "phone_number"])
+
+    @classmethod
+    def after_bulk_write(cls, instances: Sequence["PhoneUserBase"], created: bool = False) -> None:
+        """
+        Sinh mã cho các bản ghi vừa tạo chưa có mã (CSDL không hỗ trợ cấp phát pk
+        trước, một câu lệnh cho cả lô) hoặc xóa cache principal
+        """
+        super().after_bulk_write(instances, created)
+
+        if not created:
+            PrincipalCache.invalidate_many(cls, [instance.pk for instance in instances])
+            return
+
+        changed = [
+            instance for instance in instances
+            if instance.pk and not instance.code
+            and instance.generate_code(instance.get_code_prefix(), commit=False)
+        ]
+        if changed:
+            for instance in changed:
+                instance.search_text = instance.build_search_text()
+            cls._base_manager.bulk_update(changed, ["code", "search_text"])
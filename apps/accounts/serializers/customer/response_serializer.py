@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
+from utils.compiled_serializer import CompiledModelSerializer
+
 from apps.accounts.models import Customer
 
 
-class CustomerShortDetailSerializer(serializers.ModelSerializer):
+class CustomerShortDetailSerializer(CompiledModelSerializer):
 
     class Meta:
         model = Customer
@@ -14,4 +16,11 @@ class CustomerDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Customer
-        fields = '__all__'
+        exclude = ('password', 'search_text')
+
+
+class CustomerExportSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Customer
+        exclude = ('password', 'search_text')
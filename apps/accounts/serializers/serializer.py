@@ -1,7 +1,10 @@
 from rest_framework import serializers
 
 from constants.error_messages import ErrorMessages
-from helpers.token_helper import Token
+from helpers.token_helper import Token, HttpSystem
+from utils.token_revocation import TokenRevocation
+
+import jwt
 
 from ..models.utils.validators import validate_phone_number
 
@@ -51,4 +54,40 @@ class AuthenticationSerializer(serializers.Serializer):
             "access_token": token.access_token,
             "refresh_token": token.refresh_token,
             "user": self.get_user_json(token.HTTP_SYSTEM)
-        }
\ No newline at end of file
+        }
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh_token = serializers.CharField(
+        error_messages=ErrorMessages.CharField('Refresh token', 1024),
+        allow_blank=True,
+        max_length=1024,
+        required=False,
+    )
+
+    def validate_refresh_token(self, refresh_token):
+        if not refresh_token:
+            return None
+
+        request = self.context.get('request')
+        try:
+            payload = Token.decode_token(refresh_token)
+        except jwt.exceptions.InvalidTokenError:
+            raise serializers.ValidationError('Refresh token không hợp lệ')
+
+        claim_key = Token.CUSTOMER_CLAIM if HttpSystem.is_customer(request) else Token.USER_CLAIM
+        if str(payload.get(claim_key)) != str(request.user.pk):
+            raise serializers.ValidationError('Refresh token không hợp lệ')
+
+        return payload
+
+    def save(self, **kwargs):
+        request = self.context.get('request')
+
+        # Thu hồi access token hiện tại và refresh token (nếu có)
+        payloads = [Token.decode_token_cached(request.auth)]
+        if self.validated_data.get('refresh_token'):
+            payloads.append(self.validated_data['refresh_token'])
+
+        for payload in payloads:
+            TokenRevocation.revoke(payload.get('jti'), payload.get('exp', 0))
@@ -1,9 +1,11 @@
 from rest_framework import serializers
 
+from utils.compiled_serializer import CompiledModelSerializer
+
 from apps.accounts.models import User
 
 
-class UserShortDetailSerializer(serializers.ModelSerializer):
+class UserShortDetailSerializer(CompiledModelSerializer):
 
     class Meta:
         model = User
@@ -14,4 +16,11 @@ class UserDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = User
-        fields = '__all__'
+        exclude = ('password', 'search_text')
+
+
+class UserExportSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = User
+        exclude = ('password', 'search_text')
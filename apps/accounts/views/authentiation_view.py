@@ -1,6 +1,11 @@
+from utils.authentication import MultiAuthentication
+from utils.token_revocation import TokenRevocation
+from utils.permissions import Authenticated
 from utils.views import APIGenericView
 from utils.decorators import api
 
+from helpers.token_helper import HttpSystem
+
 from ..serializers import serializer
 
 from ..services.user_service import UserService
@@ -16,7 +21,8 @@ class AuthenticationAPIGenericView(APIGenericView):
     permission_classes = ()
     
     action_serializers = {
-        'login_request': serializer.AuthenticationSerializer
+        'login_request': serializer.AuthenticationSerializer,
+        'logout_request': serializer.LogoutSerializer,
     }
     
     def __init__(self, **kwargs):
@@ -31,4 +37,31 @@ class AuthenticationAPIGenericView(APIGenericView):
     def login(self, request):
         auth = self.get_request_serializer(data=request.data, context={'request': request})
         auth.is_valid(raise_exception=True)
-        return auth.validated_data
\ No newline at end of file
+        return auth.validated_data
+
+    @api.post(
+        url_path='logout',
+        authentication_classes=[MultiAuthentication],
+        permission_classes=[Authenticated.Manage | Authenticated.Customer],
+    )
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="Auth Logout",
+    )
+    def logout(self, request):
+        serializer = self.get_request_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    @api.post(
+        url_path='revoke-all',
+        authentication_classes=[MultiAuthentication],
+        permission_classes=[Authenticated.Manage | Authenticated.Customer],
+    )
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="Auth Revoke All Sessions",
+    )
+    def revoke_all(self, request):
+        system = getattr(request, HttpSystem.KEY, HttpSystem.MANAGE)
+        TokenRevocation.revoke_user(system, request.user.pk)
@@ -1,5 +1,7 @@
 from utils.permissions import Authenticated
 from utils.views import APIGenericView
+from utils.mixins.serializer_mixin import BulkDeleteSerializer
+from utils.paginator import Paginator
 from utils.decorators import api
 
 from django.db import transaction
@@ -16,6 +18,22 @@ SWAGGER_TAGS = ["Accounts: Customer"]
 
 class CustomerAPIGenericView(APIGenericView):
     
+    permission_action_classes = {
+        'export': [Authenticated.Manage],
+        'bulk_create': [Authenticated.Manage],
+        'bulk_update': [Authenticated.Manage],
+        'bulk_delete': [Authenticated.Manage],
+    }
+    
+    count_action_strategies = {
+        'list': Paginator.COUNT_CACHED,
+    }
+
+    cache_action_timeouts = {
+        'list': 60,
+        'retrieve': 300,
+    }
+    
     action_serializers = {
         'list_response': response_serializer.CustomerShortDetailSerializer,
         'retrieve_response': response_serializer.CustomerDetailSerializer,
@@ -23,6 +41,11 @@ class CustomerAPIGenericView(APIGenericView):
         'create_response': response_serializer.CustomerShortDetailSerializer,
         'update_request': request_serializer.CustomerSerializer,
         'update_response': response_serializer.CustomerDetailSerializer,
+        'export_response': response_serializer.CustomerExportSerializer,
+        'bulk_create_request': request_serializer.CustomerSerializer,
+        'bulk_create_response': response_serializer.CustomerShortDetailSerializer,
+        'bulk_update_request': request_serializer.CustomerSerializer,
+        'bulk_update_response': response_serializer.CustomerShortDetailSerializer,
     }
     
     def __init__(self, **kwargs):
@@ -34,16 +57,25 @@ class CustomerAPIGenericView(APIGenericView):
         operation_id="Customer List",
     )
     def list(self, request):
-        instances = self.service.get_objects()
+        instances = self.service.get_objects(keyword=request.query_params.get("keyword"))
         return self.paginator(instances, many=True)
 
+    @api.get(url_path='export')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="Customer Export",
+    )
+    def export(self, request):
+        instances = self.service.get_objects(keyword=request.query_params.get("keyword"))
+        return self.exporter(instances)
+
     @api.swagger(
         tags=SWAGGER_TAGS,
         operation_id="Customer Retrieve",
     )
     def retrieve(self, request, pk):
-        instance = self.service.get_by_id(pk)
-        return self.get_response_serializer(instance).data
+        instance = self.service.get_by_id(pk, only=self.get_only_fields())
+        return self.get_response_data(instance)
 
     @api.swagger(
         tags=SWAGGER_TAGS,
@@ -54,7 +86,7 @@ class CustomerAPIGenericView(APIGenericView):
         serializer = self.get_request_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         instance = serializer.save()
-        return self.get_response_serializer(instance).data
+        return self.get_response_data(instance)
 
     @api.swagger(
         tags=SWAGGER_TAGS,
@@ -66,7 +98,7 @@ class CustomerAPIGenericView(APIGenericView):
         serializer = self.get_request_serializer(instance, data=request.data)
         serializer.is_valid(raise_exception=True)
         instance_updated = serializer.save()
-        return self.get_response_serializer(instance_updated).data
+        return self.get_response_data(instance_updated)
 
     @api.swagger(
         tags=SWAGGER_TAGS,
@@ -75,3 +107,35 @@ class CustomerAPIGenericView(APIGenericView):
     @transaction.atomic
     def destroy(self, request, pk):
         self.service.delete_by_id(pk)
+
+    @api.post(url_path='bulk-create')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="Customer Bulk Create",
+        request_body=request_serializer.CustomerSerializer(many=True),
+    )
+    @transaction.atomic
+    def bulk_create(self, request):
+        instances = self.perform_bulk_create(request)
+        return self.get_response_data(instances, many=True)
+
+    @api.post(url_path='bulk-update')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="Customer Bulk Update",
+        request_body=request_serializer.CustomerSerializer(many=True),
+    )
+    @transaction.atomic
+    def bulk_update(self, request):
+        instances = self.perform_bulk_update(request)
+        return self.get_response_data(instances, many=True)
+
+    @api.post(url_path='bulk-delete')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="Customer Bulk Delete",
+        request_body=BulkDeleteSerializer,
+    )
+    @transaction.atomic
+    def bulk_delete(self, request):
+        return self.perform_bulk_delete(request)
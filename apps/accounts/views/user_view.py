@@ -1,5 +1,6 @@
 from utils.permissions import Authenticated
 from utils.views import APIGenericView
+from utils.mixins.serializer_mixin import BulkDeleteSerializer
 from utils.decorators import api
 
 from django.db import transaction
@@ -15,6 +16,11 @@ SWAGGER_TAGS = ["Accounts: User"]
 class UserAPIGenericView(APIGenericView):
     permission_classes = [Authenticated.Manage]
     
+    cache_action_timeouts = {
+        'list': 60,
+        'retrieve': 300,
+    }
+    
     action_serializers = {
         'list_response': response_serializer.UserShortDetailSerializer,
         'retrieve_response': response_serializer.UserDetailSerializer,
@@ -22,6 +28,11 @@ class UserAPIGenericView(APIGenericView):
         'create_response': response_serializer.UserShortDetailSerializer,
         'update_request': request_serializer.UserSerializer,
         'update_response': response_serializer.UserDetailSerializer,
+        'export_response': response_serializer.UserExportSerializer,
+        'bulk_create_request': request_serializer.UserSerializer,
+        'bulk_create_response': response_serializer.UserShortDetailSerializer,
+        'bulk_update_request': request_serializer.UserSerializer,
+        'bulk_update_response': response_serializer.UserShortDetailSerializer,
     }
     
     def __init__(self, **kwargs):
@@ -33,16 +44,25 @@ class UserAPIGenericView(APIGenericView):
         operation_id="User List",
     )
     def list(self, request):
-        instances = self.service.get_objects()
+        instances = self.service.get_objects(keyword=request.query_params.get("keyword"))
         return self.paginator(instances, many=True)
 
+    @api.get(url_path='export')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="User Export",
+    )
+    def export(self, request):
+        instances = self.service.get_objects(keyword=request.query_params.get("keyword"))
+        return self.exporter(instances)
+
     @api.swagger(
         tags=SWAGGER_TAGS,
         operation_id="User Retrieve",
     )
     def retrieve(self, request, pk):
-        instance = self.service.get_by_id(pk)
-        return self.get_response_serializer(instance).data
+        instance = self.service.get_by_id(pk, only=self.get_only_fields())
+        return self.get_response_data(instance)
 
     @api.swagger(
         tags=SWAGGER_TAGS,
@@ -53,7 +73,7 @@ class UserAPIGenericView(APIGenericView):
         serializer = self.get_request_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         instance = serializer.save()
-        return self.get_response_serializer(instance).data
+        return self.get_response_data(instance)
 
     @api.swagger(
         tags=SWAGGER_TAGS,
@@ -65,7 +85,7 @@ class UserAPIGenericView(APIGenericView):
         serializer = self.get_request_serializer(instance, data=request.data)
         serializer.is_valid(raise_exception=True)
         instance_updated = serializer.save()
-        return self.get_response_serializer(instance_updated).data
+        return self.get_response_data(instance_updated)
 
     @api.swagger(
         tags=SWAGGER_TAGS,
@@ -74,3 +94,35 @@ class UserAPIGenericView(APIGenericView):
     @transaction.atomic
     def destroy(self, request, pk):
         self.service.delete_by_id(pk)
+
+    @api.post(url_path='bulk-create')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="User Bulk Create",
+        request_body=request_serializer.UserSerializer(many=True),
+    )
+    @transaction.atomic
+    def bulk_create(self, request):
+        instances = self.perform_bulk_create(request)
+        return self.get_response_data(instances, many=True)
+
+    @api.post(url_path='bulk-update')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="User Bulk Update",
+        request_body=request_serializer.UserSerializer(many=True),
+    )
+    @transaction.atomic
+    def bulk_update(self, request):
+        instances = self.perform_bulk_update(request)
+        return self.get_response_data(instances, many=True)
+
+    @api.post(url_path='bulk-delete')
+    @api.swagger(
+        tags=SWAGGER_TAGS,
+        operation_id="User Bulk Delete",
+        request_body=BulkDeleteSerializer,
+    )
+    @transaction.atomic
+    def bulk_delete(self, request):
+        return self.perform_bulk_delete(request)
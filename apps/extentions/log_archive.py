@@ -0,0 +1,184 @@
+from django.conf import settings
+from django.utils import timezone
+
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import logging
+import time
+import os
+
+from utils.log_compression import LogCompression
+
+from .log_reader import LogFileInfo, LogFileReader
+
+
+logger = logging.getLogger("django.exception")
+
+
+class LogArchiver:
+    """
+    Nén và dọn dẹp file log lỗi (chạy định kỳ bằng Celery beat, xem apps.extentions.tasks).
+
+    - Nén các bản xoay vòng `.N` chưa nén (ví dụ được tạo trước khi bật
+      CompressedRotatingFileHandler); nếu `.N` đã có bản nén thì nén thành số xoay
+      vòng trống kế tiếp.
+    - Xoá file cũ hơn MAX_AGE_DAYS, sau đó xoá bản lưu trữ cũ nhất cho tới khi tổng
+      dung lượng không vượt MAX_TOTAL_SIZE_MB.
+    - Xoá file chỉ mục `.idx` không còn file log tương ứng.
+
+    File log đang được ghi (không có hậu tố `.N`) chỉ bị xoá theo tuổi khi cả ngày trong
+    tên lẫn thời gian sửa đổi đều đã quá hạn.
+
+    Cấu hình trong settings.LOG_ARCHIVE (xem DEFAULT_CONFIG).
+    """
+
+    DEFAULT_CONFIG = {
+        "COMPRESSION": LogCompression.GZIP,
+        "COMPRESS_LEVEL": None,
+        "MAX_AGE_DAYS": 30,
+        "MAX_TOTAL_SIZE_MB": 1024,
+    }
+
+    def __init__(self, log_dir: Optional[str] = None):
+        self.log_dir = log_dir or LogFileReader.get_log_dir()
+        self.config = {**self.DEFAULT_CONFIG, **getattr(settings, "LOG_ARCHIVE", {})}
+        self.compression = LogCompression.validate(self.config["COMPRESSION"])
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Trả về:
+            Dict: Số file đã nén, số file đã xoá và tổng dung lượng còn lại (byte)
+        """
+        compressed = self.compress_backups()
+        deleted = self.apply_retention()
+        self.remove_orphan_indexes()
+
+        files = LogFileReader.list_files(self.log_dir)
+        return {
+            "compressed": compressed,
+            "deleted": deleted,
+            "total_size": sum(self.get_size(info) for info in files),
+        }
+
+    @staticmethod
+    def get_size(info: LogFileInfo) -> int:
+        try:
+            return os.stat(info.path).st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def remove(path: str) -> bool:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def compress_backups(self) -> int:
+        """
+        Nén các bản xoay vòng `.N` chưa nén (kể cả khi `.N` đã có bản nén, xem get_free_backup_path).
+
+        Trả về:
+            int: Số file đã nén
+        """
+        count = 0
+        suffix = LogCompression.SUFFIXES[self.compression]
+
+        for info in LogFileReader.list_files(self.log_dir):
+            if not info.backup or info.compression:
+                continue
+
+            dest = info.path + suffix
+            if os.path.exists(dest):
+                # Bản `.N` cũ trùng số với một bản nén: nén thành số xoay vòng trống kế tiếp
+                dest = self.get_free_backup_path(info, suffix)
+
+            try:
+                LogCompression.compress_file(
+                    info.path, dest, compression=self.compression, level=self.config["COMPRESS_LEVEL"],
+                )
+            except OSError as e:
+                logger.error(f"Không nén được file log {info.filename}: {e}")
+                continue
+
+            count += 1
+
+        return count
+
+    @staticmethod
+    def get_free_backup_path(info: LogFileInfo, suffix: str) -> str:
+        """
+        Trả về:
+            str: Đường dẫn `<file>.M<suffix>` với M > N là số xoay vòng đầu tiên chưa có
+            bản nào (nén hay chưa nén)
+        """
+        base = info.path[:-len(f".{info.backup}")]
+        number = info.backup + 1
+        while any(
+            os.path.exists(f"{base}.{number}{extension}")
+            for extension in ("", *LogCompression.SUFFIXES.values())
+        ):
+            number += 1
+        return f"{base}.{number}{suffix}"
+
+    def apply_retention(self) -> int:
+        """
+        Xoá file log theo tuổi rồi theo tổng dung lượng.
+
+        Trả về:
+            int: Số file đã xoá
+        """
+        files = LogFileReader.list_files(self.log_dir)
+        deleted = 0
+
+        max_age_days = self.config["MAX_AGE_DAYS"]
+        if max_age_days:
+            cutoff = timezone.localdate() - timedelta(days=max_age_days)
+            cutoff_timestamp = time.time() - max_age_days * 86400
+
+            remaining: List[LogFileInfo] = []
+            for info in files:
+                expired = info.date < cutoff
+                if expired and not info.backup:
+                    # File hiện tại của một tiến trình chạy lâu vẫn có thể đang được ghi
+                    try:
+                        expired = os.stat(info.path).st_mtime < cutoff_timestamp
+                    except OSError:
+                        expired = False
+
+                if expired and self.remove(info.path):
+                    deleted += 1
+                else:
+                    remaining.append(info)
+            files = remaining
+
+        max_total_size = self.config["MAX_TOTAL_SIZE_MB"]
+        if max_total_size:
+            limit = max_total_size * 1024 * 1024
+            sizes = {info.path: self.get_size(info) for info in files}
+            total = sum(sizes.values())
+
+            # list_files sắp xếp mới nhất trước: xoá từ cuối danh sách, bỏ qua file đang ghi
+            for info in reversed(files):
+                if total <= limit:
+                    break
+                if not info.backup:
+                    continue
+                if self.remove(info.path):
+                    deleted += 1
+                    total -= sizes[info.path]
+
+        return deleted
+
+    def remove_orphan_indexes(self) -> None:
+        if not os.path.isdir(self.log_dir):
+            return
+
+        for filename in os.listdir(self.log_dir):
+            if not filename.endswith(LogFileReader.INDEX_SUFFIX):
+                continue
+            path = os.path.join(self.log_dir, filename)
+            if not os.path.exists(path[:-len(LogFileReader.INDEX_SUFFIX)]):
+                self.remove(path)
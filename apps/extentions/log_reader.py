@@ -0,0 +1,292 @@
+from django.conf import settings
+
+from collections import deque
+from datetime import date, datetime
+from array import array
+from typing import List, NamedTuple, Optional, Tuple
+
+import hashlib
+import struct
+import mmap
+import os
+import re
+
+from utils.log_compression import LogCompression
+
+
+class LogFileInfo(NamedTuple):
+    filename: str
+    path: str
+    date: date
+    backup: int
+    compression: Optional[str]
+
+
+class LogFileReader:
+    """
+    Đọc file log theo trang mà không nạp toàn bộ file vào bộ nhớ.
+
+    - `tail(limit)`: đọc ngược từ cuối file theo từng khối BLOCK_SIZE byte.
+    - `read_lines(start, limit)`: đọc một khoảng dòng bất kỳ qua `mmap`, dùng chỉ
+      mục offset lưu cạnh file log (`<file>.idx`): cứ INDEX_STRIDE dòng lưu offset
+      byte của dòng đầu, nên mỗi trang chỉ cần quét tối đa INDEX_STRIDE dòng.
+
+    File log chỉ được ghi thêm (append) nên chỉ mục được cập nhật tăng dần từ vị
+    trí đã đánh chỉ mục; chỉ mục được dựng lại khi file bị xoay vòng (rotate).
+    """
+
+    BLOCK_SIZE = 64 * 1024
+    INDEX_STRIDE = 64
+    INDEX_SUFFIX = ".idx"
+
+    # magic, stride, số byte đã đánh chỉ mục, số dòng hoàn chỉnh, fingerprint đầu file
+    INDEX_HEADER = struct.Struct("<8sQQQ8s")
+    INDEX_MAGIC = b"LOGIDX01"
+    FINGERPRINT_SIZE = 256
+
+    ENCODING = "utf-8"
+
+    # errors-<ngày>.log, bản xoay vòng .N và bản nén .N.gz/.N.zst
+    LOG_FILE_RE = re.compile(r"^errors-(\d{4}-\d{2}-\d{2})\.log(?:\.(\d+))?(?:\.(gz|zst))?$")
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def get_log_dir(cls) -> str:
+        return os.path.join(settings.BASE_DIR, "logs")
+
+    @classmethod
+    def parse_filename(cls, filename: str, log_dir: Optional[str] = None) -> Optional[LogFileInfo]:
+        """
+        Phân tích tên file log lỗi.
+
+        Trả về:
+            Optional[LogFileInfo]: None nếu không phải file log lỗi
+        """
+        match = cls.LOG_FILE_RE.match(filename)
+        if not match:
+            return None
+        try:
+            file_date = datetime.strptime(match.group(1), "%Y-%m-%d").date()
+        except ValueError:
+            return None
+
+        return LogFileInfo(
+            filename=filename,
+            path=os.path.join(log_dir or cls.get_log_dir(), filename),
+            date=file_date,
+            backup=int(match.group(2) or 0),
+            compression=LogCompression.get_compression(filename),
+        )
+
+    @classmethod
+    def list_files(cls, log_dir: Optional[str] = None) -> List[LogFileInfo]:
+        """
+        Liệt kê các file log lỗi, mới nhất trước (file hiện tại, rồi .1, .2, ...).
+        """
+        log_dir = log_dir or cls.get_log_dir()
+        if not os.path.isdir(log_dir):
+            return []
+
+        files = []
+        for filename in os.listdir(log_dir):
+            info = cls.parse_filename(filename, log_dir)
+            if info is not None:
+                files.append(info)
+
+        files.sort(key=lambda info: (-info.date.toordinal(), info.backup))
+        return files
+
+    @classmethod
+    def from_filename(cls, filename: str) -> Optional["LogFileReader"]:
+        """
+        Tạo reader cho một file trong thư mục log (không cho phép đường dẫn ra ngoài).
+
+        Trả về:
+            Optional[LogFileReader]: None nếu file không tồn tại,
+            CompressedLogFileReader nếu là bản nén
+        """
+        if not filename or os.path.basename(filename) != filename or filename.endswith((cls.INDEX_SUFFIX, ".tmp")):
+            return None
+
+        path = os.path.join(cls.get_log_dir(), filename)
+        if not os.path.isfile(path):
+            return None
+        if LogCompression.get_compression(filename):
+            return CompressedLogFileReader(path)
+        return cls(path)
+
+    def decode(self, line: bytes) -> str:
+        return line.rstrip(b"\r\n").decode(self.ENCODING, errors="replace")
+
+    def tail(self, limit: int) -> List[str]:
+        """
+        Lấy `limit` dòng cuối file, đọc ngược từ cuối theo từng khối.
+
+        Tham số:
+            limit: Số dòng cần lấy
+
+        Trả về:
+            List[str]: Các dòng (từ cũ đến mới)
+        """
+        if limit < 1:
+            return []
+
+        with open(self.path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            buffer = b""
+
+            # Bỏ qua ký tự xuống dòng cuối file để không sinh dòng rỗng
+            while position > 0 and buffer.count(b"\n") <= limit:
+                size = min(self.BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                buffer = f.read(size) + buffer
+
+        lines = buffer.rstrip(b"\n").split(b"\n") if buffer.strip(b"\n") else []
+        if position > 0:
+            # Dòng đầu của buffer có thể bị cắt dở
+            lines = lines[1:]
+        return [self.decode(line) for line in lines[-limit:]]
+
+    @property
+    def index_path(self) -> str:
+        return self.path + self.INDEX_SUFFIX
+
+    def get_fingerprint(self, mm) -> bytes:
+        return hashlib.blake2b(mm[:self.FINGERPRINT_SIZE], digest_size=8).digest()
+
+    def load_index(self, mm) -> Tuple[array, int, int]:
+        """
+        Đọc chỉ mục đã lưu nếu còn khớp với file log.
+
+        Trả về:
+            Tuple[array, int, int]: (offset các điểm mốc, số byte đã đánh chỉ mục, số dòng)
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(self.INDEX_HEADER.size)
+                magic, stride, indexed_size, line_count, fingerprint = self.INDEX_HEADER.unpack(header)
+                checkpoints = array("Q")
+                checkpoints.frombytes(f.read())
+        except (OSError, struct.error, ValueError):
+            return array("Q", [0]), 0, 0
+
+        if (
+            magic != self.INDEX_MAGIC
+            or stride != self.INDEX_STRIDE
+            or indexed_size > len(mm)
+            or (indexed_size and fingerprint != self.get_fingerprint(mm))
+            or len(checkpoints) != line_count // stride + 1
+        ):
+            return array("Q", [0]), 0, 0
+
+        return checkpoints, indexed_size, line_count
+
+    def save_index(self, mm, checkpoints: array, indexed_size: int, line_count: int) -> None:
+        header = self.INDEX_HEADER.pack(
+            self.INDEX_MAGIC, self.INDEX_STRIDE, indexed_size, line_count, self.get_fingerprint(mm)
+        )
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(header)
+                f.write(checkpoints.tobytes())
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            # Thư mục log chỉ đọc: dùng chỉ mục trong bộ nhớ cho lần đọc này
+            pass
+
+    def build_index(self, mm) -> Tuple[array, int]:
+        """
+        Cập nhật chỉ mục tới dòng hoàn chỉnh cuối cùng của file.
+
+        Trả về:
+            Tuple[array, int]: (offset các điểm mốc, tổng số dòng kể cả dòng cuối chưa có xuống dòng)
+        """
+        checkpoints, indexed_size, line_count = self.load_index(mm)
+        size = len(mm)
+
+        if indexed_size < size:
+            position = indexed_size
+            while True:
+                newline = mm.find(b"\n", position)
+                if newline < 0:
+                    break
+                position = newline + 1
+                line_count += 1
+                if line_count % self.INDEX_STRIDE == 0:
+                    checkpoints.append(position)
+
+            if position != indexed_size:
+                self.save_index(mm, checkpoints, position, line_count)
+            indexed_size = position
+
+        # Dòng cuối chưa kết thúc bằng xuống dòng (đang được ghi)
+        total = line_count + (1 if indexed_size < size else 0)
+        return checkpoints, total
+
+    def read_lines(self, start: int, limit: int) -> Tuple[List[str], int]:
+        """
+        Đọc `limit` dòng bắt đầu từ dòng `start` (đánh số từ 1).
+
+        Tham số:
+            start: Số thứ tự dòng đầu tiên
+            limit: Số dòng cần lấy
+
+        Trả về:
+            Tuple[List[str], int]: (các dòng, tổng số dòng của file)
+        """
+        start = max(start, 1)
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return [], 0
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                checkpoints, total = self.build_index(mm)
+                if limit < 1 or start > total:
+                    return [], total
+
+                # Nhảy tới điểm mốc gần nhất rồi quét tối đa INDEX_STRIDE - 1 dòng
+                checkpoint = (start - 1) // self.INDEX_STRIDE
+                position = checkpoints[checkpoint]
+                for _ in range((start - 1) % self.INDEX_STRIDE):
+                    position = mm.find(b"\n", position) + 1
+
+                lines = []
+                size = len(mm)
+                while len(lines) < limit and position < size:
+                    newline = mm.find(b"\n", position)
+                    end = size if newline < 0 else newline + 1
+                    lines.append(self.decode(mm[position:end]))
+                    position = end
+
+        return lines, total
+
+
+class CompressedLogFileReader(LogFileReader):
+    """
+    Đọc bản log đã nén (gzip/zstd) bằng cách giải nén theo luồng.
+
+    File nén không seek được theo dòng nên mỗi lần đọc quét tuần tự từ đầu file,
+    nhưng chỉ giữ trong bộ nhớ các dòng cần trả về.
+    """
+
+    def iter_raw_lines(self):
+        with LogCompression.open(self.path) as f:
+            yield from f
+
+    def tail(self, limit: int) -> List[str]:
+        if limit < 1:
+            return []
+        return [self.decode(line) for line in deque(self.iter_raw_lines(), maxlen=limit)]
+
+    def read_lines(self, start: int, limit: int) -> Tuple[List[str], int]:
+        start = max(start, 1)
+        lines = []
+        total = 0
+        for total, line in enumerate(self.iter_raw_lines(), 1):
+            if start <= total < start + limit:
+                lines.append(self.decode(line))
+        return lines, total
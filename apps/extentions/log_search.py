@@ -0,0 +1,398 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+
+from datetime import date
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import multiprocessing
+import threading
+import queue
+import mmap
+import time
+import os
+import re
+
+from utils.log_compression import LogCompression
+
+from .log_reader import LogFileReader
+
+
+class LogSearchQuery(NamedTuple):
+    pattern: Optional[str] = None
+    ignore_case: bool = False
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    levels: Tuple[str, ...] = ()
+    limit: int = 200
+
+
+# Dòng đầu của một bản ghi log: "<client_ip> - [YYYY-MM-DD HH:MM:SS] LEVEL message"
+# (client_ip và level có thể không có). Các dòng tiếp theo (traceback) thuộc cùng bản ghi.
+RECORD_HEADER_RE = re.compile(
+    rb"^(?:(?P<client_ip>[^\s\[]+) - )?"
+    rb"\[(?P<time>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]"
+    rb"(?: (?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL)\b)?",
+    re.MULTILINE,
+)
+
+MAX_RECORD_LINES = 500
+MAX_MESSAGE_LENGTH = 4000
+RESULT_BATCH_SIZE = 20
+# Giây giữa hai lần worker kiểm tra cờ dừng (mỗi lần là một lệnh gọi tới Manager)
+STOP_CHECK_INTERVAL = 0.05
+
+
+def _decode(value: Optional[bytes]) -> Optional[str]:
+    return None if value is None else value.decode("utf-8", errors="replace")
+
+
+def _count_lines(buffer, start: int, end: int) -> int:
+    if isinstance(buffer, bytes):
+        return buffer.count(b"\n", start, end)
+    # mmap không có count()
+    return buffer[start:end].count(b"\n")
+
+
+def _find_record(mm, position: int) -> Tuple[int, Optional[re.Match]]:
+    """
+    Tìm dòng đầu của bản ghi chứa vị trí `position` (lùi tối đa MAX_RECORD_LINES dòng).
+    """
+    start = mm.rfind(b"\n", 0, position) + 1
+    header = RECORD_HEADER_RE.match(mm, start)
+    for _ in range(MAX_RECORD_LINES):
+        if header is not None or start == 0:
+            break
+        start = mm.rfind(b"\n", 0, start - 1) + 1
+        header = RECORD_HEADER_RE.match(mm, start)
+    return start, header
+
+
+class FileSearch:
+    """
+    Tìm trong một file log (chạy trong tiến trình worker), gửi kết quả theo lô qua hàng đợi
+    `results` của lần tìm kiếm và dừng khi cờ `stop` được bật.
+
+    File thường được quét qua `mmap`; bản nén được giải nén theo luồng từng khối
+    CHUNK_SIZE, mỗi khối được cắt tại dòng đầu bản ghi cuối cùng để không tách bản ghi.
+    """
+
+    CHUNK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, path: str, query: LogSearchQuery, results, stop):
+        self.path = path
+        self.filename = os.path.basename(path)
+        self.query = query
+        self.results = results
+        self.stop = stop
+
+        self.date_from = query.date_from.isoformat().encode() if query.date_from else None
+        self.date_to = query.date_to.isoformat().encode() if query.date_to else None
+        self.levels = {level.encode() for level in query.levels}
+
+        if query.pattern:
+            self.matcher = re.compile(
+                query.pattern.encode("utf-8"), re.MULTILINE | (re.IGNORECASE if query.ignore_case else 0)
+            )
+        else:
+            # Không có biểu thức: mỗi dòng đầu bản ghi là một kết quả
+            self.matcher = RECORD_HEADER_RE
+
+        self.batch: List[Dict[str, Any]] = []
+        self.found = 0
+        self.cancelled = False
+        self.checked_at = time.monotonic()
+
+    @property
+    def stopped(self) -> bool:
+        if self.found >= self.query.limit or self.cancelled:
+            return True
+
+        now = time.monotonic()
+        if now - self.checked_at >= STOP_CHECK_INTERVAL:
+            self.checked_at = now
+            self.cancelled = self.stop.is_set()
+        return self.cancelled
+
+    def run(self) -> int:
+        """
+        Trả về:
+            int: Số bản ghi khớp đã gửi
+        """
+        try:
+            if LogCompression.get_compression(self.path):
+                self.search_stream()
+            else:
+                self.search_mmap()
+        except (OSError, ValueError, EOFError):
+            # File bị xoay vòng/xoá trong lúc tìm hoặc bản nén bị hỏng
+            pass
+
+        self.flush()
+        return self.found
+
+    def search_mmap(self) -> None:
+        with open(self.path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                self.scan(mm, len(mm), 1)
+
+    def search_stream(self) -> None:
+        line_number = 1
+        carry = b""
+        with LogCompression.open(self.path) as f:
+            while not self.stopped:
+                chunk = f.read(self.CHUNK_SIZE)
+                buffer = carry + chunk
+                if not buffer:
+                    break
+
+                if chunk:
+                    # Bản ghi cuối có thể chưa đọc hết: để lại cho khối sau (cut == 0: cả
+                    # buffer là một bản ghi, tối đa MAX_RECORD_LINES dòng)
+                    cut, header = _find_record(buffer, len(buffer) - 1)
+                    if header is None:
+                        cut = buffer.rfind(b"\n") + 1
+                else:
+                    cut = len(buffer)
+
+                self.scan(buffer, cut, line_number)
+                line_number += _count_lines(buffer, 0, cut)
+                carry = buffer[cut:]
+
+    def scan(self, buffer, end: int, line_number: int) -> None:
+        """
+        Tìm các bản ghi bắt đầu trước vị trí `end` của buffer.
+
+        Tham số:
+            buffer: Nội dung (mmap hoặc bytes), bắt đầu tại đầu một dòng
+            end: Vị trí kết thúc vùng cần quét
+            line_number: Số thứ tự dòng của byte đầu tiên trong buffer
+        """
+        record_end = 0
+        line_position = 0
+
+        for match in self.matcher.finditer(buffer, 0, end):
+            if match.start() < record_end:
+                # Đã xử lý bản ghi chứa kết quả này
+                continue
+            if self.stopped:
+                break
+
+            start, header = _find_record(buffer, match.start())
+            line_end = buffer.find(b"\n", max(match.end() - 1, match.start()), end)
+            next_header = RECORD_HEADER_RE.search(buffer, end if line_end < 0 else line_end + 1, end)
+            record_end = end if next_header is None else next_header.start()
+
+            day = header.group("time")[:10] if header else None
+            level = header.group("level") if header else None
+            if (self.date_from or self.date_to) and day is None:
+                continue
+            if (self.date_from and day < self.date_from) or (self.date_to and day > self.date_to):
+                continue
+            if self.levels and level not in self.levels:
+                continue
+
+            line_number += _count_lines(buffer, line_position, start)
+            line_position = start
+
+            message = _decode(buffer[start:min(record_end, start + MAX_MESSAGE_LENGTH)])
+            self.batch.append({
+                "file": self.filename,
+                "line": line_number,
+                "time": _decode(header.group("time")) if header else None,
+                "level": _decode(level),
+                "client_ip": _decode(header.group("client_ip")) if header else None,
+                "message": message.rstrip("\r\n"),
+            })
+            self.found += 1
+
+            if len(self.batch) >= RESULT_BATCH_SIZE:
+                self.flush()
+
+    def flush(self) -> None:
+        if self.batch and not self.cancelled:
+            self.cancelled = self.stop.is_set()
+            if not self.cancelled:
+                self.results.put(self.batch)
+        self.batch = []
+
+
+def search_file(path: str, query: LogSearchQuery, results, stop) -> int:
+    """
+    Điểm vào của tiến trình worker, xem FileSearch.
+    """
+    return FileSearch(path, query, results, stop).run()
+
+
+class SearchPool:
+    """
+    Pool tiến trình worker và Manager dùng chung cho mọi lần tìm kiếm, tạo khi cần lần đầu.
+
+    Worker được khởi động bằng `spawn`: tiến trình web có nhiều luồng nên `fork` có thể
+    sao chép lock đang bị giữ sang tiến trình con. Mỗi lần tìm kiếm tạo hàng đợi kết quả
+    và cờ dừng riêng trên Manager rồi truyền cho worker qua tham số của task.
+    """
+
+    START_METHOD = "spawn"
+
+    _executor: Optional[ProcessPoolExecutor] = None
+    _manager = None
+    _pid: Optional[int] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, max_workers: int) -> Tuple[ProcessPoolExecutor, Any]:
+        """
+        Trả về:
+            Tuple[ProcessPoolExecutor, SyncManager]: Pool worker và Manager của tiến trình
+        """
+        with cls._lock:
+            # Pool không được dùng chung giữa các tiến trình sau khi fork
+            if cls._pid != os.getpid():
+                cls._executor = cls._manager = None
+                cls._pid = os.getpid()
+
+            context = multiprocessing.get_context(cls.START_METHOD)
+            if cls._manager is None:
+                cls._manager = context.Manager()
+            if cls._executor is None:
+                cls._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+            return cls._executor, cls._manager
+
+    @classmethod
+    def reset(cls, executor: Optional[ProcessPoolExecutor] = None, manager=None) -> None:
+        """
+        Bỏ pool/Manager bị hỏng (tiến trình bị kill) để lần tìm kiếm sau tạo mới.
+        """
+        with cls._lock:
+            if executor is not None and cls._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
+            if manager is not None and cls._manager is manager:
+                try:
+                    manager.shutdown()
+                except OSError:
+                    pass
+                cls._manager = None
+
+
+class LogSearcher:
+    """
+    Tìm kiếm song song trên các file log lỗi (`errors-YYYY-MM-DD.log`, các bản
+    xoay vòng `.N` và bản nén `.N.gz`/`.N.zst`), mỗi file được quét trong một tiến
+    trình worker (xem FileSearch).
+
+    Kết quả được trả về dạng stream ngay khi worker tìm thấy (theo lô RESULT_BATCH_SIZE)
+    và dừng mọi worker khi đạt giới hạn `limit`. Các lần tìm kiếm dùng chung pool worker
+    của tiến trình (xem SearchPool), MAX_WORKERS được áp dụng khi pool được tạo.
+
+    Cấu hình trong settings.LOG_SEARCH (xem DEFAULT_CONFIG).
+    """
+
+    DEFAULT_CONFIG = {
+        "MAX_WORKERS": 4,
+        "MAX_LIMIT": 5000,
+    }
+
+    LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, log_dir: Optional[str] = None):
+        self.log_dir = log_dir or LogFileReader.get_log_dir()
+        self.config = {**self.DEFAULT_CONFIG, **getattr(settings, "LOG_SEARCH", {})}
+
+    def get_files(self, query: LogSearchQuery) -> List[str]:
+        """
+        Liệt kê các file log cần tìm (kể cả bản nén), mới nhất trước.
+
+        File `errors-<ngày>.log` được tạo khi tiến trình khởi động nên chỉ chứa bản ghi
+        từ ngày đó trở đi: bỏ qua các file có ngày sau `date_to`.
+        """
+        return [
+            info.path
+            for info in LogFileReader.list_files(self.log_dir)
+            if not (query.date_to and info.date > query.date_to)
+        ]
+
+    def validate(self, query: LogSearchQuery) -> LogSearchQuery:
+        """
+        Kiểm tra điều kiện tìm kiếm.
+
+        Trả về:
+            LogSearchQuery: Điều kiện đã chuẩn hoá (giới hạn limit)
+
+        Raises:
+            ValueError: Nếu biểu thức chính quy, khoảng ngày hoặc level không hợp lệ
+        """
+        if query.pattern:
+            try:
+                re.compile(query.pattern.encode("utf-8"))
+            except re.error as e:
+                raise ValueError(f"Biểu thức chính quy không hợp lệ: {e}")
+
+        if query.date_from and query.date_to and query.date_from > query.date_to:
+            raise ValueError("Ngày bắt đầu phải trước ngày kết thúc")
+
+        invalid = set(query.levels) - set(self.LEVELS)
+        if invalid:
+            raise ValueError(f"Level không hợp lệ: {', '.join(sorted(invalid))}")
+
+        return query._replace(limit=max(1, min(query.limit, self.config["MAX_LIMIT"])))
+
+    def search(self, query: LogSearchQuery) -> Iterator[Dict[str, Any]]:
+        """
+        Tìm kiếm trên các file log, trả về từng bản ghi khớp ngay khi tìm thấy.
+
+        Tham số:
+            query: Điều kiện tìm kiếm (đã qua validate)
+
+        Trả về:
+            Iterator[Dict]: Bản ghi khớp (file, line, time, level, client_ip, message)
+        """
+        files = self.get_files(query)
+        if not files:
+            return
+
+        executor, manager = SearchPool.get(max(1, min(self.config["MAX_WORKERS"], os.cpu_count() or 1)))
+        try:
+            results = manager.Queue()
+            stop = manager.Event()
+        except (OSError, EOFError):
+            SearchPool.reset(manager=manager)
+            raise
+
+        try:
+            futures = [executor.submit(search_file, path, query, results, stop) for path in files]
+        except BrokenProcessPool:
+            SearchPool.reset(executor=executor)
+            raise
+
+        found = 0
+        try:
+            while True:
+                try:
+                    batch = results.get(timeout=self.POLL_INTERVAL)
+                except queue.Empty:
+                    # Worker ghi vào hàng đợi trước khi task kết thúc: khi mọi task xong
+                    # và hàng đợi rỗng thì không còn kết quả
+                    if all(future.done() for future in futures) and results.empty():
+                        break
+                    continue
+
+                for item in batch:
+                    yield item
+                    found += 1
+                    if found >= query.limit:
+                        return
+        finally:
+            stop.set()
+            for future in futures:
+                future.cancel()
+
+        if any(
+            future.done() and not future.cancelled() and isinstance(future.exception(), BrokenProcessPool)
+            for future in futures
+        ):
+            SearchPool.reset(executor=executor)
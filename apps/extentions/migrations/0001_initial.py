@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Logs',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+            ],
+            options={
+                'verbose_name': 'Nhật ký hệ thống',
+                'verbose_name_plural': 'Nhật ký hệ thống',
+                'managed': False,
+            },
+        ),
+    ]
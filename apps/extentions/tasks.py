@@ -0,0 +1,11 @@
+from celery import shared_task
+
+from .log_archive import LogArchiver
+
+
+@shared_task
+def archive_logs():
+    """
+    Nén bản xoay vòng và dọn dẹp file log lỗi theo cấu hình settings.LOG_ARCHIVE.
+    """
+    return LogArchiver().run()
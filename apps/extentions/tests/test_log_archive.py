@@ -0,0 +1,144 @@
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+
+from datetime import timedelta
+
+import logging
+import tempfile
+import time
+import os
+
+from apps.extentions.log_archive import LogArchiver
+from utils.log_compression import LogCompression
+from utils.logging import CompressedRotatingFileHandler
+
+
+class LogArchiverTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log_dir = directory.name
+
+    def get_name(self, days_ago=0, suffix=""):
+        day = timezone.localdate() - timedelta(days=days_ago)
+        return f"errors-{day.isoformat()}.log{suffix}"
+
+    def write(self, filename, content=b"", size=None, modified_days_ago=0):
+        path = os.path.join(self.log_dir, filename)
+        with open(path, "wb") as f:
+            f.write(content)
+            if size is not None:
+                f.truncate(size)
+        modified_at = time.time() - modified_days_ago * 86400
+        os.utime(path, (modified_at, modified_at))
+        return path
+
+    def exists(self, filename):
+        return os.path.exists(os.path.join(self.log_dir, filename))
+
+    @override_settings(LOG_ARCHIVE={"MAX_AGE_DAYS": 30, "MAX_TOTAL_SIZE_MB": 0})
+    def test_age_retention(self):
+        old_backup = self.write(self.get_name(40, ".1.gz"), modified_days_ago=40)
+        recent_backup = self.write(self.get_name(5, ".1.gz"), modified_days_ago=5)
+        old_live = self.write(self.get_name(41), modified_days_ago=41)
+
+        deleted = LogArchiver(self.log_dir).apply_retention()
+
+        self.assertEqual(deleted, 2)
+        self.assertFalse(os.path.exists(old_backup))
+        self.assertFalse(os.path.exists(old_live))
+        self.assertTrue(os.path.exists(recent_backup))
+
+    @override_settings(LOG_ARCHIVE={"MAX_AGE_DAYS": 30, "MAX_TOTAL_SIZE_MB": 0})
+    def test_live_file_written_recently_is_kept(self):
+        # Tên file đã quá hạn nhưng tiến trình chạy lâu vẫn đang ghi vào
+        live = self.write(self.get_name(40), modified_days_ago=0)
+
+        self.assertEqual(LogArchiver(self.log_dir).apply_retention(), 0)
+        self.assertTrue(os.path.exists(live))
+
+    @override_settings(LOG_ARCHIVE={"MAX_AGE_DAYS": 0, "MAX_TOTAL_SIZE_MB": 1})
+    def test_total_size_retention_removes_oldest_backups(self):
+        kb = 1024
+        self.write(self.get_name(0), size=600 * kb)
+        self.write(self.get_name(0, ".1.gz"), size=300 * kb)
+        self.write(self.get_name(1, ".1.gz"), size=300 * kb)
+        self.write(self.get_name(1, ".2.gz"), size=300 * kb)
+
+        deleted = LogArchiver(self.log_dir).apply_retention()
+
+        self.assertEqual(deleted, 2)
+        self.assertTrue(self.exists(self.get_name(0)))
+        self.assertTrue(self.exists(self.get_name(0, ".1.gz")))
+        self.assertFalse(self.exists(self.get_name(1, ".1.gz")))
+        self.assertFalse(self.exists(self.get_name(1, ".2.gz")))
+
+    @override_settings(LOG_ARCHIVE={"MAX_AGE_DAYS": 0, "MAX_TOTAL_SIZE_MB": 1})
+    def test_total_size_retention_keeps_live_file(self):
+        self.write(self.get_name(1), size=2 * 1024 * 1024)
+        self.write(self.get_name(0, ".1.gz"), size=1024)
+
+        self.assertEqual(LogArchiver(self.log_dir).apply_retention(), 1)
+        self.assertTrue(self.exists(self.get_name(1)))
+
+    def test_orphan_indexes_are_removed(self):
+        self.write(self.get_name(0))
+        self.write(self.get_name(0, ".idx"))
+        self.write(self.get_name(0, ".1.idx"))
+
+        LogArchiver(self.log_dir).remove_orphan_indexes()
+
+        self.assertTrue(self.exists(self.get_name(0, ".idx")))
+        self.assertFalse(self.exists(self.get_name(0, ".1.idx")))
+
+    def read(self, filename):
+        with LogCompression.open(os.path.join(self.log_dir, filename)) as f:
+            return f.read()
+
+    @override_settings(LOG_ARCHIVE={"COMPRESSION": LogCompression.GZIP})
+    def test_compress_legacy_backup(self):
+        self.write(self.get_name(0, ".1"), b"legacy 1\n")
+
+        self.assertEqual(LogArchiver(self.log_dir).compress_backups(), 1)
+        self.assertFalse(self.exists(self.get_name(0, ".1")))
+        self.assertEqual(self.read(self.get_name(0, ".1.gz")), b"legacy 1\n")
+
+    @override_settings(LOG_ARCHIVE={"COMPRESSION": LogCompression.GZIP})
+    def test_compress_legacy_backup_next_to_compressed_one(self):
+        # `.1` cũ còn sót lại khi handler mới đã tạo `.1.gz` và `.2.gz`
+        legacy = self.write(self.get_name(0, ".1"), b"legacy 1\n")
+        for number in (1, 2):
+            source = self.write(self.get_name(0, f".{number}.src"), f"rotated {number}\n".encode())
+            LogCompression.compress_file(source, os.path.join(self.log_dir, self.get_name(0, f".{number}.gz")))
+
+        self.assertEqual(LogArchiver(self.log_dir).compress_backups(), 1)
+        self.assertFalse(os.path.exists(legacy))
+        self.assertEqual(self.read(self.get_name(0, ".1.gz")), b"rotated 1\n")
+        self.assertEqual(self.read(self.get_name(0, ".2.gz")), b"rotated 2\n")
+        self.assertEqual(self.read(self.get_name(0, ".3.gz")), b"legacy 1\n")
+
+
+class CompressedRotatingFileHandlerTest(SimpleTestCase):
+    def test_rotation_shifts_compressed_backups(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "errors-2026-10-17.log")
+
+        handler = CompressedRotatingFileHandler(path, maxBytes=10, backupCount=3, encoding="utf-8")
+        self.addCleanup(handler.close)
+        for number in range(1, 6):
+            handler.handle(logging.LogRecord("test", logging.ERROR, __file__, 0, f"line {number}", None, None))
+
+        def read(suffix):
+            with LogCompression.open(path + suffix) as f:
+                return f.read()
+
+        self.assertEqual(read(""), b"line 5\n")
+        self.assertEqual(read(".1.gz"), b"line 4\n")
+        self.assertEqual(read(".2.gz"), b"line 3\n")
+        self.assertEqual(read(".3.gz"), b"line 2\n")
+        self.assertFalse(os.path.exists(path + ".4.gz"))
+        self.assertEqual(sorted(os.listdir(directory.name)), [
+            "errors-2026-10-17.log", "errors-2026-10-17.log.1.gz",
+            "errors-2026-10-17.log.2.gz", "errors-2026-10-17.log.3.gz",
+        ])
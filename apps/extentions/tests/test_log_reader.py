@@ -0,0 +1,118 @@
+from django.test import SimpleTestCase, override_settings
+
+import tempfile
+import os
+
+from apps.extentions.log_reader import CompressedLogFileReader, LogFileReader
+from utils.log_compression import LogCompression
+
+
+class SmallLogFileReader(LogFileReader):
+    # Khoảng cách điểm mốc và khối đọc nhỏ để kiểm tra các biên
+    INDEX_STRIDE = 4
+    BLOCK_SIZE = 16
+
+
+class LogFileReaderTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.base_dir = directory.name
+        self.log_dir = os.path.join(self.base_dir, "logs")
+        os.makedirs(self.log_dir)
+        self.path = os.path.join(self.log_dir, "errors-2026-10-17.log")
+
+    def write(self, lines, mode="w", end="\n"):
+        with open(self.path, mode) as f:
+            f.write("\n".join(lines) + end)
+
+    def make_lines(self, start, stop):
+        return [f"line {number}" for number in range(start, stop)]
+
+    def test_read_lines_across_checkpoints(self):
+        self.write(self.make_lines(1, 31))
+        reader = SmallLogFileReader(self.path)
+
+        for start, limit in ((1, 3), (4, 2), (5, 4), (7, 10), (29, 5)):
+            lines, total = reader.read_lines(start, limit)
+            self.assertEqual(total, 30)
+            self.assertEqual(lines, self.make_lines(start, min(start + limit, 31)))
+
+        self.assertEqual(reader.read_lines(31, 5), ([], 30))
+        self.assertEqual(reader.read_lines(1, 0), ([], 30))
+        self.assertTrue(os.path.exists(reader.index_path))
+
+    def test_index_is_updated_incrementally(self):
+        self.write(self.make_lines(1, 10))
+        reader = SmallLogFileReader(self.path)
+        self.assertEqual(reader.read_lines(9, 1), (["line 9"], 9))
+
+        # Dòng cuối chưa có xuống dòng được tính nhưng không được đánh chỉ mục
+        self.write(self.make_lines(10, 20), mode="a", end="")
+        self.assertEqual(reader.read_lines(18, 5), (["line 18", "line 19"], 19))
+
+        with open(reader.index_path, "rb") as f:
+            _, _, indexed_size, line_count, _ = reader.INDEX_HEADER.unpack(f.read(reader.INDEX_HEADER.size))
+        self.assertEqual(line_count, 18)
+        self.assertEqual(indexed_size, os.path.getsize(self.path) - len("line 19"))
+
+        self.write([], mode="a")
+        self.write(self.make_lines(20, 23), mode="a")
+        self.assertEqual(reader.read_lines(19, 10), (self.make_lines(19, 23), 22))
+
+    def test_index_is_rebuilt_after_rotation(self):
+        self.write(self.make_lines(1, 30))
+        reader = SmallLogFileReader(self.path)
+        reader.read_lines(1, 1)
+
+        # File mới (khác nội dung đầu file) ngắn hơn và dài hơn chỉ mục cũ
+        self.write([f"rotated {number}" for number in range(1, 6)])
+        self.assertEqual(reader.read_lines(5, 1), (["rotated 5"], 5))
+
+        self.write([f"other {number}" for number in range(1, 41)])
+        self.assertEqual(reader.read_lines(33, 1), (["other 33"], 40))
+
+    def test_corrupt_index_is_ignored(self):
+        self.write(self.make_lines(1, 10))
+        reader = SmallLogFileReader(self.path)
+        with open(reader.index_path, "wb") as f:
+            f.write(b"broken")
+
+        self.assertEqual(reader.read_lines(6, 2), (["line 6", "line 7"], 9))
+
+    def test_empty_file(self):
+        self.write([], end="")
+        reader = SmallLogFileReader(self.path)
+        self.assertEqual(reader.read_lines(1, 10), ([], 0))
+        self.assertEqual(reader.tail(10), [])
+
+    def test_tail_reads_backwards_in_blocks(self):
+        self.write(self.make_lines(1, 30))
+        reader = SmallLogFileReader(self.path)
+
+        self.assertEqual(reader.tail(3), self.make_lines(27, 30))
+        self.assertEqual(reader.tail(100), self.make_lines(1, 30))
+        self.assertEqual(reader.tail(0), [])
+
+    def test_compressed_reader(self):
+        self.write(self.make_lines(1, 30))
+        dest = self.path + ".1.gz"
+        LogCompression.compress_file(self.path, dest, compression=LogCompression.GZIP)
+
+        reader = CompressedLogFileReader(dest)
+        self.assertEqual(reader.tail(2), ["line 28", "line 29"])
+        self.assertEqual(reader.read_lines(5, 3), (["line 5", "line 6", "line 7"], 29))
+        self.assertEqual(reader.read_lines(40, 3), ([], 29))
+
+    def test_from_filename(self):
+        self.write(self.make_lines(1, 3))
+        LogCompression.compress_file(self.path, self.path + ".1.gz", compression=LogCompression.GZIP)
+        self.write(self.make_lines(1, 3))
+        LogFileReader(self.path).read_lines(1, 1)
+
+        with override_settings(BASE_DIR=self.base_dir):
+            self.assertIs(type(LogFileReader.from_filename("errors-2026-10-17.log")), LogFileReader)
+            self.assertIs(type(LogFileReader.from_filename("errors-2026-10-17.log.1.gz")), CompressedLogFileReader)
+
+            for filename in ("", "missing.log", "errors-2026-10-17.log.idx", "../logs/errors-2026-10-17.log"):
+                self.assertIsNone(LogFileReader.from_filename(filename))
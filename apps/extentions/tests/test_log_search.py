@@ -0,0 +1,143 @@
+from django.test import SimpleTestCase
+
+from datetime import date
+
+import threading
+import tempfile
+import queue
+import os
+
+from apps.extentions.log_search import FileSearch, LogSearcher, LogSearchQuery, SearchPool
+from utils.log_compression import LogCompression
+
+
+RECORDS = [
+    "10.0.0.1 - [2026-10-15 08:00:00] ERROR Database timeout",
+    "Traceback (most recent call last):",
+    '  File "app.py", line 1, in <module>',
+    "TimeoutError: timeout",
+    "10.0.0.2 - [2026-10-16 09:30:00] WARNING Slow request /api/users",
+    "[2026-10-17 10:00:00] ERROR Payment failed: timeout",
+    "[2026-10-17 10:05:00] INFO Worker started",
+]
+
+
+class FileSearchTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "errors-2026-10-17.log")
+        with open(self.path, "w") as f:
+            f.write("\n".join(RECORDS) + "\n")
+
+    def search(self, path=None, **kwargs):
+        results, stop = queue.Queue(), threading.Event()
+        FileSearch(path or self.path, LogSearchQuery(**kwargs), results, stop).run()
+        items = []
+        while not results.empty():
+            items.extend(results.get())
+        return items
+
+    def test_match_returns_whole_record(self):
+        items = self.search(pattern="TimeoutError")
+
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]["line"], 1)
+        self.assertEqual(items[0]["level"], "ERROR")
+        self.assertEqual(items[0]["client_ip"], "10.0.0.1")
+        self.assertEqual(items[0]["time"], "2026-10-15 08:00:00")
+        self.assertEqual(items[0]["message"], "\n".join(RECORDS[:4]))
+
+    def test_filters(self):
+        self.assertEqual([item["line"] for item in self.search(pattern="timeout", ignore_case=True)], [1, 6])
+        self.assertEqual([item["line"] for item in self.search(pattern="timeout", levels=("ERROR",))], [1, 6])
+        self.assertEqual(
+            [item["line"] for item in self.search(date_from=date(2026, 10, 16), date_to=date(2026, 10, 16))], [5]
+        )
+        self.assertEqual([item["line"] for item in self.search(levels=("INFO",))], [7])
+        self.assertEqual(len(self.search(limit=2)), 2)
+
+    def test_compressed_file_matches_plain_file(self):
+        expected = self.search(pattern="timeout|started", ignore_case=True)
+
+        dest = self.path + ".1.gz"
+        LogCompression.compress_file(self.path, dest, compression=LogCompression.GZIP)
+
+        # Khối nhỏ để bản ghi nhiều dòng bị cắt qua nhiều khối
+        FileSearch.CHUNK_SIZE, chunk_size = 40, FileSearch.CHUNK_SIZE
+        try:
+            items = self.search(dest, pattern="timeout|started", ignore_case=True)
+        finally:
+            FileSearch.CHUNK_SIZE = chunk_size
+
+        self.assertEqual(
+            [(item["line"], item["message"]) for item in items],
+            [(item["line"], item["message"]) for item in expected],
+        )
+        self.assertEqual([item["line"] for item in items], [1, 6, 7])
+
+    def test_stop_flag_discards_results(self):
+        results, stop = queue.Queue(), threading.Event()
+        stop.set()
+        search = FileSearch(self.path, LogSearchQuery(), results, stop)
+        search.checked_at = 0
+
+        self.assertEqual(search.run(), 0)
+        self.assertTrue(results.empty())
+
+
+class LogSearcherTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        directory = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directory.cleanup)
+        cls.log_dir = directory.name
+
+        for filename, day in (("errors-2026-10-16.log", "2026-10-16"), ("errors-2026-10-17.log", "2026-10-17")):
+            with open(os.path.join(cls.log_dir, filename), "w") as f:
+                for number in range(50):
+                    f.write(f"[{day} 10:00:{number:02d}] ERROR request {number} failed\n")
+
+    @classmethod
+    def tearDownClass(cls):
+        SearchPool.reset(executor=SearchPool._executor, manager=SearchPool._manager)
+        super().tearDownClass()
+
+    def search(self, **kwargs):
+        searcher = LogSearcher(self.log_dir)
+        return list(searcher.search(searcher.validate(LogSearchQuery(**kwargs))))
+
+    def test_searches_all_files_with_spawned_workers(self):
+        items = self.search(pattern=r"request 4\d failed")
+
+        self.assertEqual(len(items), 20)
+        self.assertEqual({item["file"] for item in items}, {"errors-2026-10-16.log", "errors-2026-10-17.log"})
+        self.assertEqual(SearchPool._executor._mp_context.get_start_method(), "spawn")
+
+    def test_pool_is_reused_across_searches(self):
+        self.search(pattern="request 1 ")
+        executor, manager = SearchPool._executor, SearchPool._manager
+
+        items = self.search(limit=30)
+
+        self.assertEqual(len(items), 30)
+        self.assertIs(SearchPool._executor, executor)
+        self.assertIs(SearchPool._manager, manager)
+
+    def test_date_to_skips_newer_files(self):
+        items = self.search(date_to=date(2026, 10, 16), limit=1000)
+        self.assertEqual({item["file"] for item in items}, {"errors-2026-10-16.log"})
+        self.assertEqual(len(items), 50)
+
+    def test_validate(self):
+        searcher = LogSearcher(self.log_dir)
+        for query in (
+            LogSearchQuery(pattern="("),
+            LogSearchQuery(date_from=date(2026, 10, 17), date_to=date(2026, 10, 16)),
+            LogSearchQuery(levels=("FATAL",)),
+        ):
+            with self.assertRaises(ValueError):
+                searcher.validate(query)
+
+        self.assertEqual(searcher.validate(LogSearchQuery(limit=10 ** 6)).limit, LogSearcher.DEFAULT_CONFIG["MAX_LIMIT"])
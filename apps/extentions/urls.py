@@ -7,6 +7,8 @@ from .views import log_view
 extentions_v1_router = DefaultRouter(trailing_slash=False)
 
 admin_logs_urlpatterns = [
+    path('logs/search/stream/', log_view.LogSearchStreamView.as_view(), name='admin_log_search_stream'),
+    path('logs/search/', log_view.LogSearchView.as_view(), name='admin_log_search'),
     path('logs/<str:filename>/', log_view.LogFileDetailView.as_view(), name='admin_log_file_detail'),
     path('logs/', log_view.LogFilesView.as_view(), name='admin_log_files'),
 ]
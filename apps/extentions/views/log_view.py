@@ -1,12 +1,16 @@
 from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
-from django.views.generic import TemplateView
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.generic import TemplateView, View
 from django.contrib import admin
-from django.conf import settings
 
 from datetime import datetime
+import json
+import time
 import os
-import re
+
+from ..log_search import LogSearcher, LogSearchQuery
+from ..log_reader import LogFileReader
 
 
 @method_decorator(staff_member_required, name='dispatch')
@@ -14,34 +18,24 @@ class LogFilesView(TemplateView):
     template_name = 'admin/log_files.html'
     
     def get_log_files(self):
-        log_dir = os.path.join(settings.BASE_DIR, 'logs')
         log_files = []
-        
-        if os.path.exists(log_dir):
-            for filename in os.listdir(log_dir):
-                if filename.startswith('errors-') and filename.endswith('.log'):
-                    file_path = os.path.join(log_dir, filename)
-                    match = re.match(r'errors-(\d{4}-\d{2}-\d{2})\.log', filename)
-                    
-                    if match:
-                        date_str = match.group(1)
-                        try:
-                            file_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-                            
-                            # Lấy kích thước file
-                            size_bytes = os.path.getsize(file_path)
-                            size_kb = size_bytes / 1024
-                            
-                            log_files.append({
-                                'filename': filename,
-                                'path': file_path,
-                                'date': file_date,
-                                'size': f'{size_kb:.2f} KB'
-                            })
-                        except ValueError:
-                            pass
-        
-        log_files.sort(key=lambda x: x['date'], reverse=True)
+
+        for info in LogFileReader.list_files():
+            try:
+                # Lấy kích thước file (kích thước đã nén với bản lưu trữ)
+                size_kb = os.stat(info.path).st_size / 1024
+            except OSError:
+                # File vừa bị xoay vòng/dọn dẹp
+                continue
+
+            log_files.append({
+                'filename': info.filename,
+                'path': info.path,
+                'date': info.date,
+                'compression': info.compression,
+                'size': f'{size_kb:.2f} KB'
+            })
+
         return log_files
     
     def get_context_data(self, **kwargs):
@@ -60,6 +54,7 @@ class LogFilesView(TemplateView):
 @method_decorator(staff_member_required, name='dispatch')
 class LogFileDetailView(TemplateView):
     template_name = 'admin/log_file_detail.html'
+    DEFAULT_LIMIT = 500
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -74,20 +69,120 @@ class LogFileDetailView(TemplateView):
         filename = self.kwargs.get('filename')
         context['title'] = "File: " + filename
         
-        log_path = os.path.join(settings.BASE_DIR, 'logs', filename)
+        reader = LogFileReader.from_filename(filename)
+        limit = self.get_int_param('limit', self.DEFAULT_LIMIT)
+        start = self.get_int_param('start', None)
         content = []
-        
-        if os.path.exists(log_path) and os.path.isfile(log_path):
+        total = None
+
+        if reader is None:
+            content = ["Log file not found."]
+        else:
             try:
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    content = f.readlines()
+                if start is None:
+                    # Chế độ tail: đọc ngược từ cuối file
+                    content = reader.tail(limit)
+                else:
+                    content, total = reader.read_lines(start, limit)
             except Exception as e:
                 content = [f"Error reading log file: {str(e)}"]
-        else:
-            content = ["Log file not found."]
-            
-        limit = int(self.request.GET.get('limit', 500)) * -1
-            
+
         context['filename'] = filename
-        context['content'] = content[limit:]
-        return context
\ No newline at end of file
+        context['content'] = content
+        context['limit'] = limit
+        if start is not None and total is not None:
+            context['start'] = start
+            context['end'] = start + len(content) - 1
+            context['total'] = total
+            context['prev_start'] = max(start - limit, 1) if start > 1 else None
+            context['next_start'] = start + limit if start + limit <= total else None
+        return context
+
+    def get_int_param(self, name, default):
+        try:
+            value = int(self.request.GET.get(name, default))
+        except (TypeError, ValueError):
+            return default
+        return value if value > 0 else default
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class LogSearchView(TemplateView):
+    template_name = 'admin/log_search.html'
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+
+        context['has_permission'] = True
+        context['site_header'] = admin.site.site_header
+        context['site_title'] = admin.site.site_title
+        context['title'] = 'Tìm kiếm nhật ký lỗi'
+        context['is_nav_sidebar_enabled'] = True
+        context['available_apps'] = admin.site.get_app_list(self.request)
+        context['levels'] = LogSearcher.LEVELS
+        return context
+
+
+@method_decorator(staff_member_required, name='dispatch')
+class LogSearchStreamView(View):
+    """
+    Tìm kiếm trên các file log lỗi, trả về dạng NDJSON: mỗi dòng một bản ghi khớp
+    (`type: match`) ngay khi tìm thấy, dòng cuối là tổng kết (`type: summary`).
+
+    Tham số: q (biểu thức chính quy), ignore_case, date_from, date_to (YYYY-MM-DD),
+    level (nhiều giá trị, phân cách bởi dấu phẩy), limit.
+    """
+    DEFAULT_LIMIT = 200
+
+    def get_query(self):
+        params = self.request.GET
+
+        def parse_date(name):
+            value = params.get(name)
+            if not value:
+                return None
+            try:
+                return datetime.strptime(value, '%Y-%m-%d').date()
+            except ValueError:
+                raise ValueError(f"Ngày không hợp lệ: {value}")
+
+        try:
+            limit = int(params.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            raise ValueError("limit phải là số nguyên")
+
+        return LogSearchQuery(
+            pattern=params.get('q') or None,
+            ignore_case=params.get('ignore_case') in ('1', 'true', 'on'),
+            date_from=parse_date('date_from'),
+            date_to=parse_date('date_to'),
+            levels=tuple(level.strip().upper() for level in params.get('level', '').split(',') if level.strip()),
+            limit=limit,
+        )
+
+    def get(self, request, *args, **kwargs):
+        searcher = LogSearcher()
+        try:
+            query = searcher.validate(self.get_query())
+        except ValueError as e:
+            return JsonResponse({'message': str(e)}, status=400, json_dumps_params={'ensure_ascii': False})
+
+        def stream():
+            start = time.perf_counter()
+            count = 0
+            for item in searcher.search(query):
+                count += 1
+                yield json.dumps({'type': 'match', **item}, ensure_ascii=False) + '\n'
+
+            yield json.dumps({
+                'type': 'summary',
+                'count': count,
+                'truncated': count >= query.limit,
+                'elapsed_ms': round((time.perf_counter() - start) * 1000, 2),
+            }) + '\n'
+
+        response = StreamingHttpResponse(stream(), content_type='application/x-ndjson; charset=utf-8')
+        response['Cache-Control'] = 'no-cache'
+        # Tắt buffer của nginx để kết quả tới trình duyệt ngay khi tìm thấy
+        response['X-Accel-Buffering'] = 'no'
+        return response
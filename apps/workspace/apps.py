@@ -5,3 +5,8 @@ class WorkspaceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     verbose_name = 'Hệ thống Workspace'
     name = 'apps.workspace'
+
+    def ready(self):
+        from . import signals
+
+        signals.connect()
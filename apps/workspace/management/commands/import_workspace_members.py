@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.workspace.models import Workspace
+from apps.workspace.services.membership_import_service import MembershipImportService
+from utils.importer import StreamRowReader
+
+
+class Command(BaseCommand):
+    help = "Nhập thành viên workspace (người dùng/khách hàng) hàng loạt từ file CSV hoặc NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Đường dẫn file cần nhập")
+        parser.add_argument(
+            "--format",
+            dest="import_format",
+            choices=StreamRowReader.FORMATS,
+            help="Định dạng file, mặc định theo phần mở rộng",
+        )
+        parser.add_argument(
+            "--workspace",
+            help="Mã workspace mặc định cho các dòng không có cột workspace",
+        )
+        parser.add_argument(
+            "--type",
+            dest="member_type",
+            choices=tuple(MembershipImportService.MEMBER_TYPES),
+            help="Loại thành viên mặc định cho các dòng không có cột type",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=StreamRowReader.DEFAULT_BATCH_SIZE,
+            help=f"Số dòng mỗi lô (mặc định {StreamRowReader.DEFAULT_BATCH_SIZE})",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size phải ít nhất là 1")
+
+        try:
+            import_format = options["import_format"] or StreamRowReader.from_filename(options["path"])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        workspace = None
+        if options["workspace"]:
+            workspace = Workspace.objects.filter(code=options["workspace"], is_delete=False).first()
+            if workspace is None:
+                raise CommandError(f"Không tìm thấy workspace: {options['workspace']}")
+
+        service = MembershipImportService(
+            workspace=workspace,
+            member_type=options["member_type"],
+            batch_size=batch_size,
+        )
+
+        try:
+            with open(options["path"], "rb") as stream:
+                result = service.run(stream, import_format=import_format)
+        except OSError as e:
+            raise CommandError(f"Không đọc được file: {e}")
+
+        for error in result["errors"]:
+            self.stderr.write(f"Dòng {error['line']}: {error['message']}")
+        if result["error_count"] > len(result["errors"]):
+            self.stderr.write(f"... và {result['error_count'] - len(result['errors'])} lỗi khác")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Đã xử lý {result['total']} dòng: tạo mới {result['created']}, "
+            f"đã tồn tại {result['existing']}, lỗi {result['error_count']}"
+        ))
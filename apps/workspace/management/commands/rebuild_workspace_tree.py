@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.workspace.models import Workspace
+
+
+class Command(BaseCommand):
+    help = "Tính lại chỉ mục cây workspace (path, depth) từ Workspace.parent"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Số bản ghi mỗi lô (mặc định 1000)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size phải ít nhất là 1")
+
+        stdout = self.stdout if options["verbosity"] > 1 else None
+        with transaction.atomic():
+            updated, cycles = Workspace.rebuild_tree(batch_size=batch_size, stdout=stdout)
+
+        if cycles:
+            self.stdout.write(self.style.WARNING(
+                f"Workspace nằm trong vòng lặp cha-con (đã đánh chỉ mục như gốc): "
+                f"{', '.join(str(pk) for pk in cycles)}"
+            ))
+        self.stdout.write(self.style.SUCCESS(f"Workspace: đã cập nhật {updated} bản ghi"))
@@ -0,0 +1,123 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0005_drop_field_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Action',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, error_messages={'blank': 'Tên hành động không được bỏ trống', 'invalid': 'Tên hành động không hợp lệ', 'max_length': 'Tên hành động không thể dài hơn 255 ký tự', 'null': 'Tên hành động không được bỏ trống', 'required': 'Tên hành động không được bỏ trống', 'unique': 'Tên hành động đã tồn tại trên hệ thống'}, max_length=255, verbose_name='Tên hành động')),
+                ('code', models.CharField(db_index=True, error_messages={'blank': 'Mã hành động không được bỏ trống', 'invalid': 'Mã hành động không hợp lệ', 'max_length': 'Mã hành động không thể dài hơn 100 ký tự', 'null': 'Mã hành động không được bỏ trống', 'required': 'Mã hành động không được bỏ trống', 'unique': 'Mã hành động đã tồn tại trên hệ thống'}, max_length=100, unique=True, verbose_name='Mã hành động')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Mô tả')),
+            ],
+            options={
+                'verbose_name': 'Hành động',
+                'verbose_name_plural': 'Hành động',
+                'db_table': 'workspace_action',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Workspace',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated_at', models.DateTimeField(blank=True, null=True, verbose_name='Thời gian cập nhật')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Thời gian tạo')),
+                ('is_delete', models.BooleanField(default=False, verbose_name='Đã xóa')),
+                ('deleted_at', models.DateTimeField(blank=True, null=True, verbose_name='Thời gian xóa')),
+                ('name', models.CharField(db_index=True, error_messages={'blank': 'Tên workspace không được bỏ trống', 'invalid': 'Tên workspace không hợp lệ', 'max_length': 'Tên workspace không thể dài hơn 255 ký tự', 'null': 'Tên workspace không được bỏ trống', 'required': 'Tên workspace không được bỏ trống', 'unique': 'Tên workspace đã tồn tại trên hệ thống'}, max_length=255, verbose_name='Tên workspace')),
+                ('code', models.CharField(db_index=True, error_messages={'blank': 'Mã workspace không được bỏ trống', 'invalid': 'Mã workspace không hợp lệ', 'max_length': 'Mã workspace không thể dài hơn 100 ký tự', 'null': 'Mã workspace không được bỏ trống', 'required': 'Mã workspace không được bỏ trống', 'unique': 'Mã workspace đã tồn tại trên hệ thống'}, max_length=100, verbose_name='Mã workspace')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Mô tả')),
+                ('path', models.CharField(blank=True, db_index=True, default='', editable=False, max_length=1024, verbose_name='Đường dẫn cây')),
+                ('depth', models.PositiveSmallIntegerField(db_index=True, default=0, editable=False, verbose_name='Cấp')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='created_workspace', to='accounts.user', verbose_name='Người tạo')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='workspace_owner', to='accounts.user', verbose_name='Chủ workspace')),
+                ('parent', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='workspace_parent', to='workspace.workspace', verbose_name='Workspace cha')),
+                ('updated_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='updated_workspace', to='accounts.user', verbose_name='Người cập nhật')),
+            ],
+            options={
+                'verbose_name': 'Workspace',
+                'verbose_name_plural': 'Workspace',
+                'db_table': 'workspace_workspace',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Position',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, error_messages={'blank': 'Tên chức vụ không được bỏ trống', 'invalid': 'Tên chức vụ không hợp lệ', 'max_length': 'Tên chức vụ không thể dài hơn 255 ký tự', 'null': 'Tên chức vụ không được bỏ trống', 'required': 'Tên chức vụ không được bỏ trống', 'unique': 'Tên chức vụ đã tồn tại trên hệ thống'}, max_length=255, verbose_name='Tên chức vụ')),
+                ('code', models.CharField(db_index=True, error_messages={'blank': 'Mã chức vụ không được bỏ trống', 'invalid': 'Mã chức vụ không hợp lệ', 'max_length': 'Mã chức vụ không thể dài hơn 100 ký tự', 'null': 'Mã chức vụ không được bỏ trống', 'required': 'Mã chức vụ không được bỏ trống', 'unique': 'Mã chức vụ đã tồn tại trên hệ thống'}, max_length=100, verbose_name='Mã chức vụ')),
+                ('description', models.TextField(blank=True, null=True, verbose_name='Mô tả')),
+                ('is_default', models.BooleanField(default=True, verbose_name='Mặc định')),
+                ('actions', models.ManyToManyField(blank=True, related_name='position_actions', to='workspace.action', verbose_name='Hành động')),
+                ('workspace', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='position_workspace', to='workspace.workspace', verbose_name='Workspace')),
+            ],
+            options={
+                'verbose_name': 'Chức vụ',
+                'verbose_name_plural': 'Chức vụ',
+                'db_table': 'workspace_position',
+                'ordering': ['-id'],
+                'unique_together': {('workspace', 'code')},
+            },
+        ),
+        migrations.CreateModel(
+            name='WorkspaceCustomer',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(auto_now_add=True, verbose_name='Ngày tham gia')),
+                ('left_at', models.DateTimeField(blank=True, null=True, verbose_name='Ngày rời khỏi workspace')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workspace_customer_customer', to='accounts.customer', verbose_name='Khách hàng')),
+                ('positions', models.ManyToManyField(blank=True, related_name='workspace_customer_positions', to='workspace.position', verbose_name='Chức vụ')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='workspace.workspace', verbose_name='Workspace')),
+            ],
+            options={
+                'verbose_name': 'Khách hàng trong workspace',
+                'verbose_name_plural': 'Khách hàng trong workspace',
+                'db_table': 'workspace_customer',
+                'unique_together': {('workspace', 'customer')},
+            },
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='customers',
+            field=models.ManyToManyField(blank=True, related_name='workspace_customers', through='workspace.WorkspaceCustomer', to='accounts.customer', verbose_name='Khách hàng'),
+        ),
+        migrations.CreateModel(
+            name='WorkspaceUser',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('joined_at', models.DateTimeField(auto_now_add=True, verbose_name='Ngày tham gia')),
+                ('left_at', models.DateTimeField(blank=True, null=True, verbose_name='Ngày rời khỏi workspace')),
+                ('positions', models.ManyToManyField(blank=True, related_name='workspace_user_positions', to='workspace.position', verbose_name='Chức vụ')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='workspace_user_user', to='accounts.user', verbose_name='Người dùng')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='workspace.workspace', verbose_name='Workspace')),
+            ],
+            options={
+                'verbose_name': 'Người dùng trong workspace',
+                'verbose_name_plural': 'Người dùng trong workspace',
+                'db_table': 'workspace_user',
+                'unique_together': {('workspace', 'user')},
+            },
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='users',
+            field=models.ManyToManyField(blank=True, related_name='workspace_users', through='workspace.WorkspaceUser', to='accounts.user', verbose_name='Người dùng'),
+        ),
+        migrations.AddConstraint(
+            model_name='workspace',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_delete', False)), fields=('code',), name='unique_workspace_code'),
+        ),
+    ]
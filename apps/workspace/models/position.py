@@ -44,7 +44,7 @@ class Position(models.Model):
         db_table = 'workspace_position'
         verbose_name_plural = 'Chức vụ'
         verbose_name = 'Chức vụ'
-        ordering = ['-created_at']
+        ordering = ['-id']
         unique_together = [['workspace', 'code']]
 
     def __str__(self):
@@ -1,6 +1,12 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Concat, Substr
+
+from typing import Any, List, Optional, Sequence, Tuple, Type
 
 from utils.base_models import BaseModelSoftDelete
+from utils.exception import MessageError
+from utils.id_allocator import IdAllocator
 from constants.error_messages import ErrorMessages
 
 
@@ -69,6 +75,27 @@ class Workspace(BaseModelSoftDelete):
         null=True,
     )
 
+    # Chỉ mục cây workspace (materialized path): "/<id gốc>/.../<id>/", cập nhật khi save/đổi cha
+    path = models.CharField(
+        verbose_name='Đường dẫn cây',
+        max_length=1024,
+        editable=False,
+        blank=True,
+        default='',
+        db_index=True,
+    )
+    depth = models.PositiveSmallIntegerField(
+        verbose_name='Cấp',
+        editable=False,
+        default=0,
+        db_index=True,
+    )
+
+    PATH_SEPARATOR = "/"
+
+    # (parent_id, path, depth) đã lưu trong CSDL, dùng để nhận biết đổi cha
+    _tree_state: Optional[Tuple[Any, str, int]] = None
+
     class Meta:
         db_table = 'workspace_workspace'
         verbose_name_plural = 'Workspace'
@@ -85,6 +112,276 @@ class Workspace(BaseModelSoftDelete):
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        loaded = dict(zip(field_names, values))
+        if all(name in loaded for name in ("parent_id", "path", "depth")):
+            instance._tree_state = (loaded["parent_id"], loaded["path"], loaded["depth"])
+        return instance
+
+    @classmethod
+    def build_path(cls, parent_path: Optional[str], pk: Any) -> str:
+        return f"{parent_path or cls.PATH_SEPARATOR}{pk}{cls.PATH_SEPARATOR}"
+
+    @classmethod
+    def parse_path(cls, path: str) -> List[int]:
+        return [int(pk) for pk in path.strip(cls.PATH_SEPARATOR).split(cls.PATH_SEPARATOR) if pk]
+
+    def get_stored_tree(self) -> Tuple[Any, str, int]:
+        if self._tree_state is None:
+            self._tree_state = (
+                type(self)._base_manager.filter(pk=self.pk)
+                .values_list("parent_id", "path", "depth")
+                .first()
+            ) or (None, "", 0)
+        return self._tree_state
+
+    def set_tree_position(self, using: Optional[str] = None) -> str:
+        """
+        Tính path/depth theo workspace cha (một truy vấn lấy path của cha)
+
+        Returns:
+            str: Path của workspace cha
+
+        Raises:
+            MessageError: Nếu workspace cha là chính nó hoặc là workspace con của nó
+        """
+        parent_path, parent_depth = "", -1
+        if self.parent_id is not None:
+            parent_path, parent_depth = (
+                type(self)._base_manager.using(using or router.db_for_write(type(self)))
+                .filter(pk=self.parent_id)
+                .values_list("path", "depth")
+                .first()
+            ) or ("", -1)
+
+            if self.pk is not None and f"{self.PATH_SEPARATOR}{self.pk}{self.PATH_SEPARATOR}" in (
+                parent_path or self.build_path(None, self.parent_id)
+            ):
+                raise MessageError("Không thể chọn workspace con (hoặc chính nó) làm workspace cha")
+
+        self.depth = parent_depth + 1
+        self.path = self.build_path(parent_path, self.pk) if self.pk is not None else ""
+        return parent_path
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "parent" not in update_fields and "parent_id" not in update_fields:
+            return super().save(*args, **kwargs)
+
+        using = kwargs.get("using")
+        adding = self._state.adding
+        if adding and self.pk is None and IdAllocator.supports(type(self), using):
+            # pk đã có giá trị: path được INSERT cùng bản ghi
+            self.pk = IdAllocator.next_id(type(self), using)
+            kwargs["force_insert"] = True
+
+        old_parent_id, old_path, old_depth = (None, "", 0) if adding else self.get_stored_tree()
+        moved = adding or self.parent_id != old_parent_id or not old_path
+        if not moved:
+            return super().save(*args, **kwargs)
+
+        if update_fields is not None:
+            kwargs["update_fields"] = [*update_fields, "path", "depth"]
+
+        with transaction.atomic(using=using or router.db_for_write(type(self))):
+            parent_path = self.set_tree_position(using)
+            super().save(*args, **kwargs)
+
+            queryset = type(self)._base_manager.using(using or router.db_for_write(type(self)))
+            if not self.path:
+                # CSDL không cấp phát pk trước: cập nhật path sau khi INSERT
+                self.path = self.build_path(parent_path, self.pk)
+                queryset.filter(pk=self.pk).update(path=self.path)
+
+            if old_path and old_path != self.path:
+                # Chuyển cả cây con bằng một câu lệnh UPDATE
+                queryset.filter(path__startswith=old_path).exclude(pk=self.pk).update(
+                    path=Concat(Value(self.path), Substr("path", len(old_path) + 1), output_field=models.CharField()),
+                    depth=F("depth") + (self.depth - old_depth),
+                )
+
+        self._tree_state = (self.parent_id, self.path, self.depth)
+
+    def detach_descendants(self, using: Optional[str] = None) -> int:
+        """
+        Đưa cây con lên làm gốc khi workspace bị xóa cứng (parent SET_NULL không gửi tín hiệu save)
+
+        Returns:
+            int: Số workspace đã cập nhật
+        """
+        if not self.path:
+            return 0
+
+        queryset = type(self)._base_manager.using(using or router.db_for_write(type(self)))
+        return queryset.filter(path__startswith=self.path).exclude(pk=self.pk).update(
+            path=Substr("path", len(self.path)),
+            depth=F("depth") - (self.depth + 1),
+        )
+
+    def get_ancestor_ids(self, include_self: bool = False) -> List[int]:
+        """
+        Lấy ID các workspace tổ tiên từ path (không truy vấn), từ gốc xuống
+
+        Args:
+            include_self: Có bao gồm chính workspace này không
+        """
+        ids = self.parse_path(self.path)
+        return ids if include_self else ids[:-1]
+
+    def get_ancestors(self, include_self: bool = False):
+        """
+        Lấy các workspace tổ tiên (một truy vấn theo khóa chính), từ gốc xuống
+
+        Returns:
+            QuerySet: Các workspace tổ tiên
+        """
+        return type(self).objects.filter(pk__in=self.get_ancestor_ids(include_self)).order_by("depth")
+
+    def get_descendants(self, include_self: bool = False, max_depth: Optional[int] = None):
+        """
+        Lấy các workspace con cháu (một truy vấn LIKE 'path%' trên index)
+
+        Args:
+            include_self: Có bao gồm chính workspace này không
+            max_depth: Chỉ lấy đến độ sâu tương đối này (1 = con trực tiếp)
+
+        Returns:
+            QuerySet: Các workspace con cháu
+        """
+        queryset = type(self).objects.filter(path__startswith=self.path)
+        if not include_self:
+            queryset = queryset.exclude(pk=self.pk)
+        if max_depth is not None:
+            queryset = queryset.filter(depth__lte=self.depth + max_depth)
+        return queryset
+
+    def is_descendant_of(self, other: "Workspace", include_self: bool = False) -> bool:
+        if self.pk == other.pk:
+            return include_self
+        return other.pk in self.get_ancestor_ids()
+
+    def get_inherited_memberships(self, model: Type[models.Model]):
+        """
+        Lấy bản ghi thành viên của workspace này và các workspace tổ tiên (một truy vấn)
+
+        Args:
+            model: WorkspaceUser hoặc WorkspaceCustomer
+
+        Returns:
+            QuerySet: Các bản ghi thành viên
+        """
+        return model.objects.filter(workspace_id__in=self.get_ancestor_ids(include_self=True))
+
+    @classmethod
+    def prepare_bulk_create(cls, instances: Sequence["Workspace"]) -> None:
+        super().prepare_bulk_create(instances)
+
+        # Cấp phát pk cho cả lô để path được INSERT cùng bản ghi
+        pending = [instance for instance in instances if instance.pk is None]
+        if pending and IdAllocator.supports(cls):
+            for instance, pk in zip(pending, IdAllocator.reserve(cls, len(pending))):
+                instance.pk = pk
+
+        parent_ids = {instance.parent_id for instance in instances if instance.parent_id is not None}
+        parents = dict(cls._base_manager.filter(pk__in=parent_ids).values_list("pk", "path")) if parent_ids else {}
+        for instance in instances:
+            parent_path = parents.get(instance.parent_id, "")
+            instance.depth = len(cls.parse_path(parent_path))
+            instance.path = cls.build_path(parent_path, instance.pk) if instance.pk is not None else ""
+
+    @classmethod
+    def prepare_bulk_update(cls, instances: Sequence["Workspace"], fields: Sequence[str]) -> List[str]:
+        if "parent" in fields or "parent_id" in fields:
+            raise ValueError("Đổi workspace cha phải dùng save() để cập nhật cây con")
+        return super().prepare_bulk_update(instances, fields)
+
+    @classmethod
+    def after_bulk_write(cls, instances: Sequence["Workspace"], created: bool = False) -> None:
+        super().after_bulk_write(instances, created)
+
+        # CSDL không cấp phát pk trước: điền path sau khi INSERT (một câu lệnh cho cả lô)
+        changed = [instance for instance in instances if created and instance.pk and not instance.path]
+        if changed:
+            parents = dict(
+                cls._base_manager.filter(pk__in={instance.parent_id for instance in changed})
+                .values_list("pk", "path")
+            )
+            for instance in changed:
+                instance.path = cls.build_path(parents.get(instance.parent_id, ""), instance.pk)
+            cls._base_manager.bulk_update(changed, ["path"])
+
+    @classmethod
+    def rebuild_tree(cls, batch_size=1000, stdout=None) -> Tuple[int, List[int]]:
+        """
+        Tính lại path/depth cho toàn bộ workspace (kể cả đã xóa mềm) từ parent
+
+        Cây được dựng trong bộ nhớ từ một truy vấn (id, parent_id); chỉ các bản ghi
+        thay đổi được ghi lại theo từng lô. Workspace nằm trong vòng lặp cha-con được
+        đánh chỉ mục như gốc và được trả về để xử lý thủ công.
+
+        Args:
+            batch_size: Số bản ghi mỗi lô
+            stdout: Luồng ghi tiến trình (tùy chọn)
+
+        Returns:
+            Tuple[int, List[int]]: Số bản ghi đã cập nhật, ID workspace nằm trong vòng lặp
+        """
+        rows = list(cls._base_manager.order_by("pk").values_list("pk", "parent_id", "path", "depth"))
+        stored = {pk: (path, depth) for pk, _, path, depth in rows}
+        parents = {pk: parent_id for pk, parent_id, _, _ in rows}
+
+        children = {}
+        roots = []
+        for pk, parent_id, _, _ in rows:
+            if parent_id is None or parent_id not in stored:
+                roots.append(pk)
+            else:
+                children.setdefault(parent_id, []).append(pk)
+
+        positions = {}
+
+        def walk(root_ids):
+            stack = [(pk, cls.build_path(None, pk), 0) for pk in root_ids]
+            while stack:
+                pk, path, depth = stack.pop()
+                if pk in positions:
+                    continue
+                positions[pk] = (path, depth)
+                stack.extend(
+                    (child, cls.build_path(path, child), depth + 1)
+                    for child in children.get(pk, ())
+                )
+
+        walk(roots)
+
+        # Các bản ghi chưa được duyệt nằm trong (hoặc treo dưới) một vòng lặp cha-con:
+        # lần theo parent đến một workspace trong vòng lặp và lấy nó làm gốc
+        cycles = []
+        for pk, _, _, _ in rows:
+            if pk in positions:
+                continue
+            seen = set()
+            while pk not in seen:
+                seen.add(pk)
+                pk = parents[pk]
+            cycles.append(pk)
+            walk([pk])
+
+        changed = [
+            cls(pk=pk, path=path, depth=depth)
+            for pk, (path, depth) in positions.items()
+            if stored[pk] != (path, depth)
+        ]
+        for start in range(0, len(changed), batch_size):
+            batch = changed[start:start + batch_size]
+            cls._base_manager.bulk_update(batch, ["path", "depth"])
+            if stdout is not None:
+                stdout.write(f"{cls.__name__}: {start + len(batch)}/{len(changed)} cập nhật")
+
+        return len(changed), cycles
+
 
 class WorkspaceMemberBase(models.Model):
     workspace = models.ForeignKey(
@@ -0,0 +1,333 @@
+from django.core.cache import cache
+from django.db import transaction
+
+from rest_framework import permissions
+
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Type
+
+import hashlib
+
+from helpers.token_helper import HttpSystem
+from utils.lru_cache import LRUCache
+
+from .models import Action, WorkspaceUser, WorkspaceCustomer
+
+
+class ActionBits(NamedTuple):
+    """
+    Vị trí bit của các hành động: thứ tự của Action.code (liên tục từ 0).
+    """
+
+    version: str  # Digest của danh sách (mã, pk) hành động, là một phần của key bitset
+    codes: Dict[str, int]  # Action.code -> bit
+    ids: Dict[int, int]  # Action.pk -> bit
+
+
+class WorkspacePermissionResolver:
+    """
+    Tập quyền (Action.code) hiệu lực của mỗi thành viên trong workspace, lưu dưới
+    dạng bitset: bit thứ i bật nếu thành viên có hành động thứ i (theo thứ tự
+    Action.code, xem ActionBits) qua một trong các chức vụ
+    (WorkspaceUser/WorkspaceCustomer.positions -> Position.actions).
+
+    Bit được đánh số liên tục nên bitset nhỏ dù Action.pk lớn. Thêm/xóa hành động làm
+    dịch bit nên key của bitset chứa version của danh sách hành động: khi danh sách
+    đổi, mọi bitset cũ không còn được dùng và được tính lại khi cần.
+
+    Bitset được cache hai tầng: LRU trong tiến trình (LOCAL_TIMEOUT giây) và cache
+    dùng chung (django-redis). Khi thành viên, chức vụ hoặc hành động thay đổi, chỉ
+    bitset của các thành viên bị ảnh hưởng được tính lại (xem apps.workspace.signals).
+    Tiến trình khác thấy thay đổi sau tối đa LOCAL_TIMEOUT giây.
+    """
+
+    KEY_PREFIX = "workspace_perm"
+    ACTIONS_KEY = "workspace_perm:action_bits"
+    TIMEOUT = 60 * 60  # Giây, tầng cache dùng chung
+    LOCAL_TIMEOUT = 5  # Giây, tầng LRU trong tiến trình
+    LOCAL_MAX_SIZE = 10000
+
+    # Map hệ thống xác thực -> (model thành viên, trường trỏ tới thành viên)
+    MEMBER_MODELS = {
+        HttpSystem.MANAGE: (WorkspaceUser, "user_id"),
+        HttpSystem.CUSTOMER: (WorkspaceCustomer, "customer_id"),
+    }
+
+    local = LRUCache(max_size=LOCAL_MAX_SIZE, timeout=LOCAL_TIMEOUT)
+
+    @classmethod
+    def get_key(cls, system: str, workspace_id: Any, member_id: Any, version: Optional[str] = None) -> str:
+        if version is None:
+            version = cls.get_action_bits().version
+        return f"{cls.KEY_PREFIX}:{version}:{system}:{workspace_id}:{member_id}"
+
+    @classmethod
+    def get_member_model(cls, system: str) -> Tuple[Type, str]:
+        if system not in cls.MEMBER_MODELS:
+            raise ValueError(f"Hệ thống không hợp lệ: {system}")
+        return cls.MEMBER_MODELS[system]
+
+    @classmethod
+    def load_action_bits(cls) -> ActionBits:
+        """
+        Đánh số bit các hành động theo thứ tự Action.code bằng một truy vấn.
+
+        Returns:
+            ActionBits: Vị trí bit và version của danh sách hành động
+        """
+        rows = list(Action.objects.order_by("code").values_list("code", "pk"))
+        # Gồm cả pk: hành động bị xóa rồi tạo lại cùng mã cũng đổi version
+        digest = hashlib.sha1(repr(rows).encode()).hexdigest()[:12]
+        return ActionBits(
+            version=digest,
+            codes={code: bit for bit, (code, _) in enumerate(rows)},
+            ids={pk: bit for bit, (_, pk) in enumerate(rows)},
+        )
+
+    @classmethod
+    def get_action_bits(cls) -> ActionBits:
+        """
+        Lấy vị trí bit của các hành động từ cache, tính và lưu lại nếu chưa có.
+
+        Returns:
+            ActionBits: Vị trí bit và version của danh sách hành động
+        """
+        bits = cls.local.get(cls.ACTIONS_KEY)
+        if bits is not None:
+            return bits
+
+        try:
+            bits = cache.get(cls.ACTIONS_KEY)
+        except Exception:
+            bits = None
+
+        if bits is None:
+            bits = cls.load_action_bits()
+            try:
+                cache.set(cls.ACTIONS_KEY, bits, cls.TIMEOUT)
+            except Exception:
+                pass
+
+        cls.local.set(cls.ACTIONS_KEY, bits)
+        return bits
+
+    @classmethod
+    def compute(cls, system: str, workspace_id: Any, member_id: Any, bits: Optional[ActionBits] = None) -> int:
+        """
+        Tính bitset của một thành viên bằng một truy vấn.
+
+        Thành viên đã rời workspace (left_at) hoặc workspace đã bị xóa không có quyền nào.
+
+        Args:
+            bits: Vị trí bit dùng để tính (mặc định là get_action_bits())
+
+        Returns:
+            int: Bitset các hành động
+        """
+        bits = bits or cls.get_action_bits()
+        model, member_field = cls.get_member_model(system)
+        action_ids = model.objects.filter(
+            workspace_id=workspace_id,
+            workspace__is_delete=False,
+            left_at__isnull=True,
+            positions__actions__isnull=False,
+            **{member_field: member_id},
+        ).order_by().values_list("positions__actions__id", flat=True)
+
+        mask = 0
+        for action_id in action_ids:
+            # Hành động vừa được thêm sau khi đánh số bit: có hiệu lực ở version sau
+            if action_id in bits.ids:
+                mask |= 1 << bits.ids[action_id]
+        return mask
+
+    @classmethod
+    def get_mask(cls, system: str, workspace_id: Any, member_id: Any, bits: Optional[ActionBits] = None) -> int:
+        """
+        Lấy bitset của thành viên từ cache, tính và lưu lại nếu chưa có.
+
+        Args:
+            bits: Vị trí bit của bitset (mặc định là get_action_bits())
+
+        Returns:
+            int: Bitset các hành động
+        """
+        bits = bits or cls.get_action_bits()
+        key = cls.get_key(system, workspace_id, member_id, bits.version)
+
+        mask = cls.local.get(key)
+        if mask is not None:
+            return mask
+
+        try:
+            mask = cache.get(key)
+        except Exception:
+            mask = None
+
+        if mask is None:
+            mask = cls.compute(system, workspace_id, member_id, bits)
+            try:
+                cache.set(key, mask, cls.TIMEOUT)
+            except Exception:
+                pass
+
+        cls.local.set(key, mask)
+        return mask
+
+    @classmethod
+    def has_action(cls, system: str, workspace_id: Any, member_id: Any, action_code: str) -> bool:
+        """
+        Kiểm tra thành viên có hành động `action_code` trong workspace không.
+
+        Args:
+            system: Hệ thống xác thực (manage/customer)
+            workspace_id: ID workspace
+            member_id: ID người dùng/khách hàng
+            action_code: Mã hành động (Action.code)
+
+        Returns:
+            bool: True nếu có quyền
+        """
+        bits = cls.get_action_bits()
+        bit = bits.codes.get(action_code)
+        if bit is None:
+            return False
+
+        return bool(cls.get_mask(system, workspace_id, member_id, bits) >> bit & 1)
+
+    @classmethod
+    def refresh_memberships(cls, system: str, membership_ids: Iterable[Any]) -> None:
+        """
+        Tính lại bitset của các thành viên (theo ID của WorkspaceUser/WorkspaceCustomer)
+        bằng một truy vấn và ghi đè vào cache.
+
+        Args:
+            system: Hệ thống xác thực (manage/customer)
+            membership_ids: ID các bản ghi thành viên
+        """
+        membership_ids = list(membership_ids)
+        if not membership_ids:
+            return
+
+        bits = cls.get_action_bits()
+        model, member_field = cls.get_member_model(system)
+        rows = model.objects.filter(pk__in=membership_ids).order_by().values_list(
+            "workspace_id", member_field, "left_at", "workspace__is_delete", "positions__actions__id"
+        )
+
+        masks: Dict[str, int] = {}
+        for workspace_id, member_id, left_at, workspace_deleted, action_id in rows:
+            key = cls.get_key(system, workspace_id, member_id, bits.version)
+            mask = masks.setdefault(key, 0)
+            if left_at is None and not workspace_deleted and action_id in bits.ids:
+                masks[key] = mask | (1 << bits.ids[action_id])
+
+        for key, mask in masks.items():
+            cls.local.set(key, mask)
+        try:
+            cache.set_many(masks, cls.TIMEOUT)
+        except Exception:
+            pass
+
+    @classmethod
+    def delete(cls, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        for key in keys:
+            cls.local.delete(key)
+        try:
+            cache.delete_many(keys)
+        except Exception:
+            pass
+
+    @classmethod
+    def invalidate_member(cls, system: str, workspace_id: Any, member_id: Any) -> None:
+        key = cls.get_key(system, workspace_id, member_id)
+        transaction.on_commit(lambda: cls.delete([key]))
+
+    @classmethod
+    def invalidate_memberships(cls, system: str, membership_ids: Iterable[Any]) -> None:
+        """
+        Tính lại bitset của các thành viên sau khi transaction được commit.
+        """
+        membership_ids = [pk for pk in membership_ids if pk is not None]
+        if membership_ids:
+            transaction.on_commit(lambda: cls.refresh_memberships(system, membership_ids))
+
+    @classmethod
+    def invalidate_workspace(cls, workspace_id: Any) -> None:
+        """
+        Xóa bitset của mọi thành viên trong workspace (tính lại khi được dùng).
+        """
+
+        def delete():
+            version = cls.get_action_bits().version
+            keys = []
+            for system, (model, member_field) in cls.MEMBER_MODELS.items():
+                member_ids = model.objects.filter(workspace_id=workspace_id).order_by().values_list(member_field, flat=True)
+                keys.extend(cls.get_key(system, workspace_id, member_id, version) for member_id in member_ids)
+            cls.delete(keys)
+
+        transaction.on_commit(delete)
+
+    @classmethod
+    def invalidate_actions(cls) -> None:
+        """
+        Đánh số lại bit sau khi hành động thay đổi. Version mới làm mọi bitset được
+        tính lại (kể cả khi bảng Position.actions bị xóa theo cascade, không có tín hiệu).
+        """
+        transaction.on_commit(lambda: cls.delete([cls.ACTIONS_KEY]))
+
+
+class WorkspaceAction(permissions.BasePermission):
+    """
+    Permission kiểm tra người dùng/khách hàng hiện tại có hành động `action_code`
+    trong workspace của request (O(1) trên bitset đã cache).
+
+    Workspace được lấy từ tham số URL `workspace_id`, header `X-Workspace-Id` hoặc
+    query param `workspace_id`.
+
+    Ví dụ:
+        permission_classes = [Authenticated.Manage, WorkspaceAction.require("order.create")]
+    """
+
+    action_code: Optional[str] = None
+    workspace_kwarg = "workspace_id"
+    workspace_header = "HTTP_X_WORKSPACE_ID"
+
+    @classmethod
+    def require(cls, action_code: str) -> Type["WorkspaceAction"]:
+        """
+        Tạo permission class cho một mã hành động.
+
+        Args:
+            action_code: Mã hành động (Action.code)
+
+        Returns:
+            Type[WorkspaceAction]: Permission class
+        """
+        return type(f"WorkspaceAction[{action_code}]", (cls,), {"action_code": action_code})
+
+    def get_workspace_id(self, request, view) -> Optional[int]:
+        value = (
+            getattr(view, "kwargs", {}).get(self.workspace_kwarg)
+            or request.META.get(self.workspace_header)
+            or request.query_params.get(self.workspace_kwarg)
+        )
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    def has_permission(self, request, view):
+        if self.action_code is None:
+            raise ValueError("WorkspaceAction cần action_code, dùng WorkspaceAction.require(...)")
+
+        user = request.user
+        if not user or not user.is_authenticated:
+            return False
+
+        workspace_id = self.get_workspace_id(request, view)
+        if workspace_id is None:
+            return False
+
+        system = getattr(request, HttpSystem.KEY, HttpSystem.MANAGE)
+        return WorkspacePermissionResolver.has_action(system, workspace_id, user.pk, self.action_code)
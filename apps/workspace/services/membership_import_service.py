@@ -0,0 +1,300 @@
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+
+from typing import Any, Dict, IO, Iterable, List, Optional, Set, Tuple
+
+from apps.accounts.models.utils.validators import validate_phone_number
+from apps.accounts.models import User, Customer
+from helpers.token_helper import HttpSystem
+from utils.importer import ImportRow, StreamRowReader
+
+from ..models import Position, Workspace
+from ..permissions import WorkspacePermissionResolver
+
+
+class MembershipImportService:
+    """
+    Nhập thành viên workspace (WorkspaceUser/WorkspaceCustomer) hàng loạt từ file
+    CSV/NDJSON, xử lý theo từng lô:
+
+    - Số điện thoại, mã workspace và mã chức vụ được tra cứu bằng truy vấn `IN` cho
+      cả lô (workspace/chức vụ đã tra được giữ lại cho các lô sau).
+    - Thành viên và liên kết chức vụ được tạo bằng `bulk_create(ignore_conflicts=True)`,
+      bản ghi đã tồn tại (unique_together) được bỏ qua.
+    - Dòng lỗi được ghi lại kèm số dòng, không làm dừng lô.
+
+    Cột của mỗi dòng: `phone_number`, `type` (user/customer), `workspace` (mã workspace)
+    và `positions` (mã chức vụ, phân cách bởi POSITION_SEPARATOR hoặc danh sách trong NDJSON).
+    `type` và `workspace` có thể bỏ trống nếu đã truyền giá trị mặc định.
+    """
+
+    TYPE_USER = "user"
+    TYPE_CUSTOMER = "customer"
+
+    # Map loại thành viên -> (hệ thống xác thực, model tài khoản)
+    MEMBER_TYPES = {
+        TYPE_USER: (HttpSystem.MANAGE, User),
+        TYPE_CUSTOMER: (HttpSystem.CUSTOMER, Customer),
+    }
+
+    POSITION_SEPARATOR = "|"
+    MAX_ERRORS = 1000
+
+    def __init__(
+        self,
+        workspace: Optional[Workspace] = None,
+        member_type: Optional[str] = None,
+        batch_size: int = StreamRowReader.DEFAULT_BATCH_SIZE,
+    ):
+        """
+        Args:
+            workspace: Workspace mặc định cho các dòng không có cột `workspace`
+            member_type: Loại thành viên mặc định (user/customer)
+            batch_size: Số dòng mỗi lô
+
+        Raises:
+            ValueError: Nếu loại thành viên không hợp lệ
+        """
+        if member_type is not None and member_type not in self.MEMBER_TYPES:
+            raise ValueError(f"Loại thành viên không hợp lệ: {member_type}")
+
+        self.workspace = workspace
+        self.member_type = member_type
+        self.batch_size = batch_size
+
+        self._workspaces: Dict[str, Optional[int]] = {}
+        self._positions: Dict[Tuple[int, str], Optional[int]] = {}
+
+        self.result: Dict[str, Any] = {
+            "total": 0,
+            "created": 0,
+            "existing": 0,
+            "error_count": 0,
+            "errors": [],
+        }
+
+    def add_error(self, line: int, message: str) -> None:
+        self.result["error_count"] += 1
+        if len(self.result["errors"]) < self.MAX_ERRORS:
+            self.result["errors"].append({"line": line, "message": message})
+
+    def run(self, stream: IO, import_format: str = StreamRowReader.FORMAT_CSV) -> Dict[str, Any]:
+        """
+        Nhập toàn bộ file theo từng lô.
+
+        Args:
+            stream: File cần nhập (văn bản hoặc nhị phân)
+            import_format: Định dạng ("csv" hoặc "ndjson")
+
+        Returns:
+            Dict: Tổng số dòng, số thành viên đã tạo/đã tồn tại và các dòng lỗi
+        """
+        reader = StreamRowReader(stream, import_format=import_format, batch_size=self.batch_size)
+        for batch in reader.iter_batches():
+            self.import_batch(batch)
+
+        self.result["errors"].sort(key=lambda error: error["line"])
+        return self.result
+
+    def parse_row(self, row: ImportRow) -> Optional[Tuple[str, str, Optional[str], List[str]]]:
+        """
+        Kiểm tra một dòng, trả về (loại thành viên, số điện thoại, mã workspace, mã chức vụ)
+
+        Returns:
+            Optional[Tuple]: None nếu dòng lỗi (lỗi đã được ghi lại)
+        """
+        if row.error:
+            self.add_error(row.line, row.error)
+            return None
+
+        data = row.data
+        member_type = str(data.get("type") or self.member_type or "").strip().lower()
+        if member_type not in self.MEMBER_TYPES:
+            self.add_error(row.line, f"Loại thành viên không hợp lệ: {member_type or '(trống)'}")
+            return None
+
+        phone_number = str(data.get("phone_number") or "").replace(" ", "")
+        try:
+            validate_phone_number(phone_number)
+        except ValidationError as e:
+            self.add_error(row.line, f"{phone_number or '(trống)'}: {' '.join(e.messages)}")
+            return None
+
+        workspace_code = str(data.get("workspace") or "").strip() or None
+        if workspace_code is None and self.workspace is None:
+            self.add_error(row.line, "Thiếu mã workspace")
+            return None
+
+        positions = data.get("positions") or []
+        if isinstance(positions, str):
+            positions = positions.split(self.POSITION_SEPARATOR)
+        if not isinstance(positions, list):
+            self.add_error(row.line, "Danh sách chức vụ không hợp lệ")
+            return None
+
+        position_codes = [str(code).strip() for code in positions if str(code).strip()]
+        return member_type, phone_number, workspace_code, position_codes
+
+    def resolve_workspaces(self, codes: Set[str]) -> None:
+        missing = codes - self._workspaces.keys()
+        if not missing:
+            return
+
+        found = dict(
+            Workspace.objects.filter(code__in=missing, is_delete=False)
+            .order_by().values_list("code", "pk")
+        )
+        for code in missing:
+            self._workspaces[code] = found.get(code)
+
+    def resolve_positions(self, keys: Set[Tuple[int, str]]) -> None:
+        """
+        Tra cứu chức vụ theo (workspace, mã), ưu tiên chức vụ riêng của workspace
+        hơn chức vụ dùng chung (workspace rỗng).
+        """
+        missing = keys - self._positions.keys()
+        if not missing:
+            return
+
+        workspace_ids = {workspace_id for workspace_id, _ in missing}
+        rows = (
+            Position.objects.filter(code__in={code for _, code in missing})
+            .filter(Q(workspace_id__in=workspace_ids) | Q(workspace__isnull=True))
+            .order_by().values_list("workspace_id", "code", "pk")
+        )
+
+        shared, own = {}, {}
+        for workspace_id, code, pk in rows:
+            if workspace_id is None:
+                shared[code] = pk
+            else:
+                own[(workspace_id, code)] = pk
+
+        for workspace_id, code in missing:
+            self._positions[(workspace_id, code)] = own.get((workspace_id, code), shared.get(code))
+
+    def resolve_members(self, member_type: str, phone_numbers: Iterable[str]) -> Dict[str, int]:
+        _, model = self.MEMBER_TYPES[member_type]
+        return dict(
+            model.objects.filter(phone_number__in=set(phone_numbers), is_delete=False)
+            .order_by().values_list("phone_number", "pk")
+        )
+
+    def import_batch(self, rows: List[ImportRow]) -> None:
+        """
+        Nhập một lô dòng: tra cứu bằng truy vấn IN, tạo thành viên và liên kết chức vụ
+        bằng bulk_create trong một transaction.
+        """
+        self.result["total"] += len(rows)
+
+        parsed = []
+        for row in rows:
+            values = self.parse_row(row)
+            if values is not None:
+                parsed.append((row.line, *values))
+
+        self.resolve_workspaces({code for *_, code, _ in parsed if code is not None})
+
+        members = {}
+        for member_type in self.MEMBER_TYPES:
+            phones = [phone for _, kind, phone, _, _ in parsed if kind == member_type]
+            members[member_type] = self.resolve_members(member_type, phones) if phones else {}
+
+        # (loại thành viên, workspace, thành viên) -> (các dòng, mã chức vụ)
+        pairs: Dict[Tuple[str, int, int], Tuple[List[int], Set[str]]] = {}
+        for line, member_type, phone_number, workspace_code, position_codes in parsed:
+            if workspace_code is None:
+                workspace_id = self.workspace.pk
+            else:
+                workspace_id = self._workspaces.get(workspace_code)
+                if workspace_id is None:
+                    self.add_error(line, f"Không tìm thấy workspace: {workspace_code}")
+                    continue
+
+            member_id = members[member_type].get(phone_number)
+            if member_id is None:
+                self.add_error(line, f"Không tìm thấy tài khoản: {phone_number}")
+                continue
+
+            lines, codes = pairs.setdefault((member_type, workspace_id, member_id), ([], set()))
+            lines.append(line)
+            codes.update(position_codes)
+
+        self.resolve_positions({
+            (workspace_id, code)
+            for (_, workspace_id, _), (_, codes) in pairs.items()
+            for code in codes
+        })
+
+        for key, (lines, codes) in list(pairs.items()):
+            missing = sorted(code for code in codes if self._positions.get((key[1], code)) is None)
+            if missing:
+                for line in lines:
+                    self.add_error(line, f"Không tìm thấy chức vụ: {', '.join(missing)}")
+                del pairs[key]
+
+        try:
+            with transaction.atomic():
+                for member_type in self.MEMBER_TYPES:
+                    self.write_memberships(member_type, {
+                        (workspace_id, member_id): {self._positions[(workspace_id, code)] for code in codes}
+                        for (kind, workspace_id, member_id), (_, codes) in pairs.items()
+                        if kind == member_type
+                    })
+        except DatabaseError as e:
+            for lines, _ in pairs.values():
+                for line in lines:
+                    self.add_error(line, f"Lỗi khi lưu dữ liệu: {e}")
+
+    def write_memberships(self, member_type: str, pairs: Dict[Tuple[int, int], Set[int]]) -> None:
+        """
+        Tạo thành viên còn thiếu và liên kết chức vụ cho các cặp (workspace, thành viên).
+
+        Args:
+            member_type: Loại thành viên (user/customer)
+            pairs: Map (workspace, thành viên) -> ID các chức vụ
+        """
+        if not pairs:
+            return
+
+        system, _ = self.MEMBER_TYPES[member_type]
+        model, member_field = WorkspacePermissionResolver.get_member_model(system)
+
+        def lookup():
+            rows = model.objects.filter(
+                workspace_id__in={workspace_id for workspace_id, _ in pairs},
+                **{f"{member_field}__in": {member_id for _, member_id in pairs}},
+            ).order_by().values_list("workspace_id", member_field, "pk")
+            return {(workspace_id, member_id): pk for workspace_id, member_id, pk in rows}
+
+        memberships = lookup()
+        pending = [pair for pair in pairs if pair not in memberships]
+        if pending:
+            model.objects.bulk_create(
+                [model(workspace_id=workspace_id, **{member_field: member_id}) for workspace_id, member_id in pending],
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
+            # ignore_conflicts không trả về pk: tra cứu lại các thành viên vừa tạo
+            existing = len(memberships)
+            memberships = lookup()
+            self.result["created"] += len(memberships) - existing
+        self.result["existing"] += len(pairs) - len(pending)
+
+        through = model.positions.through
+        source_field = f"{model.positions.field.m2m_field_name()}_id"
+        target_field = f"{model.positions.field.m2m_reverse_field_name()}_id"
+        links = [
+            through(**{source_field: memberships[pair], target_field: position_id})
+            for pair, position_ids in pairs.items()
+            if pair in memberships
+            for position_id in position_ids
+        ]
+        if links:
+            through.objects.bulk_create(links, batch_size=self.batch_size, ignore_conflicts=True)
+
+        # bulk_create không gửi tín hiệu: làm mới bitset quyền của các thành viên bị ảnh hưởng
+        WorkspacePermissionResolver.invalidate_memberships(
+            system, [memberships[pair] for pair in pairs if pair in memberships]
+        )
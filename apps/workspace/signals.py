@@ -0,0 +1,122 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+
+from helpers.token_helper import HttpSystem
+
+from .models import Action, Position, Workspace, WorkspaceUser, WorkspaceCustomer
+from .permissions import WorkspacePermissionResolver
+
+
+# Map model thành viên -> hệ thống xác thực
+MEMBER_SYSTEMS = {
+    WorkspaceUser: HttpSystem.MANAGE,
+    WorkspaceCustomer: HttpSystem.CUSTOMER,
+}
+
+
+def memberships_of_positions(position_ids):
+    """
+    Lấy ID thành viên (theo hệ thống) đang giữ một trong các chức vụ.
+    """
+    return {
+        system: list(model.objects.filter(positions__in=position_ids).order_by().values_list("pk", flat=True).distinct())
+        for model, system in MEMBER_SYSTEMS.items()
+    }
+
+
+def on_membership_saved(sender, instance, **kwargs):
+    WorkspacePermissionResolver.invalidate_memberships(MEMBER_SYSTEMS[sender], [instance.pk])
+
+
+def on_membership_deleted(sender, instance, **kwargs):
+    member_id = instance.user_id if sender is WorkspaceUser else instance.customer_id
+    WorkspacePermissionResolver.invalidate_member(MEMBER_SYSTEMS[sender], instance.workspace_id, member_id)
+
+
+def on_membership_positions_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        # pk_set không có khi clear từ phía Position: lưu lại trước khi xóa
+        instance._cleared_memberships = list(
+            model.objects.filter(positions=instance).order_by().values_list("pk", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        membership_ids = [instance.pk]
+        system = MEMBER_SYSTEMS[type(instance)]
+    else:
+        if action == "post_clear":
+            membership_ids = getattr(instance, "_cleared_memberships", [])
+        else:
+            membership_ids = list(pk_set or [])
+        system = MEMBER_SYSTEMS[model]
+
+    WorkspacePermissionResolver.invalidate_memberships(system, membership_ids)
+
+
+def on_position_actions_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        instance._cleared_positions = list(
+            Position.objects.filter(actions=instance).order_by().values_list("pk", flat=True)
+        )
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        position_ids = [instance.pk]
+    elif action == "post_clear":
+        position_ids = getattr(instance, "_cleared_positions", [])
+    else:
+        position_ids = list(pk_set or [])
+
+    for system, membership_ids in memberships_of_positions(position_ids).items():
+        WorkspacePermissionResolver.invalidate_memberships(system, membership_ids)
+
+
+def on_position_pre_delete(sender, instance, **kwargs):
+    # Bảng trung gian bị xóa theo cascade, không có tín hiệu m2m_changed
+    instance._affected_memberships = memberships_of_positions([instance.pk])
+
+
+def on_position_deleted(sender, instance, **kwargs):
+    for system, membership_ids in getattr(instance, "_affected_memberships", {}).items():
+        WorkspacePermissionResolver.invalidate_memberships(system, membership_ids)
+
+
+def on_action_changed(sender, instance, **kwargs):
+    WorkspacePermissionResolver.invalidate_actions()
+
+
+def on_workspace_saved(sender, instance, **kwargs):
+    # Xóa mềm hoặc khôi phục workspace: thành viên mất/có lại toàn bộ quyền
+    update_fields = kwargs.get("update_fields")
+    if update_fields is None or "is_delete" in update_fields:
+        if not kwargs.get("created"):
+            WorkspacePermissionResolver.invalidate_workspace(instance.pk)
+
+
+def on_workspace_pre_delete(sender, instance, using, **kwargs):
+    # parent của workspace con được SET_NULL bằng UPDATE trực tiếp: đưa cây con lên làm gốc
+    instance.detach_descendants(using)
+
+
+def connect():
+    """
+    Đăng ký các tín hiệu làm mới bitset quyền và chỉ mục cây workspace (gọi trong WorkspaceConfig.ready).
+    """
+    for member_model in MEMBER_SYSTEMS:
+        post_save.connect(on_membership_saved, sender=member_model)
+        post_delete.connect(on_membership_deleted, sender=member_model)
+        m2m_changed.connect(on_membership_positions_changed, sender=member_model.positions.through)
+
+    m2m_changed.connect(on_position_actions_changed, sender=Position.actions.through)
+    pre_delete.connect(on_position_pre_delete, sender=Position)
+    post_delete.connect(on_position_deleted, sender=Position)
+    post_save.connect(on_action_changed, sender=Action)
+    post_delete.connect(on_action_changed, sender=Action)
+    post_save.connect(on_workspace_saved, sender=Workspace)
+    pre_delete.connect(on_workspace_pre_delete, sender=Workspace)
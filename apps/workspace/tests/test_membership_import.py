@@ -0,0 +1,103 @@
+from django.test import TestCase
+
+import io
+
+from apps.accounts.models import Customer, User
+from apps.workspace.models import Position, Workspace, WorkspaceCustomer, WorkspaceUser
+from apps.workspace.services.membership_import_service import MembershipImportService
+
+
+class MembershipImportErrorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.workspace = Workspace.objects.create(name="Root", code="ROOT")
+        cls.user = User.objects.create(phone_number="0123456789", full_name="Nguyễn Văn An", password="x")
+        cls.customer = Customer.objects.create(phone_number="0987654321", full_name="Trần Thị Bình", password="x")
+        cls.manager = Position.objects.create(name="Quản lý", code="MANAGER", workspace=cls.workspace)
+
+    def run_import(self, content, import_format="csv", **kwargs):
+        service = MembershipImportService(**kwargs)
+        return service.run(io.BytesIO(content.encode("utf-8")), import_format)
+
+    def get_errors(self, result):
+        return [(error["line"], error["message"]) for error in result["errors"]]
+
+    def test_row_errors_do_not_stop_the_batch(self):
+        result = self.run_import(
+            "phone_number,type,workspace,positions\n"
+            "0123456789,user,ROOT,MANAGER\n"
+            "0123456789,admin,ROOT,\n"
+            "12345,user,ROOT,\n"
+            "0123456789,user,,\n"
+            "0123456789,user,MISSING,\n"
+            "0900000000,user,ROOT,\n"
+            "0987654321,customer,ROOT,MANAGER|UNKNOWN\n"
+            "0987654321,customer,ROOT,MANAGER,extra\n"
+        )
+
+        self.assertEqual(result["total"], 8)
+        self.assertEqual(result["created"], 1)
+        self.assertEqual(result["error_count"], 7)
+
+        lines = [line for line, _ in self.get_errors(result)]
+        self.assertEqual(lines, [3, 4, 5, 6, 7, 8, 9])
+
+        messages = dict(self.get_errors(result))
+        self.assertIn("Loại thành viên không hợp lệ: admin", messages[3])
+        self.assertTrue(messages[4].startswith("12345:"))
+        self.assertEqual(messages[5], "Thiếu mã workspace")
+        self.assertEqual(messages[6], "Không tìm thấy workspace: MISSING")
+        self.assertEqual(messages[7], "Không tìm thấy tài khoản: 0900000000")
+        self.assertEqual(messages[8], "Không tìm thấy chức vụ: UNKNOWN")
+        self.assertEqual(messages[9], "Dòng có nhiều cột hơn header")
+
+        membership = WorkspaceUser.objects.get(workspace=self.workspace, user=self.user)
+        self.assertEqual(list(membership.positions.values_list("code", flat=True)), ["MANAGER"])
+        self.assertFalse(WorkspaceCustomer.objects.exists())
+
+    def test_ndjson_errors_keep_line_numbers(self):
+        result = self.run_import(
+            '{"phone_number": "0123456789"}\n'
+            "\n"
+            "{not json}\n"
+            "[1, 2]\n"
+            '{"phone_number": "0987654321", "type": "customer", "positions": "MANAGER"}\n',
+            import_format="ndjson",
+            workspace=self.workspace,
+            member_type="user",
+        )
+
+        self.assertEqual(result["created"], 2)
+        errors = self.get_errors(result)
+        self.assertEqual([line for line, _ in errors], [3, 4])
+        self.assertTrue(errors[0][1].startswith("JSON không hợp lệ"))
+        self.assertEqual(errors[1][1], "Mỗi dòng phải là một đối tượng JSON")
+
+    def test_invalid_position_list_is_reported(self):
+        result = self.run_import(
+            '{"phone_number": "0123456789", "positions": {"code": "MANAGER"}}\n',
+            import_format="ndjson",
+            workspace=self.workspace,
+            member_type="user",
+        )
+        self.assertEqual(self.get_errors(result), [(1, "Danh sách chức vụ không hợp lệ")])
+
+    def test_existing_memberships_are_counted_not_duplicated(self):
+        content = "phone_number,type,workspace\n0123456789,user,ROOT\n"
+        self.run_import(content)
+        result = self.run_import(content)
+
+        self.assertEqual((result["created"], result["existing"], result["error_count"]), (0, 1, 0))
+        self.assertEqual(WorkspaceUser.objects.count(), 1)
+
+    def test_invalid_default_member_type_is_rejected(self):
+        with self.assertRaises(ValueError):
+            MembershipImportService(member_type="admin")
+
+    def test_errors_are_capped(self):
+        service = MembershipImportService(workspace=self.workspace, member_type="user")
+        service.MAX_ERRORS = 2
+        result = service.run(io.StringIO("phone_number\n1\n2\n3\n"))
+
+        self.assertEqual(result["error_count"], 3)
+        self.assertEqual(len(result["errors"]), 2)
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.workspace.models import Action, Position, Workspace, WorkspaceUser
+from apps.workspace.permissions import WorkspacePermissionResolver
+from helpers.token_helper import HttpSystem
+
+
+class WorkspacePermissionResolverTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.workspace = Workspace.objects.create(name="Root", code="ROOT")
+        cls.user = User.objects.create(phone_number="0123456789", full_name="Nguyễn Văn An", password="x")
+        cls.create = Action.objects.create(pk=5000, name="Tạo đơn", code="order.create")
+        cls.view = Action.objects.create(pk=9000, name="Xem đơn", code="order.view")
+        cls.manager = Position.objects.create(name="Quản lý", code="MANAGER", workspace=cls.workspace)
+        cls.manager.actions.add(cls.create, cls.view)
+
+        membership = WorkspaceUser.objects.create(workspace=cls.workspace, user=cls.user)
+        membership.positions.add(cls.manager)
+
+    def setUp(self):
+        cache.clear()
+        WorkspacePermissionResolver.local.clear()
+
+    def has_action(self, code):
+        return WorkspacePermissionResolver.has_action(HttpSystem.MANAGE, self.workspace.pk, self.user.pk, code)
+
+    def test_bits_are_dense_in_code_order(self):
+        bits = WorkspacePermissionResolver.get_action_bits()
+
+        self.assertEqual(bits.codes, {"order.create": 0, "order.view": 1})
+        self.assertEqual(bits.ids, {self.create.pk: 0, self.view.pk: 1})
+        mask = WorkspacePermissionResolver.get_mask(HttpSystem.MANAGE, self.workspace.pk, self.user.pk)
+        self.assertEqual(mask, 0b11)
+
+    def test_has_action(self):
+        self.assertTrue(self.has_action("order.create"))
+        self.assertFalse(self.has_action("order.delete"))
+
+    def test_new_action_shifts_bits_under_new_version(self):
+        self.assertTrue(self.has_action("order.view"))
+        version = WorkspacePermissionResolver.get_action_bits().version
+
+        # "order.approve" đứng trước các mã cũ: mọi bit bị dịch
+        with self.captureOnCommitCallbacks(execute=True):
+            Action.objects.create(name="Duyệt đơn", code="order.approve")
+
+        bits = WorkspacePermissionResolver.get_action_bits()
+        self.assertNotEqual(bits.version, version)
+        self.assertEqual(bits.codes["order.create"], 1)
+        self.assertFalse(self.has_action("order.approve"))
+        self.assertTrue(self.has_action("order.create"))
+        self.assertTrue(self.has_action("order.view"))
+
+    def test_deleted_action_is_not_granted(self):
+        self.assertTrue(self.has_action("order.create"))
+
+        # Bảng trung gian bị xóa theo cascade (không có m2m_changed)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create.delete()
+            Action.objects.create(name="Tạo đơn mới", code="order.create")
+
+        self.assertFalse(self.has_action("order.create"))
+        self.assertTrue(self.has_action("order.view"))
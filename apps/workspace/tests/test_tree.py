@@ -0,0 +1,70 @@
+from django.test import TestCase
+
+from apps.workspace.models import Workspace
+from utils.exception import MessageError
+
+
+class WorkspaceTreeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.root = Workspace.objects.create(name="Root", code="ROOT")
+        cls.branch = Workspace.objects.create(name="Branch", code="BRANCH", parent=cls.root)
+        cls.team = Workspace.objects.create(name="Team", code="TEAM", parent=cls.branch)
+        cls.other = Workspace.objects.create(name="Other", code="OTHER")
+
+    def get(self, workspace):
+        return Workspace.objects.get(pk=workspace.pk)
+
+    def test_create_sets_path_and_depth(self):
+        team = self.get(self.team)
+        self.assertEqual(team.path, f"/{self.root.pk}/{self.branch.pk}/{self.team.pk}/")
+        self.assertEqual(team.depth, 2)
+        self.assertEqual(team.get_ancestor_ids(), [self.root.pk, self.branch.pk])
+        self.assertIsNone(team.updated_at)
+
+    def test_move_updates_subtree(self):
+        branch = self.get(self.branch)
+        branch.parent = self.other
+        branch.save()
+
+        team = self.get(self.team)
+        self.assertEqual(team.path, f"/{self.other.pk}/{self.branch.pk}/{self.team.pk}/")
+        self.assertEqual(team.depth, 2)
+        self.assertEqual(set(self.get(self.root).get_descendants().values_list("pk", flat=True)), set())
+        self.assertEqual(
+            set(self.get(self.other).get_descendants().values_list("pk", flat=True)),
+            {self.branch.pk, self.team.pk},
+        )
+
+    def test_move_to_root_updates_depth(self):
+        branch = self.get(self.branch)
+        branch.parent = None
+        branch.save(update_fields=["parent"])
+
+        branch = self.get(self.branch)
+        self.assertEqual((branch.path, branch.depth), (f"/{self.branch.pk}/", 0))
+
+        team = self.get(self.team)
+        self.assertEqual((team.path, team.depth), (f"/{self.branch.pk}/{self.team.pk}/", 1))
+
+    def test_descendant_as_parent_is_rejected(self):
+        root = self.get(self.root)
+        root.parent = self.team
+        with self.assertRaises(MessageError):
+            root.save()
+
+        self.assertEqual(self.get(self.root).parent_id, None)
+        self.assertEqual(self.get(self.team).path, f"/{self.root.pk}/{self.branch.pk}/{self.team.pk}/")
+
+    def test_self_as_parent_is_rejected(self):
+        branch = self.get(self.branch)
+        branch.parent = branch
+        with self.assertRaises(MessageError):
+            branch.save()
+
+    def test_hard_delete_detaches_subtree(self):
+        self.get(self.branch).delete(hard_delete=True)
+
+        team = self.get(self.team)
+        self.assertIsNone(team.parent_id)
+        self.assertEqual((team.path, team.depth), (f"/{self.team.pk}/", 0))
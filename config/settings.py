@@ -4,6 +4,7 @@ from pathlib import Path
 import os
 
 from config.tasks import TASK_SCHEDULE
+from constants import AppMode
 
 
 DEBUG = config('DEBUG', default=True, cast=bool)
@@ -30,16 +31,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "utils.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "utils.exception.ExceptionMiddleware",
+    "utils.sql_profiler.SQLProfilerMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "utils.middleware.MultiTableAuthMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "django_currentuser.middleware.ThreadLocalUserMiddleware",
+    "utils.middleware.CurrentUserMiddleware",
 ]
 
 REST_FRAMEWORK = {
@@ -82,6 +85,36 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# SQL profiler (utils.sql_profiler.SQLProfilerMiddleware)
+SQL_PROFILER = {
+    "ENABLED": config("SQL_PROFILER_ENABLED", default=AppMode.DEBUG, cast=bool),
+    "N_PLUS_ONE_THRESHOLD": config("SQL_PROFILER_N_PLUS_ONE_THRESHOLD", default=5, cast=int),
+    "LOG_MIN_QUERIES": config("SQL_PROFILER_LOG_MIN_QUERIES", default=50, cast=int),
+    "LOG_MIN_DB_TIME_MS": config("SQL_PROFILER_LOG_MIN_DB_TIME_MS", default=500, cast=int),
+}
+
+# Prometheus metrics (utils.metrics), thư mục snapshot dùng chung giữa các worker
+METRICS = {
+    "ENABLED": config("METRICS_ENABLED", default=True, cast=bool),
+    "DIRECTORY": config("METRICS_DIR", default="", cast=str) or None,
+    "TOKEN": config("METRICS_TOKEN", default="", cast=str),
+    # IP/CIDR được truy cập /metrics không cần token (bỏ trống: bắt buộc token)
+    "ALLOWED_IPS": config("METRICS_ALLOWED_IPS", default="", cast=Csv()),
+}
+
+# Tìm kiếm song song trên file log lỗi (apps.extentions.log_search)
+LOG_SEARCH = {
+    "MAX_WORKERS": config("LOG_SEARCH_MAX_WORKERS", default=4, cast=int),
+    "MAX_LIMIT": config("LOG_SEARCH_MAX_LIMIT", default=5000, cast=int),
+}
+
+# Nén bản xoay vòng của file log (gzip/zstd) và giới hạn lưu trữ (apps.extentions.log_archive)
+LOG_ARCHIVE = {
+    "COMPRESSION": config("LOG_COMPRESSION", default="gzip", cast=str),
+    "MAX_AGE_DAYS": config("LOG_MAX_AGE_DAYS", default=30, cast=int),
+    "MAX_TOTAL_SIZE_MB": config("LOG_MAX_TOTAL_SIZE_MB", default=1024, cast=int),
+}
+
 # Database
 DATABASES = {
     "default": {
@@ -238,13 +271,15 @@ os.makedirs(LOG_DIR, exist_ok=True)
 
 LOG_FILE_NAME = datetime.now().strftime("%Y-%m-%d") + ".log"
 
+LOGGING_CONFIG = "utils.logging.configure_logging"
+
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": True,
     "formatters": {
         "verbose": {
             "()": "utils.logging.VietnameseFormatter",
-            "format": "[{asctime}] {message}",
+            "format": "[{asctime}] {levelname} {message}",
             "datefmt": "%Y-%m-%d %H:%M:%S",
             "style": "{",
         },
@@ -269,31 +304,60 @@ LOGGING = {
     "handlers": {
         "console": {
             "level": "INFO",
-            "class": "logging.StreamHandler",
+            "class": "utils.logging.BatchStreamHandler",
             "formatter": "colored",
             "filters": ["debug_filter_logging", "filter_logging"],
         },
         "error_file": {
             "level": "ERROR",
-            "class": "logging.handlers.RotatingFileHandler",
+            "class": "utils.logging.CompressedRotatingFileHandler",
             "filename": os.path.join(LOG_DIR, "errors-" + LOG_FILE_NAME),
             "maxBytes": 1024 * 1024 * 10,
             "backupCount": 10,
+            "compression": LOG_ARCHIVE["COMPRESSION"],
             "formatter": "verbose",
             "encoding": "utf-8",
             "filters": ["production_filter_logging"],
         },
+        "profiler_file": {
+            "level": "WARNING",
+            "class": "utils.logging.BatchRotatingFileHandler",
+            "filename": os.path.join(LOG_DIR, "profiler-" + LOG_FILE_NAME),
+            "maxBytes": 1024 * 1024 * 10,
+            "backupCount": 10,
+            "formatter": "verbose",
+            "encoding": "utf-8",
+            "filters": ["production_filter_logging"],
+        },
+        # Ghi log qua hàng đợi: filter/format/ghi file chạy trên luồng nền (utils.logging.BatchQueueListener)
+        "queue_request": {
+            "()": "utils.logging.BoundedQueueHandler",
+            "handlers": ["console"],
+        },
+        "queue_exception": {
+            "()": "utils.logging.BoundedQueueHandler",
+            "handlers": ["console", "error_file"],
+        },
+        "queue_profiler": {
+            "()": "utils.logging.BoundedQueueHandler",
+            "handlers": ["console", "profiler_file"],
+        },
     },
     "loggers": {
         "django.request": {
-            "handlers": ["console"],
+            "handlers": ["queue_request"],
             "level": "INFO",
             "propagate": False,
         },
         "django.exception": {
-            "handlers": ["console", "error_file"],
+            "handlers": ["queue_exception"],
             "level": "ERROR",
             "propagate": False,
         },
+        "django.profiler": {
+            "handlers": ["queue_profiler"],
+            "level": "WARNING",
+            "propagate": False,
+        },
     },
 }
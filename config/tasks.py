@@ -1,4 +1,9 @@
 from celery.schedules import crontab
 
 
-TASK_SCHEDULE = {}
+TASK_SCHEDULE = {
+    "archive-logs": {
+        "task": "apps.extentions.tasks.archive_logs",
+        "schedule": crontab(minute=15),
+    },
+}
@@ -6,6 +6,7 @@ from django.conf import settings
 from .openapi import swaggers_urlpatterns
 from apps.app_urls import app_urlpatterns
 from apps.extentions.urls import admin_logs_urlpatterns
+from utils.metrics import metrics_view
 
 
 urlpatterns = [
@@ -13,6 +14,7 @@ urlpatterns = [
     re_path(r"^media/(?P<path>.*)$", serve, {"document_root": settings.MEDIA_ROOT}),
     path("admin/extentions/", include(admin_logs_urlpatterns)),
     path("admin/", admin.site.urls),
+    path("internal/metrics", metrics_view, name="metrics"),
 ]
 
 urlpatterns += swaggers_urlpatterns
@@ -6,6 +6,10 @@ from typing import Any, Optional, TypeVar
 
 T = TypeVar("T")
 
+# Bảng ký tự có dấu và không dấu tương ứng, dùng cho hàm translate của PostgreSQL
+VIETNAMESE_ACCENTED_CHARS = "áàảãạăắằẳẵặâấầẩẫậéèẻẽẹêếềểễệóòỏõọôốồổỗộơớờởỡợúùủũụưứừửữựíìỉĩịýỳỷỹỵđÁÀẢÃẠĂẮẰẲẴẶÂẤẦẨẪẬÉÈẺẼẸÊẾỀỂỄỆÓÒỎÕỌÔỐỒỔỖỘƠỚỜỞỠỢÚÙỦŨỤƯỨỪỬỮỰÍÌỈĨỊÝỲỶỸỴĐ"
+VIETNAMESE_UNACCENTED_CHARS = "aaaaaaaaaaaaaaaaaeeeeeeeeeeeooooooooooooooooouuuuuuuuuuuiiiiiyyyyydAAAAAAAAAAAAAAAAAEEEEEEEEEEEOOOOOOOOOOOOOOOOOUUUUUUUUUUUIIIIIYYYYYD"
+
 
 class PostgresqlJsonField(models.JSONField):
     """
@@ -171,7 +175,7 @@ class UnaccentVN(models.Func):
     """
 
     function = "unaccent_vn"
-    template = "translate(%(expressions)s, 'áàảãạăắằẳẵặâấầẩẫậéèẻẽẹêếềểễệóòỏõọôốồổỗộơớờởỡợúùủũụưứừửữựíìỉĩịýỳỷỹỵđÁÀẢÃẠĂẮẰẲẴẶÂẤẦẨẪẬÉÈẺẼẸÊẾỀỂỄỆÓÒỎÕỌÔỐỒỔỖỘƠỚỜỞỠỢÚÙỦŨỤƯỨỪỬỮỰÍÌỈĨỊÝỲỶỸỴĐ', 'aaaaaaaaaaaaaaaaaeeeeeeeeeeeooooooooooooooooouuuuuuuuuuuiiiiiyyyyydAAAAAAAAAAAAAAAAAEEEEEEEEEEEOOOOOOOOOOOOOOOOOUUUUUUUUUUUIIIIIYYYYYD')"
+    template = f"translate(%(expressions)s, '{VIETNAMESE_ACCENTED_CHARS}', '{VIETNAMESE_UNACCENTED_CHARS}')"
     output_field = models.CharField()
 
     def __init__(self, expression: Any, **extra: Any) -> None:
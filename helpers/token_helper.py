@@ -2,7 +2,11 @@ from datetime import datetime
 from typing import Dict, Any
 
 from config.settings import JWT_CONFIG
+from utils.lru_cache import LRUCache
+from utils.metrics import Metrics
 
+import hashlib
+import time
 import uuid
 import jwt
 
@@ -33,6 +37,10 @@ class Token:
     SIGNING_KEY = JWT_CONFIG.get('SIGNING_KEY', '')
     
     HTTP_SYSTEM = HttpSystem.MANAGE
+
+    # Cache payload đã xác thực theo digest của token, hết hạn đúng tại `exp`
+    DECODE_CACHE_MAX_SIZE = JWT_CONFIG.get('DECODE_CACHE_MAX_SIZE', 4096)
+    _decode_cache = LRUCache(max_size=DECODE_CACHE_MAX_SIZE)
     
     def __init__(self, user_id: str, request):
         self.claim_key = self.__get_claim_key(request)
@@ -50,11 +58,16 @@ class Token:
         
     def __get_payload(self, token_type: str) -> Dict[str, Any]:
         expiry = self.__get_lifetime(token_type)
+        issued_at = time.time()
         
         payload = {
             self.claim_key: self.user_id,
             "exp": int(expiry.timestamp()),
-            "jti": str(uuid.uuid4().hex)[:8],
+            "iat": int(issued_at),
+            # `iat` phải là số nguyên giây (PyJWT so với thời điểm hiện tại làm tròn
+            # xuống giây); thời điểm cấp theo mili giây để so với thời điểm thu hồi
+            "iat_ms": int(issued_at * 1000),
+            "jti": uuid.uuid4().hex,
         }
         
         return payload
@@ -80,4 +93,30 @@ class Token:
                 "verify_signature": True,
                 "verify_exp": True
             }
-        )
\ No newline at end of file
+        )
+    
+    @classmethod
+    def decode_token_cached(cls, token: str) -> Dict[str, Any]:
+        """
+        Giải mã token, dùng lại payload đã xác thực nếu token đã được giải mã trước đó.
+
+        Payload chỉ được cache sau khi xác thực chữ ký thành công và bị loại khỏi
+        cache tại thời điểm `exp`, nên các lần gọi lặp lại bỏ qua HMAC và JSON parse
+        mà vẫn cho cùng kết quả với decode_token.
+        """
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+
+        payload = cls._decode_cache.get(key)
+        if payload is not None:
+            return dict(payload)
+
+        payload = cls.decode_token(token)
+
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            cls._decode_cache.set(key, dict(payload), exp - time.time())
+
+        return payload
+
+
+Metrics.register_cache("token_decode", Token._decode_cache)
@@ -9,6 +9,8 @@ from constants import AppMode
 from constants.http_status_code import HttpStatusCode
 from constants.response_messages import ResponseMessage
 
+from utils.metrics import Metrics
+
 
 class BaseAPIResponse:
     """
@@ -105,6 +107,15 @@ class APIResponse(Response, BaseAPIResponse):
 
         super().__init__(data=response_data, status=http_status.value, **kwargs)
 
+    @property
+    def rendered_content(self):
+        request = (getattr(self, "renderer_context", None) or {}).get("request")
+        if request is None:
+            return super().rendered_content
+
+        with Metrics.phase(request, "render"):
+            return super().rendered_content
+
 
 class JsonAPIResponse(JsonResponse, BaseAPIResponse):
     """
@@ -139,6 +150,9 @@ class JsonAPIResponse(JsonResponse, BaseAPIResponse):
 
         super().__init__(data=response_data, **kwargs)
 
+        # Giữ lại nội dung để middleware đọc được status (giống APIResponse.data)
+        self.data = response_data
+
 
 class SuccessResponse(APIResponse):
     """
@@ -6,6 +6,8 @@ import helpers
 import jwt
 
 from helpers.token_helper import Token, HttpSystem
+from utils.principal_cache import PrincipalCache
+from utils.token_revocation import TokenRevocation
 
 
 
@@ -16,6 +18,25 @@ class MultiAuthentication(authentication.BaseAuthentication):
     signing_key = JWT_CONFIG.get('SIGNING_KEY', '')
     
     def authenticate(self, request):
+        token = self.get_raw_token(request)
+        
+        if token is None:
+            return None
+            
+        return self.authenticate_credentials(request, token)
+        
+    async def aauthenticate(self, request):
+        """
+        Phiên bản async của `authenticate` (dùng bởi AsyncAPIGenericView).
+        """
+        token = self.get_raw_token(request)
+        
+        if token is None:
+            return None
+            
+        return await self.aauthenticate_credentials(request, token)
+        
+    def get_raw_token(self, request):
         authorization = self.verify_authorization_header(request)
         
         if not authorization:
@@ -27,41 +48,63 @@ class MultiAuthentication(authentication.BaseAuthentication):
             raise exceptions.AuthenticationFailed('Invalid token header. Token string should not contain spaces')
             
         try:
-            token = authorization[1].decode()
+            return authorization[1].decode()
         except UnicodeError:
             raise exceptions.AuthenticationFailed('Invalid token header. Token string should not contain invalid characters')
-            
-        return self.authenticate_credentials(request, token)
         
     def authenticate_credentials(self, request, token):
         auth_model = getattr(request, 'auth_model')
-        claim_key = self.get_claim_key(request)
         
-        if not auth_model:
+        try:
+            payload, system, payload_user_id = self.get_payload(request, token)
+            
+            if TokenRevocation.is_revoked(payload, system, payload_user_id):
+                raise exceptions.AuthenticationFailed('Token has been revoked')
+            
+            user = PrincipalCache.get(auth_model, payload_user_id)
+            return self.get_user_token(user, token)
+        except jwt.exceptions.ExpiredSignatureError:
+            raise exceptions.AuthenticationFailed('Token has expired')
+        except jwt.exceptions.InvalidTokenError:
             raise exceptions.AuthenticationFailed('Invalid token')
+
+    async def aauthenticate_credentials(self, request, token):
+        auth_model = getattr(request, 'auth_model')
         
         try:
-            unverified_payload = Token.decode_token(token)
-            payload_user_id = unverified_payload.get(claim_key)
-
-            if not payload_user_id:
-                raise exceptions.AuthenticationFailed('Invalid token')
+            payload, system, payload_user_id = self.get_payload(request, token)
             
-            try:
-                user = auth_model.objects.get(pk=payload_user_id)
-            except auth_model.DoesNotExist:
-                raise exceptions.AuthenticationFailed('Invalid token')
+            if await TokenRevocation.ais_revoked(payload, system, payload_user_id):
+                raise exceptions.AuthenticationFailed('Token has been revoked')
             
-            if user.is_delete:
-                raise exceptions.AuthenticationFailed('Invalid token')
-            return (user, token)
+            user = await PrincipalCache.aget(auth_model, payload_user_id)
+            return self.get_user_token(user, token)
         except jwt.exceptions.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed('Token has expired')
-        except jwt.exceptions.DecodeError:
-            raise exceptions.AuthenticationFailed('Invalid token')
         except jwt.exceptions.InvalidTokenError:
             raise exceptions.AuthenticationFailed('Invalid token')
 
+    def get_payload(self, request, token):
+        auth_model = getattr(request, 'auth_model')
+        claim_key = self.get_claim_key(request)
+        
+        if not auth_model:
+            raise exceptions.AuthenticationFailed('Invalid token')
+        
+        payload = Token.decode_token_cached(token)
+        payload_user_id = payload.get(claim_key)
+
+        if not payload_user_id:
+            raise exceptions.AuthenticationFailed('Invalid token')
+
+        system = getattr(request, HttpSystem.KEY, HttpSystem.MANAGE)
+        return payload, system, payload_user_id
+
+    def get_user_token(self, user, token):
+        if user is None or user.is_delete:
+            raise exceptions.AuthenticationFailed('Invalid token')
+        return (user, token)
+
     def verify_authorization_header(self, request):
         auth = self.get_authorization_header(request).split()
         
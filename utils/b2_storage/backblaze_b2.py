@@ -1,16 +1,40 @@
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
+
+import threading
 import requests
+import hashlib
 import base64
+import random
+import time
 
 
 class BackBlazeB2(object):
-    def __init__(self, app_key=None, account_id=None, bucket_name=None, bucket_id=None):
+    API_URL = "https://api.backblaze.com"
+
+    # File lớn (>= LARGE_FILE_THRESHOLD) được tải lên theo từng phần PART_SIZE byte bằng
+    # b2_start_large_file/b2_upload_part/b2_finish_large_file. B2 yêu cầu phần >= 5 MB.
+    PART_SIZE = 16 * 1024 * 1024
+    LARGE_FILE_THRESHOLD = 2 * PART_SIZE
+    UPLOAD_WORKERS = 4
+
+    # Thử lại khi B2 báo bận/lỗi tạm thời, chờ theo cấp số nhân (có jitter)
+    RETRY_STATUS_CODES = (401, 408, 429, 500, 502, 503, 504)
+    MAX_RETRIES = 5
+    BACKOFF_BASE = 1.0
+    BACKOFF_MAX = 32.0
+    REQUEST_TIMEOUT = 60
+
+    def __init__(self, app_key=None, account_id=None, bucket_name=None, bucket_id=None, api_url=None):
         self.bucket_id = bucket_id
         self.account_id = account_id
         self.app_key = app_key
         self.bucket_name = bucket_name
+        self.api_url = api_url or self.API_URL
         self.base_url = ""
         self.authorization_token = ""
         self.download_url = ""
+        self._auth_lock = threading.Lock()
         self.authorize()
 
     def authorize(self):
@@ -24,7 +48,7 @@ class BackBlazeB2(object):
             headers = {"Authorization": basic_auth_header}
 
             response = requests.get(
-                "https://api.backblaze.com/b2api/v2/b2_authorize_account",
+                f"{self.api_url}/b2api/v2/b2_authorize_account",
                 headers=headers,
             )
 
@@ -50,38 +74,235 @@ class BackBlazeB2(object):
     def _build_url(self, endpoint=None, authorization=True):
         return "%s%s" % (self.base_url, endpoint)
 
+    def get_backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.BACKOFF_MAX)
+        return min(self.BACKOFF_BASE * (2 ** attempt), self.BACKOFF_MAX) * random.uniform(0.5, 1.0)
+
+    def api_post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Gọi API B2 (POST JSON) bằng token tài khoản, tự xác thực lại khi token hết hạn
+        và thử lại khi B2 báo lỗi tạm thời.
+
+        Raises:
+            requests.HTTPError: Nếu vẫn lỗi sau MAX_RETRIES lần thử
+        """
+        attempt = 0
+        while True:
+            response = None
+            try:
+                response = requests.post(
+                    self._build_url(endpoint),
+                    headers={"Authorization": self.authorization_token},
+                    json=payload,
+                    timeout=self.REQUEST_TIMEOUT,
+                )
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt >= self.MAX_RETRIES:
+                    response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.MAX_RETRIES:
+                    raise
+
+            if response is not None and response.status_code == 401:
+                self.reauthorize()
+            time.sleep(self.get_backoff(attempt, response))
+            attempt += 1
+
+    def reauthorize(self):
+        # Nhiều luồng cùng gặp token hết hạn: chỉ xác thực lại một lần
+        token = self.authorization_token
+        with self._auth_lock:
+            if self.authorization_token == token:
+                self.authorize()
+
     def upload_file(self, name, content):
-        response = self.get_upload_url()
-        if "uploadUrl" not in response:
-            self.authorize()
+        """
+        Tải file lên B2. File từ LARGE_FILE_THRESHOLD trở lên được tải theo từng phần
+        song song (xem upload_large_file).
+        """
+        content.seek(0)
+
+        data = content.read(self.LARGE_FILE_THRESHOLD)
+        if len(data) >= self.LARGE_FILE_THRESHOLD:
+            return self.upload_large_file(name, content, first_chunk=data)
+
+        return self.upload_small_file(name, data)
+
+    def upload_small_file(self, name, data: bytes):
+        """
+        Tải file nhỏ bằng b2_upload_file. Dữ liệu chỉ được đọc một lần nên có thể gửi lại
+        khi thử lại; URL tải lên mới được lấy lại sau mỗi lỗi (theo khuyến nghị của B2).
+        """
+        sha1 = hashlib.sha1(data).hexdigest()
+        attempt = 0
+
+        while True:
             response = self.get_upload_url()
             if "uploadUrl" not in response:
-                return False
+                self.authorize()
+                response = self.get_upload_url()
+                if "uploadUrl" not in response:
+                    return False
 
-        url = response["uploadUrl"]
-        content.seek(0)
+            headers = {
+                "Authorization": response["authorizationToken"],
+                "X-Bz-File-Name": name,
+                "Content-Type": "b2/x-auto",
+                "X-Bz-Content-Sha1": sha1,
+                "X-Bz-Info-src_last_modified_millis": "",
+            }
+
+            upload_response = None
+            try:
+                upload_response = requests.post(
+                    response["uploadUrl"], headers=headers, data=data, timeout=self.REQUEST_TIMEOUT,
+                )
+                if upload_response.status_code == 200:
+                    return upload_response.json()
+                if upload_response.status_code not in self.RETRY_STATUS_CODES or attempt >= self.MAX_RETRIES:
+                    upload_response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.MAX_RETRIES:
+                    raise
+
+            time.sleep(self.get_backoff(attempt, upload_response))
+            attempt += 1
 
-        headers = {
-            "Authorization": response["authorizationToken"],
-            "X-Bz-File-Name": name,
-            "Content-Type": "b2/x-auto",
-            "X-Bz-Content-Sha1": "do_not_verify",
-            "X-Bz-Info-src_last_modified_millis": "",
-        }
-
-        download_response = requests.post(url, headers=headers, data=content.read())
-
-        if download_response.status_code == 503:
-            attempts = 0
-            while attempts <= 3 and download_response.status_code == 503:
-                download_response = requests.post(
-                    url, headers=headers, data=content.read()
+    def start_large_file(self, name: str, content_type: str = "b2/x-auto") -> str:
+        response = self.api_post("/b2api/v2/b2_start_large_file", {
+            "bucketId": self.bucket_id,
+            "fileName": name,
+            "contentType": content_type,
+        })
+        return response["fileId"]
+
+    def get_upload_part_url(self, file_id: str) -> Dict[str, Any]:
+        return self.api_post("/b2api/v2/b2_get_upload_part_url", {"fileId": file_id})
+
+    def finish_large_file(self, file_id: str, part_sha1_array: List[str]) -> Dict[str, Any]:
+        return self.api_post("/b2api/v2/b2_finish_large_file", {
+            "fileId": file_id,
+            "partSha1Array": part_sha1_array,
+        })
+
+    def cancel_large_file(self, file_id: str) -> None:
+        try:
+            self.api_post("/b2api/v2/b2_cancel_large_file", {"fileId": file_id})
+        except requests.RequestException:
+            # Phần đã tải lên sẽ bị B2 dọn theo lifecycle rules của bucket
+            pass
+
+    def upload_part(self, file_id: str, part_number: int, data: bytes, sha1: str, upload_urls: threading.local):
+        """
+        Tải một phần của file lớn, thử lại với backoff. Mỗi luồng dùng URL tải lên riêng
+        (B2 không cho dùng chung URL giữa các luồng) và lấy URL mới sau mỗi lỗi.
+
+        Raises:
+            requests.HTTPError: Nếu vẫn lỗi sau MAX_RETRIES lần thử
+        """
+        attempt = 0
+        while True:
+            upload_url = getattr(upload_urls, "value", None)
+            if upload_url is None:
+                upload_url = upload_urls.value = self.get_upload_part_url(file_id)
+
+            headers = {
+                "Authorization": upload_url["authorizationToken"],
+                "X-Bz-Part-Number": str(part_number),
+                "X-Bz-Content-Sha1": sha1,
+            }
+
+            response = None
+            try:
+                response = requests.post(
+                    upload_url["uploadUrl"], headers=headers, data=data, timeout=self.REQUEST_TIMEOUT,
                 )
-                attempts += 1
-        if download_response.status_code != 200:
-            download_response.raise_for_status()
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code not in self.RETRY_STATUS_CODES or attempt >= self.MAX_RETRIES:
+                    response.raise_for_status()
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.MAX_RETRIES:
+                    raise
+
+            upload_urls.value = None
+            time.sleep(self.get_backoff(attempt, response))
+            attempt += 1
+
+    def upload_large_file(self, name, content, first_chunk: bytes = b""):
+        """
+        Tải file lớn theo từng phần PART_SIZE byte bằng UPLOAD_WORKERS luồng.
+
+        Luồng gọi đọc tuần tự từng phần và tính SHA1, các luồng trong pool tải lên song
+        song. Tối đa UPLOAD_WORKERS phần nằm trong bộ nhớ cùng lúc. Nếu một phần lỗi,
+        file lớn bị huỷ bằng b2_cancel_large_file và lỗi được ném lại.
+
+        Args:
+            name: Tên file trên B2
+            content: File nguồn (đã đọc `first_chunk` từ đầu file)
+            first_chunk: Dữ liệu đã đọc trước từ đầu file
+
+        Returns:
+            Dict: Kết quả của b2_finish_large_file (có fileName)
+        """
+        file_id = self.start_large_file(name)
+        upload_urls = threading.local()
+        slots = threading.BoundedSemaphore(self.UPLOAD_WORKERS)
+        failed = threading.Event()
+        sha1s: List[str] = []
+        futures = []
+
+        def upload(part_number, data, sha1):
+            try:
+                if failed.is_set():
+                    return None
+                return self.upload_part(file_id, part_number, data, sha1, upload_urls)
+            except BaseException:
+                failed.set()
+                raise
+            finally:
+                slots.release()
+
+        executor = ThreadPoolExecutor(max_workers=self.UPLOAD_WORKERS)
+        try:
+            buffer = first_chunk
+            part_number = 0
+            while True:
+                if len(buffer) < self.PART_SIZE:
+                    buffer += content.read(self.PART_SIZE - len(buffer)) or b""
+
+                data, buffer = buffer[:self.PART_SIZE], buffer[self.PART_SIZE:]
+                if not data:
+                    break
+
+                # Chờ có luồng rảnh trước khi đọc thêm, giới hạn bộ nhớ đang dùng
+                slots.acquire()
+                if failed.is_set():
+                    slots.release()
+                    break
+
+                part_number += 1
+                sha1 = hashlib.sha1(data).hexdigest()
+                sha1s.append(sha1)
+                futures.append(executor.submit(upload, part_number, data, sha1))
+
+            # Không có lỗi: chờ tất cả các phần; có lỗi: ném lại lỗi đầu tiên
+            done, _ = wait(futures, return_when=FIRST_EXCEPTION)
+            for future in done:
+                future.result()
+        except BaseException:
+            failed.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            self.cancel_large_file(file_id)
+            raise
 
-        return download_response.json()
+        executor.shutdown(wait=True)
+        return self.finish_large_file(file_id, sha1s)
 
     def get_file_info(self, name):
         headers = {"Authorization": self.authorization_token}
@@ -3,7 +3,10 @@ from django.contrib.auth.models import AnonymousUser
 from django.utils import timezone
 from django.db import models
 
+from typing import List, Sequence
+
 from utils.exception import MessageError
+from utils.response_cache import ResponseCache
 from constants.response_messages import ResponseMessage
 
 
@@ -27,7 +30,8 @@ class BaseModel(models.Model):
         """
 
         # Thiết lập thời gian sửa đổi
-        is_update = self.pk is not None
+        # Không dựa vào pk: pk có thể được cấp phát trước khi INSERT (IdAllocator)
+        is_update = not self._state.adding
         if is_update:
             self.updated_at = timezone.now()
 
@@ -49,6 +53,75 @@ class BaseModel(models.Model):
 
         super(BaseModel, self).save(*args, **kwargs)
 
+        # Làm mất hiệu lực các response đã cache của model
+        ResponseCache.invalidate(type(self))
+
+    @classmethod
+    def get_login_user(cls):
+        current_user = get_current_user()
+        if current_user and not isinstance(current_user, AnonymousUser):
+            return current_user
+        return None
+
+    @classmethod
+    def prepare_bulk_create(cls, instances: Sequence["BaseModel"]) -> None:
+        """
+        Chuẩn bị các instance trước khi bulk_create (thay cho phần xử lý trong save)
+
+        Args:
+            instances: Các instance chưa được lưu
+        """
+        current_user = cls.get_login_user()
+        if current_user is None or not hasattr(cls, "created_by"):
+            return
+
+        if not isinstance(current_user, cls._meta.get_field('created_by').related_model):
+            return
+
+        for instance in instances:
+            if instance.created_by_id is None:
+                instance.created_by = current_user
+
+    @classmethod
+    def prepare_bulk_update(cls, instances: Sequence["BaseModel"], fields: Sequence[str]) -> List[str]:
+        """
+        Chuẩn bị các instance trước khi bulk_update (thay cho phần xử lý trong save)
+
+        Args:
+            instances: Các instance đã được gán giá trị mới
+            fields: Các trường được cập nhật
+
+        Returns:
+            List[str]: Các trường cần cập nhật (gồm cả updated_at/updated_by)
+        """
+        fields = list(fields)
+        now = timezone.now()
+        for instance in instances:
+            instance.updated_at = now
+        if "updated_at" not in fields:
+            fields.append("updated_at")
+
+        current_user = cls.get_login_user()
+        if current_user is not None and hasattr(cls, "updated_by"):
+            if isinstance(current_user, cls._meta.get_field('updated_by').related_model):
+                for instance in instances:
+                    instance.updated_by = current_user
+                if "updated_by" not in fields:
+                    fields.append("updated_by")
+
+        return fields
+
+    @classmethod
+    def after_bulk_write(cls, instances: Sequence["BaseModel"], created: bool = False) -> None:
+        """
+        Xử lý sau khi bulk_create/bulk_update (thay cho phần xử lý sau save)
+
+        Args:
+            instances: Các instance đã được ghi
+            created: True nếu là bulk_create
+        """
+        ResponseCache.invalidate(cls)
+
 
 class BaseModelSoftDelete(BaseModel):
     is_delete = models.BooleanField(verbose_name="Đã xóa", default=False)
@@ -72,6 +145,7 @@ class BaseModelSoftDelete(BaseModel):
 
         if hard_delete:
             super(BaseModelSoftDelete, self).delete(using, keep_parents)
+            ResponseCache.invalidate(type(self))
             return
 
         if self.is_delete:
@@ -120,6 +194,49 @@ class BaseModelSoftDelete(BaseModel):
 
         super(BaseModelSoftDelete, self).save(*args, **kwargs)
 
+    @classmethod
+    def prepare_bulk_delete(cls, instances: Sequence["BaseModelSoftDelete"], delete_keys: Sequence[str] = ()) -> List[str]:
+        """
+        Đánh dấu xóa mềm các instance để lưu bằng bulk_update (giống delete)
+
+        Args:
+            instances: Các instance cần xóa
+            delete_keys: Các trường được gắn flag __deleted__<pk>
+
+        Returns:
+            List[str]: Các trường cần cập nhật
+
+        Raises:
+            MessageError: Nếu có object đã bị xóa
+        """
+        fields = ["is_delete", "deleted_at", *delete_keys]
+        now = timezone.now()
+
+        current_user = cls.get_login_user()
+        if current_user is not None and hasattr(cls, "deleted_by"):
+            if isinstance(current_user, cls._meta.get_field('deleted_by').related_model):
+                fields.append("deleted_by")
+            else:
+                current_user = None
+
+        for instance in instances:
+            if instance.is_delete:
+                raise MessageError(ResponseMessage.DELETED_ERROR)
+
+            instance.is_delete = True
+            instance.deleted_at = now
+
+            deleted_flag = f"__deleted__{instance.pk}"
+            for delete_key in delete_keys:
+                delete_key_value = getattr(instance, delete_key, None)
+                if delete_key_value and isinstance(delete_key_value, str) and not delete_key_value.endswith(deleted_flag):
+                    setattr(instance, delete_key, f"{delete_key_value}{deleted_flag}")
+
+            if "deleted_by" in fields:
+                instance.deleted_by = current_user
+
+        return fields
+
     @classmethod
     def all_objects(cls):
         """
@@ -1,9 +1,17 @@
 from django.apps import apps
-from django.db.models import QuerySet, Model, Q
+from django.db.models import QuerySet, Model, Q, UniqueConstraint
 from django.contrib.auth.models import AnonymousUser
 from django_currentuser.middleware import get_current_user
 
-from typing import TypeVar, Generic, Optional, Any, Type, List, Literal
+from asgiref.sync import sync_to_async
+
+from typing import TypeVar, Generic, Optional, Any, Type, List, Literal, Sequence, Dict, Union
+
+from collections import Counter
+
+from utils.search import SearchBackend, get_search_backend
+from utils.response_cache import ResponseCache
+from utils.exception import MessageError
 
 
 T = TypeVar("T", bound=Model)
@@ -18,6 +26,7 @@ class BaseService(Generic[T]):
     """
 
     model: Type[T] = None
+    bulk_batch_size: int = 500  # Số dòng mỗi câu lệnh INSERT/UPDATE khi ghi theo lô
 
     def __init__(self, model: Type[T] = None):
         """
@@ -39,16 +48,19 @@ class BaseService(Generic[T]):
         keyword: Optional[str] = None,
         prefetch_related: List[Any] = None,
         select_related: List[Any] = None,
+        only: List[str] = None,
         **kwargs,
     ) -> QuerySet[T]:
         """
         Truy vấn đối tượng với các tùy chọn tìm kiếm và lọc
 
         Args:
-            keyword: Từ khóa tìm kiếm
+            keyword: Từ khóa tìm kiếm (không phân biệt dấu, kết quả được xếp hạng)
+            only: Chỉ truy vấn các trường được chỉ định
             **kwargs: Các tham số lọc và sắp xếp
                 - order_by: Hướng sắp xếp ("asc" hoặc "desc")
-                - search_fields: Danh sách các trường cần tìm kiếm
+                - search_fields: Danh sách các trường cần tìm kiếm (mặc định
+                  là `search_index_fields` của model nếu có)
                 - Các tham số khác sẽ được sử dụng làm điều kiện lọc
 
         Returns:
@@ -63,6 +75,7 @@ class BaseService(Generic[T]):
             "limit",
             "prefetch_related",
             "select_related",
+            "only",
         ]
 
         # Xử lý các điều kiện lọc
@@ -74,19 +87,17 @@ class BaseService(Generic[T]):
             if value is not None:
                 q_filters &= Q(**{key: value})
 
-        # Xử lý tìm kiếm theo từ khóa
+        # Kiểm tra tham số tìm kiếm theo từ khóa
+        search_fields = kwargs.get("search_fields") or getattr(
+            self.model, "search_index_fields", []
+        )
         if keyword and keyword.strip():
             keyword = keyword.strip()
 
-            search_fields = kwargs.get("search_fields", [])
             if not search_fields:
                 raise ValueError("Cần chỉ định search_fields khi sử dụng keyword")
-
-            search_query = Q()
-            for field in search_fields:
-                search_query |= Q(**{f"{field}__icontains": keyword})
-
-            q_filters &= search_query
+        else:
+            keyword = None
 
         # Thực hiện truy vấn
         objects = self.get_queryset()
@@ -97,22 +108,49 @@ class BaseService(Generic[T]):
         if select_related:
             objects = objects.select_related(*select_related)
 
+        if only:
+            objects = objects.only(*only)
+
         objects = objects.filter(q_filters)
 
+        # Xử lý tìm kiếm theo từ khóa
+        ordering = []
+        if keyword:
+            objects = self.search(objects, keyword, search_fields)
+            ordering.append(f"-{SearchBackend.RANK_ANNOTATION}")
+
         # Xử lý sắp xếp
         order_by = str(kwargs.get("order_by") or "desc").lower()
         if order_by == "asc":
-            objects = objects.order_by("created_at")
+            ordering.append("created_at")
         else:
-            objects = objects.order_by("-created_at")
+            ordering.append("-created_at")
+
+        return objects.order_by(*ordering)
+
+    def search(
+        self, queryset: QuerySet[T], keyword: str, search_fields: Sequence[str]
+    ) -> QuerySet[T]:
+        """
+        Tìm kiếm theo từ khóa bằng backend phù hợp với CSDL (xem utils.search)
 
-        return objects
+        Args:
+            queryset: Queryset cần tìm kiếm
+            keyword: Từ khóa tìm kiếm
+            search_fields: Danh sách các trường cần tìm kiếm
+
+        Returns:
+            QuerySet[T]: Queryset đã lọc, có annotation `search_rank`
+        """
+        backend = get_search_backend(queryset, search_fields)
+        return backend.search(queryset, keyword, search_fields)
 
     def get_by_id(
         self,
         id: Any,
         prefetch_related: List[Any] = None,
         select_related: List[Any] = None,
+        only: List[str] = None,
         **kwargs,
     ) -> T:
         """
@@ -120,6 +158,7 @@ class BaseService(Generic[T]):
 
         Args:
             id: ID của đối tượng
+            only: Chỉ truy vấn các trường được chỉ định
             **kwargs: Các điều kiện lọc bổ sung
 
         Returns:
@@ -136,6 +175,9 @@ class BaseService(Generic[T]):
         if select_related:
             objects = objects.select_related(*select_related)
 
+        if only:
+            objects = objects.only(*only)
+
         return objects.get(pk=id, **kwargs)
 
     def get_by_filters(
@@ -231,6 +273,350 @@ class BaseService(Generic[T]):
         instance = self.get_by_id(id)
         self.delete(instance)
 
+    def bulk_create(self, objects: Sequence[Union[Dict[str, Any], T]]) -> List[T]:
+        """
+        Tạo mới nhiều đối tượng theo lô (không gọi save() của từng đối tượng)
+
+        created_by, search_text, mã... được gán bằng các hook bulk của model
+        (prepare_bulk_create/after_bulk_write).
+
+        Args:
+            objects: Danh sách dict dữ liệu hoặc instance chưa lưu
+
+        Returns:
+            List[T]: Các đối tượng đã được tạo
+
+        Raises:
+            MessageError: Nếu có giá trị bị trùng với trường unique
+        """
+        instances = [
+            item if isinstance(item, self.model) else self.model(**item) for item in objects
+        ]
+        if not instances:
+            return []
+
+        self.validate_bulk_unique(instances)
+
+        if hasattr(self.model, "prepare_bulk_create"):
+            self.model.prepare_bulk_create(instances)
+
+        instances = self.model._default_manager.bulk_create(
+            instances, batch_size=self.bulk_batch_size
+        )
+
+        self.after_bulk_write(instances, created=True)
+        return instances
+
+    def bulk_update(self, instances: Sequence[T], fields: Sequence[str]) -> List[T]:
+        """
+        Cập nhật nhiều đối tượng theo lô (không gọi save() của từng đối tượng)
+
+        Args:
+            instances: Các đối tượng đã được gán giá trị mới
+            fields: Các trường cần cập nhật
+
+        Returns:
+            List[T]: Các đối tượng đã được cập nhật
+
+        Raises:
+            MessageError: Nếu có giá trị bị trùng với trường unique
+        """
+        instances = list(instances)
+        if not instances or not fields:
+            return instances
+
+        self.validate_bulk_unique(instances, fields)
+
+        if hasattr(self.model, "prepare_bulk_update"):
+            fields = self.model.prepare_bulk_update(instances, fields)
+
+        self.model._default_manager.bulk_update(
+            instances, fields, batch_size=self.bulk_batch_size
+        )
+
+        self.after_bulk_write(instances)
+        return instances
+
+    def bulk_delete(self, ids: Sequence[Any]) -> int:
+        """
+        Xóa nhiều đối tượng theo ID (xóa mềm nếu model hỗ trợ)
+
+        Args:
+            ids: Danh sách ID cần xóa
+
+        Returns:
+            int: Số đối tượng đã xóa
+
+        Raises:
+            MessageError: Nếu có ID không tồn tại
+        """
+        instances = self.get_bulk_instances(ids)
+
+        if not hasattr(self.model, "prepare_bulk_delete"):
+            self.get_queryset().filter(pk__in=list(instances)).delete()
+            ResponseCache.invalidate(self.model)
+            return len(instances)
+
+        instances = list(instances.values())
+        fields = self.model.prepare_bulk_delete(instances)
+        self.model._default_manager.bulk_update(
+            instances, fields, batch_size=self.bulk_batch_size
+        )
+
+        self.after_bulk_write(instances)
+        return len(instances)
+
+    def get_bulk_instances(self, ids: Sequence[Any], **kwargs) -> Dict[Any, T]:
+        """
+        Lấy nhiều đối tượng theo ID bằng một truy vấn
+
+        Args:
+            ids: Danh sách ID
+            **kwargs: Tham số bổ sung cho QuerySet.in_bulk (ví dụ: field_name)
+
+        Returns:
+            Dict[Any, T]: Map pk -> đối tượng, theo thứ tự của `ids`
+
+        Raises:
+            MessageError: Nếu có ID không tồn tại
+        """
+        ids = list(dict.fromkeys(ids))
+        found = self.get_queryset().in_bulk(ids, **kwargs)
+
+        # in_bulk trả về key theo kiểu của cột, ID từ request có thể là chuỗi
+        pk_field = self.model._meta.pk
+        instances = {}
+        missing = []
+        for id in ids:
+            try:
+                key = pk_field.to_python(id)
+            except Exception:
+                key = id
+
+            if key in found:
+                instances[key] = found[key]
+            else:
+                missing.append(str(id))
+
+        if missing:
+            raise MessageError(f"Không tìm thấy dữ liệu: {', '.join(missing)}")
+
+        return instances
+
+    def after_bulk_write(self, instances: Sequence[T], created: bool = False) -> None:
+        if hasattr(self.model, "after_bulk_write"):
+            self.model.after_bulk_write(instances, created)
+        else:
+            ResponseCache.invalidate(self.model)
+
+    def get_unique_checks(self) -> List[tuple]:
+        """
+        Lấy các ràng buộc unique một trường của model (field.unique và UniqueConstraint)
+
+        Returns:
+            List[tuple]: Danh sách (field, điều kiện Q hoặc None)
+        """
+        opts = self.model._meta
+        checks = [
+            (field, None)
+            for field in opts.concrete_fields
+            if field.unique and not field.primary_key
+        ]
+
+        for constraint in opts.constraints:
+            if not isinstance(constraint, UniqueConstraint) or len(constraint.fields) != 1:
+                continue
+
+            field = opts.get_field(constraint.fields[0])
+            if not field.unique:
+                checks.append((field, constraint.condition))
+
+        return checks
+
+    def validate_bulk_unique(self, instances: Sequence[T], fields: Optional[Sequence[str]] = None) -> None:
+        """
+        Kiểm tra trùng lặp của các trường unique cho cả lô (mỗi ràng buộc một truy vấn)
+        thay cho UniqueValidator của từng dòng
+
+        Args:
+            instances: Các đối tượng cần ghi
+            fields: Chỉ kiểm tra các trường này (None: tất cả)
+
+        Raises:
+            MessageError: Nếu giá trị bị trùng trong lô hoặc đã tồn tại
+        """
+        pks = [instance.pk for instance in instances if instance.pk is not None]
+
+        for field, condition in self.get_unique_checks():
+            if fields is not None and field.name not in fields and field.attname not in fields:
+                continue
+
+            values = [getattr(instance, field.attname) for instance in instances]
+            values = [value for value in values if value not in (None, "")]
+            if not values:
+                continue
+
+            duplicates = {value for value, count in Counter(values).items() if count > 1}
+
+            queryset = self.model._base_manager.filter(**{f"{field.attname}__in": values})
+            if condition is not None:
+                queryset = queryset.filter(condition)
+            if pks:
+                queryset = queryset.exclude(pk__in=pks)
+            duplicates.update(queryset.values_list(field.attname, flat=True))
+
+            if duplicates:
+                raise MessageError(
+                    f"{field.verbose_name} đã tồn tại: {', '.join(sorted(map(str, duplicates)))}"
+                )
+
+    async def aget_objects(self, keyword: Optional[str] = None, **kwargs) -> QuerySet[T]:
+        """
+        Phiên bản async của `get_objects`
+
+        Queryset trả về chưa được thực thi, dùng `async for` hoặc các phương thức
+        async của QuerySet (acount, afirst, ...) để truy vấn mà không chiếm thread.
+
+        Args:
+            keyword: Từ khóa tìm kiếm
+            **kwargs: Các tham số giống `get_objects`
+
+        Returns:
+            QuerySet[T]: Danh sách đối tượng phù hợp
+        """
+        # Backend tìm kiếm có thể kiểm tra cấu trúc CSDL (chỉ một lần mỗi tiến trình)
+        if keyword and keyword.strip():
+            return await sync_to_async(self.get_objects)(keyword, **kwargs)
+
+        return self.get_objects(keyword, **kwargs)
+
+    async def aget_by_id(
+        self,
+        id: Any,
+        prefetch_related: List[Any] = None,
+        select_related: List[Any] = None,
+        only: List[str] = None,
+        **kwargs,
+    ) -> T:
+        """
+        Phiên bản async của `get_by_id`
+
+        Args:
+            id: ID của đối tượng
+            only: Chỉ truy vấn các trường được chỉ định
+            **kwargs: Các điều kiện lọc bổ sung
+
+        Returns:
+            T: Đối tượng được tìm thấy
+
+        Raises:
+            model.DoesNotExist: Nếu không tìm thấy đối tượng
+        """
+        objects = self.get_queryset()
+
+        if prefetch_related:
+            objects = objects.prefetch_related(*prefetch_related)
+
+        if select_related:
+            objects = objects.select_related(*select_related)
+
+        if only:
+            objects = objects.only(*only)
+
+        return await objects.aget(pk=id, **kwargs)
+
+    async def aget_by_filters(
+        self,
+        prefetch_related: List[Any] = None,
+        select_related: List[Any] = None,
+        **kwargs,
+    ) -> T:
+        """
+        Phiên bản async của `get_by_filters`
+
+        Args:
+            **kwargs: Các điều kiện lọc
+
+        Returns:
+            T: Đối tượng được tìm thấy
+
+        Raises:
+            model.DoesNotExist: Nếu không tìm thấy đối tượng
+        """
+        objects = self.get_queryset()
+
+        if prefetch_related:
+            objects = objects.prefetch_related(*prefetch_related)
+
+        if select_related:
+            objects = objects.select_related(*select_related)
+
+        return await objects.aget(**kwargs)
+
+    async def aexists(self, **kwargs) -> bool:
+        """
+        Phiên bản async của `exists`
+
+        Args:
+            **kwargs: Các điều kiện lọc
+
+        Returns:
+            bool: True nếu đối tượng tồn tại, ngược lại False
+        """
+        return await self.get_queryset().filter(**kwargs).aexists()
+
+    async def acreate(self, **kwargs) -> T:
+        """
+        Phiên bản async của `create`
+
+        Args:
+            **kwargs: Các tham số cho đối tượng mới
+
+        Returns:
+            T: Đối tượng đã được tạo
+        """
+        return await self.get_queryset().acreate(**kwargs)
+
+    async def aupdate(self, instance: T, **kwargs) -> T:
+        """
+        Phiên bản async của `update`
+
+        Args:
+            instance: Đối tượng cần cập nhật
+            **kwargs: Các tham số cần cập nhật
+
+        Returns:
+            T: Đối tượng đã được cập nhật
+        """
+        for key, value in kwargs.items():
+            if hasattr(instance, key):
+                setattr(instance, key, value)
+
+        await instance.asave()
+        return instance
+
+    async def adelete(self, instance: T) -> None:
+        """
+        Phiên bản async của `delete`
+
+        Args:
+            instance: Đối tượng cần xóa
+        """
+        await instance.adelete()
+
+    async def adelete_by_id(self, id: Any) -> None:
+        """
+        Phiên bản async của `delete_by_id`
+
+        Args:
+            id: ID của đối tượng cần xóa
+
+        Raises:
+            model.DoesNotExist: Nếu không tìm thấy đối tượng
+        """
+        instance = await self.aget_by_id(id)
+        await self.adelete(instance)
+
     @property
     def current_user(self) -> Optional[Any]:
         """
@@ -0,0 +1,57 @@
+from typing import Iterable
+
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Bloom filter đơn giản dựa trên bytearray và double hashing (blake2b).
+
+    Không có false negative: nếu `key in bloom` trả về False thì key chắc chắn
+    chưa được thêm. Khi trả về True, cần kiểm tra lại ở nguồn dữ liệu thật.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.01):
+        """
+        Args:
+            capacity: Số phần tử dự kiến
+            error_rate: Tỉ lệ false positive mong muốn khi đạt capacity
+
+        Raises:
+            ValueError: Nếu capacity hoặc error_rate không hợp lệ
+        """
+        if capacity < 1:
+            raise ValueError("capacity phải ít nhất là 1")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate phải nằm trong khoảng (0, 1)")
+
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self.add(key)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,255 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.query import QuerySet
+from django.db.models import Model
+
+from rest_framework.relations import PrimaryKeyRelatedField, PKOnlyObject
+from rest_framework.fields import SkipField
+from rest_framework import serializers
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import operator
+
+
+class CompiledModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer bật chế độ serialize đã biên dịch cho các response dạng danh sách.
+
+    Khi được dùng làm response serializer của action `list`, Paginator sẽ dùng
+    CompiledSerializer thay vì gọi `to_representation` của DRF trên từng trường.
+    Ở các chỗ khác, serializer hoạt động như ModelSerializer bình thường.
+    """
+
+
+class CompiledSerializer:
+    """
+    Biên dịch các trường của một ModelSerializer thành hàm chuyển một dòng dữ liệu
+    thành dict.
+
+    - Trường trỏ thẳng tới một cột của model (kể cả khóa ngoại trả về pk) được đọc
+      bằng `values_list()` và chuyển đổi bằng hàm đã tính trước.
+    - Các trường không biên dịch được (SerializerMethodField, serializer lồng nhau,
+      source="*", source nhiều cấp, ...) được xử lý bằng DRF như bình thường; khi đó
+      dữ liệu được đọc từ model instance thay vì `values_list()`.
+
+    Bản biên dịch chỉ chứa kế hoạch (cột, tên trường) và mã đã biên dịch, dùng chung
+    giữa các request; hàm chuyển đổi được lấy từ serializer của request hiện tại ở mỗi
+    lần serialize nên `context` (request, URL file, ...) không bị giữ lại giữa các request.
+    """
+
+    # Hàm chuyển đổi nhanh cho các kiểu trường phổ biến (thay cho to_representation)
+    FAST_CONVERTERS: Dict[Type[serializers.Field], Optional[Callable[[Any], Any]]] = {
+        serializers.CharField: str,
+        serializers.IntegerField: int,
+        serializers.BooleanField: bool,
+        serializers.ReadOnlyField: None,
+    }
+
+    # Cache kế hoạch và mã đã biên dịch theo (lớp serializer, danh sách trường)
+    _cache: Dict[Tuple[type, Tuple[str, ...]], "CompiledSerializer"] = {}
+
+    _SKIP = object()
+
+    def __init__(self, serializer: serializers.ModelSerializer):
+        """
+        Biên dịch một serializer (đã bind các trường, có thể đã bị lọc bởi ?fields=).
+        Không giữ tham chiếu tới serializer hay các trường của nó.
+
+        Args:
+            serializer: Instance ModelSerializer
+        """
+        self.model = serializer.Meta.model
+        self.field_names: List[str] = []
+        self.columns: List[str] = []
+        self.fallback_names: List[str] = []
+
+        # Tên trường và hàm lấy converter từ trường đã bind của từng cột
+        self.converter_getters: List[Tuple[str, Callable[[serializers.Field], Optional[Callable]]]] = []
+        expressions: List[str] = []
+
+        for field in serializer._readable_fields:
+            self.field_names.append(field.field_name)
+
+            compiled = self.compile_field(field)
+            if compiled is None:
+                expressions.append(f"_fallback[{len(self.fallback_names)}](obj)")
+                self.fallback_names.append(field.field_name)
+                continue
+
+            column, get_converter = compiled
+            index = len(self.columns)
+            self.columns.append(column)
+            self.converter_getters.append((field.field_name, get_converter))
+
+            if get_converter(field) is None:
+                expressions.append(f"row[{index}]")
+            else:
+                expressions.append(
+                    f"(None if row[{index}] is None else _convert[{index}](row[{index}]))"
+                )
+
+        body = ", ".join(
+            f"{name!r}: {expression}"
+            for name, expression in zip(self.field_names, expressions)
+        )
+        source = f"def to_representation(row, obj, _convert, _fallback):\n    return {{{body}}}\n"
+
+        namespace: Dict[str, Any] = {}
+        exec(compile(source, f"<compiled {type(serializer).__name__}>", "exec"), namespace)
+        self._to_representation = namespace["to_representation"]
+
+        getter = operator.attrgetter(*self.columns) if self.columns else None
+        if getter is not None and len(self.columns) == 1:
+            self._instance_row = lambda instance: (getter(instance),)
+        elif getter is not None:
+            self._instance_row = getter
+        else:
+            self._instance_row = lambda instance: ()
+
+    @classmethod
+    def from_serializer(cls, serializer: Any) -> Optional["CompiledSerializer"]:
+        """
+        Lấy bản biên dịch (có cache) của serializer nếu serializer bật chế độ biên dịch.
+
+        Args:
+            serializer: Instance serializer (không phải many=True)
+
+        Returns:
+            Optional[CompiledSerializer]: Bản biên dịch hoặc None
+        """
+        if not isinstance(serializer, CompiledModelSerializer):
+            return None
+
+        key = (type(serializer), tuple(serializer.fields))
+        if key not in cls._cache:
+            cls._cache[key] = cls(serializer)
+        return cls._cache[key]
+
+    def compile_field(
+        self, field: serializers.Field
+    ) -> Optional[Tuple[str, Callable[[serializers.Field], Optional[Callable]]]]:
+        """
+        Biên dịch một trường thành (tên cột/attname, hàm lấy converter từ trường đã bind).
+
+        Args:
+            field: Trường DRF đã bind
+
+        Returns:
+            Optional[Tuple[str, Callable]]: None nếu không biên dịch được
+        """
+        if len(field.source_attrs) != 1:
+            return None
+
+        try:
+            model_field = self.model._meta.get_field(field.source_attrs[0])
+        except FieldDoesNotExist:
+            return None
+
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+
+        # Khóa ngoại trả về pk: đọc trực tiếp cột <field>_id
+        if isinstance(field, PrimaryKeyRelatedField):
+            if not field.use_pk_only_optimization() or not model_field.many_to_one:
+                return None
+            return model_field.attname, self.get_pk_converter
+
+        if model_field.is_relation or isinstance(field, (serializers.Serializer, serializers.RelatedField)):
+            return None
+
+        if type(field) in self.FAST_CONVERTERS:
+            fast_converter = self.FAST_CONVERTERS[type(field)]
+            return model_field.attname, lambda bound_field: fast_converter
+        return model_field.attname, self.get_field_converter
+
+    @staticmethod
+    def get_pk_converter(field: serializers.Field) -> Optional[Callable]:
+        return field.pk_field.to_representation if field.pk_field else None
+
+    @staticmethod
+    def get_field_converter(field: serializers.Field) -> Optional[Callable]:
+        return field.to_representation
+
+    @property
+    def values_only(self) -> bool:
+        """
+        Tất cả các trường đều được biên dịch, có thể dùng `values_list()`.
+        """
+        return not self.fallback_names
+
+    def prepare(self, object_list: Any) -> Any:
+        """
+        Chuyển queryset sang `values_list()` nếu tất cả các trường đều được biên dịch.
+
+        Args:
+            object_list: Queryset hoặc danh sách
+
+        Returns:
+            Queryset values_list hoặc giữ nguyên
+        """
+        if (
+            self.values_only
+            and isinstance(object_list, QuerySet)
+            and object_list.model is self.model
+            and object_list._fields is None
+        ):
+            return object_list.values_list(*self.columns)
+        return object_list
+
+    def serialize(
+        self, objects: Sequence[Any], serializer: serializers.ModelSerializer
+    ) -> List[Dict[str, Any]]:
+        """
+        Serialize danh sách dòng (từ `prepare`) hoặc model instance.
+
+        Args:
+            objects: Các dòng `values_list()` hoặc model instance
+            serializer: Instance serializer của request hiện tại, cung cấp hàm chuyển
+                đổi và các trường không biên dịch được
+
+        Returns:
+            List[Dict]: Dữ liệu đã serialize
+        """
+        to_representation = self._to_representation
+        fields = serializer.fields
+        convert = [get_converter(fields[name]) for name, get_converter in self.converter_getters]
+
+        if not objects or not isinstance(objects[0], Model):
+            return [to_representation(row, None, convert, ()) for row in objects]
+
+        fallback = [self.fallback(fields[name]) for name in self.fallback_names]
+        instance_row = self._instance_row
+        results = [to_representation(instance_row(obj), obj, convert, fallback) for obj in objects]
+
+        if fallback:
+            skip = self._SKIP
+            results = [
+                {key: value for key, value in item.items() if value is not skip}
+                for item in results
+            ]
+        return results
+
+    def fallback(self, field: serializers.Field) -> Callable[[Any], Any]:
+        """
+        Tạo hàm serialize một trường bằng DRF (giống Serializer.to_representation).
+
+        Args:
+            field: Trường DRF đã bind
+
+        Returns:
+            Callable: Hàm nhận model instance và trả về giá trị đã serialize
+        """
+        skip = self._SKIP
+
+        def represent(instance: Any) -> Any:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                return skip
+
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            if check_for_none is None:
+                return None
+            return field.to_representation(attribute)
+
+        return represent
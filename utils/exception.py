@@ -34,6 +34,7 @@ from rest_framework.exceptions import (
 from rest_framework.views import exception_handler
 
 from typing import Union, Dict, Any
+from collections.abc import Mapping
 import logging
 import traceback
 import json
@@ -51,6 +52,9 @@ from helpers import bigger, get_client_ip
 logger = logging.getLogger("django.exception")
 request_logger = logging.getLogger("django.request")
 
+# Các trường không được đưa vào thông tin debug của response lỗi
+SENSITIVE_FIELDS = ("password", "token", "access_token", "refresh_token")
+
 
 class MessageError(APIException):
     """
@@ -294,6 +298,25 @@ def get_simplified_traceback(limit: int = 8) -> str:
     return "".join(simplified_lines).strip()
 
 
+def hide_sensitive(item: Any) -> Any:
+    """
+    Ẩn giá trị của các trường nhạy cảm trong dữ liệu request
+
+    Args:
+        item: Dữ liệu của một bản ghi trong request
+
+    Returns:
+        Any: Bản sao với các trường nhạy cảm đã được ẩn
+    """
+    if not isinstance(item, Mapping):
+        return item
+    item = dict(item)
+    for field in SENSITIVE_FIELDS:
+        if field in item:
+            item[field] = "***HIDDEN***"
+    return item
+
+
 def get_meaningful_traceback(simplified_traceback, initial_slice=10):
     """
     Lấy phần traceback có ý nghĩa
@@ -511,13 +534,13 @@ def ExceptionHandler(exc, context):
 
             # Thêm body data nếu an toàn (không chứa mật khẩu)
             if hasattr(request, "data"):
-                data = dict(request.data)
-                # Lọc bỏ các thông tin nhạy cảm
-                if "password" in data:
-                    data["password"] = "***HIDDEN***"
-                if "token" in data:
-                    data["token"] = "***HIDDEN***"
-                request_info["data"] = data
+
+                # Request ghi theo lô gửi lên một danh sách
+                data = request.data
+                if isinstance(data, list):
+                    request_info["data"] = [hide_sensitive(item) for item in data]
+                else:
+                    request_info["data"] = hide_sensitive(data)
 
         if response_kwargs["errors"] is None:
             response_kwargs["errors"] = {}
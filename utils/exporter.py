@@ -0,0 +1,228 @@
+from django.http import StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from django.forms.models import model_to_dict
+from django.db.models.query import QuerySet
+from django.db.models import Model
+
+from rest_framework.request import Request
+
+from typing import Union, List, Dict, Any, Optional, Callable, Iterator, Iterable, TypeVar, Generic
+
+import itertools
+import json
+import csv
+
+from utils.exception import MessageError
+
+
+T = TypeVar("T")
+
+
+class _EchoBuffer:
+    """
+    Buffer giả cho csv.writer, trả về ngay chuỗi được ghi thay vì lưu lại.
+    """
+
+    def write(self, value: str) -> str:
+        return value
+
+
+class QuerySetExporter(Generic[T]):
+    """
+    Lớp xuất dữ liệu dạng stream (NDJSON hoặc CSV) cho QuerySet hoặc danh sách.
+
+    Dữ liệu được đọc theo từng chunk bằng `iterator(chunk_size=...)` (server-side
+    cursor trên PostgreSQL) và serialize theo từng chunk, nên bộ nhớ sử dụng
+    không phụ thuộc vào tổng số dòng được xuất.
+    """
+
+    FORMAT_NDJSON = "ndjson"
+    FORMAT_CSV = "csv"
+    FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+
+    CONTENT_TYPES = {
+        FORMAT_NDJSON: "application/x-ndjson; charset=utf-8",
+        FORMAT_CSV: "text/csv; charset=utf-8",
+    }
+
+    DEFAULT_FORMAT = FORMAT_NDJSON
+    DEFAULT_CHUNK_SIZE = 2000
+    MAX_CHUNK_SIZE = 10000
+
+    def __init__(
+        self,
+        object_list: Union[List[T], QuerySet],
+        serializer_class: Optional[Callable] = None,
+        serializer_kwargs: Optional[Dict[str, Any]] = None,
+        export_format: str = DEFAULT_FORMAT,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Khởi tạo một instance QuerySetExporter mới.
+
+        Tham số:
+            object_list: Danh sách hoặc queryset cần xuất
+            serializer_class: Lớp serializer dùng cho từng chunk (tùy chọn)
+            serializer_kwargs: Tham số bổ sung truyền vào serializer (ví dụ: context)
+            export_format: Định dạng xuất ("ndjson" hoặc "csv")
+            chunk_size: Số dòng đọc và serialize mỗi lần
+
+        Raises:
+            ValueError: Nếu định dạng không hợp lệ hoặc chunk_size nhỏ hơn 1
+        """
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Định dạng xuất không hợp lệ: {export_format}")
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size phải ít nhất là 1")
+
+        self._object_list = object_list
+        self.serializer_class = serializer_class
+        self.serializer_kwargs = serializer_kwargs or {}
+        self.export_format = export_format
+        self.chunk_size = min(chunk_size, self.MAX_CHUNK_SIZE)
+
+    @classmethod
+    def from_request(cls, request: Request, key: str = "export_format") -> str:
+        """
+        Trích xuất định dạng xuất từ request.
+
+        Không dùng `?format=` vì tham số này được DRF dành cho content negotiation.
+
+        Tham số:
+            request: Đối tượng Request của DRF
+            key: Tên tham số chứa định dạng
+
+        Trả về:
+            str: Định dạng xuất
+
+        Raises:
+            MessageError: Nếu định dạng không được hỗ trợ
+        """
+        export_format = str(request.query_params.get(key) or cls.DEFAULT_FORMAT).lower()
+
+        if export_format not in cls.FORMATS:
+            raise MessageError(f"Định dạng xuất không được hỗ trợ: {export_format}")
+
+        return export_format
+
+    def iter_objects(self) -> Iterator[T]:
+        """
+        Duyệt từng đối tượng mà không nạp toàn bộ queryset vào bộ nhớ.
+
+        Trả về:
+            Iterator: Các đối tượng cần xuất
+        """
+        if isinstance(self._object_list, QuerySet):
+            return self._object_list.iterator(chunk_size=self.chunk_size)
+
+        return iter(self._object_list)
+
+    def iter_chunks(self) -> Iterator[List[T]]:
+        """
+        Gom các đối tượng thành từng chunk có kích thước chunk_size.
+
+        Trả về:
+            Iterator[List]: Các chunk đối tượng
+        """
+        objects = self.iter_objects()
+
+        while True:
+            chunk = list(itertools.islice(objects, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def serialize_chunk(self, chunk: List[T]) -> Iterable[Dict[str, Any]]:
+        """
+        Serialize một chunk đối tượng thành danh sách dict.
+
+        Tham số:
+            chunk: Các đối tượng cần serialize
+
+        Trả về:
+            Iterable[Dict]: Các dòng dữ liệu
+        """
+        if self.serializer_class is not None:
+            return self.serializer_class(chunk, many=True, **self.serializer_kwargs).data
+
+        return [
+            model_to_dict(item) if isinstance(item, Model) else item for item in chunk
+        ]
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """
+        Duyệt từng dòng dữ liệu đã được serialize.
+
+        Trả về:
+            Iterator[Dict]: Các dòng dữ liệu
+        """
+        for chunk in self.iter_chunks():
+            yield from self.serialize_chunk(chunk)
+
+    def iter_ndjson(self) -> Iterator[str]:
+        """
+        Sinh dữ liệu dạng NDJSON, mỗi dòng là một đối tượng JSON.
+
+        Trả về:
+            Iterator[str]: Các dòng NDJSON
+        """
+        for row in self.iter_rows():
+            yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n"
+
+    def iter_csv(self) -> Iterator[str]:
+        """
+        Sinh dữ liệu dạng CSV, header lấy từ các khóa của dòng đầu tiên.
+
+        Giá trị lồng nhau (dict, list) được ghi dưới dạng chuỗi JSON.
+
+        Trả về:
+            Iterator[str]: Các dòng CSV
+        """
+        writer = csv.writer(_EchoBuffer())
+        header = None
+
+        for row in self.iter_rows():
+            if header is None:
+                header = list(row.keys())
+                # BOM để Excel nhận đúng UTF-8 (tiếng Việt)
+                yield "\ufeff" + writer.writerow(header)
+
+            values = []
+            for key in header:
+                value = row.get(key)
+                if isinstance(value, (dict, list)):
+                    value = json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+                values.append("" if value is None else value)
+
+            yield writer.writerow(values)
+
+    def stream(self) -> Iterator[str]:
+        """
+        Lấy generator dữ liệu theo định dạng đã chọn.
+
+        Trả về:
+            Iterator[str]: Dữ liệu đã được định dạng
+        """
+        if self.export_format == self.FORMAT_CSV:
+            return self.iter_csv()
+        return self.iter_ndjson()
+
+    def response(self, filename: str = "export") -> StreamingHttpResponse:
+        """
+        Tạo StreamingHttpResponse cho dữ liệu xuất.
+
+        Tham số:
+            filename: Tên file (không gồm phần mở rộng)
+
+        Trả về:
+            StreamingHttpResponse: Response dạng stream
+        """
+        response = StreamingHttpResponse(
+            self.stream(), content_type=self.CONTENT_TYPES[self.export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{self.export_format}"'
+        )
+        response["X-Accel-Buffering"] = "no"
+        return response
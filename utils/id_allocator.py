@@ -0,0 +1,111 @@
+from django.db import connections, router
+from django.db.models import Model
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Type
+
+import os
+import threading
+
+
+class IdAllocator:
+    """
+    Cấp phát trước khóa chính từ sequence của CSDL (PostgreSQL).
+
+    Dùng khi một cột phải được tính từ khóa chính ngay lúc INSERT (ví dụ mã
+    `{prefix}{YYYYMMDD}{pk}`), tránh phải UPDATE lại sau khi tạo.
+
+    - `next_id` lấy id từ một block được giữ trong tiến trình (mỗi lần lấy
+      BLOCK_SIZE id bằng một truy vấn `nextval`).
+    - `reserve` lấy ngay nhiều id bằng một truy vấn (dùng cho bulk_create).
+
+    Id đã lấy nhưng không dùng (tiến trình dừng, transaction rollback) để lại
+    khoảng trống trong dãy id, giống như sequence thông thường.
+
+    Chỉ hỗ trợ PostgreSQL (xem `supports`). Với CSDL khác (SQLite khi phát triển,
+    MySQL) model vẫn INSERT rồi UPDATE lại cột phụ thuộc pk như trước. Không dùng
+    bảng đếm thay cho sequence: `nextval` không thuộc transaction nên block id được
+    giữ an toàn trong tiến trình, còn bảng đếm phải khóa dòng tới khi transaction
+    của request kết thúc (tuần tự hóa mọi lần tạo bản ghi của model) và thêm một
+    UPDATE + SELECT cho mỗi bản ghi, không ít câu lệnh ghi hơn cách INSERT rồi UPDATE.
+    """
+
+    BLOCK_SIZE = 20
+    AUTO_FIELDS = ("AutoField", "BigAutoField", "SmallAutoField")
+
+    _pools: Dict[Tuple[str, str], Deque[int]] = {}
+    _pid: Optional[int] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_alias(cls, model: Type[Model], using: Optional[str] = None) -> str:
+        return using or router.db_for_write(model)
+
+    @classmethod
+    def supports(cls, model: Type[Model], using: Optional[str] = None) -> bool:
+        """
+        Kiểm tra model có thể cấp phát id trước không.
+
+        Args:
+            model: Lớp model
+            using: Alias CSDL
+
+        Returns:
+            bool: True nếu CSDL là PostgreSQL và khóa chính là AutoField; False với
+            CSDL khác (người gọi phải tự cập nhật cột phụ thuộc pk sau khi INSERT)
+        """
+        connection = connections[cls.get_alias(model, using)]
+        return (
+            connection.vendor == "postgresql"
+            and model._meta.pk.get_internal_type() in cls.AUTO_FIELDS
+        )
+
+    @classmethod
+    def reserve(cls, model: Type[Model], count: int, using: Optional[str] = None) -> List[int]:
+        """
+        Lấy `count` id từ sequence của khóa chính bằng một truy vấn.
+
+        Args:
+            model: Lớp model
+            count: Số id cần lấy
+            using: Alias CSDL
+
+        Returns:
+            List[int]: Các id đã được cấp phát (tăng dần)
+        """
+        if count < 1:
+            return []
+
+        opts = model._meta
+        with connections[cls.get_alias(model, using)].cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(pg_get_serial_sequence(%s, %s)) FROM generate_series(1, %s)",
+                [opts.db_table, opts.pk.column, count],
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+
+    @classmethod
+    def next_id(cls, model: Type[Model], using: Optional[str] = None) -> int:
+        """
+        Lấy một id từ block của tiến trình, cấp phát block mới khi hết.
+
+        Args:
+            model: Lớp model
+            using: Alias CSDL
+
+        Returns:
+            int: Id chưa được sử dụng
+        """
+        alias = cls.get_alias(model, using)
+        key = (alias, model._meta.db_table)
+
+        with cls._lock:
+            # Block không được dùng chung giữa các tiến trình sau khi fork
+            if cls._pid != os.getpid():
+                cls._pools = {}
+                cls._pid = os.getpid()
+
+            pool = cls._pools.setdefault(key, deque())
+            if not pool:
+                pool.extend(cls.reserve(model, cls.BLOCK_SIZE, alias))
+            return pool.popleft()
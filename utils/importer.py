@@ -0,0 +1,184 @@
+from typing import Any, Dict, IO, Iterator, List, NamedTuple, Optional
+
+import codecs
+import itertools
+import json
+import csv
+import os
+
+
+class ImportRow(NamedTuple):
+    """
+    Một dòng dữ liệu nhập: số dòng trong file, dữ liệu (None nếu lỗi) và lỗi đọc.
+    """
+
+    line: int
+    data: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+
+
+class StreamRowReader:
+    """
+    Lớp đọc dữ liệu nhập dạng stream (NDJSON hoặc CSV), đối xứng với QuerySetExporter.
+
+    File được đọc từng dòng và gom thành từng lô `batch_size` dòng, nên bộ nhớ sử
+    dụng không phụ thuộc vào kích thước file. Dòng không đọc được không làm dừng
+    việc đọc mà được trả về kèm lỗi.
+    """
+
+    FORMAT_NDJSON = "ndjson"
+    FORMAT_CSV = "csv"
+    FORMATS = (FORMAT_NDJSON, FORMAT_CSV)
+
+    EXTENSIONS = {
+        ".ndjson": FORMAT_NDJSON,
+        ".jsonl": FORMAT_NDJSON,
+        ".csv": FORMAT_CSV,
+    }
+
+    DEFAULT_BATCH_SIZE = 1000
+    MAX_BATCH_SIZE = 10000
+
+    def __init__(
+        self,
+        stream: IO,
+        import_format: str = FORMAT_CSV,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        encoding: str = "utf-8-sig",
+    ):
+        """
+        Khởi tạo một instance StreamRowReader mới.
+
+        Tham số:
+            stream: File (văn bản hoặc nhị phân, ví dụ UploadedFile) cần đọc
+            import_format: Định dạng ("ndjson" hoặc "csv")
+            batch_size: Số dòng mỗi lô
+            encoding: Bảng mã khi stream là nhị phân (mặc định bỏ qua BOM của Excel)
+
+        Raises:
+            ValueError: Nếu định dạng không hợp lệ hoặc batch_size nhỏ hơn 1
+        """
+        if import_format not in self.FORMATS:
+            raise ValueError(f"Định dạng nhập không hợp lệ: {import_format}")
+
+        if batch_size < 1:
+            raise ValueError("batch_size phải ít nhất là 1")
+
+        self.stream = stream
+        self.import_format = import_format
+        self.batch_size = min(batch_size, self.MAX_BATCH_SIZE)
+        self.encoding = encoding
+
+    @classmethod
+    def from_filename(cls, filename: str, default: Optional[str] = None) -> str:
+        """
+        Xác định định dạng từ phần mở rộng của tên file.
+
+        Tham số:
+            filename: Tên file
+            default: Định dạng mặc định nếu không nhận ra phần mở rộng
+
+        Trả về:
+            str: Định dạng nhập
+
+        Raises:
+            ValueError: Nếu không xác định được định dạng
+        """
+        extension = os.path.splitext(filename or "")[1].lower()
+        import_format = cls.EXTENSIONS.get(extension, default)
+
+        if import_format not in cls.FORMATS:
+            raise ValueError(f"Định dạng nhập không được hỗ trợ: {filename}")
+
+        return import_format
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Duyệt từng dòng văn bản, giải mã dần nếu stream là nhị phân.
+
+        Trả về:
+            Iterator[str]: Các dòng văn bản
+        """
+        decoder = None
+        for line in self.stream:
+            if isinstance(line, bytes):
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+                line = decoder.decode(line)
+            yield line
+
+    def iter_ndjson(self) -> Iterator[ImportRow]:
+        """
+        Đọc NDJSON, mỗi dòng là một đối tượng JSON (bỏ qua dòng trống).
+
+        Trả về:
+            Iterator[ImportRow]: Các dòng dữ liệu
+        """
+        for line_number, line in enumerate(self.iter_lines(), start=1):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                data = json.loads(line)
+            except ValueError as e:
+                yield ImportRow(line_number, None, f"JSON không hợp lệ: {e}")
+                continue
+
+            if not isinstance(data, dict):
+                yield ImportRow(line_number, None, "Mỗi dòng phải là một đối tượng JSON")
+                continue
+
+            yield ImportRow(line_number, data)
+
+    def iter_csv(self) -> Iterator[ImportRow]:
+        """
+        Đọc CSV, header lấy từ dòng đầu tiên (bỏ qua dòng trống).
+
+        Trả về:
+            Iterator[ImportRow]: Các dòng dữ liệu
+        """
+        reader = csv.DictReader(self.iter_lines())
+        while True:
+            try:
+                data = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield ImportRow(reader.line_num, None, f"CSV không hợp lệ: {e}")
+                continue
+
+            if None in data:
+                yield ImportRow(reader.line_num, None, "Dòng có nhiều cột hơn header")
+                continue
+
+            yield ImportRow(reader.line_num, {
+                (key or "").strip(): value.strip() if isinstance(value, str) else value
+                for key, value in data.items()
+            })
+
+    def iter_rows(self) -> Iterator[ImportRow]:
+        """
+        Duyệt từng dòng dữ liệu theo định dạng đã chọn.
+
+        Trả về:
+            Iterator[ImportRow]: Các dòng dữ liệu
+        """
+        if self.import_format == self.FORMAT_NDJSON:
+            return self.iter_ndjson()
+        return self.iter_csv()
+
+    def iter_batches(self) -> Iterator[List[ImportRow]]:
+        """
+        Gom các dòng thành từng lô có kích thước batch_size.
+
+        Trả về:
+            Iterator[List[ImportRow]]: Các lô dữ liệu
+        """
+        rows = self.iter_rows()
+
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                return
+            yield batch
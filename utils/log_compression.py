@@ -0,0 +1,112 @@
+from typing import IO, Optional
+
+import shutil
+import gzip
+import os
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class LogCompression:
+    """
+    Nén/đọc file log đã xoay vòng (gzip hoặc zstd), luôn xử lý theo luồng (stream)
+    nên không cần giải nén ra đĩa hay nạp cả file vào bộ nhớ.
+
+    zstd cần gói `zstandard`.
+    """
+
+    GZIP = "gzip"
+    ZSTD = "zstd"
+
+    SUFFIXES = {
+        GZIP: ".gz",
+        ZSTD: ".zst",
+    }
+
+    CHUNK_SIZE = 1024 * 1024
+
+    @classmethod
+    def validate(cls, compression: str) -> str:
+        """
+        Raises:
+            ValueError: Nếu kiểu nén không hỗ trợ hoặc thiếu thư viện
+        """
+        if compression not in cls.SUFFIXES:
+            raise ValueError(f"Kiểu nén không hỗ trợ: {compression}")
+        if compression == cls.ZSTD and zstandard is None:
+            raise ValueError("Nén zstd cần cài đặt gói zstandard")
+        return compression
+
+    @classmethod
+    def get_compression(cls, path: str) -> Optional[str]:
+        """
+        Trả về:
+            Optional[str]: Kiểu nén theo phần mở rộng, None nếu là file thường
+        """
+        for compression, suffix in cls.SUFFIXES.items():
+            if path.endswith(suffix):
+                return compression
+        return None
+
+    @classmethod
+    def strip_suffix(cls, path: str) -> str:
+        compression = cls.get_compression(path)
+        return path[:-len(cls.SUFFIXES[compression])] if compression else path
+
+    @classmethod
+    def open(cls, path: str) -> IO[bytes]:
+        """
+        Mở file log để đọc tuần tự, tự giải nén theo phần mở rộng.
+
+        Trả về:
+            IO[bytes]: File đọc ở chế độ nhị phân
+        """
+        compression = cls.get_compression(path)
+        if compression == cls.GZIP:
+            return gzip.open(path, "rb")
+        if compression == cls.ZSTD:
+            cls.validate(compression)
+            return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return open(path, "rb")
+
+    @classmethod
+    def compress_file(cls, source: str, dest: str, compression: str = GZIP, level: Optional[int] = None) -> None:
+        """
+        Nén `source` thành `dest` rồi xoá `source`. Ghi vào file tạm và đổi tên khi xong
+        để người đọc không bao giờ thấy file nén dở.
+
+        Tham số:
+            source: File log cần nén
+            dest: File nén đích
+            compression: Kiểu nén (gzip/zstd)
+            level: Mức nén, mặc định của từng thư viện nếu không truyền
+        """
+        cls.validate(compression)
+        temp_path = f"{dest}.{os.getpid()}.tmp"
+
+        try:
+            with open(source, "rb") as src, open(temp_path, "wb") as raw:
+                if compression == cls.GZIP:
+                    # mtime=0: nội dung file nén không phụ thuộc thời điểm nén
+                    with gzip.GzipFile(
+                        filename="", mode="wb", fileobj=raw, mtime=0,
+                        compresslevel=6 if level is None else level,
+                    ) as dst:
+                        shutil.copyfileobj(src, dst, cls.CHUNK_SIZE)
+                else:
+                    compressor = zstandard.ZstdCompressor(level=3 if level is None else level)
+                    compressor.copy_stream(src, raw, read_size=cls.CHUNK_SIZE)
+
+            # Giữ thời gian sửa đổi của file gốc cho việc dọn dẹp theo tuổi
+            stat = os.stat(source)
+            os.utime(temp_path, (stat.st_atime, stat.st_mtime))
+            os.replace(temp_path, dest)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        os.remove(source)
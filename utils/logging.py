@@ -1,6 +1,15 @@
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import logging.handlers
+import logging.config
 import logging
+import weakref
+import queue
+import os
 
 from constants import AppMode
+from utils.log_compression import LogCompression
 
 
 COLOR_CMD = {
@@ -79,3 +88,234 @@ class ProductionFilterLogging(logging.Filter):
 class DebugFilterLogging(logging.Filter):
     def filter(self, record):
         return AppMode.DEBUG
+
+
+class DeferredFlushMixin:
+    """
+    Cho phép hoãn flush của handler trong khi BatchQueueListener xử lý một lô.
+
+    Trong `deferred_flush()`, các lần gọi flush (StreamHandler.emit gọi sau mỗi bản
+    ghi) chỉ được đánh dấu và thực hiện một lần khi thoát khỏi khối.
+    """
+
+    _flush_deferred = False
+    _flush_pending = False
+
+    def flush(self):
+        if self._flush_deferred:
+            self._flush_pending = True
+            return
+        super().flush()
+
+    @contextmanager
+    def deferred_flush(self) -> Iterator[None]:
+        self._flush_deferred = True
+        try:
+            yield
+        finally:
+            self._flush_deferred = False
+            if self._flush_pending:
+                self._flush_pending = False
+                try:
+                    self.flush()
+                except Exception:
+                    self.handleError(None)
+
+
+class BatchStreamHandler(DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+
+class BatchRotatingFileHandler(DeferredFlushMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class BatchQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener xử lý bản ghi theo lô (tối đa BATCH_SIZE) và flush mỗi handler
+    đích một lần sau mỗi lô (với handler có DeferredFlushMixin).
+
+    Tham số:
+        pop_dropped: Hàm trả về (và reset) số bản ghi bị bỏ qua do hàng đợi đầy;
+            số này được ghi thành một bản ghi WARNING ở lô kế tiếp
+    """
+
+    BATCH_SIZE = 500
+
+    def __init__(self, queue, *handlers, respect_handler_level=False, pop_dropped: Optional[Callable[[], int]] = None):
+        super().__init__(queue, *handlers, respect_handler_level=respect_handler_level)
+        self.pop_dropped = pop_dropped
+        self._stopping = False
+
+    def dequeue(self, block):
+        if self._stopping:
+            return self._sentinel
+
+        record = self.queue.get(block)
+        if record is self._sentinel:
+            return record
+
+        batch = [record]
+        while len(batch) < self.BATCH_SIZE:
+            try:
+                record = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if record is self._sentinel:
+                # Trả về sentinel ở lần dequeue kế tiếp, sau khi xử lý xong lô này
+                self._stopping = True
+                break
+            self.queue.task_done()
+            batch.append(record)
+        return batch
+
+    def handle(self, batch: List[logging.LogRecord]) -> None:
+        dropped = self.pop_dropped() if self.pop_dropped is not None else 0
+        if dropped:
+            batch.append(logging.LogRecord(
+                "logging", logging.WARNING, __file__, 0,
+                f"Hàng đợi log đầy, đã bỏ qua {dropped} bản ghi", None, None,
+            ))
+
+        with ExitStack() as stack:
+            for handler in self.handlers:
+                if isinstance(handler, DeferredFlushMixin):
+                    stack.enter_context(handler.deferred_flush())
+            for record in batch:
+                super().handle(record)
+
+    def enqueue_sentinel(self):
+        # Hàng đợi có giới hạn: chờ luồng nền lấy bớt thay vì báo queue.Full
+        self.queue.put(self._sentinel)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler với hàng đợi giới hạn: khi đầy, bản ghi mới bị bỏ qua và được đếm.
+
+    Không format trên luồng gọi: bản ghi được đưa nguyên vào hàng đợi (trong cùng
+    tiến trình), filter/format/emit của các handler đích chạy trên luồng nền của
+    BatchQueueListener. Cấu hình trong LOGGING bằng "()" với `handlers` là tên các
+    handler đích; listener được khởi động bởi `configure_logging` (LOGGING_CONFIG)
+    và được khởi tạo lại trong tiến trình con sau khi fork.
+    """
+
+    QUEUE_SIZE = 10000
+
+    def __init__(self, handlers: List[str], queue_size: int = QUEUE_SIZE):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target_names: Tuple[str, ...] = tuple(handlers)
+        self.targets: Tuple[logging.Handler, ...] = ()
+        self.listener: Optional[BatchQueueListener] = None
+        self.dropped = 0
+        self._pid: Optional[int] = None
+        _queue_handlers.add(self)
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self.lock:
+                self.dropped += 1
+
+    def pop_dropped(self) -> int:
+        with self.lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+    def start(self, targets: Sequence[logging.Handler]) -> None:
+        """
+        Khởi động luồng nền ghi bản ghi ra các handler đích.
+        """
+        self.stop()
+        self.targets = tuple(targets)
+        self.listener = BatchQueueListener(
+            self.queue, *self.targets, respect_handler_level=True, pop_dropped=self.pop_dropped,
+        )
+        self.listener.start()
+        self._pid = os.getpid()
+
+    def stop(self) -> None:
+        """
+        Ghi hết các bản ghi còn trong hàng đợi rồi dừng luồng nền.
+        """
+        listener, self.listener = self.listener, None
+        if listener is not None and self._pid == os.getpid():
+            listener.stop()
+
+    def reinit_after_fork(self) -> None:
+        # Luồng nền không tồn tại trong tiến trình con, khóa của hàng đợi có thể
+        # đang bị giữ lúc fork: tạo hàng đợi và listener mới
+        if self.listener is None:
+            return
+        self.listener = None
+        self.queue = queue.Queue(maxsize=self.queue.maxsize)
+        self.dropped = 0
+        self.start(self.targets)
+
+    def close(self):
+        self.stop()
+        super().close()
+
+
+_queue_handlers: "weakref.WeakSet[BoundedQueueHandler]" = weakref.WeakSet()
+
+
+def _reinit_queue_handlers() -> None:
+    for handler in list(_queue_handlers):
+        handler.reinit_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reinit_queue_handlers)
+
+
+def configure_logging(config: Dict[str, Any]) -> None:
+    """
+    LOGGING_CONFIG: cấu hình logging bằng dictConfig rồi khởi động listener của các
+    BoundedQueueHandler với handler đích theo tên.
+
+    Tham số:
+        config: Dict LOGGING
+    """
+    configurator = logging.config.DictConfigurator(config)
+    configurator.configure()
+
+    # Sau configure, mỗi mục trong "handlers" là instance handler đã cấu hình
+    handlers = configurator.config.get("handlers", {})
+    for name in list(handlers):
+        handler = handlers[name]
+        if not isinstance(handler, BoundedQueueHandler):
+            continue
+
+        targets = []
+        for target_name in handler.target_names:
+            if target_name not in handlers:
+                raise ValueError(f"Handler {name}: không tìm thấy handler đích {target_name}")
+            targets.append(handlers[target_name])
+        handler.start(targets)
+
+
+class CompressedRotatingFileHandler(BatchRotatingFileHandler):
+    """
+    RotatingFileHandler nén các bản xoay vòng (`errors-<ngày>.log.1.gz`, ...).
+
+    Khi dùng sau BoundedQueueHandler, việc nén chạy trên luồng nền của BatchQueueListener nên
+    không làm chậm request. Các bản cũ được đổi tên theo `namer` như bình thường.
+    """
+
+    def __init__(self, filename, compression: str = LogCompression.GZIP, compress_level: Optional[int] = None, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.compression = LogCompression.validate(compression)
+        self.compress_level = compress_level
+
+    def namer(self, default_name: str) -> str:
+        return default_name + LogCompression.SUFFIXES[self.compression]
+
+    def rotator(self, source: str, dest: str) -> None:
+        if not os.path.exists(source):
+            return
+        LogCompression.compress_file(source, dest, compression=self.compression, level=self.compress_level)
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+import threading
+import time
+
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[V]):
+    """
+    Cache LRU trong tiến trình, giới hạn số phần tử và hỗ trợ thời hạn theo từng phần tử.
+
+    An toàn khi dùng từ nhiều thread. Dùng cho các dữ liệu nhỏ được đọc rất nhiều lần
+    trong mỗi request (principal, payload token, ...) để tránh cả round trip tới Redis.
+    """
+
+    def __init__(self, max_size: int = 1024, timeout: Optional[float] = None):
+        """
+        Args:
+            max_size: Số phần tử tối đa, phần tử ít được dùng nhất bị loại khi đầy
+            timeout: Thời gian sống mặc định của phần tử (giây), None là không hết hạn
+
+        Raises:
+            ValueError: Nếu max_size nhỏ hơn 1
+        """
+        if max_size < 1:
+            raise ValueError("max_size phải ít nhất là 1")
+
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Lấy giá trị theo key, bỏ qua (và xóa) phần tử đã hết hạn.
+
+        Args:
+            key: Key cần lấy
+            default: Giá trị trả về khi không có
+
+        Returns:
+            Giá trị đã cache hoặc default
+        """
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: V, timeout: Optional[float] = _MISSING) -> None:
+        """
+        Lưu giá trị vào cache.
+
+        Args:
+            key: Key cần lưu
+            value: Giá trị
+            timeout: Thời gian sống (giây), mặc định dùng timeout của cache
+        """
+        if timeout is _MISSING:
+            timeout = self.timeout
+
+        if timeout is not None and timeout <= 0:
+            return
+
+        expires_at = None if timeout is None else time.monotonic() + timeout
+
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Lấy thống kê của cache.
+
+        Returns:
+            Dict: Số lần hit/miss, tỉ lệ hit và kích thước hiện tại
+        """
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "size": len(self._data),
+            "max_size": self.max_size,
+        }
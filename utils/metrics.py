@@ -0,0 +1,479 @@
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.deprecation import MiddlewareMixin
+from django.conf import settings
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import ipaddress
+import tempfile
+import bisect
+import fcntl
+import json
+import hmac
+import math
+import os
+import threading
+import time
+import uuid
+
+
+class Metrics:
+    """
+    Bộ đếm metrics HTTP theo định dạng Prometheus, an toàn khi chạy nhiều tiến trình
+    (gunicorn workers).
+
+    Mỗi tiến trình giữ metrics trong bộ nhớ và ghi snapshot ra file
+    `<METRICS_DIR>/<pid>-<token>.json` (tối đa mỗi FLUSH_INTERVAL giây). Khi được
+    scrape, snapshot của mọi tiến trình được cộng lại. Snapshot không được ghi lại
+    trong STALE_AFTER giây (tiến trình đã dừng hoặc không có request) được gộp
+    counter/histogram vào `_archive.json` rồi xóa, gauge của nó bị bỏ. Tiến trình
+    còn chạy nhận ra snapshot đã bị gộp ở lần ghi sau và chỉ ghi phần phát sinh thêm.
+
+    Metrics:
+        http_requests_total{view, method, status}
+        http_request_duration_seconds{view, method} (histogram)
+        http_requests_in_flight{view} (gauge)
+        http_request_phase_seconds{view, phase} (histogram, phase: db/serializer/render)
+        cache_hits_total{cache}, cache_misses_total{cache}, cache_size{cache} (gauge)
+
+    `view` là "<basename>.<action>" của viewset (ví dụ: customer.list). `cache` là tên
+    LRUCache trong tiến trình đã đăng ký bằng `register_cache`.
+    """
+
+    COUNTER = "counter"
+    HISTOGRAM = "histogram"
+    GAUGE = "gauge"
+
+    REQUESTS = "http_requests_total"
+    DURATION = "http_request_duration_seconds"
+    IN_FLIGHT = "http_requests_in_flight"
+    PHASE = "http_request_phase_seconds"
+    CACHE_HITS = "cache_hits_total"
+    CACHE_MISSES = "cache_misses_total"
+    CACHE_SIZE = "cache_size"
+
+    # Tên metric -> (loại, mô tả, tên các label)
+    DEFINITIONS = {
+        REQUESTS: (COUNTER, "Tổng số request HTTP", ("view", "method", "status")),
+        DURATION: (HISTOGRAM, "Thời gian xử lý request (giây)", ("view", "method")),
+        IN_FLIGHT: (GAUGE, "Số request đang xử lý", ("view",)),
+        PHASE: (HISTOGRAM, "Thời gian theo giai đoạn xử lý request (giây)", ("view", "phase")),
+        CACHE_HITS: (COUNTER, "Số lần đọc trúng cache trong tiến trình", ("cache",)),
+        CACHE_MISSES: (COUNTER, "Số lần đọc trượt cache trong tiến trình", ("cache",)),
+        CACHE_SIZE: (GAUGE, "Số phần tử của cache trong tiến trình", ("cache",)),
+    }
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    PHASES = ("db", "serializer", "render")
+
+    DEFAULT_DIRECTORY = os.path.join(tempfile.gettempdir(), "pharmago-metrics")
+    FLUSH_INTERVAL = 1.0
+    STALE_AFTER = 3 * FLUSH_INTERVAL
+    ARCHIVE_FILE = "_archive.json"
+    LOCK_FILE = "_lock"
+
+    _lock = threading.Lock()
+    _values: Dict[str, Dict[str, Any]] = {}
+    _pid: Optional[int] = None
+    _filename: Optional[str] = None
+    _last_flush = 0.0
+    _written: Optional[Tuple[str, str]] = None
+    _caches: Dict[str, Any] = {}
+    _cache_offsets: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def get_directory(cls) -> str:
+        directory = getattr(settings, "METRICS", {}).get("DIRECTORY") or cls.DEFAULT_DIRECTORY
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @classmethod
+    def _reset_if_forked(cls) -> None:
+        # Metrics không được dùng chung giữa các tiến trình sau khi fork
+        if cls._pid != os.getpid():
+            cls._pid = os.getpid()
+            cls._filename = f"{cls._pid}-{uuid.uuid4().hex[:8]}.json"
+            cls._values = {name: {} for name in cls.DEFINITIONS}
+            cls._last_flush = 0.0
+            cls._written = None
+            cls._cache_offsets = {}
+
+    @classmethod
+    def get_key(cls, name: str, labels: Tuple[str, ...]) -> str:
+        if len(labels) != len(cls.DEFINITIONS[name][2]):
+            raise ValueError(f"Số label không hợp lệ cho metric {name}: {labels}")
+        return json.dumps([str(label) for label in labels], ensure_ascii=False)
+
+    @classmethod
+    def inc(cls, name: str, labels: Tuple[str, ...], value: float = 1) -> None:
+        """
+        Tăng counter hoặc gauge (value âm để giảm gauge).
+        """
+        key = cls.get_key(name, labels)
+        with cls._lock:
+            cls._reset_if_forked()
+            values = cls._values[name]
+            values[key] = values.get(key, 0) + value
+
+    @classmethod
+    def observe(cls, name: str, labels: Tuple[str, ...], value: float) -> None:
+        """
+        Ghi một giá trị vào histogram: [số đếm theo bucket..., sum, count].
+        """
+        key = cls.get_key(name, labels)
+        with cls._lock:
+            cls._reset_if_forked()
+            values = cls._values[name]
+            histogram = values.get(key)
+            if histogram is None:
+                histogram = values[key] = [0] * len(cls.BUCKETS) + [0.0, 0]
+
+            index = bisect.bisect_left(cls.BUCKETS, value)
+            if index < len(cls.BUCKETS):
+                histogram[index] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    @classmethod
+    def register_cache(cls, name: str, cache: Any) -> None:
+        """
+        Xuất hits/misses/kích thước của một LRUCache trong tiến trình (lấy mẫu khi flush).
+
+        Args:
+            name: Giá trị label `cache`
+            cache: Instance LRUCache
+        """
+        cls._caches[name] = cache
+
+    @classmethod
+    def _sample_caches(cls) -> None:
+        # Gọi khi đang giữ _lock: hits/misses của LRUCache là tổng dồn của tiến trình,
+        # trừ đi phần đã được gộp vào file lưu trữ
+        for name, cache in cls._caches.items():
+            labels = (name,)
+            for metric, value in ((cls.CACHE_HITS, cache.hits), (cls.CACHE_MISSES, cache.misses)):
+                key = cls.get_key(metric, labels)
+                cls._values[metric][key] = value - cls._cache_offsets.get((metric, key), 0)
+            cls._values[cls.CACHE_SIZE][cls.get_key(cls.CACHE_SIZE, labels)] = len(cache)
+
+    @classmethod
+    def _subtract_archived(cls, archived: Dict[str, Dict[str, Any]]) -> None:
+        # Gọi khi đang giữ _lock: snapshot đã ghi được gộp vào file lưu trữ
+        for name, values in archived.items():
+            kind = cls.DEFINITIONS.get(name, (cls.GAUGE,))[0]
+            if kind == cls.GAUGE:
+                continue
+
+            current = cls._values[name]
+            for key, value in values.items():
+                if name in (cls.CACHE_HITS, cls.CACHE_MISSES):
+                    offset = cls._cache_offsets.get((name, key), 0)
+                    cls._cache_offsets[(name, key)] = offset + value
+                elif kind == cls.HISTOGRAM:
+                    current[key] = [a - b for a, b in zip(current[key], value)]
+                else:
+                    current[key] -= value
+
+    @classmethod
+    @contextmanager
+    def locked(cls, directory: str) -> Iterator[None]:
+        """
+        Khóa thư mục metrics giữa các tiến trình (ghi snapshot/gộp vào file lưu trữ).
+        """
+        with open(os.path.join(directory, cls.LOCK_FILE), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            yield
+
+    @classmethod
+    def record_phase(cls, request, phase: str, seconds: float) -> None:
+        request = getattr(request, "_request", request)
+        phases = getattr(request, "_metrics_phases", None)
+        if phases is not None:
+            phases[phase] = phases.get(phase, 0.0) + seconds
+
+    @classmethod
+    @contextmanager
+    def phase(cls, request, phase: str) -> Iterator[None]:
+        """
+        Đo thời gian một giai đoạn của request (chỉ tính lần gọi ngoài cùng nếu lồng nhau).
+
+        Args:
+            request: HttpRequest hoặc Request của DRF
+            phase: Tên giai đoạn (xem PHASES)
+        """
+        request = getattr(request, "_request", request)
+        active = getattr(request, "_metrics_active_phases", None)
+        if active is None or phase in active:
+            yield
+            return
+
+        active.add(phase)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            active.discard(phase)
+            cls.record_phase(request, phase, time.perf_counter() - start)
+
+    @classmethod
+    def flush(cls, force: bool = False) -> None:
+        """
+        Ghi snapshot của tiến trình hiện tại ra file (ghi đè nguyên tử).
+        """
+        now = time.monotonic()
+        with cls._lock:
+            cls._reset_if_forked()
+            if not force and now - cls._last_flush < cls.FLUSH_INTERVAL:
+                return
+            cls._last_flush = now
+
+        directory = cls.get_directory()
+        with cls.locked(directory):
+            with cls._lock:
+                cls._reset_if_forked()
+                path = os.path.join(directory, cls._filename)
+                if cls._written is not None and cls._written[0] == path and not os.path.exists(path):
+                    # Snapshot đã được gộp vào file lưu trữ (xem collect)
+                    cls._subtract_archived(json.loads(cls._written[1]))
+                cls._sample_caches()
+                snapshot = json.dumps(cls._values, ensure_ascii=False)
+                cls._written = (path, snapshot)
+
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(snapshot)
+            os.replace(temp_path, path)
+
+    @classmethod
+    def merge(cls, target: Dict[str, Dict[str, Any]], source: Dict[str, Dict[str, Any]], gauges: bool = True) -> None:
+        for name, values in source.items():
+            if name not in cls.DEFINITIONS:
+                continue
+            kind = cls.DEFINITIONS[name][0]
+            if kind == cls.GAUGE and not gauges:
+                continue
+
+            merged = target.setdefault(name, {})
+            for key, value in values.items():
+                if kind == cls.HISTOGRAM:
+                    current = merged.get(key)
+                    merged[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    merged[key] = merged.get(key, 0) + value
+
+    @classmethod
+    def read_file(cls, path: str) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def collect(cls) -> Dict[str, Dict[str, Any]]:
+        """
+        Cộng snapshot của mọi tiến trình, gộp các snapshot quá STALE_AFTER giây vào
+        file lưu trữ.
+
+        Snapshot được coi là cũ theo thời điểm ghi (mtime), không theo pid: pid có
+        thể được tái sử dụng (container) hoặc thuộc namespace khác.
+
+        Returns:
+            Dict: Tên metric -> (label -> giá trị)
+        """
+        cls.flush(force=True)
+        directory = cls.get_directory()
+
+        with cls.locked(directory):
+            stale_before = time.time() - cls.STALE_AFTER
+            archive_path = os.path.join(directory, cls.ARCHIVE_FILE)
+            archive = cls.read_file(archive_path)
+            archived = False
+
+            result: Dict[str, Dict[str, Any]] = {}
+            for filename in os.listdir(directory):
+                if not filename.endswith(".json") or filename == cls.ARCHIVE_FILE:
+                    continue
+
+                path = os.path.join(directory, filename)
+                try:
+                    modified_at = os.path.getmtime(path)
+                except OSError:
+                    continue
+
+                values = cls.read_file(path)
+                if modified_at >= stale_before:
+                    cls.merge(result, values)
+                else:
+                    cls.merge(archive, values, gauges=False)
+                    os.remove(path)
+                    archived = True
+
+            if archived:
+                temp_path = f"{archive_path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(archive, f, ensure_ascii=False)
+                os.replace(temp_path, archive_path)
+
+        cls.merge(result, archive)
+        return result
+
+    @classmethod
+    def format_labels(cls, names: Tuple[str, ...], values: List[str], extra: str = "") -> str:
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+        parts = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    @classmethod
+    def format_value(cls, value: float) -> str:
+        if math.isinf(value):
+            return "+Inf"
+        return repr(float(value)) if isinstance(value, float) else str(value)
+
+    @classmethod
+    def render(cls) -> str:
+        """
+        Xuất metrics của mọi tiến trình theo định dạng text của Prometheus.
+
+        Returns:
+            str: Nội dung exposition format 0.0.4
+        """
+        collected = cls.collect()
+        lines = []
+
+        for name, (kind, description, label_names) in cls.DEFINITIONS.items():
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {kind}")
+
+            for key, value in sorted(collected.get(name, {}).items()):
+                label_values = json.loads(key)
+                if kind != cls.HISTOGRAM:
+                    lines.append(f"{name}{cls.format_labels(label_names, label_values)} {cls.format_value(value)}")
+                    continue
+
+                cumulative = 0
+                for bound, count in zip(cls.BUCKETS, value):
+                    cumulative += count
+                    labels = cls.format_labels(label_names, label_values, f'le="{bound}"')
+                    lines.append(f"{name}_bucket{labels} {cumulative}")
+
+                labels = cls.format_labels(label_names, label_values, 'le="+Inf"')
+                lines.append(f"{name}_bucket{labels} {value[-1]}")
+                lines.append(f"{name}_sum{cls.format_labels(label_names, label_values)} {cls.format_value(value[-2])}")
+                lines.append(f"{name}_count{cls.format_labels(label_names, label_values)} {value[-1]}")
+
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """
+    Ghi metrics cho mỗi request (đặt đầu danh sách MIDDLEWARE để đo toàn bộ request).
+
+    Thời gian CSDL lấy từ SQLProfilerMiddleware (nếu được bật), thời gian serializer
+    và render được đo trong BaseAPIViewMixin/APIResponse qua Metrics.phase.
+    """
+
+    def process_request(self, request):
+        if not getattr(settings, "METRICS", {}).get("ENABLED", True):
+            return
+
+        request._metrics_start = time.perf_counter()
+        request._metrics_phases = {}
+        request._metrics_active_phases = set()
+
+    def get_view_label(self, request, view_func) -> str:
+        view_class = getattr(view_func, "cls", None)
+        actions = getattr(view_func, "actions", None)
+        basename = (getattr(view_func, "initkwargs", None) or {}).get("basename")
+
+        if view_class is not None and basename:
+            action = (actions or {}).get(request.method.lower(), request.method.lower())
+            return f"{basename}.{action}"
+
+        match = getattr(request, "resolver_match", None)
+        return (match and (match.view_name or match.url_name)) or "other"
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if getattr(request, "_metrics_start", None) is None:
+            return
+
+        request._metrics_view = self.get_view_label(request, view_func)
+        Metrics.inc(Metrics.IN_FLIGHT, (request._metrics_view,))
+
+    def get_status(self, response) -> int:
+        # Lỗi nghiệp vụ (MessageError) trả về HTTP 200 với status trong nội dung
+        try:
+            return int(response.data["status"])
+        except Exception:
+            return response.status_code
+
+    def process_response(self, request, response):
+        start = getattr(request, "_metrics_start", None)
+        if start is None:
+            return response
+
+        duration = time.perf_counter() - start
+        view = getattr(request, "_metrics_view", None)
+        if view is not None:
+            Metrics.inc(Metrics.IN_FLIGHT, (view,), -1)
+        else:
+            view = "unmatched"
+
+        Metrics.inc(Metrics.REQUESTS, (view, request.method, str(self.get_status(response))))
+        Metrics.observe(Metrics.DURATION, (view, request.method), duration)
+
+        phases = dict(request._metrics_phases)
+        profile = getattr(request, "_sql_profile", None)
+        if profile is not None:
+            phases["db"] = profile.duration
+        for phase, seconds in phases.items():
+            Metrics.observe(Metrics.PHASE, (view, phase), seconds)
+
+        Metrics.flush()
+        return response
+
+
+def is_allowed_address(address: str, networks: List[str]) -> bool:
+    """
+    Kiểm tra địa chỉ IP có thuộc một trong các mạng (IP hoặc CIDR) được cho phép.
+    """
+    try:
+        address = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+
+    for network in networks:
+        try:
+            if address in ipaddress.ip_network(network.strip(), strict=False):
+                return True
+        except ValueError:
+            continue
+    return False
+
+
+def metrics_view(request):
+    """
+    Endpoint nội bộ trả về metrics dạng Prometheus.
+
+    Chỉ cho phép khi có header `Authorization: Bearer <METRICS.TOKEN>` hoặc request
+    đến từ địa chỉ trong METRICS.ALLOWED_IPS (IP/CIDR). Không cấu hình cả hai thì
+    endpoint bị đóng: sau reverse proxy, REMOTE_ADDR luôn là địa chỉ nội bộ của proxy.
+    """
+    config = getattr(settings, "METRICS", {})
+    token = config.get("TOKEN")
+
+    allowed = bool(token) and hmac.compare_digest(
+        request.META.get("HTTP_AUTHORIZATION", ""), f"Bearer {token}"
+    )
+    if not allowed:
+        allowed = is_allowed_address(request.META.get("REMOTE_ADDR", ""), config.get("ALLOWED_IPS") or [])
+
+    if not allowed:
+        return HttpResponseForbidden()
+
+    return HttpResponse(Metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,6 +1,8 @@
 from django.utils.deprecation import MiddlewareMixin
 from django.apps import apps
 
+from django_currentuser.middleware import SetCurrentUser
+
 from config.settings import JWT_CONFIG
 
 from helpers.token_helper import HttpSystem
@@ -25,4 +27,25 @@ class MultiTableAuthMiddleware(MiddlewareMixin):
         if value not in [HttpSystem.CUSTOMER, HttpSystem.MANAGE]:
             value = HttpSystem.MANAGE
         
-        return key, value
\ No newline at end of file
+        return key, value
+
+
+class CurrentUserMiddleware(MiddlewareMixin):
+    """
+    Thay cho ThreadLocalUserMiddleware của django_currentuser (chỉ hỗ trợ sync).
+
+    Dưới ASGI, MiddlewareMixin chạy process_request/process_response trong thread
+    thread-sensitive của request, cũng là thread mà ORM đồng bộ chạy (save, acreate,
+    ...), nên get_current_user() trong model vẫn thấy người dùng mà view async không
+    phải giữ một thread trong lúc chờ I/O.
+    """
+
+    def process_request(self, request):
+        request.current_user_context = SetCurrentUser(request)
+        request.current_user_context.__enter__()
+
+    def process_response(self, request, response):
+        context = getattr(request, "current_user_context", None)
+        if context is not None:
+            context.__exit__(None, None, None)
+        return response
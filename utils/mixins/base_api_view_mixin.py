@@ -1,16 +1,35 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model
 from django.db.models.query import QuerySet
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
 
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import Serializer, ListSerializer
 from rest_framework.response import Response
 from rest_framework.request import Request
 
+from asgiref.sync import sync_to_async
+
+from datetime import datetime
 from functools import cached_property
-from typing import Any, Dict, Type, Union, List, Optional
+from typing import Any, Dict, Type, Union, List, Optional, Set, Tuple
+
+import hashlib
+import json
+
+from helpers.token_helper import HttpSystem
 
 from utils.mixins.serializer_mixin import SerializerMixin
 from utils.mixins.serializer_mixin import EmptySerializer
 from utils.api_response import APIResponse
+from utils.exception import MessageError
+from utils.response_cache import ResponseCache
+from utils.compiled_serializer import CompiledSerializer
+from utils.exporter import QuerySetExporter
 from utils.paginator import Paginator
+from utils.metrics import Metrics
 
 
 class BaseAPIViewMixin(SerializerMixin):
@@ -25,6 +44,16 @@ class BaseAPIViewMixin(SerializerMixin):
     request: Request = None  # Sẽ được thiết lập bởi Django
     pagination_class = None  # Lớp phân trang
     page_size = 20  # Kích thước trang mặc định
+    pagination_mode = Paginator.MODE_PAGE  # Chế độ phân trang mặc định ("page" hoặc "cursor")
+    pagination_action_modes: Dict[str, str] = {}  # Map action -> chế độ phân trang
+    count_strategy = Paginator.COUNT_EXACT  # Chiến lược count mặc định
+    count_action_strategies: Dict[str, str] = {}  # Map action -> chiến lược count
+    sparse_fields_param = "fields"  # Tham số chọn trường trả về (?fields=id,full_name)
+    sparse_exclude_param = "exclude"  # Tham số loại bỏ trường trả về (?exclude=email)
+    conditional_enabled = True  # Gửi ETag/Last-Modified và trả về 304 cho GET
+    conditional_detail_actions = ("retrieve",)  # Action lấy fingerprint theo updated_at của object
+    conditional_list_actions = ("list",)  # Action lấy fingerprint theo version của model (ResponseCache)
+    CONDITIONAL_FIELDS = ("updated_at", "created_at")
 
     @cached_property
     def api_response(self) -> Type[APIResponse]:
@@ -102,8 +131,189 @@ class BaseAPIViewMixin(SerializerMixin):
 
         kwargs["context"].update(self.get_serializer_context() or {})
 
-        # Trả về serializer đã khởi tạo
-        return serializer_class(*args, **kwargs)
+        # Object của action chi tiết: dùng để tính ETag sau handler (xem set_conditional_headers)
+        if args and isinstance(args[0], Model) and getattr(self, "action", None) in self.conditional_detail_actions:
+            self.conditional_instance = args[0]
+
+        # Khởi tạo serializer và lọc các trường theo ?fields= / ?exclude=
+        return self.trim_serializer_fields(serializer_class(*args, **kwargs))
+
+    def get_serializer_data(self, serializer: Serializer) -> Any:
+        """
+        Lấy dữ liệu đã serialize, đo thời gian (giai đoạn "serializer" của metrics).
+
+        Args:
+            serializer: Serializer đã khởi tạo
+
+        Returns:
+            Any: serializer.data
+        """
+        with Metrics.phase(self.request, "serializer"):
+            return serializer.data
+
+    def get_response_data(self, *args, **kwargs) -> Any:
+        """
+        Serialize bằng response serializer của action hiện tại.
+
+        Args:
+            *args: Đối số vị trí để truyền cho serializer
+            **kwargs: Đối số từ khóa để truyền cho serializer
+
+        Returns:
+            Any: Dữ liệu response
+        """
+        return self.get_serializer_data(self.get_response_serializer(*args, **kwargs))
+
+    def get_sparse_fields(self) -> Tuple[Optional[Set[str]], Set[str]]:
+        """
+        Lấy danh sách trường được chọn và bị loại bỏ từ query params.
+
+        Returns:
+            Tuple[Optional[Set[str]], Set[str]]: (các trường được chọn hoặc None, các trường bị loại bỏ)
+        """
+        query_params = getattr(self.request, "query_params", None)
+        if query_params is None:
+            return None, set()
+
+        def parse(key: str) -> Optional[Set[str]]:
+            value = query_params.get(key)
+            if value is None:
+                return None
+            return {name.strip() for name in value.split(",") if name.strip()}
+
+        fields = parse(self.sparse_fields_param)
+        exclude = parse(self.sparse_exclude_param) or set()
+        return fields or None, exclude
+
+    def trim_serializer_fields(self, serializer: Serializer) -> Serializer:
+        """
+        Loại bỏ các trường không được yêu cầu khỏi response serializer.
+
+        Args:
+            serializer: Instance serializer (hoặc ListSerializer khi many=True)
+
+        Returns:
+            Serializer: Serializer đã được lọc trường
+
+        Raises:
+            MessageError: Nếu có trường không tồn tại trong serializer
+        """
+        fields, exclude = self.get_sparse_fields()
+        if fields is None and not exclude:
+            return serializer
+
+        target = serializer.child if isinstance(serializer, ListSerializer) else serializer
+        if not hasattr(target, "fields"):
+            return serializer
+
+        unknown = ((fields or set()) | exclude) - set(target.fields)
+        if unknown:
+            raise MessageError(f"Trường không hợp lệ: {', '.join(sorted(unknown))}")
+
+        for name in list(target.fields):
+            if (fields is not None and name not in fields) or name in exclude:
+                target.fields.pop(name)
+
+        return serializer
+
+    def get_only_fields(self, model: Optional[Type] = None) -> Optional[List[str]]:
+        """
+        Lấy danh sách cột cần truy vấn (dùng cho `.only()`) theo các trường được yêu cầu.
+
+        Chỉ áp dụng khi request có ?fields= hoặc ?exclude= và mọi trường còn lại
+        của serializer đều lấy trực tiếp từ model (không dùng source="*").
+
+        Args:
+            model: Model của queryset, bỏ qua nếu không trùng với model của serializer
+
+        Returns:
+            Optional[List[str]]: Danh sách trường hoặc None nếu không thể giới hạn
+        """
+        fields, exclude = self.get_sparse_fields()
+        if fields is None and not exclude:
+            return None
+
+        serializer = self.get_response_serializer()
+        serializer_model = getattr(getattr(serializer, "Meta", None), "model", None)
+        if serializer_model is None or (model is not None and model is not serializer_model):
+            return None
+
+        only = {serializer_model._meta.pk.name}
+        for field in serializer.fields.values():
+            if field.source == "*":
+                return None
+
+            name = field.source.split(".")[0]
+            try:
+                model_field = serializer_model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+
+            if model_field.concrete and not model_field.many_to_many:
+                only.add(model_field.name)
+
+        # Các cột fingerprint để ETag được tính từ object đã tải (không truy vấn thêm)
+        if self.conditional_enabled:
+            only.update(self.get_conditional_fields(serializer_model))
+
+        return sorted(only)
+
+    def apply_sparse_fields(self, object_list: Union[List, QuerySet]) -> Union[List, QuerySet]:
+        """
+        Giới hạn các cột được truy vấn của queryset theo ?fields= / ?exclude=.
+
+        Args:
+            object_list: Danh sách hoặc queryset
+
+        Returns:
+            Union[List, QuerySet]: Queryset đã áp dụng `.only()` hoặc giữ nguyên
+        """
+        if not isinstance(object_list, QuerySet):
+            return object_list
+
+        only = self.get_only_fields(object_list.model)
+        if not only:
+            return object_list
+
+        # Giữ lại các cột dùng để sắp xếp (cursor phân trang cần đọc giá trị của chúng)
+        opts = object_list.model._meta
+        for ordering in object_list.query.order_by:
+            if not isinstance(ordering, str):
+                continue
+            name = ordering.lstrip("-").split("__")[0]
+            if name == "pk":
+                continue
+            try:
+                only.append(opts.get_field(name).name)
+            except FieldDoesNotExist:
+                continue
+
+        return object_list.only(*only)
+
+    def get_compiled_serializer(
+        self, option: Optional[Dict[str, Any]] = None
+    ) -> Optional[Tuple[CompiledSerializer, Serializer]]:
+        """
+        Lấy bản biên dịch của response serializer cho các response dạng danh sách.
+
+        Chỉ áp dụng khi response serializer kế thừa CompiledModelSerializer và không
+        có tham số khởi tạo nào khác ngoài `many`.
+
+        Args:
+            option: Tham số bổ sung truyền vào serializer
+
+        Returns:
+            Optional[Tuple[CompiledSerializer, Serializer]]: (bản biên dịch, serializer) hoặc None
+        """
+        if set(option or {}) - {"many"}:
+            return None
+
+        serializer = self.get_response_serializer()
+        compiled = CompiledSerializer.from_serializer(serializer)
+        if compiled is None:
+            return None
+
+        return compiled, serializer
 
     def get_serializer(self, *args, **kwargs) -> Serializer:
         """
@@ -157,6 +367,287 @@ class BaseAPIViewMixin(SerializerMixin):
         """
         return super().initialize_request(request, *args, **kwargs)
 
+    def initial(self, request, *args, **kwargs) -> None:
+        """
+        Sau khi xác thực và kiểm tra quyền, trả về 304 ngay nếu fingerprint của dữ
+        liệu khớp với If-None-Match/If-Modified-Since (không truy vấn, không serialize).
+        """
+        super().initial(request, *args, **kwargs)
+
+        fingerprint = None
+        if self.should_check_conditional(request):
+            fingerprint = self.get_conditional_fingerprint(**kwargs)
+        self.apply_conditional_fingerprint(request, fingerprint)
+
+    def should_check_conditional(self, request) -> bool:
+        return self.conditional_enabled and request.method in ("GET", "HEAD")
+
+    def has_conditional_headers(self, request) -> bool:
+        return "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META
+
+    def apply_conditional_fingerprint(
+        self, request, fingerprint: Optional[Tuple[Any, Optional[int]]]
+    ) -> None:
+        """
+        Tính ETag/Last-Modified từ fingerprint và thay handler bằng response 304 nếu
+        request có If-None-Match/If-Modified-Since khớp.
+
+        Args:
+            request: Request đến
+            fingerprint: Kết quả của get_conditional_fingerprint (hoặc None)
+        """
+        self.conditional_etag = None
+        self.conditional_last_modified = None
+        self.conditional_not_modified = False
+        self.conditional_instance = None
+
+        if fingerprint is None:
+            return
+
+        value, last_modified = fingerprint
+        self.conditional_etag = self.build_etag(value)
+        self.conditional_last_modified = last_modified
+
+        not_modified = get_conditional_response(
+            request._request,
+            etag=self.conditional_etag,
+            last_modified=self.conditional_last_modified,
+        )
+        if not_modified is not None:
+            self.conditional_not_modified = True
+            not_modified["ETag"] = self.conditional_etag
+            setattr(self, request.method.lower(), lambda *a, **kw: not_modified)
+
+    def get_conditional_fields(self, model: Type[Model]) -> List[str]:
+        """
+        Lấy các trường CONDITIONAL_FIELDS có trên model.
+        """
+        fields = []
+        for name in self.CONDITIONAL_FIELDS:
+            try:
+                model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            fields.append(name)
+        return fields
+
+    def get_conditional_query(self, **kwargs) -> Optional[Tuple[QuerySet, List[str]]]:
+        """
+        Lấy queryset và các trường dùng để tính fingerprint cho action chi tiết.
+
+        Args:
+            **kwargs: Tham số URL (pk, ...)
+
+        Returns:
+            Optional[Tuple[QuerySet, List[str]]]: (queryset của object, các trường) hoặc None
+        """
+        action = getattr(self, "action", None)
+        service = getattr(self, "service", None)
+        if service is None or getattr(service, "model", None) is None:
+            return None
+        if action not in self.conditional_detail_actions or "pk" not in kwargs:
+            return None
+
+        fields = self.get_conditional_fields(service.model)
+        if not fields:
+            return None
+
+        queryset = service.get_queryset().filter(pk=kwargs["pk"]).values_list(*fields)
+        return queryset, fields
+
+    def get_list_fingerprint(self) -> Optional[Tuple[Any, Optional[int]]]:
+        """
+        Fingerprint của action danh sách từ version của các model trong ResponseCache
+        (một lần đọc cache, không truy vấn CSDL). Query string là một phần của ETag nên
+        bộ lọc không cần xét.
+
+        Returns:
+            Optional[Tuple[Any, Optional[int]]]: (version các model, thời điểm thay đổi gần nhất) hoặc None
+        """
+        if getattr(self, "action", None) not in self.conditional_list_actions:
+            return None
+
+        get_cache_models = getattr(self, "get_cache_models", None)
+        if get_cache_models is not None:
+            models = get_cache_models()
+        else:
+            model = getattr(getattr(self, "service", None), "model", None)
+            models = ResponseCache.get_dependent_models(model) if model is not None else []
+        if not models:
+            return None
+
+        try:
+            versions, last_modified = ResponseCache.get_state(models)
+        except Exception:
+            return None
+        return ("list", versions), last_modified
+
+    def get_conditional_fingerprint(self, **kwargs) -> Optional[Tuple[Any, Optional[int]]]:
+        """
+        Lấy fingerprint rẻ của dữ liệu trả về trước khi chạy handler.
+
+        - Action chi tiết: (updated_at, created_at) của object theo `pk`
+        - Action danh sách: version của các model (xem get_list_fingerprint)
+
+        Args:
+            **kwargs: Tham số URL (pk, ...)
+
+        Returns:
+            Optional[Tuple[Any, Optional[int]]]: (fingerprint, timestamp Last-Modified) hoặc None
+        """
+        fingerprint = self.get_list_fingerprint()
+        if fingerprint is not None:
+            return fingerprint
+
+        # Không có header điều kiện: ETag được tính từ object mà handler đã tải
+        if not self.has_conditional_headers(self.request):
+            return None
+
+        query = self.get_conditional_query(**kwargs)
+        if query is None:
+            return None
+
+        queryset, fields = query
+        return self.build_conditional_fingerprint(queryset.first(), **kwargs)
+
+    async def aget_conditional_fingerprint(self, **kwargs) -> Optional[Tuple[Any, Optional[int]]]:
+        """
+        Phiên bản async của `get_conditional_fingerprint`: version của danh sách
+        được đọc từ cache trong thread, object chi tiết được truy vấn bằng async ORM.
+        """
+        if getattr(self, "action", None) in self.conditional_list_actions:
+            return await sync_to_async(self.get_list_fingerprint)()
+
+        if not self.has_conditional_headers(self.request):
+            return None
+
+        query = self.get_conditional_query(**kwargs)
+        if query is None:
+            return None
+
+        queryset, fields = query
+        return self.build_conditional_fingerprint(await queryset.afirst(), **kwargs)
+
+    def build_conditional_fingerprint(self, result: Any, **kwargs) -> Optional[Tuple[Any, Optional[int]]]:
+        if result is None:
+            return None
+        return (kwargs["pk"], result), self._last_modified(result)
+
+    def get_instance_fingerprint(self, instance: Model) -> Optional[Tuple[Any, Optional[int]]]:
+        """
+        Fingerprint của action chi tiết từ object handler đã tải (cùng giá trị với
+        get_conditional_fingerprint, không truy vấn thêm).
+
+        Returns:
+            Optional[Tuple[Any, Optional[int]]]: None nếu object không thuộc model của service
+            hoặc các trường fingerprint bị hoãn tải (.only())
+        """
+        model = getattr(getattr(self, "service", None), "model", None)
+        if model is None or not isinstance(instance, model) or "pk" not in self.kwargs:
+            return None
+
+        fields = self.get_conditional_fields(model)
+        if not fields or instance.get_deferred_fields() & set(fields):
+            return None
+
+        result = tuple(getattr(instance, name) for name in fields)
+        return self.build_conditional_fingerprint(result, **self.kwargs)
+
+    def _last_modified(self, values: Any) -> Optional[int]:
+        # Last-Modified chỉ chính xác tới giây
+        timestamps = [int(value.timestamp()) for value in values if isinstance(value, datetime)]
+        return max(timestamps) if timestamps else None
+
+    def build_etag(self, value: Any, weak: bool = False) -> str:
+        """
+        Tạo ETag từ fingerprint kèm action, path, query string, hệ thống xác thực,
+        người dùng và các trường được yêu cầu.
+
+        Args:
+            value: Fingerprint của dữ liệu
+            weak: Tạo weak ETag (W/"...")
+
+        Returns:
+            str: ETag đã được đặt trong dấu nháy
+        """
+        request = self.request
+        user = getattr(request, "user", None)
+        serializer_class = self.get_response_serializer_class() or self.serializer_class
+
+        parts = (
+            getattr(self, "action", None),
+            request.path,
+            sorted((key, sorted(values)) for key, values in request.query_params.lists()),
+            getattr(request, HttpSystem.KEY, None),
+            getattr(user, "pk", None),
+            getattr(serializer_class, "__qualname__", None),
+            value,
+        )
+        digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+        etag = quote_etag(digest)
+        return f"W/{etag}" if weak else etag
+
+    def set_conditional_headers(self, request, response: Any) -> Any:
+        """
+        Thêm ETag/Last-Modified cho response GET thành công, trả về 304 nếu khớp.
+
+        Khi không có fingerprint trước: action chi tiết lấy fingerprint từ object đã tải;
+        action khác chỉ tính ETag yếu từ dữ liệu response (không tính timestamp của
+        APIResponse) khi request có If-None-Match.
+
+        Args:
+            request: Request đến
+            response: Response đã được bọc
+
+        Returns:
+            Response hoặc HttpResponseNotModified
+        """
+        if getattr(self, "conditional_not_modified", False):
+            return response
+
+        if (
+            not self.conditional_enabled
+            or request.method not in ("GET", "HEAD")
+            or not isinstance(response, Response)
+            or response.status_code != 200
+            or response.exception
+            or not isinstance(response.data, dict)
+            or not response.data.get("success")
+        ):
+            return response
+
+        etag = getattr(self, "conditional_etag", None)
+        last_modified = getattr(self, "conditional_last_modified", None)
+
+        instance = getattr(self, "conditional_instance", None)
+        if etag is None and instance is not None:
+            fingerprint = self.get_instance_fingerprint(instance)
+            if fingerprint is not None:
+                value, last_modified = fingerprint
+                etag = self.build_etag(value)
+
+        if etag is None:
+            if "HTTP_IF_NONE_MATCH" not in request.META:
+                return response
+
+            content = json.dumps(
+                [response.data.get("data"), response.data.get("metadata")],
+                cls=DjangoJSONEncoder,
+                sort_keys=True,
+            )
+            etag = self.build_etag(hashlib.sha1(content.encode("utf-8")).hexdigest(), weak=True)
+
+            not_modified = get_conditional_response(request._request, etag=etag)
+            if not_modified is not None:
+                not_modified["ETag"] = etag
+                return not_modified
+
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_vary_headers(response, ("Authorization",))
+        return response
+
     def finalize_response(self, request, response, *args, **kwargs) -> Response:
         """
         Hoàn thiện response, đảm bảo nó được bọc trong một APIResponse.
@@ -171,9 +662,13 @@ class BaseAPIViewMixin(SerializerMixin):
             Response: Response đã hoàn thiện sẵn sàng gửi đến client
         """
         # Bọc response trong APIResponse nếu cần thiết
-        if not isinstance(response, Response):
+        # (giữ nguyên các HttpResponse khác như StreamingHttpResponse)
+        if not isinstance(response, (Response, HttpResponseBase)):
             response = self.api_response(data=response)
 
+        # Thêm ETag/Last-Modified (hoặc trả về 304) cho các GET thành công
+        response = self.set_conditional_headers(request, response)
+
         return super().finalize_response(request, response, *args, **kwargs)
 
     def dispatch(self, request, *args, **kwargs):
@@ -202,11 +697,45 @@ class BaseAPIViewMixin(SerializerMixin):
         """
         return super().handle_exception(exc)
 
+    def get_pagination_mode(self) -> str:
+        """
+        Lấy chế độ phân trang cho action hiện tại.
+
+        Client có thể chủ động dùng chế độ cursor bằng cách truyền `?cursor=`
+        (giá trị rỗng cho trang đầu tiên).
+
+        Returns:
+            str: Paginator.MODE_PAGE hoặc Paginator.MODE_CURSOR
+        """
+        if "cursor" in self.request.query_params:
+            return Paginator.MODE_CURSOR
+
+        action = getattr(self, "action", None)
+        mode = self.pagination_action_modes.get(action, self.pagination_mode)
+
+        if mode not in Paginator.MODES:
+            raise ValueError(f"Chế độ phân trang không hợp lệ: {mode}")
+
+        return mode
+
+    def get_count_strategy(self) -> str:
+        """
+        Lấy chiến lược count cho action hiện tại.
+
+        Returns:
+            str: Một trong Paginator.COUNT_STRATEGIES
+        """
+        action = getattr(self, "action", None)
+        return self.count_action_strategies.get(action, self.count_strategy)
+
     def paginator(
         self,
         object_list: Union[List, QuerySet],
         per_page: Optional[int] = None,
         page: Optional[int] = None,
+        mode: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_strategy: Optional[str] = None,
         **kwargs
     ) -> Dict:
         """
@@ -215,7 +744,10 @@ class BaseAPIViewMixin(SerializerMixin):
         Args:
             object_list: Danh sách cần phân trang
             per_page: Số lượng item trên mỗi trang
-            page: Số trang
+            page: Số trang (chế độ "page")
+            mode: Chế độ phân trang, mặc định lấy từ get_pagination_mode()
+            cursor: Cursor của trang cần lấy (chế độ "cursor"), mặc định lấy từ `?cursor=`
+            count_strategy: Chiến lược count, mặc định lấy từ get_count_strategy()
             **kwargs: Tham số bổ sung
 
         Returns:
@@ -223,22 +755,80 @@ class BaseAPIViewMixin(SerializerMixin):
         """
         # Lấy serializer cho response
         response_serializer = self.get_response_serializer
+        object_list = self.apply_sparse_fields(object_list)
 
-        # Lấy thông tin trang từ request nếu chưa được chỉ định
-        if page is None:
-            page = Paginator.from_request(self.request, "page")
+        if mode is None:
+            mode = self.get_pagination_mode()
 
         if per_page is None:
             per_page = Paginator.from_request(self.request, "limit") or self.page_size
 
+        if count_strategy is None:
+            count_strategy = self.get_count_strategy()
+
         # Tạo paginator và phân trang
-        _paginator = Paginator(object_list, per_page)
-        _paginator = _paginator.page(page)
+        _paginator = Paginator(object_list, per_page, count_strategy=count_strategy)
+
+        if mode == Paginator.MODE_CURSOR:
+            if cursor is None:
+                cursor = self.request.query_params.get("cursor")
+            _paginator = _paginator.cursor(cursor)
+        else:
+            # Lấy thông tin trang từ request nếu chưa được chỉ định
+            if page is None:
+                page = Paginator.from_request(self.request, "page")
+            _paginator = _paginator.page(page)
+
         _paginator = _paginator.set_results_classes(response_serializer, option=kwargs)
 
-        output_results = _paginator.output_results
+        # Dùng serializer đã biên dịch nếu response serializer hỗ trợ (CompiledModelSerializer)
+        compiled_serializer = self.get_compiled_serializer(kwargs)
+        if compiled_serializer is not None:
+            _paginator = _paginator.set_results_compiled(*compiled_serializer)
+
+        with Metrics.phase(self.request, "serializer"):
+            output_results = _paginator.output_results
 
         return self.api_response(
             data=output_results.pop("results", []),
             metadata={"pagination": output_results},
         )
+
+    def exporter(
+        self,
+        object_list: Union[List, QuerySet],
+        export_format: Optional[str] = None,
+        filename: Optional[str] = None,
+        chunk_size: int = QuerySetExporter.DEFAULT_CHUNK_SIZE,
+    ) -> HttpResponseBase:
+        """
+        Xuất toàn bộ danh sách đối tượng dưới dạng stream (NDJSON hoặc CSV).
+
+        Mỗi chunk được serialize bằng response serializer của action hiện tại.
+
+        Args:
+            object_list: Danh sách hoặc queryset cần xuất
+            export_format: Định dạng xuất, mặc định lấy từ `?export_format=`
+            filename: Tên file tải về (không gồm phần mở rộng)
+            chunk_size: Số dòng đọc và serialize mỗi lần
+
+        Returns:
+            StreamingHttpResponse: Response dạng stream
+        """
+        if export_format is None:
+            export_format = QuerySetExporter.from_request(self.request)
+
+        serializer_class = self.get_response_serializer_class() or self.serializer_class
+        object_list = self.apply_sparse_fields(object_list)
+
+        if filename is None:
+            filename = getattr(self, "basename", None) or "export"
+
+        _exporter = QuerySetExporter(
+            object_list,
+            serializer_class=self.get_response_serializer if serializer_class else None,
+            export_format=export_format,
+            chunk_size=chunk_size,
+        )
+
+        return _exporter.response(filename=filename)
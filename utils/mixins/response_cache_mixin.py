@@ -0,0 +1,150 @@
+from django.apps import apps
+from django.db.models import Model
+
+from rest_framework.response import Response
+from rest_framework.request import Request
+
+from typing import Any, Dict, List, Optional, Type, Union
+
+import time
+
+from helpers.token_helper import HttpSystem
+from utils.response_cache import ResponseCache
+
+
+class ResponseCacheMixin:
+    """
+    Mixin cache response theo action (khai báo bằng `cache_action_timeouts`).
+
+    Cache key gồm action, path, query string, hệ thống xác thực (manage/customer) và
+    version của các model trong `cache_models` (mặc định là model của `self.service`
+    và các model mà nó tham chiếu tới qua khóa ngoại/one-to-one/many-to-many).
+    Response dùng dữ liệu của model khác (ví dụ serializer lồng nhau qua quan hệ
+    ngược) cần khai báo đủ các model đó trong `cache_models`.
+    Cache được kiểm tra sau khi xác thực và kiểm tra quyền, chỉ áp dụng cho GET và
+    chỉ lưu các response thành công.
+
+    Không dùng cho các action có response phụ thuộc vào người dùng hiện tại.
+    """
+
+    cache_action_timeouts: Dict[str, int] = {}  # Map action -> thời gian cache (giây)
+    cache_models: List[Union[str, Type[Model]]] = []  # Các model làm mất hiệu lực cache
+
+    CACHE_HEADER = "X-Response-Cache"
+
+    def get_cache_models(self) -> List[Type[Model]]:
+        """
+        Lấy danh sách model mà response phụ thuộc vào.
+
+        Returns:
+            List[Type[Model]]: Danh sách model
+        """
+        if self.cache_models:
+            return [
+                apps.get_model(model) if isinstance(model, str) else model
+                for model in self.cache_models
+            ]
+
+        model = getattr(getattr(self, "service", None), "model", None)
+        return ResponseCache.get_dependent_models(model) if model is not None else []
+
+    def get_response_cache_timeout(self) -> Optional[int]:
+        """
+        Lấy thời gian cache của action hiện tại.
+
+        Returns:
+            Optional[int]: Số giây hoặc None nếu action không được cache
+        """
+        if self.request.method != "GET":
+            return None
+        return self.cache_action_timeouts.get(getattr(self, "action", None))
+
+    def get_response_cache_key(self, request: Request) -> Optional[str]:
+        """
+        Tạo cache key cho request hiện tại.
+
+        Args:
+            request: Request đến
+
+        Returns:
+            Optional[str]: Cache key hoặc None nếu không cache
+        """
+        if not self.get_response_cache_timeout():
+            return None
+
+        models = self.get_cache_models()
+        if not models:
+            return None
+
+        try:
+            versions = ResponseCache.get_versions(models)
+        except Exception:
+            return None
+
+        query = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+        system = getattr(request, HttpSystem.KEY, HttpSystem.MANAGE)
+        return ResponseCache.build_key(self.action, request.path, query, system, versions)
+
+    def initial(self, request: Request, *args, **kwargs) -> None:
+        """
+        Sau khi xác thực và kiểm tra quyền, trả về response đã cache nếu có.
+        """
+        super().initial(request, *args, **kwargs)
+        self.load_cached_response(request)
+
+    def load_cached_response(self, request: Request) -> None:
+        """
+        Đọc response từ cache và thay handler của method hiện tại nếu có.
+
+        Args:
+            request: Request đến
+        """
+        self.response_cache_key = None
+        self.response_cache_hit = False
+
+        # Đã trả về 304 (xem BaseAPIViewMixin.initial) thì không cần đọc cache
+        if getattr(self, "conditional_not_modified", False):
+            return
+
+        key = self.get_response_cache_key(request)
+        if key is None:
+            return
+
+        cached = ResponseCache.get(key)
+        if cached is None:
+            self.response_cache_key = key
+            return
+
+        data, status = cached
+        self.response_cache_hit = True
+
+        # Thời điểm trả về là của lần phát lại này, không phải lúc lưu cache
+        if "timestamp" in data:
+            data = {**data, "timestamp": int(time.time())}
+
+        # Thay handler của method hiện tại để bỏ qua truy vấn và serialize
+        setattr(self, request.method.lower(), lambda *a, **kw: Response(data=data, status=status))
+
+    def finalize_response(self, request: Request, response: Any, *args, **kwargs) -> Any:
+        """
+        Lưu response thành công vào cache nếu action được cache.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        if getattr(self, "response_cache_hit", False):
+            response[self.CACHE_HEADER] = "HIT"
+            return response
+
+        key = getattr(self, "response_cache_key", None)
+        if (
+            key
+            and isinstance(response, Response)
+            and response.status_code == 200
+            and not response.exception
+            and isinstance(response.data, dict)
+            and response.data.get("success")
+        ):
+            ResponseCache.set(key, (response.data, response.status_code), self.get_response_cache_timeout())
+            response[self.CACHE_HEADER] = "MISS"
+
+        return response
@@ -1,4 +1,4 @@
-from rest_framework.serializers import Serializer
+from rest_framework.serializers import Serializer, ListField
 from rest_framework.exceptions import NotFound
 from rest_framework import viewsets
 
@@ -38,6 +38,14 @@ class EmptySerializer(Serializer):
         pass
 
 
+class BulkDeleteSerializer(EmptySerializer):
+    """
+    Serializer cho request xóa theo lô: {"ids": [1, 2, 3]}
+    """
+
+    ids = ListField(allow_empty=False)
+
+
 class SerializerMixin(object):
     """
     Mixin cung cấp khả năng sử dụng nhiều serializer khác nhau cho từng action
@@ -162,15 +170,4 @@ class GenericViewSetMixin(viewsets.GenericViewSet):
             QuerySet: Queryset đã được lọc
         """
         # Áp dụng các filter backend
-        filtered_queryset = super().filter_queryset(queryset)
-
-        # Log thông tin
-        if filtered_queryset is not queryset:
-            original_count = queryset.count() if hasattr(queryset, "count") else "?"
-            filtered_count = (
-                filtered_queryset.count()
-                if hasattr(filtered_queryset, "count")
-                else "?"
-            )
-
-        return filtered_queryset
+        return super().filter_queryset(queryset)
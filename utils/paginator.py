@@ -1,15 +1,24 @@
 from django.utils.functional import cached_property
 from django.utils.inspect import method_has_no_args
+from django.core.exceptions import ValidationError
 from django.db.models.query import QuerySet
+from django.db.models import Q
+from django.core.cache import cache
+from django.db import connections
 
 from rest_framework.request import Request
 
-from typing import Union, List, Dict, Any, Optional, Callable, TypeVar, Generic
+from typing import Union, List, Dict, Any, Optional, Callable, TypeVar, Generic, Tuple
 
+import binascii
+import hashlib
 import inspect
+import base64
+import json
 import math
 
 from utils.exception import MessageError
+from utils.search import SearchBackend
 
 
 T = TypeVar("T")
@@ -29,20 +38,50 @@ class Paginator(Generic[T]):
     MIN_PAGE = 1  # Trang tối thiểu
     MAX_PER_PAGE = 100  # Ngăn chặn kích thước truy vấn quá lớn
 
-    def __init__(self, object_list: Union[List[T], QuerySet], per_page: int = 10):
+    MODE_PAGE = "page"  # Phân trang LIMIT/OFFSET theo số trang
+    MODE_CURSOR = "cursor"  # Phân trang keyset theo cursor
+    MODES = (MODE_PAGE, MODE_CURSOR)
+
+    # Các trường dùng để seek trong chế độ cursor, khớp với sắp xếp của BaseService.get_objects
+    CURSOR_FIELDS: Tuple[str, ...] = ("created_at", "pk")
+
+    COUNT_EXACT = "exact"  # COUNT(*) mỗi lần
+    COUNT_CACHED = "cached"  # COUNT(*) được cache theo câu SQL đã chuẩn hóa
+    COUNT_ESTIMATED = "estimated"  # Ước lượng từ planner (PostgreSQL)
+    COUNT_NONE = "none"  # Không đếm, lấy thêm 1 bản ghi để biết trang tiếp theo
+    COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CACHED, COUNT_ESTIMATED, COUNT_NONE)
+
+    COUNT_CACHE_PREFIX = "paginator:count"
+    COUNT_CACHE_TIMEOUT = 60  # Giây
+    ESTIMATE_EXACT_THRESHOLD = 1000  # Dưới ngưỡng này vẫn đếm chính xác
+
+    def __init__(
+        self,
+        object_list: Union[List[T], QuerySet],
+        per_page: int = 10,
+        cursor_fields: Optional[Tuple[str, ...]] = None,
+        count_strategy: str = COUNT_EXACT,
+        count_cache_timeout: Optional[int] = None,
+    ):
         """
         Khởi tạo một instance Paginator mới.
 
         Tham số:
             object_list: Danh sách hoặc queryset để phân trang
             per_page: Số lượng mục trên mỗi trang (mặc định: 10)
+            cursor_fields: Các trường seek cho chế độ cursor (mặc định: CURSOR_FIELDS)
+            count_strategy: Cách tính tổng số mục ("exact", "cached", "estimated", "none")
+            count_cache_timeout: Thời gian cache count với chiến lược "cached" (giây)
 
         Raises:
-            ValueError: Nếu per_page nhỏ hơn 1
+            ValueError: Nếu per_page nhỏ hơn 1 hoặc count_strategy không hợp lệ
         """
         if per_page < 1:
             raise ValueError("per_page phải ít nhất là 1")
 
+        if count_strategy not in self.COUNT_STRATEGIES:
+            raise ValueError(f"Chiến lược count không hợp lệ: {count_strategy}")
+
         if per_page > self.MAX_PER_PAGE:
             per_page = self.MAX_PER_PAGE
 
@@ -53,6 +92,17 @@ class Paginator(Generic[T]):
         self.top = 0
         self.classes: Optional[Callable] = None
         self.option_classes: Dict[str, Any] = {}
+        self.compiled: Optional[Any] = None
+        self.compiled_serializer: Optional[Any] = None
+        self.mode = self.MODE_PAGE
+        self.cursor_fields = tuple(cursor_fields or self.CURSOR_FIELDS)
+        self.next_cursor: Optional[str] = None
+        self.previous_cursor: Optional[str] = None
+        self._cursor_results: List[T] = []
+        self.count_strategy = count_strategy
+        self.count_cache_timeout = count_cache_timeout or self.COUNT_CACHE_TIMEOUT
+        self.count_is_exact = count_strategy != self.COUNT_NONE
+        self._has_more = False
 
     @staticmethod
     def from_request(request: Request, key: str = "page") -> int:
@@ -122,8 +172,18 @@ class Paginator(Generic[T]):
 
         # Tính toán giới hạn cắt (slice)
         self.bottom = current_page_index * self.per_page
+
+        # Không có count chính xác thì không thể giới hạn theo count
+        if self.count_strategy == self.COUNT_NONE:
+            self.top = self.per_page + self.bottom
+            return self
+
         self.top = min(self.per_page + self.bottom, self.count)
 
+        if not self.count_is_exact:
+            self.top = self.per_page + self.bottom
+            return self
+
         # Kiểm tra nếu trang tồn tại
         if page_number > self.num_pages and self.num_pages > 0:
             message = f"Trang {page_number} vượt quá số trang tối đa {self.num_pages}"
@@ -131,6 +191,179 @@ class Paginator(Generic[T]):
 
         return self
 
+    def cursor(self, cursor: Optional[str] = None) -> "Paginator[T]":
+        """
+        Lấy một trang theo cursor (keyset pagination).
+
+        Thay vì OFFSET, trang được xác định bằng điều kiện seek trên CURSOR_FIELDS
+        (mặc định `(created_at, id)`), nên chi phí của trang N bằng trang đầu tiên
+        khi có index tương ứng. Không thực hiện COUNT(*).
+
+        Tham số:
+            cursor: Cursor do lần gọi trước trả về (next_cursor/previous_cursor),
+                None để lấy trang đầu tiên
+
+        Trả về:
+            Paginator: Self, để có thể gọi phương thức theo chuỗi
+
+        Raises:
+            ValueError: Nếu object_list không phải là QuerySet
+            MessageError: Nếu cursor không hợp lệ hoặc queryset đang sắp xếp theo độ
+                liên quan tìm kiếm (order_by bị thay bằng CURSOR_FIELDS sẽ làm mất thứ tự này)
+        """
+        if not isinstance(self._object_list, QuerySet):
+            raise ValueError("Chế độ cursor chỉ hỗ trợ QuerySet")
+
+        if self._is_rank_ordered():
+            raise MessageError("Không hỗ trợ phân trang theo cursor khi tìm kiếm theo từ khóa")
+
+        self.mode = self.MODE_CURSOR
+
+        position, backward = self.decode_cursor(cursor)
+        descending = self._is_descending()
+
+        # Khi đi lùi, đảo chiều sắp xếp để seek từ vị trí cursor về phía trước
+        seek_descending = descending != backward
+
+        queryset = self._object_list
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(position, seek_descending))
+
+        prefix = "-" if seek_descending else ""
+        queryset = queryset.order_by(*[f"{prefix}{field}" for field in self.cursor_fields])
+
+        # Lấy thêm 1 bản ghi để biết còn trang tiếp theo hay không
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+
+        if backward:
+            rows.reverse()
+
+        self._cursor_results = rows
+        self.next_cursor = None
+        self.previous_cursor = None
+
+        if rows:
+            if backward or has_more:
+                self.next_cursor = self.encode_cursor(rows[-1], backward=False)
+            if (not backward and position is not None) or (backward and has_more):
+                self.previous_cursor = self.encode_cursor(rows[0], backward=True)
+
+        return self
+
+    def encode_cursor(self, instance: Any, backward: bool = False) -> str:
+        """
+        Mã hóa vị trí của một đối tượng thành cursor dạng chuỗi.
+
+        Tham số:
+            instance: Đối tượng làm mốc
+            backward: True nếu cursor dùng để lấy trang trước đó
+
+        Trả về:
+            str: Cursor đã được mã hóa base64 (urlsafe)
+        """
+        values = []
+        for field in self.cursor_fields:
+            value = getattr(instance, field)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+
+        payload = json.dumps({"p": values, "b": int(backward)}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def decode_cursor(self, cursor: Optional[str]) -> Tuple[Optional[List[Any]], bool]:
+        """
+        Giải mã cursor thành giá trị các trường seek.
+
+        Tham số:
+            cursor: Cursor dạng chuỗi hoặc None
+
+        Trả về:
+            Tuple: (Danh sách giá trị hoặc None, True nếu đi lùi)
+
+        Raises:
+            MessageError: Nếu cursor không hợp lệ
+        """
+        if not cursor:
+            return None, False
+
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            values = payload["p"]
+
+            if not isinstance(values, list) or len(values) != len(self.cursor_fields):
+                raise ValueError
+
+            model = self._object_list.model
+            position = []
+            for field_name, value in zip(self.cursor_fields, values):
+                if field_name == "pk":
+                    model_field = model._meta.pk
+                else:
+                    model_field = model._meta.get_field(field_name)
+                position.append(model_field.to_python(value))
+
+            return position, bool(payload.get("b"))
+        except (ValueError, TypeError, KeyError, binascii.Error, ValidationError):
+            raise MessageError("Cursor không hợp lệ")
+
+    def _is_rank_ordered(self) -> bool:
+        """
+        Kiểm tra queryset có đang sắp xếp theo độ liên quan tìm kiếm (`search_rank`).
+        """
+        for order in self._object_list.query.order_by:
+            name = order if isinstance(order, str) else getattr(getattr(order, "expression", None), "name", None)
+            if name and name.lstrip("-") == SearchBackend.RANK_ANNOTATION:
+                return True
+        return False
+
+    def _is_descending(self) -> bool:
+        """
+        Xác định chiều sắp xếp hiện tại của queryset dựa trên trường seek đầu tiên.
+
+        Trả về:
+            bool: True nếu sắp xếp giảm dần (mặc định của BaseService.get_objects)
+        """
+        query = self._object_list.query
+        ordering = list(query.order_by) or list(self._object_list.model._meta.ordering)
+        first_field = self.cursor_fields[0]
+
+        for order in ordering:
+            if not isinstance(order, str):
+                continue
+            if order.lstrip("-") == first_field:
+                return order.startswith("-")
+
+        return True
+
+    def _seek_filter(self, position: List[Any], descending: bool) -> Q:
+        """
+        Tạo điều kiện seek theo thứ tự từ điển trên các trường cursor.
+
+        Ví dụ với (created_at, pk) giảm dần:
+            created_at < v1 OR (created_at = v1 AND pk < v2)
+
+        Tham số:
+            position: Giá trị các trường tại vị trí cursor
+            descending: True nếu seek theo chiều giảm dần
+
+        Trả về:
+            Q: Điều kiện lọc
+        """
+        lookup = "lt" if descending else "gt"
+        condition = Q()
+
+        for index, field in enumerate(self.cursor_fields):
+            seek = Q(**{f"{field}__{lookup}": position[index]})
+            for previous_field, previous_value in zip(
+                self.cursor_fields[:index], position[:index]
+            ):
+                seek &= Q(**{previous_field: previous_value})
+            condition |= seek
+
+        return condition
+
     def set_results_classes(
         self, classes: Callable[[List[T]], Any], option: Dict[str, Any] = {}
     ) -> "Paginator[T]":
@@ -148,22 +381,76 @@ class Paginator(Generic[T]):
         self.classes = classes
         return self
 
+    def set_results_compiled(self, compiled: Any, serializer: Any) -> "Paginator[T]":
+        """
+        Dùng serializer đã biên dịch (xem utils.compiled_serializer) cho kết quả.
+
+        Ở chế độ "page", nếu mọi trường đều được biên dịch, trang được truy vấn bằng
+        `values_list()` thay vì tạo model instance.
+
+        Tham số:
+            compiled: Instance CompiledSerializer
+            serializer: Instance serializer của request hiện tại (hàm chuyển đổi và
+                các trường không biên dịch được)
+
+        Trả về:
+            Paginator: Self, để có thể gọi phương thức theo chuỗi
+        """
+        self.compiled = compiled
+        self.compiled_serializer = serializer
+        return self
+
+    @cached_property
+    def page_object_list(self) -> Union[List[T], QuerySet]:
+        """
+        Lấy danh sách dùng để cắt trang ở chế độ "page".
+
+        Trả về:
+            Union[List, QuerySet]: object_list, hoặc queryset values_list khi dùng serializer đã biên dịch
+        """
+        if self.compiled is not None:
+            return self.compiled.prepare(self._object_list)
+        return self._object_list
+
     @cached_property
-    def num_pages(self) -> int:
+    def num_pages(self) -> Optional[int]:
         """
         Tính tổng số trang.
 
         Trả về:
-            int: Tổng số trang
+            Optional[int]: Tổng số trang, None nếu không đếm (chiến lược "none")
         """
+        if self.count is None:
+            return None
         if self.count == 0:
             return 0
         return math.ceil(self.count / self.per_page)
 
     @cached_property
-    def count(self) -> int:
+    def count(self) -> Optional[int]:
         """
-        Lấy tổng số mục.
+        Lấy tổng số mục theo chiến lược count đã chọn.
+
+        Trả về:
+            Optional[int]: Tổng số mục, None nếu dùng chiến lược "none"
+        """
+        if self.count_strategy == self.COUNT_NONE:
+            self.count_is_exact = False
+            return None
+
+        # Các chiến lược tối ưu chỉ áp dụng cho QuerySet
+        if isinstance(self._object_list, QuerySet):
+            if self.count_strategy == self.COUNT_CACHED:
+                return self._cached_count()
+            if self.count_strategy == self.COUNT_ESTIMATED:
+                return self._estimated_count()
+
+        self.count_is_exact = True
+        return self._exact_count()
+
+    def _exact_count(self) -> int:
+        """
+        Đếm chính xác tổng số mục.
 
         Cố gắng sử dụng phương thức count() của đối tượng nếu có, nếu không sẽ sử dụng len().
 
@@ -185,6 +472,88 @@ class Paginator(Generic[T]):
         except (TypeError, AttributeError) as e:
             return 0
 
+    def get_count_cache_key(self) -> str:
+        """
+        Tạo cache key cho count dựa trên câu SQL đã chuẩn hóa (bỏ ORDER BY).
+
+        Trả về:
+            str: Cache key
+        """
+        queryset = self._object_list.order_by()
+        sql, params = queryset.query.sql_with_params()
+        normalized_sql = " ".join(sql.split())
+        digest = hashlib.sha1(
+            f"{queryset.db}:{normalized_sql}:{params!r}".encode("utf-8")
+        ).hexdigest()
+        return f"{self.COUNT_CACHE_PREFIX}:{digest}"
+
+    def _cached_count(self) -> int:
+        """
+        Lấy count từ cache, đếm chính xác và lưu lại nếu chưa có.
+
+        Trả về:
+            int: Tổng số mục (có thể đã cũ trong khoảng TTL)
+        """
+        try:
+            cache_key = self.get_count_cache_key()
+            count = cache.get(cache_key)
+        except Exception:
+            # Không tạo được key (EmptyResultSet, ...) hoặc cache lỗi: đếm trực tiếp
+            self.count_is_exact = True
+            return self._exact_count()
+
+        if count is not None:
+            self.count_is_exact = False
+            return count
+
+        count = self._exact_count()
+        self.count_is_exact = True
+
+        try:
+            cache.set(cache_key, count, self.count_cache_timeout)
+        except Exception:
+            pass
+
+        return count
+
+    def _estimated_count(self) -> int:
+        """
+        Ước lượng count từ kế hoạch thực thi của PostgreSQL (EXPLAIN).
+
+        Nếu không phải PostgreSQL hoặc ước lượng nhỏ hơn ESTIMATE_EXACT_THRESHOLD
+        thì đếm chính xác.
+
+        Trả về:
+            int: Tổng số mục ước lượng hoặc chính xác
+        """
+        queryset = self._object_list.order_by()
+        connection = connections[queryset.db]
+
+        if connection.vendor != "postgresql":
+            self.count_is_exact = True
+            return self._exact_count()
+
+        try:
+            sql, params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            estimate = int(plan[0]["Plan"]["Plan Rows"])
+        except Exception:
+            self.count_is_exact = True
+            return self._exact_count()
+
+        if estimate < self.ESTIMATE_EXACT_THRESHOLD:
+            self.count_is_exact = True
+            return self._exact_count()
+
+        self.count_is_exact = False
+        return estimate
+
     @cached_property
     def object_results(self) -> List[T]:
         """
@@ -194,10 +563,20 @@ class Paginator(Generic[T]):
             List: Các đối tượng cho trang hiện tại
         """
         try:
+            # Chế độ cursor đã lấy sẵn kết quả khi seek
+            if self.mode == self.MODE_CURSOR:
+                return self._cursor_results
+
+            # Không đếm: lấy thêm 1 bản ghi để xác định trang tiếp theo
+            if self.count_strategy == self.COUNT_NONE:
+                rows = list(self.page_object_list[self.bottom : self.top + 1])
+                self._has_more = len(rows) > self.per_page
+                return rows[: self.per_page]
+
             # Xử lý cả danh sách và queryset
             if isinstance(self._object_list, QuerySet):
                 # Đối với QuerySets, việc cắt tạo ra một truy vấn SQL LIMIT/OFFSET hiệu quả
-                return list(self._object_list[self.bottom : self.top])
+                return list(self.page_object_list[self.bottom : self.top])
             else:
                 # Đối với danh sách, chỉ cắt như bình thường
                 return self._object_list[self.bottom : self.top]
@@ -219,6 +598,10 @@ class Paginator(Generic[T]):
             if not self.object_results:
                 return []
 
+            # Serializer đã biên dịch: bỏ qua to_representation của DRF
+            if self.compiled is not None:
+                return self.compiled.serialize(self.object_results, self.compiled_serializer)
+
             # Nếu có cung cấp lớp serializer, sử dụng nó
             if hasattr(self, "classes") and self.classes is not None:
                 kwargs = {"many": True}
@@ -243,15 +626,7 @@ class Paginator(Generic[T]):
         Trả về:
             Dict: Thông tin phân trang và kết quả
         """
-        return {
-            "count": self.count,
-            "num_pages": self.num_pages,
-            "current_page": self.current_page,
-            "previous_page": self.previous_page,
-            "next_page": self.next_page,
-            "per_page": self.per_page,
-            "results": self.results,
-        }
+        return self.get_output_results(self.results)
 
     def get_output_results(self, results: List[Any]) -> Dict[str, Any]:
         """
@@ -265,8 +640,18 @@ class Paginator(Generic[T]):
         Trả về:
             Dict: Thông tin phân trang và kết quả tùy chỉnh
         """
+        if self.mode == self.MODE_CURSOR:
+            return {
+                "mode": self.MODE_CURSOR,
+                "previous_cursor": self.previous_cursor,
+                "next_cursor": self.next_cursor,
+                "per_page": self.per_page,
+                "results": results,
+            }
+
         return {
             "count": self.count,
+            "count_exact": self.count_is_exact,
             "num_pages": self.num_pages,
             "current_page": self.current_page,
             "previous_page": self.previous_page,
@@ -293,7 +678,7 @@ class Paginator(Generic[T]):
         Trả về:
             Optional[int]: Số trang tiếp theo hoặc None
         """
-        return self.current_page + 1 if self.current_page < self.num_pages else None
+        return self.current_page + 1 if self.has_next() else None
 
     def has_next(self) -> bool:
         """
@@ -302,6 +687,11 @@ class Paginator(Generic[T]):
         Trả về:
             bool: True nếu có trang tiếp theo
         """
+        if self.count_strategy == self.COUNT_NONE:
+            # Đảm bảo đã lấy dữ liệu trang hiện tại (kèm bản ghi dư)
+            self.object_results
+            return self._has_more
+
         return self.current_page < self.num_pages
 
     def has_previous(self) -> bool:
@@ -0,0 +1,227 @@
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import Model
+
+from typing import Any, List, Optional, Sequence, Type
+
+from utils.lru_cache import LRUCache
+
+
+class PrincipalCache:
+    """
+    Cache người dùng đã xác thực (User/Customer) theo (auth_model, pk).
+
+    Gồm hai tầng: LRU trong tiến trình và cache dùng chung (django-redis). Giá trị lưu
+    là các cột trong `principal_cache_fields` của model (không bao giờ gồm `password`),
+    được dựng lại bằng `Model.from_db` nên mỗi request nhận một instance riêng; các
+    cột còn lại được tải khi truy cập.
+
+    Mỗi principal có một version trong Redis, được tăng khi bản ghi được lưu hoặc xóa
+    (xem PhoneUserBase.save/delete). Cả hai tầng đều lưu theo version nên mỗi request
+    chỉ cần đọc version (một lệnh GET) để biết bản trong tiến trình còn đúng hay không:
+    mọi tiến trình thấy thay đổi ngay khi version được tăng.
+
+    Cần cache dùng chung giữa các tiến trình (Redis, xem REDIS_HOST): với cache chỉ nằm
+    trong tiến trình (LocMemCache mặc định khi không cấu hình Redis), version tăng ở một
+    worker không được worker khác thấy nên cache bị tắt và mỗi request đọc trực tiếp CSDL.
+    """
+
+    KEY_PREFIX = "principal"
+    VERSION_PREFIX = "principal:version"
+    TIMEOUT = 60  # Giây, tầng cache dùng chung
+    LOCAL_TIMEOUT = 5  # Giây, tầng LRU trong tiến trình (giới hạn khi version bị mất khỏi Redis)
+    LOCAL_MAX_SIZE = 2048
+
+    # Các cột không bao giờ được cache
+    EXCLUDE_FIELDS = ("password",)
+
+    # Backend không chia sẻ dữ liệu giữa các tiến trình
+    PROCESS_LOCAL_BACKENDS = (LocMemCache, DummyCache)
+
+    local = LRUCache(max_size=LOCAL_MAX_SIZE, timeout=LOCAL_TIMEOUT)
+
+    @classmethod
+    def get_version_key(cls, model: Type[Model], pk: Any) -> str:
+        return f"{cls.VERSION_PREFIX}:{model._meta.label_lower}:{pk}"
+
+    @classmethod
+    def get_key(cls, model: Type[Model], pk: Any, version: int) -> str:
+        return f"{cls.KEY_PREFIX}:{model._meta.label_lower}:{pk}:{version}"
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return not isinstance(caches[DEFAULT_CACHE_ALIAS], cls.PROCESS_LOCAL_BACKENDS)
+
+    @classmethod
+    def get_field_names(cls, model: Type[Model]) -> List[str]:
+        """
+        Lấy các cột được cache: khóa chính và `principal_cache_fields` của model (mặc
+        định là mọi cột), trừ EXCLUDE_FIELDS.
+
+        Args:
+            model: Lớp model xác thực
+
+        Returns:
+            List[str]: Tên cột (attname) theo thứ tự của model (yêu cầu của `Model.from_db`)
+        """
+        names = getattr(model, "principal_cache_fields", None)
+        return [
+            field.attname
+            for field in model._meta.concrete_fields
+            if field.name not in cls.EXCLUDE_FIELDS
+            and (names is None or field.primary_key or field.name in names)
+        ]
+
+    @classmethod
+    def get(cls, model: Type[Model], pk: Any) -> Optional[Model]:
+        """
+        Lấy principal từ cache, truy vấn CSDL và lưu lại nếu chưa có.
+
+        Args:
+            model: Lớp model xác thực (request.auth_model)
+            pk: Khóa chính lấy từ token
+
+        Returns:
+            Optional[Model]: Instance hoặc None nếu không tồn tại
+        """
+        if not cls.is_enabled():
+            return model._default_manager.filter(pk=pk).first()
+
+        try:
+            version = cache.get(cls.get_version_key(model, pk), 0)
+        except Exception:
+            # Không kiểm tra được version: không tin dữ liệu đã cache
+            version = None
+
+        key = None if version is None else cls.get_key(model, pk, version)
+
+        values = cls.local.get(key) if key else None
+        if values is None:
+            if key:
+                try:
+                    values = cache.get(key)
+                except Exception:
+                    values = None
+
+            if values is None:
+                values = cls.fetch(model, pk)
+                if values is None:
+                    return None
+
+                if key:
+                    try:
+                        cache.set(key, values, cls.TIMEOUT)
+                    except Exception:
+                        pass
+
+            if key:
+                cls.local.set(key, values)
+
+        return cls.load(model, values)
+
+    @classmethod
+    async def aget(cls, model: Type[Model], pk: Any) -> Optional[Model]:
+        """
+        Phiên bản async của `get`, truy vấn bằng async ORM khi chưa có trong cache.
+
+        Args:
+            model: Lớp model xác thực (request.auth_model)
+            pk: Khóa chính lấy từ token
+
+        Returns:
+            Optional[Model]: Instance hoặc None nếu không tồn tại
+        """
+        if not cls.is_enabled():
+            return await model._default_manager.filter(pk=pk).afirst()
+
+        try:
+            version = await cache.aget(cls.get_version_key(model, pk), 0)
+        except Exception:
+            version = None
+
+        key = None if version is None else cls.get_key(model, pk, version)
+
+        values = cls.local.get(key) if key else None
+        if values is None:
+            if key:
+                try:
+                    values = await cache.aget(key)
+                except Exception:
+                    values = None
+
+            if values is None:
+                values = await model._default_manager.filter(pk=pk).values_list(
+                    *cls.get_field_names(model)
+                ).afirst()
+                if values is None:
+                    return None
+
+                if key:
+                    try:
+                        await cache.aset(key, values, cls.TIMEOUT)
+                    except Exception:
+                        pass
+
+            if key:
+                cls.local.set(key, values)
+
+        return cls.load(model, values)
+
+    @classmethod
+    def fetch(cls, model: Type[Model], pk: Any) -> Optional[tuple]:
+        return model._default_manager.filter(pk=pk).values_list(*cls.get_field_names(model)).first()
+
+    @classmethod
+    def load(cls, model: Type[Model], values: tuple) -> Model:
+        return model.from_db(model._default_manager.db, cls.get_field_names(model), values)
+
+    @classmethod
+    def bump(cls, model: Type[Model], pks: Sequence[Any]) -> None:
+        """
+        Tăng version của các principal: bản cache cũ (ở mọi tiến trình) không còn được dùng.
+        """
+        for pk in pks:
+            key = cls.get_version_key(model, pk)
+            try:
+                cache.add(key, 0, None)
+                cache.incr(key)
+            except Exception:
+                # Không xóa key: version quay về 0 có thể trùng với bản cache cũ
+                try:
+                    cache.set(key, (cache.get(key) or 0) + 1, None)
+                except Exception:
+                    pass
+
+    @classmethod
+    def invalidate(cls, model: Type[Model], pk: Any) -> None:
+        """
+        Tăng version của principal ngay và một lần nữa sau khi transaction được commit
+        (tránh request khác lưu lại dữ liệu cũ với version mới trước khi commit).
+
+        Args:
+            model: Lớp model
+            pk: Khóa chính
+        """
+        if pk is None:
+            return
+
+        cls.invalidate_many(model, [pk])
+
+    @classmethod
+    def invalidate_many(cls, model: Type[Model], pks: Sequence[Any]) -> None:
+        """
+        Giống `invalidate` cho nhiều bản ghi
+
+        Args:
+            model: Lớp model
+            pks: Danh sách khóa chính
+        """
+        pks = [pk for pk in pks if pk is not None]
+        if not pks:
+            return
+
+        model = model._meta.concrete_model
+        cls.bump(model, pks)
+        transaction.on_commit(lambda: cls.bump(model, pks))
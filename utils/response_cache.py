@@ -0,0 +1,149 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+
+from typing import Any, Iterable, List, Optional, Tuple, Type
+
+import hashlib
+import time
+
+
+class ResponseCache:
+    """
+    Cache response của các API đọc dữ liệu, vô hiệu hóa theo version của model.
+
+    Mỗi model có một số version lưu trong cache, được tăng mỗi khi một bản ghi của
+    model được lưu hoặc xóa (BaseModel.save, BaseModelSoftDelete.delete). Version của
+    các model liên quan là một phần của cache key nên response cũ không bao giờ được
+    đọc lại sau khi dữ liệu thay đổi, không cần xóa từng key.
+
+    Lưu ý: `QuerySet.update()`/`bulk_update()` không đi qua save nên cần gọi
+    `ResponseCache.invalidate(model)` thủ công.
+    """
+
+    KEY_PREFIX = "response_cache"
+    VERSION_PREFIX = "response_cache:version"
+    MODIFIED_PREFIX = "response_cache:modified"
+
+    @classmethod
+    def version_key(cls, model: Type[Model]) -> str:
+        return f"{cls.VERSION_PREFIX}:{model._meta.concrete_model._meta.label_lower}"
+
+    @classmethod
+    def modified_key(cls, model: Type[Model]) -> str:
+        return f"{cls.MODIFIED_PREFIX}:{model._meta.concrete_model._meta.label_lower}"
+
+    @classmethod
+    def get_dependent_models(cls, model: Type[Model]) -> List[Type[Model]]:
+        """
+        Lấy model và các model mà nó tham chiếu tới (khóa ngoại, one-to-one,
+        many-to-many): dữ liệu trả về của model có thể thay đổi theo các model này.
+
+        Args:
+            model: Lớp model
+
+        Returns:
+            List[Type[Model]]: Model và các model liên quan (không trùng lặp)
+        """
+        models = [model]
+        for field in model._meta.get_fields():
+            related_model = field.related_model if field.concrete and field.is_relation else None
+            if related_model is not None and related_model not in models:
+                models.append(related_model)
+        return models
+
+    @classmethod
+    def get_versions(cls, models: Iterable[Type[Model]]) -> Tuple[int, ...]:
+        """
+        Lấy version hiện tại của các model.
+
+        Args:
+            models: Danh sách model
+
+        Returns:
+            Tuple[int, ...]: Version theo thứ tự các model (0 nếu chưa có)
+        """
+        keys = [cls.version_key(model) for model in models]
+        versions = cache.get_many(keys)
+        return tuple(versions.get(key, 0) for key in keys)
+
+    @classmethod
+    def get_state(cls, models: Iterable[Type[Model]]) -> Tuple[Tuple[int, ...], Optional[int]]:
+        """
+        Lấy version và thời điểm thay đổi gần nhất của các model trong một lần đọc cache.
+
+        Args:
+            models: Danh sách model
+
+        Returns:
+            Tuple[Tuple[int, ...], Optional[int]]: (version theo thứ tự các model,
+            timestamp thay đổi gần nhất hoặc None nếu chưa biết cho mọi model)
+        """
+        models = list(models)
+        version_keys = [cls.version_key(model) for model in models]
+        modified_keys = [cls.modified_key(model) for model in models]
+        values = cache.get_many(version_keys + modified_keys)
+
+        versions = tuple(values.get(key, 0) for key in version_keys)
+        if not all(key in values for key in modified_keys):
+            return versions, None
+        return versions, max(values[key] for key in modified_keys)
+
+    @classmethod
+    def bump_version(cls, model: Type[Model]) -> None:
+        """
+        Tăng version của model, làm mọi response đã cache liên quan hết hiệu lực.
+
+        Args:
+            model: Lớp model
+        """
+        key = cls.version_key(model)
+        try:
+            cache.add(key, 0, None)
+            cache.incr(key)
+        except Exception:
+            # Cache lỗi: ghi đè version mới để không đọc lại response cũ
+            try:
+                cache.set(key, (cache.get(key) or 0) + 1, None)
+            except Exception:
+                pass
+
+        try:
+            cache.set(cls.modified_key(model), int(time.time()), None)
+        except Exception:
+            pass
+
+    @classmethod
+    def invalidate(cls, model: Type[Model]) -> None:
+        """
+        Tăng version của model sau khi transaction hiện tại được commit.
+
+        Args:
+            model: Lớp model
+        """
+        transaction.on_commit(lambda: cls.bump_version(model))
+
+    @classmethod
+    def build_key(cls, *parts: Any) -> str:
+        """
+        Tạo cache key từ các thành phần (path, query string, hệ thống xác thực, version, ...).
+
+        Returns:
+            str: Cache key
+        """
+        digest = hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+        return f"{cls.KEY_PREFIX}:{digest}"
+
+    @classmethod
+    def get(cls, key: str) -> Optional[Any]:
+        try:
+            return cache.get(key)
+        except Exception:
+            return None
+
+    @classmethod
+    def set(cls, key: str, value: Any, timeout: int) -> None:
+        try:
+            cache.set(key, value, timeout)
+        except Exception:
+            pass
@@ -0,0 +1,469 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, migrations
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.query import QuerySet
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from helpers.query_helper import (
+    VIETNAMESE_ACCENTED_CHARS,
+    VIETNAMESE_UNACCENTED_CHARS,
+    lower_unaccent,
+)
+from helpers.string_helper import unaccent_vn
+
+
+class SearchBackend:
+    """
+    Backend tìm kiếm mặc định cho BaseService.get_objects.
+
+    Lọc bằng `icontains` trên từng trường và xếp hạng kết quả theo mức độ khớp:
+    trùng khớp hoàn toàn > khớp phần đầu > chứa từ khóa.
+    """
+
+    RANK_ANNOTATION = "search_rank"
+    RANK_EXACT = 4
+    RANK_STARTSWITH = 2
+    RANK_CONTAINS = 1
+
+    def __init__(self, connection: Any):
+        """
+        Khởi tạo backend tìm kiếm.
+
+        Args:
+            connection: Kết nối cơ sở dữ liệu của queryset cần tìm kiếm
+        """
+        self.connection = connection
+
+    def normalize(self, keyword: str) -> str:
+        """
+        Chuẩn hóa từ khóa: bỏ dấu tiếng Việt, chữ thường và bỏ khoảng trắng thừa.
+
+        Args:
+            keyword: Từ khóa gốc
+
+        Returns:
+            str: Từ khóa đã chuẩn hóa
+        """
+        return " ".join(unaccent_vn(keyword).lower().split())
+
+    def search(
+        self, queryset: QuerySet, keyword: str, search_fields: Sequence[str]
+    ) -> QuerySet:
+        """
+        Lọc và xếp hạng queryset theo từ khóa.
+
+        Args:
+            queryset: Queryset cần tìm kiếm
+            keyword: Từ khóa tìm kiếm
+            search_fields: Danh sách các trường cần tìm kiếm
+
+        Returns:
+            QuerySet: Queryset đã lọc, có annotation `search_rank`
+        """
+        lookups = {field: field for field in search_fields}
+        return self.rank(queryset, lookups, keyword, case_insensitive=True)
+
+    def rank(
+        self,
+        queryset: QuerySet,
+        lookups: Dict[str, str],
+        keyword: str,
+        case_insensitive: bool = False,
+    ) -> QuerySet:
+        """
+        Áp dụng điều kiện lọc và annotation xếp hạng trên các biểu thức đã cho.
+
+        Args:
+            queryset: Queryset cần tìm kiếm
+            lookups: Map tên trường -> tên trường/annotation dùng để so khớp
+            keyword: Từ khóa đã chuẩn hóa (hoặc gốc nếu case_insensitive)
+            case_insensitive: Dùng các lookup không phân biệt hoa thường
+
+        Returns:
+            QuerySet: Queryset đã lọc và xếp hạng
+        """
+        prefix = "i" if case_insensitive else ""
+        search_query = Q()
+        rank = Value(0)
+
+        for target in lookups.values():
+            search_query |= Q(**{f"{target}__{prefix}contains": keyword})
+            rank = rank + Case(
+                When(**{f"{target}__{prefix}exact": keyword}, then=Value(self.RANK_EXACT)),
+                When(**{f"{target}__{prefix}startswith": keyword}, then=Value(self.RANK_STARTSWITH)),
+                When(**{f"{target}__{prefix}contains": keyword}, then=Value(self.RANK_CONTAINS)),
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+
+        return queryset.filter(search_query).annotate(
+            **{self.RANK_ANNOTATION: rank}
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Backend tìm kiếm cho PostgreSQL.
+
+    So khớp trên biểu thức `lower_unaccent(field)` nên tìm được cả khi người dùng
+    gõ không dấu. Các biểu thức này được đánh index GIN trigram (xem SearchIndex),
+    giúp `LIKE '%...%'` không phải quét toàn bảng.
+    """
+
+    def search(
+        self, queryset: QuerySet, keyword: str, search_fields: Sequence[str]
+    ) -> QuerySet:
+        keyword = self.normalize(keyword)
+
+        lookups = {}
+        annotations = {}
+        for field in search_fields:
+            alias = f"_search_{field.replace('__', '_')}"
+            annotations[alias] = lower_unaccent(F(field))
+            lookups[field] = alias
+
+        queryset = queryset.alias(**annotations)
+        return self.rank(queryset, lookups, keyword)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    Backend tìm kiếm cho SQLite dùng bảng ảo FTS5 (xem SearchIndex).
+
+    FTS5 chỉ so khớp theo từ (mỗi từ khóa là một prefix query): "nguy" tìm được
+    "Nguyễn" nhưng "456" không tìm được "0123456789". Từ khóa có chữ số (số điện
+    thoại, mã) vì vậy luôn dùng backend mặc định để giữ cách so khớp chuỗi con.
+
+    Nếu model chưa có bảng FTS5 hoặc trường tìm kiếm không nằm trong index,
+    sử dụng backend mặc định.
+    """
+
+    _fts_tables: Dict[Tuple[str, str], bool] = {}
+
+    def has_fts_table(self, table: str) -> bool:
+        """
+        Kiểm tra bảng FTS5 của một bảng đã tồn tại chưa (kết quả được cache theo tiến trình).
+
+        Args:
+            table: Tên bảng gốc
+
+        Returns:
+            bool: True nếu bảng FTS5 tồn tại
+        """
+        key = (self.connection.alias, table)
+        if key not in self._fts_tables:
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                    [SearchIndex.fts_table_name(table)],
+                )
+                self._fts_tables[key] = cursor.fetchone() is not None
+        return self._fts_tables[key]
+
+    def build_match(self, keyword: str, search_fields: Sequence[str]) -> Optional[str]:
+        """
+        Tạo biểu thức MATCH của FTS5: mỗi từ là một prefix query, giới hạn theo cột.
+
+        Args:
+            keyword: Từ khóa gốc
+            search_fields: Danh sách các cột cần tìm kiếm
+
+        Returns:
+            Optional[str]: Biểu thức MATCH hoặc None nếu từ khóa rỗng
+        """
+        tokens = self.normalize(keyword).split()
+        if not tokens:
+            return None
+
+        terms = " ".join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+        return "{%s} : (%s)" % (" ".join(search_fields), terms)
+
+    def search(
+        self, queryset: QuerySet, keyword: str, search_fields: Sequence[str]
+    ) -> QuerySet:
+        model = queryset.model
+        table = model._meta.db_table
+        index = SearchIndex.get(model)
+
+        if (
+            index is None
+            or any(char.isdigit() for char in keyword)
+            or not set(search_fields).issubset(index.fields)
+            or not self.has_fts_table(table)
+        ):
+            return super().search(queryset, keyword, search_fields)
+
+        match = self.build_match(keyword, search_fields)
+        if match is None:
+            return super().search(queryset, keyword, search_fields)
+
+        fts_table = SearchIndex.fts_table_name(table)
+        pk_column = model._meta.pk.column
+
+        # bm25 càng nhỏ càng liên quan, đổi dấu để sắp xếp giảm dần như các backend khác
+        rank_sql = (
+            f'(SELECT -bm25("{fts_table}") FROM "{fts_table}" '
+            f'WHERE "{fts_table}" MATCH %s AND "{fts_table}".rowid = "{table}"."{pk_column}")'
+        )
+        match_sql = f'SELECT rowid FROM "{fts_table}" WHERE "{fts_table}" MATCH %s'
+
+        return queryset.filter(pk__in=RawSQL(match_sql, [match])).annotate(
+            **{self.RANK_ANNOTATION: RawSQL(rank_sql, [match])}
+        )
+
+
+class SearchTextBackend(SearchBackend):
+    """
+    Backend tìm kiếm trên cột `search_text` đã được chuẩn hóa sẵn khi save
+    (xem PhoneUserBase.search_text), không phải bỏ dấu/chữ thường trên từng dòng.
+
+    Mỗi từ của từ khóa phải xuất hiện trong `search_text`; kết quả khớp cả cụm
+    (đặc biệt là khớp phần đầu) được xếp hạng cao hơn.
+    """
+
+    FIELD = "search_text"
+
+    @classmethod
+    def supports(cls, model: Any, search_fields: Sequence[str]) -> bool:
+        """
+        Kiểm tra model có cột `search_text` bao phủ đúng các trường cần tìm kiếm.
+
+        Args:
+            model: Lớp model
+            search_fields: Danh sách các trường cần tìm kiếm
+
+        Returns:
+            bool: True nếu có thể tìm kiếm trên `search_text`
+        """
+        try:
+            model._meta.get_field(cls.FIELD)
+        except FieldDoesNotExist:
+            return False
+
+        index_fields = getattr(model, "search_index_fields", None) or ()
+        return bool(search_fields) and set(search_fields) == set(index_fields)
+
+    def search(
+        self, queryset: QuerySet, keyword: str, search_fields: Sequence[str]
+    ) -> QuerySet:
+        keyword = self.normalize(keyword)
+
+        search_query = Q()
+        for token in keyword.split():
+            search_query &= Q(**{f"{self.FIELD}__contains": token})
+
+        rank = Case(
+            When(**{f"{self.FIELD}__startswith": keyword}, then=Value(self.RANK_STARTSWITH)),
+            When(**{f"{self.FIELD}__contains": keyword}, then=Value(self.RANK_CONTAINS)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+
+        return queryset.filter(search_query).annotate(
+            **{self.RANK_ANNOTATION: rank}
+        )
+
+
+class SearchIndex:
+    """
+    Khai báo index tìm kiếm cho một model và sinh SQL tạo/xóa index theo từng loại CSDL.
+
+    - PostgreSQL: index GIN trigram trên `lower_unaccent(field)` (cần extension pg_trgm)
+    - SQLite: bảng ảo FTS5 `<table>_fts` (external content) và các trigger đồng bộ
+
+    Model khai báo các trường được đánh index bằng thuộc tính `search_index_fields`;
+    migration tạo index bằng `SearchIndex(...).operation()`.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        fields: Sequence[str],
+        pk_column: str = "id",
+        normalized: bool = False,
+    ):
+        """
+        Args:
+            table: Tên bảng gốc
+            fields: Danh sách cột cần đánh index
+            pk_column: Cột khóa chính (rowid của bảng FTS5)
+            normalized: Các cột đã được chuẩn hóa sẵn (ví dụ `search_text`), chỉ
+                tạo index trigram trực tiếp trên cột (PostgreSQL)
+        """
+        self.table = table
+        self.fields = tuple(fields)
+        self.pk_column = pk_column
+        self.normalized = normalized
+
+    @classmethod
+    def get(cls, model: Any) -> Optional["SearchIndex"]:
+        """
+        Lấy index tìm kiếm của một model từ thuộc tính `search_index_fields`.
+
+        Returns:
+            Optional[SearchIndex]: Index hoặc None nếu model không khai báo
+        """
+        fields = getattr(model, "search_index_fields", None)
+        if not fields:
+            return None
+        return cls(model._meta.db_table, fields, model._meta.pk.column)
+
+    @staticmethod
+    def fts_table_name(table: str) -> str:
+        return f"{table}_fts"
+
+    def _sqlite_value(self, row: str, field: str) -> str:
+        # FTS5 (remove_diacritics) không tách được "đ" nên thay thế trước khi index
+        return f"replace(replace(coalesce({row}\"{field}\", ''), 'đ', 'd'), 'Đ', 'D')"
+
+    def sqlite_create_sql(self) -> List[str]:
+        if self.normalized:
+            return []
+
+        fts = self.fts_table_name(self.table)
+        columns = ", ".join(f'"{field}"' for field in self.fields)
+        new_values = ", ".join(self._sqlite_value("new.", field) for field in self.fields)
+        old_values = ", ".join(self._sqlite_value("old.", field) for field in self.fields)
+        select_values = ", ".join(self._sqlite_value("", field) for field in self.fields)
+
+        return [
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5({columns}, '
+            f"content='{self.table}', content_rowid='{self.pk_column}', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_ai" AFTER INSERT ON "{self.table}" BEGIN '
+            f'INSERT INTO "{fts}"(rowid, {columns}) VALUES (new."{self.pk_column}", {new_values}); END',
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_ad" AFTER DELETE ON "{self.table}" BEGIN '
+            f'INSERT INTO "{fts}"("{fts}", rowid, {columns}) VALUES (\'delete\', old."{self.pk_column}", {old_values}); END',
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_au" AFTER UPDATE ON "{self.table}" BEGIN '
+            f'INSERT INTO "{fts}"("{fts}", rowid, {columns}) VALUES (\'delete\', old."{self.pk_column}", {old_values}); '
+            f'INSERT INTO "{fts}"(rowid, {columns}) VALUES (new."{self.pk_column}", {new_values}); END',
+            f'INSERT INTO "{fts}"(rowid, {columns}) SELECT "{self.pk_column}", {select_values} FROM "{self.table}"',
+        ]
+
+    def sqlite_drop_sql(self) -> List[str]:
+        if self.normalized:
+            return []
+
+        fts = self.fts_table_name(self.table)
+        return [
+            f'DROP TRIGGER IF EXISTS "{fts}_ai"',
+            f'DROP TRIGGER IF EXISTS "{fts}_ad"',
+            f'DROP TRIGGER IF EXISTS "{fts}_au"',
+            f'DROP TABLE IF EXISTS "{fts}"',
+        ]
+
+    def _postgres_index_name(self, field: str) -> str:
+        return f"{self.table}_{field}_trgm_idx"[:63]
+
+    def postgres_create_sql(self) -> List[str]:
+        statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"]
+        for field in self.fields:
+            if self.normalized:
+                expression = f'"{field}"'
+            else:
+                expression = (
+                    f"TRIM(translate(LOWER(\"{field}\"), "
+                    f"'{VIETNAMESE_ACCENTED_CHARS}', '{VIETNAMESE_UNACCENTED_CHARS}'))"
+                )
+            statements.append(
+                f'CREATE INDEX IF NOT EXISTS "{self._postgres_index_name(field)}" '
+                f'ON "{self.table}" USING gin (({expression}) gin_trgm_ops)'
+            )
+        return statements
+
+    def postgres_drop_sql(self) -> List[str]:
+        return [
+            f'DROP INDEX IF EXISTS "{self._postgres_index_name(field)}"'
+            for field in self.fields
+        ]
+
+    def create(self, schema_editor: Any) -> None:
+        """
+        Tạo index tìm kiếm phù hợp với CSDL đang dùng.
+        """
+        vendor = schema_editor.connection.vendor
+        if vendor == "postgresql":
+            statements = self.postgres_create_sql()
+        elif vendor == "sqlite":
+            statements = self.sqlite_create_sql()
+        else:
+            return
+
+        for statement in statements:
+            schema_editor.execute(statement, params=None)
+
+        SQLiteSearchBackend._fts_tables.clear()
+
+    def drop(self, schema_editor: Any) -> None:
+        """
+        Xóa index tìm kiếm phù hợp với CSDL đang dùng.
+        """
+        vendor = schema_editor.connection.vendor
+        if vendor == "postgresql":
+            statements = self.postgres_drop_sql()
+        elif vendor == "sqlite":
+            statements = self.sqlite_drop_sql()
+        else:
+            return
+
+        for statement in statements:
+            schema_editor.execute(statement, params=None)
+
+        SQLiteSearchBackend._fts_tables.clear()
+
+    def operation(self) -> migrations.RunPython:
+        """
+        Tạo migration operation tạo (và xóa khi rollback) index tìm kiếm.
+
+        Returns:
+            migrations.RunPython: Operation dùng trong migration
+        """
+        return migrations.RunPython(
+            lambda apps, schema_editor: self.create(schema_editor),
+            lambda apps, schema_editor: self.drop(schema_editor),
+        )
+
+    def drop_operation(self) -> migrations.RunPython:
+        """
+        Tạo migration operation xóa (và tạo lại khi rollback) index tìm kiếm.
+
+        Returns:
+            migrations.RunPython: Operation dùng trong migration
+        """
+        return migrations.RunPython(
+            lambda apps, schema_editor: self.drop(schema_editor),
+            lambda apps, schema_editor: self.create(schema_editor),
+        )
+
+
+SEARCH_BACKENDS: Dict[str, Type[SearchBackend]] = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteSearchBackend,
+}
+
+
+def get_search_backend(
+    queryset: QuerySet, search_fields: Optional[Sequence[str]] = None
+) -> SearchBackend:
+    """
+    Lấy backend tìm kiếm phù hợp với queryset.
+
+    Ưu tiên cột `search_text` nếu model có và bao phủ các trường cần tìm kiếm,
+    ngược lại chọn backend theo CSDL.
+
+    Args:
+        queryset: Queryset cần tìm kiếm
+        search_fields: Danh sách các trường cần tìm kiếm
+
+    Returns:
+        SearchBackend: Backend tìm kiếm
+    """
+    connection = connections[queryset.db]
+
+    if search_fields and SearchTextBackend.supports(queryset.model, search_fields):
+        return SearchTextBackend(connection)
+
+    backend_class = SEARCH_BACKENDS.get(connection.vendor, SearchBackend)
+    return backend_class(connection)
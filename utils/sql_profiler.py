@@ -0,0 +1,163 @@
+from django.utils.deprecation import MiddlewareMixin
+from django.db import connections
+from django.conf import settings
+
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from typing import Any, Dict
+
+import logging
+import time
+import json
+import re
+
+from constants import AppMode
+from helpers import get_client_ip
+
+
+logger = logging.getLogger("django.profiler")
+
+
+class QueryProfile:
+    """
+    Bộ ghi truy vấn SQL của một request, dùng làm execute_wrapper của connection.
+
+    Ghi lại số truy vấn, tổng thời gian, số câu lệnh trùng lặp hoàn toàn (cùng SQL
+    và tham số) và số lần chạy mỗi "dạng" SQL (bỏ tham số, gộp danh sách IN/VALUES).
+    Một dạng SQL chạy từ `n_plus_one_threshold` lần trở lên được đánh dấu là N+1.
+    """
+
+    # Gộp danh sách placeholder có độ dài thay đổi: IN (%s, %s, ...) và VALUES (...), (...)
+    IN_LIST_RE = re.compile(r"\(\s*%s(?:\s*,\s*%s)*\s*\)")
+    VALUES_RE = re.compile(r"(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+")
+
+    MAX_SQL_LENGTH = 300
+
+    def __init__(self, n_plus_one_threshold: int = 5):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+        self.shapes = Counter()
+        self.shape_durations = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, params, time.perf_counter() - start)
+
+    @classmethod
+    def get_shape(cls, sql: str) -> str:
+        return cls.VALUES_RE.sub(r"\1", cls.IN_LIST_RE.sub("(...)", sql))
+
+    def record(self, sql: str, params: Any, duration: float) -> None:
+        shape = self.get_shape(sql)
+
+        self.count += 1
+        self.duration += duration
+        self.shapes[shape] += 1
+        self.shape_durations[shape] += duration
+        self.statements[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self) -> int:
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def get_n_plus_one(self):
+        return [
+            {
+                "sql": shape[:self.MAX_SQL_LENGTH],
+                "count": count,
+                "time_ms": round(self.shape_durations[shape] * 1000, 2),
+            }
+            for shape, count in self.shapes.most_common()
+            if count >= self.n_plus_one_threshold
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Tổng hợp kết quả của request.
+
+        Returns:
+            Dict: Số truy vấn, thời gian CSDL (ms), số câu lệnh trùng lặp và các dạng N+1
+        """
+        return {
+            "queries": self.count,
+            "db_time_ms": round(self.duration * 1000, 2),
+            "duplicates": self.duplicates,
+            "n_plus_one": self.get_n_plus_one(),
+        }
+
+
+class SQLProfilerMiddleware(MiddlewareMixin):
+    """
+    Đo truy vấn SQL của mỗi request bằng `connection.execute_wrapper` trên mọi CSDL.
+
+    - Chế độ debug: trả kết quả trong các header X-DB-*.
+    - Mọi chế độ: ghi log có cấu trúc (JSON) vào logger `django.profiler` khi phát
+      hiện N+1 hoặc request vượt ngưỡng số truy vấn/thời gian CSDL.
+
+    Cấu hình trong settings.SQL_PROFILER (xem DEFAULT_CONFIG), mặc định chỉ bật khi
+    AppMode.DEBUG (bật ở production bằng SQL_PROFILER_ENABLED).
+    Truy vấn chạy khi đang stream response (StreamingHttpResponse) không được tính.
+    """
+
+    DEFAULT_CONFIG = {
+        "ENABLED": AppMode.DEBUG,
+        "N_PLUS_ONE_THRESHOLD": 5,
+        "LOG_MIN_QUERIES": 50,
+        "LOG_MIN_DB_TIME_MS": 500,
+    }
+
+    def get_config(self) -> Dict[str, Any]:
+        return {**self.DEFAULT_CONFIG, **getattr(settings, "SQL_PROFILER", {})}
+
+    def process_request(self, request):
+        config = self.get_config()
+        if not config["ENABLED"]:
+            return
+
+        profile = QueryProfile(n_plus_one_threshold=config["N_PLUS_ONE_THRESHOLD"])
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(profile))
+
+        request._sql_profile = profile
+        request._sql_profile_stack = stack
+
+    def process_response(self, request, response):
+        stack = getattr(request, "_sql_profile_stack", None)
+        if stack is None:
+            return response
+
+        stack.close()
+        del request._sql_profile_stack
+
+        config = self.get_config()
+        summary = request._sql_profile.summary()
+
+        if AppMode.DEBUG:
+            response["X-DB-Query-Count"] = str(summary["queries"])
+            response["X-DB-Time-Ms"] = str(summary["db_time_ms"])
+            response["X-DB-Duplicate-Queries"] = str(summary["duplicates"])
+            response["X-DB-N-Plus-One"] = str(len(summary["n_plus_one"]))
+
+        if (
+            summary["n_plus_one"]
+            or summary["queries"] >= config["LOG_MIN_QUERIES"]
+            or summary["db_time_ms"] >= config["LOG_MIN_DB_TIME_MS"]
+        ):
+            payload = {
+                "method": request.method,
+                "path": request.path,
+                "status_code": response.status_code,
+                **summary,
+            }
+            logger.warning(
+                json.dumps(payload, ensure_ascii=False),
+                extra={"client_ip": get_client_ip(request)},
+            )
+
+        return response
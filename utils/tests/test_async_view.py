@@ -0,0 +1,102 @@
+from django.test import RequestFactory, TestCase, override_settings
+from django.conf import settings
+from django.urls import path
+from django.utils.module_loading import import_string
+
+from asgiref.sync import iscoroutinefunction
+
+from apps.accounts.models import User
+from apps.accounts.serializers.user import response_serializer
+from apps.accounts.services.user_service import UserService
+from helpers.token_helper import Token
+from utils.permissions import Authenticated
+from utils.token_revocation import LocalRevocationStore, TokenRevocation
+from utils.views import AsyncAPIGenericView
+
+
+class AsyncUserView(AsyncAPIGenericView):
+    permission_classes = [Authenticated.Manage]
+
+    action_serializers = {
+        "retrieve_response": response_serializer.UserShortDetailSerializer,
+        "create_response": response_serializer.UserShortDetailSerializer,
+    }
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.service = UserService()
+
+    async def retrieve(self, request, pk):
+        instance = await self.service.aget_by_id(pk, only=self.get_only_fields())
+        return self.get_response_data(instance)
+
+    async def create(self, request):
+        instance = await self.service.acreate(**request.data, password="x")
+        return self.get_response_data(instance)
+
+
+urlpatterns = [
+    path("users/", AsyncUserView.as_view({"post": "create"})),
+    path("users/<int:pk>/", AsyncUserView.as_view({"get": "retrieve"})),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class AsyncAPIGenericViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(phone_number="0900000001", full_name="An", password="x")
+        cls.token = Token(cls.user.pk, RequestFactory().get("/")).access_token
+
+    def setUp(self):
+        TokenRevocation._store = LocalRevocationStore()
+        TokenRevocation._bloom = None
+        TokenRevocation._epoch = None
+        self.addCleanup(setattr, TokenRevocation, "_store", None)
+        self.addCleanup(setattr, TokenRevocation, "_bloom", None)
+        self.addCleanup(setattr, TokenRevocation, "_epoch", None)
+
+        self.headers = {"Authorization": f"Bearer {self.token}"}
+
+    def test_view_is_coroutine_function(self):
+        self.assertTrue(iscoroutinefunction(AsyncUserView.as_view({"get": "retrieve"})))
+
+    def test_middleware_is_async_capable(self):
+        # Middleware chỉ hỗ trợ sync khiến view async chạy qua async_to_sync
+        for name in settings.MIDDLEWARE:
+            self.assertTrue(getattr(import_string(name), "async_capable", False), name)
+
+    async def test_retrieve(self):
+        response = await self.async_client.get(f"/users/{self.user.pk}/", headers=self.headers)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"]["full_name"], "An")
+        self.assertIn("ETag", response)
+
+    async def test_not_modified(self):
+        etag = (await self.async_client.get(f"/users/{self.user.pk}/", headers=self.headers))["ETag"]
+
+        response = await self.async_client.get(f"/users/{self.user.pk}/", headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get(f"/users/{self.user.pk}/")
+        self.assertEqual(response.json()["status"], 401)
+
+    async def test_revoked_token_is_rejected(self):
+        TokenRevocation.revoke_user("manage", self.user.pk)
+
+        response = await self.async_client.get(f"/users/{self.user.pk}/", headers=self.headers)
+        self.assertEqual(response.json()["status"], 401)
+
+    async def test_create_records_current_user(self):
+        response = await self.async_client.post(
+            "/users/",
+            {"phone_number": "0900000002", "full_name": "Bình"},
+            content_type="application/json",
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        created = await User.objects.select_related("created_by").aget(phone_number="0900000002")
+        self.assertEqual(created.created_by_id, self.user.pk)
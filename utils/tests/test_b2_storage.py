@@ -0,0 +1,177 @@
+from django.test import SimpleTestCase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import threading
+import requests
+import hashlib
+import random
+import json
+import io
+
+from utils.b2_storage.backblaze_b2 import BackBlazeB2
+
+
+class FakeB2Handler(BaseHTTPRequestHandler):
+    """
+    Giả lập các API B2 được dùng khi tải lên, ghi lại mọi yêu cầu vào `server.state`.
+    """
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_port}"
+
+    def send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def next_status(self, key):
+        # Mã lỗi được cấu hình cho lần gọi này (hết danh sách: thành công)
+        statuses = self.server.state["failures"].get(key)
+        return statuses.pop(0) if statuses else 200
+
+    def do_GET(self):
+        if self.path.startswith("/b2api/v2/b2_authorize_account"):
+            return self.send(200, {"apiUrl": self.base_url, "downloadUrl": self.base_url, "authorizationToken": "account"})
+        if self.path.startswith("/b2api/v1/b2_get_upload_url"):
+            return self.send(200, {"uploadUrl": f"{self.base_url}/upload", "authorizationToken": "upload"})
+        self.send(404, {})
+
+    def do_POST(self):
+        data = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        state = self.server.state
+
+        with self.server.lock:
+            if self.path == "/upload":
+                state["uploads"].append((data, self.headers["X-Bz-Content-Sha1"]))
+                status = self.next_status("upload")
+                return self.send(status, {"fileName": self.headers["X-Bz-File-Name"]} if status == 200 else {})
+
+            if self.path.startswith("/part/"):
+                file_id = self.path.rsplit("/", 1)[1]
+                part_number = int(self.headers["X-Bz-Part-Number"])
+                state["attempts"].append((part_number, data, self.headers["X-Bz-Content-Sha1"]))
+                status = self.next_status(part_number)
+                if status == 200:
+                    state["parts"][(file_id, part_number)] = data
+                return self.send(status, {"partNumber": part_number} if status == 200 else {"code": "error"})
+
+            payload = json.loads(data or b"{}")
+            if self.path == "/b2api/v2/b2_start_large_file":
+                file_id = f"file{len(state['files'])}"
+                state["files"][file_id] = payload["fileName"]
+                return self.send(200, {"fileId": file_id})
+            if self.path == "/b2api/v2/b2_get_upload_part_url":
+                return self.send(200, {"uploadUrl": f"{self.base_url}/part/{payload['fileId']}", "authorizationToken": "part"})
+            if self.path == "/b2api/v2/b2_finish_large_file":
+                state["finished"].append(payload)
+                return self.send(200, {"fileId": payload["fileId"], "fileName": state["files"][payload["fileId"]]})
+            if self.path == "/b2api/v2/b2_cancel_large_file":
+                state["cancelled"].append(payload["fileId"])
+                return self.send(200, {})
+
+        self.send(404, {})
+
+
+class SmallPartB2(BackBlazeB2):
+    PART_SIZE = 100_000
+    LARGE_FILE_THRESHOLD = 2 * PART_SIZE
+    BACKOFF_BASE = 0.01
+    MAX_RETRIES = 3
+
+
+class BackBlazeB2UploadTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeB2Handler)
+        cls.server.lock = threading.Lock()
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.server.state = self.state = {
+            "failures": {},
+            "files": {},
+            "parts": {},
+            "attempts": [],
+            "uploads": [],
+            "finished": [],
+            "cancelled": [],
+        }
+        self.b2 = SmallPartB2("key", "account", "bucket", "bucket-id", api_url=f"http://127.0.0.1:{self.server.server_port}")
+        self.blob = random.Random(0).randbytes(350_123)
+
+    def get_parts(self, file_id="file0"):
+        return [data for (fid, _), data in sorted(self.state["parts"].items()) if fid == file_id]
+
+    def test_large_file_is_split_into_ordered_parts(self):
+        result = self.b2.upload_file("big.bin", io.BytesIO(self.blob))
+
+        self.assertEqual(result["fileName"], "big.bin")
+        parts = self.get_parts()
+        self.assertEqual([len(part) for part in parts], [100_000, 100_000, 100_000, 50_123])
+        self.assertEqual(b"".join(parts), self.blob)
+
+        for _, data, sha1 in self.state["attempts"]:
+            self.assertEqual(hashlib.sha1(data).hexdigest(), sha1)
+
+        self.assertEqual(len(self.state["finished"]), 1)
+        self.assertEqual(
+            self.state["finished"][0]["partSha1Array"],
+            [hashlib.sha1(part).hexdigest() for part in parts],
+        )
+        self.assertEqual(self.state["cancelled"], [])
+
+    def test_retry_resends_the_same_part(self):
+        self.state["failures"][2] = [503, 503]
+
+        self.b2.upload_file("big.bin", io.BytesIO(self.blob))
+
+        attempts = [(data, sha1) for part_number, data, sha1 in self.state["attempts"] if part_number == 2]
+        self.assertEqual(len(attempts), 3)
+        expected = self.blob[100_000:200_000]
+        for data, sha1 in attempts:
+            self.assertEqual(data, expected)
+            self.assertEqual(sha1, hashlib.sha1(expected).hexdigest())
+
+        self.assertEqual(b"".join(self.get_parts()), self.blob)
+        self.assertEqual(len(self.state["finished"]), 1)
+
+    def test_permanent_part_failure_cancels_large_file(self):
+        self.state["failures"][3] = [400]
+
+        with self.assertRaises(requests.HTTPError):
+            self.b2.upload_file("big.bin", io.BytesIO(self.blob))
+
+        self.assertEqual(self.state["cancelled"], ["file0"])
+        self.assertEqual(self.state["finished"], [])
+
+    def test_retries_are_exhausted(self):
+        self.state["failures"][1] = [503] * (SmallPartB2.MAX_RETRIES + 1)
+
+        with self.assertRaises(requests.HTTPError):
+            self.b2.upload_file("big.bin", io.BytesIO(self.blob))
+
+        self.assertEqual(len([1 for part_number, *_ in self.state["attempts"] if part_number == 1]), SmallPartB2.MAX_RETRIES + 1)
+        self.assertEqual(self.state["cancelled"], ["file0"])
+
+    def test_small_file_retry(self):
+        self.state["failures"]["upload"] = [503]
+
+        result = self.b2.upload_file("small.bin", io.BytesIO(b"hello"))
+
+        self.assertEqual(result["fileName"], "small.bin")
+        self.assertEqual(self.state["uploads"], [(b"hello", hashlib.sha1(b"hello").hexdigest())] * 2)
+        self.assertEqual(self.state["files"], {})
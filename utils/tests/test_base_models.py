@@ -0,0 +1,23 @@
+from django.test import TestCase
+
+from apps.accounts.models import User
+
+
+class BaseModelSaveTest(TestCase):
+    def test_insert_with_preallocated_pk_is_not_an_update(self):
+        user = User(pk=500, phone_number="0123456789", full_name="Nguyễn Văn An", password="x")
+        user.save()
+
+        user.refresh_from_db()
+        self.assertIsNone(user.updated_at)
+
+    def test_update_sets_updated_at(self):
+        user = User.objects.create(phone_number="0123456789", full_name="Nguyễn Văn An", password="x")
+        user.refresh_from_db()
+        self.assertIsNone(user.updated_at)
+
+        user.full_name = "Nguyễn Văn Ân"
+        user.save()
+
+        user.refresh_from_db()
+        self.assertIsNotNone(user.updated_at)
@@ -0,0 +1,68 @@
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.accounts.services.user_service import UserService
+from utils.exception import MessageError
+
+
+class BulkUniqueTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.an = User.objects.create(phone_number="0123456789", full_name="Nguyễn Văn An", password="x")
+        cls.binh = User.objects.create(phone_number="0987654321", full_name="Trần Thị Bình", password="x")
+
+    def setUp(self):
+        self.service = UserService()
+
+    def test_bulk_create_rejects_duplicates_in_batch(self):
+        with self.assertRaisesMessage(MessageError, "0911111111"):
+            self.service.bulk_create([
+                {"phone_number": "0911111111", "full_name": "A", "password": "x"},
+                {"phone_number": "0911111111", "full_name": "B", "password": "x"},
+            ])
+        self.assertFalse(User.objects.filter(phone_number="0911111111").exists())
+
+    def test_bulk_create_rejects_existing_values(self):
+        with self.assertRaisesMessage(MessageError, self.an.phone_number):
+            self.service.bulk_create([
+                {"phone_number": "0922222222", "full_name": "A", "password": "x"},
+                {"phone_number": self.an.phone_number, "full_name": "B", "password": "x"},
+            ])
+        self.assertFalse(User.objects.filter(phone_number="0922222222").exists())
+
+    def test_bulk_create_reuses_values_of_deleted_rows(self):
+        # Xóa mềm gắn flag __deleted__<pk> vào số điện thoại nên giá trị được giải phóng
+        self.service.bulk_delete([self.binh.pk])
+
+        created = self.service.bulk_create([
+            {"phone_number": "0987654321", "full_name": "Bình mới", "password": "x"},
+        ])
+        self.assertEqual(len(created), 1)
+        self.assertEqual(User.objects.filter(phone_number="0987654321", is_delete=False).count(), 1)
+
+    def test_bulk_update_excludes_own_rows(self):
+        self.an.full_name = "Nguyễn Văn Ân"
+        self.binh.full_name = "Trần Bình"
+        self.service.bulk_update([self.an, self.binh], ["phone_number", "full_name"])
+
+        self.an.refresh_from_db()
+        self.assertEqual(self.an.full_name, "Nguyễn Văn Ân")
+
+    def test_bulk_update_rejects_swapped_into_existing_value(self):
+        self.an.phone_number = self.binh.phone_number
+        with self.assertRaisesMessage(MessageError, self.binh.phone_number):
+            self.service.bulk_update([self.an], ["phone_number"])
+
+    def test_bulk_update_checks_only_given_fields(self):
+        # phone_number trùng nhưng không nằm trong fields cần ghi
+        self.an.phone_number = self.binh.phone_number
+        self.an.full_name = "An"
+        self.service.bulk_update([self.an], ["full_name"])
+
+        self.an.refresh_from_db()
+        self.assertEqual(self.an.phone_number, "0123456789")
+
+    def test_bulk_delete_rejects_unknown_ids(self):
+        with self.assertRaisesMessage(MessageError, "Không tìm thấy dữ liệu"):
+            self.service.bulk_delete([self.an.pk, 999999])
+        self.assertTrue(User.objects.filter(pk=self.an.pk, is_delete=False).exists())
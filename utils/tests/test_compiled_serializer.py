@@ -0,0 +1,63 @@
+from rest_framework import serializers
+from django.test import TestCase
+
+from apps.accounts.models import User
+from utils.compiled_serializer import CompiledModelSerializer, CompiledSerializer
+
+
+class SuffixField(serializers.CharField):
+    def to_representation(self, value):
+        return f"{value}{self.context['suffix']}"
+
+
+class UserContextSerializer(CompiledModelSerializer):
+    full_name = SuffixField()
+    marker = serializers.SerializerMethodField()
+
+    class Meta:
+        model = User
+        fields = ["id", "phone_number", "full_name", "marker"]
+
+    def get_marker(self, instance):
+        return self.context["suffix"]
+
+
+class UserColumnSerializer(CompiledModelSerializer):
+    full_name = SuffixField()
+
+    class Meta:
+        model = User
+        fields = ["id", "phone_number", "full_name"]
+
+
+class CompiledSerializerTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(phone_number="0900000001", full_name="An", password="x")
+
+    def serialize(self, serializer_class, suffix):
+        serializer = serializer_class(context={"suffix": suffix})
+        compiled = CompiledSerializer.from_serializer(serializer)
+        objects = list(compiled.prepare(User.objects.filter(pk=self.user.pk)))
+        return compiled, compiled.serialize(objects, serializer)
+
+    def test_matches_drf_output(self):
+        serializer = UserContextSerializer(context={"suffix": "!"})
+        _, data = self.serialize(UserContextSerializer, "!")
+        self.assertEqual(data, [serializer.to_representation(self.user)])
+
+    def test_uses_context_of_current_serializer(self):
+        first, data = self.serialize(UserContextSerializer, "-a")
+        self.assertEqual((data[0]["full_name"], data[0]["marker"]), ("An-a", "-a"))
+
+        second, data = self.serialize(UserContextSerializer, "-b")
+        self.assertIs(first, second)
+        self.assertEqual((data[0]["full_name"], data[0]["marker"]), ("An-b", "-b"))
+
+    def test_values_list_path_uses_context_of_current_serializer(self):
+        compiled, data = self.serialize(UserColumnSerializer, "-a")
+        self.assertTrue(compiled.values_only)
+        self.assertEqual(data[0]["full_name"], "An-a")
+
+        _, data = self.serialize(UserColumnSerializer, "-b")
+        self.assertEqual(data[0], {"id": self.user.pk, "phone_number": "0900000001", "full_name": "An-b"})
@@ -0,0 +1,89 @@
+from rest_framework.test import APIRequestFactory
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.accounts.views.user_view import UserAPIGenericView
+from utils.response_cache import ResponseCache
+
+
+class OpenUserView(UserAPIGenericView):
+    authentication_classes = []
+    permission_classes = []
+    cache_action_timeouts = {}
+
+
+class ConditionalListTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create(phone_number="0900000001", full_name="An", password="x")
+
+    def setUp(self):
+        cache.clear()
+        self.view = OpenUserView.as_view({"get": "list"})
+
+    def get(self, **headers):
+        return self.view(APIRequestFactory().get("/users/", **headers))
+
+    def test_list_fingerprint_does_not_query(self):
+        with self.assertNumQueries(0):
+            fingerprint = OpenUserView(action="list").get_list_fingerprint()
+        self.assertIsNotNone(fingerprint)
+
+    def test_not_modified_without_queries(self):
+        etag = self.get()["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_model_change_changes_etag(self):
+        etag = self.get()["ETag"]
+        ResponseCache.bump_version(User)
+
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertIn("Last-Modified", response)
+
+
+class ConditionalDetailTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(phone_number="0900000001", full_name="An", password="x")
+
+    def setUp(self):
+        cache.clear()
+        self.view = OpenUserView.as_view({"get": "retrieve"})
+
+    def get(self, **headers):
+        return self.view(APIRequestFactory().get(f"/users/{self.user.pk}/", **headers), pk=str(self.user.pk))
+
+    def test_unconditional_get_loads_the_object_once(self):
+        with self.assertNumQueries(1):
+            response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+
+    def test_etag_from_loaded_object_matches_precomputed_fingerprint(self):
+        etag = self.get()["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        User.objects.filter(pk=self.user.pk).update(full_name="Ân", updated_at=timezone.now())
+        response = self.get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_sparse_fields_keep_etag_without_extra_query(self):
+        with self.assertNumQueries(1):
+            response = self.get_with_query("?fields=full_name")
+        self.assertIn("ETag", response)
+        self.assertEqual(set(response.data["data"]), {"full_name"})
+
+    def get_with_query(self, query, **headers):
+        request = APIRequestFactory().get(f"/users/{self.user.pk}/{query}", **headers)
+        return self.view(request, pk=str(self.user.pk))
@@ -0,0 +1,21 @@
+from django.test import SimpleTestCase
+
+from utils.exception import hide_sensitive
+
+
+class HideSensitiveTest(SimpleTestCase):
+    def test_hides_credentials_and_tokens(self):
+        data = hide_sensitive({
+            "phone_number": "0123456789",
+            "password": "secret",
+            "token": "t",
+            "access_token": "a",
+            "refresh_token": "r",
+        })
+
+        self.assertEqual(data["phone_number"], "0123456789")
+        for field in ("password", "token", "access_token", "refresh_token"):
+            self.assertEqual(data[field], "***HIDDEN***")
+
+    def test_keeps_non_mapping_items(self):
+        self.assertEqual(hide_sensitive("raw"), "raw")
@@ -0,0 +1,107 @@
+from django.test import SimpleTestCase
+
+import io
+import logging
+import os
+import tempfile
+
+from utils.logging import BatchStreamHandler, BoundedQueueHandler
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.flushes = 0
+
+    def flush(self):
+        self.flushes += 1
+        super().flush()
+
+
+def make_record(message, level=logging.INFO):
+    return logging.LogRecord("test", level, __file__, 0, message, None, None)
+
+
+class BoundedQueueHandlerTest(SimpleTestCase):
+    def make_handler(self, queue_size=BoundedQueueHandler.QUEUE_SIZE):
+        handler = BoundedQueueHandler(handlers=["target"], queue_size=queue_size)
+        self.addCleanup(handler.close)
+        return handler
+
+    def make_target(self, stream=None):
+        target = BatchStreamHandler(stream if stream is not None else CountingStream())
+        target.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        return target
+
+    def test_overflow_is_counted_and_reported(self):
+        handler = self.make_handler(queue_size=2)
+        for i in range(5):
+            handler.handle(make_record(f"bản ghi {i}"))
+        self.assertEqual(handler.dropped, 3)
+
+        target = self.make_target()
+        handler.start([target])
+        handler.stop()
+
+        lines = target.stream.getvalue().splitlines()
+        self.assertEqual(lines[:2], ["INFO bản ghi 0", "INFO bản ghi 1"])
+        self.assertIn("WARNING Hàng đợi log đầy, đã bỏ qua 3 bản ghi", lines)
+        self.assertEqual(handler.dropped, 0)
+
+    def test_batch_is_flushed_once(self):
+        handler = self.make_handler()
+        for i in range(10):
+            handler.handle(make_record(f"bản ghi {i}"))
+
+        target = self.make_target()
+        handler.start([target])
+        handler.stop()
+
+        self.assertEqual(len(target.stream.getvalue().splitlines()), 10)
+        self.assertEqual(target.stream.flushes, 1)
+        # Ngoài lô, handler flush như bình thường
+        target.handle(make_record("trực tiếp"))
+        self.assertEqual(target.stream.flushes, 2)
+
+    def test_target_level_is_respected(self):
+        handler = self.make_handler()
+        target = self.make_target()
+        target.setLevel(logging.WARNING)
+        handler.start([target])
+        handler.handle(make_record("info"))
+        handler.handle(make_record("warning", logging.WARNING))
+        handler.stop()
+
+        self.assertEqual(target.stream.getvalue().splitlines(), ["WARNING warning"])
+
+    def test_listener_is_restarted_in_forked_child(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "fork.log")
+        stream = open(path, "a", encoding="utf-8")
+        self.addCleanup(stream.close)
+
+        handler = self.make_handler()
+        handler.start([self.make_target(stream)])
+        parent_queue = handler.queue
+
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                # Hàng đợi và luồng nền mới được tạo bởi hook sau fork
+                if handler.queue is not parent_queue and handler.listener is not None:
+                    handler.handle(make_record("từ tiến trình con"))
+                    handler.stop()
+                    code = 0
+            finally:
+                os._exit(code)
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.WEXITSTATUS(status), 0)
+
+        # Listener của tiến trình cha vẫn hoạt động
+        handler.handle(make_record("từ tiến trình cha"))
+        handler.stop()
+        with open(path, encoding="utf-8") as f:
+            self.assertEqual(f.read(), "INFO từ tiến trình con\nINFO từ tiến trình cha\n")
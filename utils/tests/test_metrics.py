@@ -0,0 +1,132 @@
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from unittest import mock
+
+import json
+import os
+import tempfile
+import time
+import jwt
+
+from helpers.token_helper import Token
+from utils.metrics import Metrics, metrics_view
+from utils.mixins.serializer_mixin import EmptySerializer
+from utils.views import APIView
+
+
+class MetricsCacheTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings_override = override_settings(METRICS={"DIRECTORY": directory.name})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        Token._decode_cache.clear()
+        Token._decode_cache.hits = Token._decode_cache.misses = 0
+        Metrics._pid = None
+        self.addCleanup(setattr, Metrics, "_pid", None)
+
+    def test_exports_token_decode_cache(self):
+        token = jwt.encode({"user_id": 1, "exp": 4102444800}, Token.SIGNING_KEY, Token.ALGORITHM)
+        for _ in range(3):
+            Token.decode_token_cached(token)
+
+        output = Metrics.render()
+
+        self.assertIn('cache_hits_total{cache="token_decode"} 2', output)
+        self.assertIn('cache_misses_total{cache="token_decode"} 1', output)
+        self.assertIn('cache_size{cache="token_decode"} 1', output)
+
+
+class MetricsViewTest(SimpleTestCase):
+    def get(self, remote_addr="10.0.0.5", **headers):
+        return metrics_view(RequestFactory().get("/internal/metrics", REMOTE_ADDR=remote_addr, **headers))
+
+    @override_settings(METRICS={"TOKEN": "", "ALLOWED_IPS": []})
+    def test_denied_without_token_or_allowlist(self):
+        # Sau reverse proxy REMOTE_ADDR luôn là địa chỉ nội bộ
+        self.assertEqual(self.get("127.0.0.1").status_code, 403)
+        self.assertEqual(self.get("10.0.0.5").status_code, 403)
+
+    @override_settings(METRICS={"TOKEN": "secret", "ALLOWED_IPS": []})
+    def test_token(self):
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer secret").status_code, 200)
+        self.assertEqual(self.get(HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        self.assertEqual(self.get().status_code, 403)
+
+    @override_settings(METRICS={"TOKEN": "", "ALLOWED_IPS": ["10.0.0.0/24", "192.168.1.7", "invalid"]})
+    def test_allowlist(self):
+        self.assertEqual(self.get("10.0.0.5").status_code, 200)
+        self.assertEqual(self.get("192.168.1.7").status_code, 200)
+        self.assertEqual(self.get("10.0.1.5").status_code, 403)
+        self.assertEqual(self.get("not-an-ip").status_code, 403)
+
+
+class MetricsSnapshotTest(SimpleTestCase):
+    LABELS = ("customer.list", "GET", "200")
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(METRICS={"DIRECTORY": self.directory})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        # Tiến trình mới: bộ đếm và file snapshot riêng cho mỗi test
+        Metrics._pid = None
+        self.addCleanup(setattr, Metrics, "_pid", None)
+
+    def requests_total(self):
+        return Metrics.collect()[Metrics.REQUESTS].get(Metrics.get_key(Metrics.REQUESTS, self.LABELS), 0)
+
+    def write_snapshot(self, name, values, age):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(values, f)
+        modified_at = time.time() - age
+        os.utime(path, (modified_at, modified_at))
+        return path
+
+    def test_stale_snapshot_is_archived_by_mtime(self):
+        key = Metrics.get_key(Metrics.REQUESTS, self.LABELS)
+        gauge = Metrics.get_key(Metrics.IN_FLIGHT, ("customer.list",))
+        # pid 1 luôn tồn tại: chỉ mtime quyết định snapshot đã cũ
+        stale = self.write_snapshot("1-old.json", {Metrics.REQUESTS: {key: 2}, Metrics.IN_FLIGHT: {gauge: 1}}, 60)
+        fresh = self.write_snapshot("1-new.json", {Metrics.REQUESTS: {key: 3}, Metrics.IN_FLIGHT: {gauge: 1}}, 0)
+
+        collected = Metrics.collect()
+
+        self.assertEqual(collected[Metrics.REQUESTS][key], 5)
+        self.assertEqual(collected[Metrics.IN_FLIGHT][gauge], 1)
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(fresh))
+
+    def test_archived_live_process_is_not_counted_twice(self):
+        Metrics.inc(Metrics.REQUESTS, self.LABELS)
+        Metrics.flush(force=True)
+
+        # Tiến trình không có request: snapshot bị tiến trình khác gộp vào file lưu trữ
+        path = os.path.join(self.directory, Metrics._filename)
+        os.utime(path, (time.time() - 60, time.time() - 60))
+        with mock.patch.object(Metrics, "flush"):
+            self.assertEqual(self.requests_total(), 1)
+        self.assertFalse(os.path.exists(path))
+
+        Metrics.inc(Metrics.REQUESTS, self.LABELS)
+        self.assertEqual(self.requests_total(), 2)
+        self.assertEqual(self.requests_total(), 2)
+
+
+class SerializerPhaseTest(SimpleTestCase):
+    def test_serializer_data_is_timed_without_patching(self):
+        view = APIView()
+        view.request = RequestFactory().get("/")
+        view.request._metrics_phases = {}
+        view.request._metrics_active_phases = set()
+
+        serializer = EmptySerializer({})
+        self.assertEqual(view.get_serializer_data(serializer), {})
+        self.assertNotIn("to_representation", vars(serializer))
+        self.assertIn("serializer", view.request._metrics_phases)
@@ -0,0 +1,67 @@
+from django.db.models import Value
+from django.test import TestCase
+
+from datetime import timedelta
+
+from apps.accounts.models import User
+from utils.exception import MessageError
+from utils.paginator import Paginator
+from utils.search import SearchBackend
+
+
+class PaginatorCursorTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        users = [
+            User.objects.create(phone_number=f"09{index:08d}", full_name=f"User {index}", password="x")
+            for index in range(7)
+        ]
+        # Hai bản ghi cùng created_at: thứ tự phải được quyết định bởi pk
+        base = users[0].created_at
+        for index, user in enumerate(users):
+            user.created_at = base + timedelta(seconds=index // 2)
+        User.objects.bulk_update(users, ["created_at"])
+        cls.ordered = list(User.objects.order_by("-created_at", "-pk").values_list("pk", flat=True))
+
+    def get_queryset(self):
+        return User.objects.order_by("-created_at")
+
+    def test_encode_decode_roundtrip(self):
+        paginator = Paginator(self.get_queryset(), per_page=3)
+        user = User.objects.get(pk=self.ordered[0])
+
+        position, backward = paginator.decode_cursor(paginator.encode_cursor(user, backward=True))
+
+        self.assertEqual(position, [user.created_at, user.pk])
+        self.assertTrue(backward)
+        self.assertEqual(paginator.decode_cursor(None), (None, False))
+
+    def test_invalid_cursor(self):
+        paginator = Paginator(self.get_queryset(), per_page=3)
+        for cursor in ("abc", "e30", "eyJwIjpbMV19"):
+            with self.assertRaises(MessageError):
+                paginator.cursor(cursor)
+
+    def test_seek_forward_and_backward(self):
+        pages = []
+        cursor = None
+        while True:
+            paginator = Paginator(self.get_queryset(), per_page=3).cursor(cursor)
+            pages.append([user.pk for user in paginator.object_results])
+            cursor = paginator.next_cursor
+            if cursor is None:
+                break
+
+        self.assertEqual([pk for page in pages for pk in page], self.ordered)
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+
+        # Quay lại trang trước từ trang cuối
+        previous = Paginator(self.get_queryset(), per_page=3).cursor(paginator.previous_cursor)
+        self.assertEqual([user.pk for user in previous.object_results], pages[1])
+
+    def test_rejects_rank_ordering(self):
+        queryset = User.objects.annotate(**{SearchBackend.RANK_ANNOTATION: Value(1)}).order_by(
+            f"-{SearchBackend.RANK_ANNOTATION}", "-created_at"
+        )
+        with self.assertRaises(MessageError):
+            Paginator(queryset, per_page=3).cursor(None)
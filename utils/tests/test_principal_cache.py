@@ -0,0 +1,78 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from unittest import mock
+
+from apps.accounts.models import User
+from utils.principal_cache import PrincipalCache
+
+
+class PrincipalCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(phone_number="0900000001", full_name="An", password="secret-hash")
+
+    def setUp(self):
+        cache.clear()
+        PrincipalCache.local.clear()
+
+        # Cache test là LocMemCache: coi như cache dùng chung (Redis)
+        patcher = mock.patch.object(PrincipalCache, "is_enabled", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_password_is_not_cached(self):
+        user = PrincipalCache.get(User, self.user.pk)
+
+        version = cache.get(PrincipalCache.get_version_key(User, self.user.pk), 0)
+        cached = cache.get(PrincipalCache.get_key(User, self.user.pk, version))
+        self.assertNotIn("secret-hash", cached)
+        self.assertIn("password", user.get_deferred_fields())
+        self.assertEqual((user.pk, user.full_name, user.is_delete), (self.user.pk, "An", False))
+
+    def test_second_get_does_not_query(self):
+        PrincipalCache.get(User, self.user.pk)
+        with self.assertNumQueries(0):
+            PrincipalCache.get(User, self.user.pk)
+
+    def test_version_bump_is_seen_despite_local_copy(self):
+        PrincipalCache.get(User, self.user.pk)
+
+        # Thay đổi từ tiến trình khác: CSDL và version trong Redis, LRU cục bộ vẫn giữ bản cũ
+        User.objects.filter(pk=self.user.pk).update(full_name="Bình")
+        self.assertEqual(PrincipalCache.get(User, self.user.pk).full_name, "An")
+
+        PrincipalCache.bump(User, [self.user.pk])
+        self.assertEqual(PrincipalCache.get(User, self.user.pk).full_name, "Bình")
+
+    def test_save_invalidates(self):
+        PrincipalCache.get(User, self.user.pk)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.is_delete = True
+        user.save()
+
+        self.assertTrue(PrincipalCache.get(User, self.user.pk).is_delete)
+
+    def test_status_is_cached(self):
+        PrincipalCache.get(User, self.user.pk)
+        with self.assertNumQueries(0):
+            user = PrincipalCache.get(User, self.user.pk)
+            self.assertEqual(user.status, self.user.status)
+
+
+class ProcessLocalCacheTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(phone_number="0900000001", full_name="An", password="secret-hash")
+
+    def test_disabled_without_shared_cache(self):
+        self.assertFalse(PrincipalCache.is_enabled())
+
+    def test_changes_take_effect_immediately(self):
+        PrincipalCache.get(User, self.user.pk)
+
+        # Thay đổi từ worker khác: không có version dùng chung nên luôn đọc CSDL
+        User.objects.filter(pk=self.user.pk).update(status="LOCKED")
+        with self.assertNumQueries(1):
+            self.assertEqual(PrincipalCache.get(User, self.user.pk).status, "LOCKED")
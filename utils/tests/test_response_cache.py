@@ -0,0 +1,66 @@
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from unittest import mock
+
+from apps.accounts.models import Customer, User
+from utils.api_response import APIResponse
+from utils.mixins.response_cache_mixin import ResponseCacheMixin
+from utils.response_cache import ResponseCache
+
+
+class CustomerService:
+    model = Customer
+
+
+class CachedCustomerView(ResponseCacheMixin, APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    action = "list"
+    cache_action_timeouts = {"list": 60}
+    calls = 0
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.service = CustomerService()
+
+    def get(self, request):
+        CachedCustomerView.calls += 1
+        return APIResponse(data={"calls": CachedCustomerView.calls})
+
+
+class ResponseCacheMixinTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        CachedCustomerView.calls = 0
+
+    def request(self):
+        return CachedCustomerView.as_view()(APIRequestFactory().get("/customers/"))
+
+    def test_default_models_include_related_models(self):
+        models = CachedCustomerView().get_cache_models()
+        self.assertEqual(models[0], Customer)
+        self.assertIn(User, models)
+
+    def test_hit_rebuilds_timestamp(self):
+        with mock.patch("utils.api_response.time") as mock_time:
+            mock_time.time.return_value = 1000
+            first = self.request()
+        second = self.request()
+
+        self.assertEqual(first[ResponseCacheMixin.CACHE_HEADER], "MISS")
+        self.assertEqual(second[ResponseCacheMixin.CACHE_HEADER], "HIT")
+        self.assertEqual(second.data["data"], {"calls": 1})
+        self.assertEqual(first.data["timestamp"], 1000)
+        self.assertGreater(second.data["timestamp"], 1000)
+
+    def test_related_model_change_invalidates(self):
+        self.request()
+        ResponseCache.bump_version(User)
+
+        response = self.request()
+        self.assertEqual(response[ResponseCacheMixin.CACHE_HEADER], "MISS")
+        self.assertEqual(response.data["data"], {"calls": 2})
@@ -0,0 +1,54 @@
+from django.db import connection
+from django.test import TestCase
+
+from apps.accounts.models import User
+from apps.accounts.services.user_service import UserService
+from utils.search import SearchIndex, SQLiteSearchBackend
+
+
+class SQLiteSearchBackendTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Bảng FTS5 được tạo trong transaction của test class và bị rollback cùng dữ liệu
+        with connection.cursor() as cursor:
+            for statement in SearchIndex.get(User).sqlite_create_sql():
+                cursor.execute(statement)
+        SQLiteSearchBackend._fts_tables.clear()
+
+        cls.nguyen = User.objects.create(phone_number="0123456789", full_name="Nguyễn Văn An", password="x")
+        cls.tran = User.objects.create(phone_number="0987000111", full_name="Trần Thị Bình", password="x")
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        SQLiteSearchBackend._fts_tables.clear()
+
+    def search(self, keyword):
+        backend = SQLiteSearchBackend(connection)
+        queryset = backend.search(User.objects.all(), keyword, User.search_index_fields)
+        return set(queryset.values_list("pk", flat=True))
+
+    def test_word_prefix_is_accent_insensitive(self):
+        self.assertEqual(self.search("nguy"), {self.nguyen.pk})
+        self.assertEqual(self.search("binh"), {self.tran.pk})
+
+    def test_digits_keep_substring_semantics(self):
+        self.assertEqual(self.search("456"), {self.nguyen.pk})
+        self.assertEqual(self.search("87000"), {self.tran.pk})
+
+
+class ServiceKeywordTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.nguyen = User.objects.create(phone_number="0123456789", full_name="Nguyễn Văn An", password="x")
+        cls.tran = User.objects.create(phone_number="0987000111", full_name="Trần Thị Bình", password="x")
+
+    def test_keyword_matches_substring_and_ranks(self):
+        objects = UserService().get_objects(keyword="456")
+        self.assertEqual(list(objects), [self.nguyen])
+
+        objects = UserService().get_objects(keyword="tran thi")
+        self.assertEqual(list(objects), [self.tran])
+
+    def test_blank_keyword_returns_all(self):
+        self.assertEqual(UserService().get_objects(keyword="  ").count(), 2)
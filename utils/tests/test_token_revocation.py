@@ -0,0 +1,98 @@
+from django.test import RequestFactory, SimpleTestCase
+
+from unittest import mock
+
+import time
+
+from helpers.token_helper import Token
+from utils.token_revocation import LocalRevocationStore, TokenRevocation
+
+
+class TokenRevocationTest(SimpleTestCase):
+    def setUp(self):
+        self.store = LocalRevocationStore()
+        TokenRevocation._store = self.store
+        TokenRevocation._bloom = None
+        TokenRevocation._epoch = None
+        self.addCleanup(setattr, TokenRevocation, "_store", None)
+        self.addCleanup(setattr, TokenRevocation, "_bloom", None)
+        self.addCleanup(setattr, TokenRevocation, "_epoch", None)
+
+    def payload(self, jti="a", iat=None):
+        iat = time.time() if iat is None else iat
+        return {"jti": jti, "iat": int(iat), "iat_ms": int(iat * 1000), "exp": time.time() + 60}
+
+    def expire_merge(self):
+        TokenRevocation._merged_at -= TokenRevocation.MERGE_INTERVAL
+
+    def test_revoke_jti(self):
+        payload = self.payload("a")
+        TokenRevocation.revoke("a", payload["exp"])
+
+        self.assertTrue(TokenRevocation.is_revoked(payload, "manage", 1))
+        self.assertFalse(TokenRevocation.is_revoked(self.payload("b"), "manage", 1))
+
+    def test_expired_token_is_not_recorded(self):
+        TokenRevocation.revoke("a", time.time() - 1)
+        self.assertEqual(list(self.store.jtis()), [])
+
+    def test_revoke_user_applies_to_tokens_issued_before(self):
+        now = time.time()
+        TokenRevocation.revoke_user("manage", 1)
+
+        self.assertTrue(TokenRevocation.is_revoked(self.payload("a", iat=now - 10), "manage", 1))
+        self.assertTrue(TokenRevocation.is_revoked({"jti": "b"}, "manage", 1))
+        self.assertFalse(TokenRevocation.is_revoked(self.payload("c", iat=now + 10), "manage", 1))
+        self.assertFalse(TokenRevocation.is_revoked(self.payload("d", iat=now - 10), "customer", 1))
+
+    def test_token_issued_in_same_second_after_revoke_is_valid(self):
+        with mock.patch("utils.token_revocation.time.time", return_value=1000.25):
+            TokenRevocation.revoke_user("manage", 1)
+
+        self.assertTrue(TokenRevocation.is_revoked(self.payload("a", iat=1000.2), "manage", 1))
+        self.assertFalse(TokenRevocation.is_revoked(self.payload("b", iat=1000.3), "manage", 1))
+        # Token cũ chỉ có `iat` theo giây
+        self.assertTrue(TokenRevocation.is_revoked({"jti": "c", "iat": 1000}, "manage", 1))
+
+    def test_issued_token_is_valid_immediately(self):
+        payload = Token.decode_token(Token(1, RequestFactory().get("/")).access_token)
+
+        self.assertIsInstance(payload["iat"], int)
+        self.assertEqual(payload["iat_ms"] // 1000, payload["iat"])
+
+    def test_request_path_does_not_read_store(self):
+        TokenRevocation.is_revoked(self.payload("a"), "manage", 1)
+
+        with mock.patch.object(self.store, "epoch") as epoch, \
+                mock.patch.object(self.store, "revoked_since") as revoked_since:
+            TokenRevocation.is_revoked(self.payload("b"), "manage", 1)
+
+        epoch.assert_not_called()
+        revoked_since.assert_not_called()
+
+    def test_revocation_from_other_process_is_merged(self):
+        payload = self.payload("a")
+        self.assertFalse(TokenRevocation.is_revoked(payload, "manage", 1))
+        bloom = TokenRevocation._bloom
+
+        # Tiến trình khác chỉ ghi vào store: được gộp vào filter sau MERGE_INTERVAL
+        self.store.add_jti(TokenRevocation.jti_key("a"), "a", payload["exp"])
+        self.store.revoke_user(TokenRevocation.user_key("manage", 2), int(time.time() * 1000))
+        self.expire_merge()
+
+        self.assertTrue(TokenRevocation.is_revoked(payload, "manage", 1))
+        self.assertTrue(TokenRevocation.is_revoked(self.payload("b", iat=time.time() - 10), "manage", 2))
+        self.assertIs(TokenRevocation._bloom, bloom)
+        self.assertEqual(TokenRevocation._epoch, 2)
+
+    def test_truncated_log_rebuilds_filter(self):
+        payload = self.payload("a")
+        TokenRevocation.is_revoked(payload, "manage", 1)
+        bloom = TokenRevocation._bloom
+
+        self.store.add_jti(TokenRevocation.jti_key("a"), "a", payload["exp"])
+        self.store._log.clear()
+        self.expire_merge()
+
+        self.assertTrue(TokenRevocation.is_revoked(payload, "manage", 1))
+        self.assertIsNot(TokenRevocation._bloom, bloom)
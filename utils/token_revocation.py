@@ -0,0 +1,414 @@
+from django.conf import settings
+
+from asgiref.sync import sync_to_async
+
+from collections import deque
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import threading
+import time
+
+from utils.bloom_filter import BloomFilter
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class LocalRevocationStore:
+    """
+    Lưu danh sách thu hồi trong bộ nhớ tiến trình (dùng khi không cấu hình Redis).
+
+    Chỉ có hiệu lực trong tiến trình hiện tại.
+    """
+
+    LOG_SIZE = 10_000
+
+    def __init__(self):
+        self._jtis: Dict[str, float] = {}
+        self._users: Dict[str, int] = {}
+        self._log: deque = deque(maxlen=self.LOG_SIZE)
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def _append(self, key: str) -> None:
+        self._log.append(key)
+        self._epoch += 1
+
+    def epoch(self) -> int:
+        return self._epoch
+
+    def revoked_since(self, epoch: int) -> Optional[Tuple[List[str], int]]:
+        with self._lock:
+            count = self._epoch - epoch
+            if count < 0 or count > len(self._log):
+                return None
+            return list(islice(self._log, len(self._log) - count, None)), self._epoch
+
+    def add_jti(self, key: str, jti: str, exp: float) -> None:
+        with self._lock:
+            self._jtis[jti] = exp
+            self._append(key)
+
+    def has_jti(self, jti: str) -> bool:
+        exp = self._jtis.get(jti)
+        return exp is not None and exp > time.time()
+
+    def jtis(self) -> Iterable[str]:
+        now = time.time()
+        with self._lock:
+            self._jtis = {jti: exp for jti, exp in self._jtis.items() if exp > now}
+            return list(self._jtis)
+
+    def revoke_user(self, user_key: str, revoked_at: int) -> None:
+        with self._lock:
+            self._users[user_key] = revoked_at
+            self._append(user_key)
+
+    def get_user_revoked_at(self, user_key: str) -> Optional[int]:
+        return self._users.get(user_key)
+
+    def users(self, expired_before: int) -> Iterable[str]:
+        with self._lock:
+            self._users = {key: at for key, at in self._users.items() if at > expired_before}
+            return list(self._users)
+
+
+class RedisRevocationStore:
+    """
+    Lưu danh sách thu hồi trong Redis (dùng chung giữa các tiến trình).
+
+    - `token_revocation:jti`: sorted set jti -> exp
+    - `token_revocation:user`: hash "<system>:<user_id>" -> thời điểm thu hồi tất cả phiên (ms)
+    - `token_revocation:epoch`: số lần thu hồi
+    - `token_revocation:log`: list "<epoch>:<key>" của LOG_SIZE lần thu hồi gần nhất
+    """
+
+    JTI_KEY = "token_revocation:jti"
+    USER_KEY = "token_revocation:user"
+    EPOCH_KEY = "token_revocation:epoch"
+    LOG_KEY = "token_revocation:log"
+    LOG_SIZE = 10_000
+
+    # Tăng epoch và ghi log trong cùng một lệnh để thứ tự trong log khớp với epoch
+    APPEND_SCRIPT = """
+        local epoch = redis.call('INCR', KEYS[1])
+        redis.call('RPUSH', KEYS[2], epoch .. ':' .. ARGV[1])
+        redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+        return epoch
+    """
+
+    def __init__(self, alias: str = "default"):
+        from django_redis import get_redis_connection
+
+        self.client = get_redis_connection(alias)
+        self.append_script = self.client.register_script(self.APPEND_SCRIPT)
+
+    def _append(self, pipeline: Any, key: str) -> None:
+        self.append_script(keys=[self.EPOCH_KEY, self.LOG_KEY], args=[key, self.LOG_SIZE], client=pipeline)
+
+    def epoch(self) -> int:
+        return int(self.client.get(self.EPOCH_KEY) or 0)
+
+    def revoked_since(self, epoch: int) -> Optional[Tuple[List[str], int]]:
+        current = self.epoch()
+        count = current - epoch
+        if count == 0:
+            return [], epoch
+        if count < 0 or count > self.LOG_SIZE:
+            return None
+
+        entries = []
+        for value in self.client.lrange(self.LOG_KEY, -count, -1):
+            value = value.decode() if isinstance(value, bytes) else value
+            entry_epoch, key = value.split(":", 1)
+            entries.append((int(entry_epoch), key))
+
+        # Log đã bị cắt hoặc có thu hồi mới chen vào giữa hai lệnh: đồng bộ lại toàn bộ
+        if not entries or entries[0][0] != epoch + 1:
+            return None
+        return [key for _, key in entries], entries[-1][0]
+
+    def add_jti(self, key: str, jti: str, exp: float) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.zadd(self.JTI_KEY, {jti: exp})
+        pipeline.zremrangebyscore(self.JTI_KEY, "-inf", time.time())
+        self._append(pipeline, key)
+        pipeline.execute()
+
+    def has_jti(self, jti: str) -> bool:
+        exp = self.client.zscore(self.JTI_KEY, jti)
+        return exp is not None and exp > time.time()
+
+    def jtis(self) -> Iterable[str]:
+        values = self.client.zrangebyscore(self.JTI_KEY, time.time(), "+inf")
+        return [value.decode() if isinstance(value, bytes) else value for value in values]
+
+    def revoke_user(self, user_key: str, revoked_at: int) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.hset(self.USER_KEY, user_key, revoked_at)
+        self._append(pipeline, user_key)
+        pipeline.execute()
+
+    def get_user_revoked_at(self, user_key: str) -> Optional[int]:
+        value = self.client.hget(self.USER_KEY, user_key)
+        return int(value) if value is not None else None
+
+    def users(self, expired_before: int) -> Iterable[str]:
+        users = []
+        expired = []
+        for key, value in self.client.hgetall(self.USER_KEY).items():
+            key = key.decode() if isinstance(key, bytes) else key
+            if int(value) > expired_before:
+                users.append(key)
+            else:
+                expired.append(key)
+
+        if expired:
+            self.client.hdel(self.USER_KEY, *expired)
+        return users
+
+
+class TokenRevocation:
+    """
+    Thu hồi token theo `jti` hoặc toàn bộ phiên của một người dùng.
+
+    Danh sách thu hồi nằm trong Redis (hoặc bộ nhớ tiến trình nếu không có Redis).
+    Mỗi tiến trình giữ một Bloom filter và epoch (số lần thu hồi) đã gộp vào filter.
+    Request chỉ kiểm tra Bloom filter trong bộ nhớ; chỉ khi filter báo có thể bị thu
+    hồi mới kiểm tra ở store.
+
+    Thu hồi trong cùng tiến trình được thêm ngay vào filter. Thu hồi từ tiến trình
+    khác được gộp từ log thu hồi của store (các key thu hồi sau epoch đã gộp), tối đa
+    mỗi MERGE_INTERVAL giây một lần. Filter chỉ được dựng lại toàn bộ sau mỗi
+    SYNC_INTERVAL giây (để loại token đã hết hạn) hoặc khi log không còn đủ các lần
+    thu hồi kể từ epoch đã gộp.
+    """
+
+    MERGE_INTERVAL = 1  # Giây
+    SYNC_INTERVAL = 60  # Giây
+    BLOOM_CAPACITY = 100_000
+    BLOOM_ERROR_RATE = 0.01
+
+    _store: Optional[Any] = None
+    _bloom: Optional[BloomFilter] = None
+    _epoch: Optional[int] = None
+    _synced_at = 0.0
+    _merged_at = 0.0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_store(cls) -> Any:
+        if cls._store is None:
+            backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+            if backend.startswith("django_redis"):
+                cls._store = RedisRevocationStore()
+            else:
+                cls._store = LocalRevocationStore()
+        return cls._store
+
+    @staticmethod
+    def user_key(system: str, user_id: Any) -> str:
+        return f"user:{system}:{user_id}"
+
+    @staticmethod
+    def jti_key(jti: str) -> str:
+        return f"jti:{jti}"
+
+    @classmethod
+    def max_token_lifetime(cls) -> float:
+        from helpers.token_helper import Token
+
+        lifetime = Token.REFRESH_TOKEN_LIFETIME
+        return lifetime.total_seconds() if hasattr(lifetime, "total_seconds") else float(lifetime)
+
+    @classmethod
+    def is_fresh(cls) -> bool:
+        """
+        Bloom filter hiện tại chưa quá SYNC_INTERVAL.
+        """
+        return cls._bloom is not None and time.monotonic() - cls._synced_at < cls.SYNC_INTERVAL
+
+    @classmethod
+    def is_merged(cls) -> bool:
+        """
+        Bloom filter đã gộp log thu hồi trong vòng MERGE_INTERVAL.
+        """
+        return cls._epoch is not None and time.monotonic() - cls._merged_at < cls.MERGE_INTERVAL
+
+    @classmethod
+    def sync(cls, force: bool = False) -> BloomFilter:
+        """
+        Dựng lại Bloom filter từ store nếu đã quá SYNC_INTERVAL.
+
+        Args:
+            force: Đồng bộ ngay
+
+        Returns:
+            BloomFilter: Bloom filter hiện tại
+        """
+        if not force and cls.is_fresh():
+            return cls._bloom
+
+        with cls._lock:
+            if not force and cls.is_fresh():
+                return cls._bloom
+            return cls._rebuild()
+
+    @classmethod
+    def _rebuild(cls) -> BloomFilter:
+        now = time.monotonic()
+        store = cls.get_store()
+        bloom = BloomFilter(cls.BLOOM_CAPACITY, cls.BLOOM_ERROR_RATE)
+        try:
+            # Đọc epoch trước dữ liệu: thu hồi xảy ra trong lúc dựng sẽ được gộp ở lần sau
+            built_epoch = store.epoch()
+            bloom.update(cls.jti_key(jti) for jti in store.jtis())
+            bloom.update(store.users(now_ms() - int(cls.max_token_lifetime() * 1000)))
+        except Exception:
+            # Store lỗi: giữ filter cũ, thử lại ở lần đồng bộ sau
+            if cls._bloom is not None:
+                cls._synced_at = cls._merged_at = now
+                return cls._bloom
+            built_epoch = None
+
+        cls._bloom = bloom
+        cls._epoch = built_epoch
+        cls._synced_at = cls._merged_at = now
+        return bloom
+
+    @classmethod
+    def merge(cls) -> BloomFilter:
+        """
+        Gộp các lần thu hồi sau epoch đã gộp vào Bloom filter, tối đa mỗi
+        MERGE_INTERVAL giây một lần.
+
+        Returns:
+            BloomFilter: Bloom filter hiện tại
+        """
+        bloom = cls.sync()
+        if cls.is_merged():
+            return bloom
+
+        with cls._lock:
+            if cls._bloom is None or cls._epoch is None:
+                return cls._rebuild()
+            if cls.is_merged():
+                return cls._bloom
+
+            try:
+                revoked = cls.get_store().revoked_since(cls._epoch)
+            except Exception:
+                cls._merged_at = time.monotonic()
+                return cls._bloom
+
+            if revoked is None:
+                return cls._rebuild()
+
+            keys, epoch = revoked
+            cls._bloom.update(keys)
+            cls._epoch = epoch
+            cls._merged_at = time.monotonic()
+            return cls._bloom
+
+    @classmethod
+    def revoke(cls, jti: str, exp: float) -> None:
+        """
+        Thu hồi một token theo jti cho tới khi token hết hạn.
+
+        Args:
+            jti: jti của token
+            exp: Thời điểm hết hạn của token (timestamp)
+        """
+        if not jti or exp <= time.time():
+            return
+
+        key = cls.jti_key(jti)
+        cls.get_store().add_jti(key, jti, exp)
+        cls.sync().add(key)
+
+    @classmethod
+    def revoke_user(cls, system: str, user_id: Any) -> None:
+        """
+        Thu hồi tất cả token của một người dùng được cấp tới thời điểm hiện tại.
+
+        Args:
+            system: Hệ thống xác thực (manage/customer)
+            user_id: ID người dùng
+        """
+        key = cls.user_key(system, user_id)
+        cls.get_store().revoke_user(key, now_ms())
+        cls.sync().add(key)
+
+    @staticmethod
+    def issued_at_ms(payload: Dict[str, Any]) -> Optional[int]:
+        """
+        Thời điểm cấp token theo mili giây: `iat_ms`, hoặc `iat` (giây) với token cũ.
+        """
+        if payload.get("iat_ms") is not None:
+            return int(payload["iat_ms"])
+        if payload.get("iat") is not None:
+            return int(payload["iat"]) * 1000
+        return None
+
+    @classmethod
+    def is_revoked(cls, payload: Dict[str, Any], system: str, user_id: Any) -> bool:
+        """
+        Kiểm tra token đã bị thu hồi chưa.
+
+        Thời điểm cấp (`iat_ms`) và thời điểm thu hồi được so sánh theo mili giây, nên
+        token cấp ngay sau khi thu hồi tất cả phiên vẫn hợp lệ. Token không có `iat`
+        (cấp trước khi hỗ trợ thu hồi) bị coi là đã thu hồi nếu người dùng đã thu hồi
+        tất cả phiên. Nếu store lỗi, token được coi là hợp lệ.
+
+        Args:
+            payload: Payload đã xác thực của token
+            system: Hệ thống xác thực (manage/customer)
+            user_id: ID người dùng trong token
+
+        Returns:
+            bool: True nếu token đã bị thu hồi
+        """
+        bloom = cls.merge()
+
+        try:
+            jti = payload.get("jti")
+            if jti and cls.jti_key(jti) in bloom and cls.get_store().has_jti(jti):
+                return True
+
+            key = cls.user_key(system, user_id)
+            if key in bloom:
+                revoked_at = cls.get_store().get_user_revoked_at(key)
+                if revoked_at is not None:
+                    issued_at = cls.issued_at_ms(payload)
+                    return issued_at is None or issued_at <= revoked_at
+        except Exception:
+            return False
+
+        return False
+
+    @classmethod
+    async def ais_revoked(cls, payload: Dict[str, Any], system: str, user_id: Any) -> bool:
+        """
+        Phiên bản async của `is_revoked`.
+
+        Khi Bloom filter đã gộp log thu hồi trong MERGE_INTERVAL và không chứa
+        token/người dùng (phần lớn request), kết quả được trả về ngay trong event loop;
+        chỉ khi cần gộp log hoặc truy vấn store mới chạy `is_revoked` trong thread.
+
+        Args:
+            payload: Payload đã xác thực của token
+            system: Hệ thống xác thực (manage/customer)
+            user_id: ID người dùng trong token
+
+        Returns:
+            bool: True nếu token đã bị thu hồi
+        """
+        bloom = cls._bloom
+        if bloom is not None and cls.is_fresh() and cls.is_merged():
+            jti = payload.get("jti")
+            if (not jti or cls.jti_key(jti) not in bloom) and cls.user_key(system, user_id) not in bloom:
+                return False
+
+        return await sync_to_async(cls.is_revoked)(payload, system, user_id)
@@ -2,14 +2,24 @@ from django.db import transaction
 from django.utils.decorators import method_decorator
 from django.core.exceptions import ObjectDoesNotExist
 
+from asgiref.sync import sync_to_async, iscoroutinefunction
+
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.validators import UniqueValidator, UniqueTogetherValidator
+from rest_framework import exceptions
 from rest_framework.renderers import JSONRenderer
 from rest_framework import mixins, views
 
 from drf_yasg.utils import swagger_auto_schema
 
+from typing import Any, Dict, List
+
+import functools
+
 from utils.mixins.base_api_view_mixin import BaseAPIViewMixin
-from utils.mixins.serializer_mixin import GenericViewSetMixin
+from utils.mixins.response_cache_mixin import ResponseCacheMixin
+from utils.mixins.serializer_mixin import GenericViewSetMixin, BulkDeleteSerializer
+from utils.exception import MessageError
 from utils.api_response import (
     SuccessResponse,
     CreatedResponse,
@@ -28,6 +38,7 @@ AUTO_SCHEMA_NONE = swagger_auto_schema(auto_schema=None)
 @method_decorator(name="retrieve", decorator=AUTO_SCHEMA_NONE)
 @method_decorator(name="partial_update", decorator=AUTO_SCHEMA_NONE)
 class APIGenericView(
+    ResponseCacheMixin,
     BaseAPIViewMixin,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -44,6 +55,7 @@ class APIGenericView(
     permission_classes = []  # Default là không yêu cầu quyền
     permission_action_classes = {}  # Map action -> permissions
     renderer_classes = [JSONRenderer]  # Default renderer
+    bulk_max_size = 1000  # Số phần tử tối đa mỗi request ghi theo lô
 
     def get_permissions(self):
         """
@@ -94,6 +106,118 @@ class APIGenericView(
         else:
             super().perform_destroy(instance)  # Xóa cứng
 
+    def get_bulk_data(self, data: Any) -> List[Any]:
+        """
+        Kiểm tra dữ liệu của request ghi theo lô
+
+        Args:
+            data: Dữ liệu request (danh sách)
+
+        Returns:
+            List[Any]: Danh sách phần tử
+
+        Raises:
+            MessageError: Nếu dữ liệu không phải danh sách, rỗng hoặc vượt quá bulk_max_size
+        """
+        if not isinstance(data, list) or not data:
+            raise MessageError("Dữ liệu phải là một danh sách không rỗng")
+
+        if len(data) > self.bulk_max_size:
+            raise MessageError(f"Chỉ được xử lý tối đa {self.bulk_max_size} phần tử mỗi lần")
+
+        return data
+
+    def get_bulk_request_serializer(self, *args, **kwargs):
+        """
+        Lấy request serializer many=True cho các action ghi theo lô
+
+        UniqueValidator/UniqueTogetherValidator (mỗi dòng một truy vấn) được bỏ qua,
+        BaseService.validate_bulk_unique kiểm tra cho cả lô.
+
+        Returns:
+            ListSerializer: Serializer đã khởi tạo
+        """
+        serializer = self.get_request_serializer(*args, many=True, **kwargs)
+        child = serializer.child
+
+        for field in child.fields.values():
+            field.validators = [
+                validator for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        child.validators = [
+            validator for validator in child.validators
+            if not isinstance(validator, UniqueTogetherValidator)
+        ]
+
+        return serializer
+
+    def perform_bulk_create(self, request) -> List[Any]:
+        """
+        Validate (many=True) và tạo mới theo lô bằng service.bulk_create
+
+        Args:
+            request: Request chứa danh sách đối tượng
+
+        Returns:
+            List[Model]: Các đối tượng đã được tạo
+        """
+        data = self.get_bulk_data(request.data)
+
+        serializer = self.get_bulk_request_serializer(data=data)
+        serializer.is_valid(raise_exception=True)
+
+        return self.service.bulk_create(serializer.validated_data)
+
+    def perform_bulk_update(self, request) -> List[Any]:
+        """
+        Validate (many=True, partial) và cập nhật theo lô bằng service.bulk_update
+
+        Mỗi phần tử phải có `id`, chỉ các trường được gửi lên mới được cập nhật.
+
+        Args:
+            request: Request chứa danh sách đối tượng
+
+        Returns:
+            List[Model]: Các đối tượng đã được cập nhật
+        """
+        data = self.get_bulk_data(request.data)
+
+        if any(not isinstance(item, dict) or item.get("id") in (None, "") for item in data):
+            raise MessageError("Mỗi phần tử phải có id")
+
+        instances = self.service.get_bulk_instances([item["id"] for item in data])
+        if len(instances) != len(data):
+            raise MessageError("Danh sách có id bị trùng lặp")
+
+        serializer = self.get_bulk_request_serializer(data=data, partial=True)
+        serializer.is_valid(raise_exception=True)
+
+        fields = set()
+        instances = list(instances.values())
+        for instance, validated_data in zip(instances, serializer.validated_data):
+            for key, value in validated_data.items():
+                setattr(instance, key, value)
+                fields.add(key)
+
+        return self.service.bulk_update(instances, sorted(fields))
+
+    def perform_bulk_delete(self, request) -> Dict[str, int]:
+        """
+        Xóa theo lô ({"ids": [...]}) bằng service.bulk_delete
+
+        Args:
+            request: Request chứa danh sách ID
+
+        Returns:
+            Dict[str, int]: Số đối tượng đã xóa
+        """
+        serializer = BulkDeleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        ids = self.get_bulk_data(serializer.validated_data["ids"])
+        return {"deleted": self.service.bulk_delete(ids)}
+
     def list(self, request, *args, **kwargs):
         """
         Override list để tùy chỉnh response
@@ -105,10 +229,10 @@ class APIGenericView(
             page = self.paginate_queryset(queryset)
             if page is not None:
                 serializer = self.get_serializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
+                return self.get_paginated_response(self.get_serializer_data(serializer))
 
             serializer = self.get_serializer(queryset, many=True)
-            return SuccessResponse(data=serializer.data)
+            return SuccessResponse(data=self.get_serializer_data(serializer))
         except Exception as e:
             raise
 
@@ -120,8 +244,9 @@ class APIGenericView(
             serializer = self.get_serializer(data=request.data)
             serializer.is_valid(raise_exception=True)
             instance = self.perform_create(serializer)
-            headers = self.get_success_headers(serializer.data)
-            return CreatedResponse(data=serializer.data, headers=headers)
+            data = self.get_serializer_data(serializer)
+            headers = self.get_success_headers(data)
+            return CreatedResponse(data=data, headers=headers)
         except Exception as e:
             raise
 
@@ -132,7 +257,7 @@ class APIGenericView(
         try:
             instance = self.get_object()
             serializer = self.get_serializer(instance)
-            return SuccessResponse(data=serializer.data)
+            return SuccessResponse(data=self.get_serializer_data(serializer))
         except ObjectDoesNotExist:
             return NotFoundResponse()
         except Exception as e:
@@ -150,7 +275,7 @@ class APIGenericView(
             )
             serializer.is_valid(raise_exception=True)
             self.perform_update(serializer)
-            return SuccessResponse(data=serializer.data)
+            return SuccessResponse(data=self.get_serializer_data(serializer))
         except ObjectDoesNotExist:
             return NotFoundResponse()
         except Exception as e:
@@ -177,6 +302,155 @@ class APIGenericView(
             raise
 
 
+class AsyncAPIGenericView(APIGenericView):
+    """
+    View cơ sở cho API Generic chạy native async (ASGI)
+
+    Xác thực (MultiAuthentication.aauthenticate), kiểm tra ETag/Last-Modified và
+    handler `async def` chạy trực tiếp trong event loop với async ORM của Django
+    (xem các phương thức a* của BaseService). Handler đồng bộ vẫn được hỗ trợ và
+    chạy trong thread qua sync_to_async.
+
+    Handler async không được truy cập lazy relation hoặc gọi ORM đồng bộ (Django
+    sẽ raise SynchronousOnlyOperation); dùng select_related/prefetch_related hoặc
+    sync_to_async cho các phần đó.
+
+    Mọi middleware trong MIDDLEWARE phải hỗ trợ async (MiddlewareMixin), nếu không
+    Django chạy view qua async_to_sync và mỗi request vẫn giữ một thread.
+    """
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        """
+        Bọc view của DRF thành coroutine function để Django gọi trực tiếp trên ASGI
+
+        Returns:
+            Callable: View async (vẫn giữ các thuộc tính cls, actions, csrf_exempt, ...)
+        """
+        view = super().as_view(actions, **initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            return await view(request, *args, **kwargs)
+
+        functools.update_wrapper(async_view, view)
+        return async_view
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Phiên bản async của APIView.dispatch
+
+        Args:
+            request: HttpRequest gốc
+            *args: Đối số vị trí bổ sung
+            **kwargs: Đối số từ khóa bổ sung
+
+        Returns:
+            Response: Response từ handler
+        """
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            elif self.conditional_not_modified or getattr(self, "response_cache_hit", False):
+                # Handler đã được thay bằng response 304/cache, không cần thread
+                response = handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = await self.afinalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def ainitial(self, request, *args, **kwargs) -> None:
+        """
+        Phiên bản async của initial: negotiation, xác thực, kiểm tra quyền,
+        throttle, ETag/Last-Modified và response cache
+        """
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+
+        # Permission có thể truy vấn CSDL/cache (vd. WorkspaceAction) nên chạy trong thread
+        if self.get_permissions():
+            await sync_to_async(self.check_permissions)(request)
+
+        if self.get_throttles():
+            await sync_to_async(self.check_throttles)(request)
+
+        fingerprint = None
+        if self.should_check_conditional(request):
+            fingerprint = await self.aget_conditional_fingerprint(**kwargs)
+        self.apply_conditional_fingerprint(request, fingerprint)
+
+        if not self.conditional_not_modified and self.get_response_cache_timeout():
+            await sync_to_async(self.load_cached_response)(request)
+
+    async def aperform_authentication(self, request) -> None:
+        """
+        Xác thực request bằng `aauthenticate` của authentication class nếu có,
+        ngược lại gọi `authenticate` trong thread (giống Request._authenticate)
+
+        Args:
+            request: Request của DRF
+        """
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, "aauthenticate"):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = await sync_to_async(authenticator.authenticate)(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+
+        request._not_authenticated()
+
+    async def afinalize_response(self, request, response, *args, **kwargs):
+        """
+        Phiên bản async của finalize_response (lưu response cache trong thread)
+        """
+        if getattr(self, "response_cache_key", None):
+            return await sync_to_async(self.finalize_response)(request, response, *args, **kwargs)
+        return self.finalize_response(request, response, *args, **kwargs)
+
+    async def apaginator(self, object_list, *args, **kwargs):
+        """
+        Phiên bản async của paginator (Paginator dùng ORM đồng bộ nên chạy trong thread)
+
+        Args:
+            object_list: Danh sách cần phân trang
+            *args, **kwargs: Tham số giống `paginator`
+
+        Returns:
+            Dict: Kết quả đã phân trang
+        """
+        return await sync_to_async(self.paginator)(object_list, *args, **kwargs)
+
+
 class APIView(BaseAPIViewMixin, views.APIView):
     """
     View cơ sở cho API thuần